@@ -0,0 +1,5 @@
+"""
+EO Studio CFO Dashboard 데이터/지표 엔진
+
+dashboard.py (Streamlit 화면)와 분리된, Streamlit 없이도 import 가능한 로직 모음
+"""
@@ -0,0 +1,241 @@
+"""
+미수금 연령 분석 (AR Aging)
+
+RAW_Revenue 의 invoice_date / payment_date / payment_terms 로 청구 건마다 만기일을 계산하고,
+기준일(as-of) 에 열려 있는(청구됐고 아직 입금되지 않은) 청구 건을 연체 일수 구간으로 나눕니다.
+
+    Current   만기 전 (연체 0일 이하)
+    1-30      만기 후 1~30일
+    31-60     31~60일
+    61-90     61~90일
+    90+       90일 초과
+
+- 기준일: 사이드바 종료일 (없으면 데이터 마지막 거래일), 그 이후 입금은 아직 입금되지 않은 것으로 봄
+- 대상: 사이드바 기간/국가/팀 필터에 해당하는 거래 (FilterEngine 으로 정렬/코드화한 배열을 한 번만 만듦)
+- DSO = 기준일 미수금 / 최근 90일 청구액 × 90
+- 월별 추이: 월말 미수금 잔고와 DSO, 청구월별 회수율(기준일까지 입금) 과 기한 내 회수율(기준일과 만기일까지 입금)
+
+모든 계산은 구간 번호 × 차원 코드 bincount 와 일별 누적합이라 수백만 건도 필터 변경마다 한 번에 처리합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cfo.filters import FilterEngine
+
+AGING_BUCKETS = ['Current', '1-30', '31-60', '61-90', '90+']
+
+# 구간 경계 (연체 일수, 오른쪽 포함): <=0, 1~30, 31~60, 61~90, 91~
+_BUCKET_EDGES = np.array([0, 30, 60, 90])
+
+# 결제 조건에 일수가 없을 때의 기본값 (NET 30)
+DEFAULT_TERM_DAYS = 30
+
+# DSO 계산 기간 (일)
+DSO_WINDOW_DAYS = 90
+
+# 입금되지 않은 청구 건의 입금일 (충분히 먼 미래)
+_NEVER = np.iinfo(np.int64).max
+
+AGING_DIMENSIONS = ('country', 'team', 'client_name')
+
+# ArAging 이 읽는 RAW_Revenue 컬럼
+AR_COLUMNS = ['date', 'invoice_date', 'payment_date', 'payment_terms', 'payment_status', 'amount_krw', *AGING_DIMENSIONS]
+
+
+def _days(values):
+    """
+    날짜 배열 → 1970-01-01 기준 일 번호 (결측은 NaT 판별용 마스크와 함께)
+    """
+    days = pd.to_datetime(values).to_numpy().astype('datetime64[D]')
+    return days.astype(np.int64), np.isnat(days)
+
+
+def term_days(payment_terms):
+    """
+    결제 조건('NET 30', 'NET 60' 등) → 일수 배열 (숫자가 없으면 DEFAULT_TERM_DAYS)
+    값 종류별로 한 번만 파싱
+    """
+    codes, values = pd.factorize(pd.Series(payment_terms).astype(object))
+    parsed = pd.Series(values, dtype=object).astype(str).str.extract(r'(\d+)')[0]
+    lookup = np.append(pd.to_numeric(parsed, errors='coerce').fillna(DEFAULT_TERM_DAYS).to_numpy(dtype=np.int64),
+                       DEFAULT_TERM_DAYS)
+    return lookup[codes]
+
+
+def aging_bucket(days_past_due):
+    """
+    연체 일수 배열 → 구간 번호 (AGING_BUCKETS 위치)
+    """
+    return np.searchsorted(_BUCKET_EDGES, days_past_due, side='left')
+
+
+class ArAging:
+    """
+    매출 원장의 청구/만기/입금일 배열 (거래일 순 정렬, 데이터 로드 시 한 번 생성)
+
+    engine: 거래일/차원 필터용 FilterEngine (country, team, client_name)
+    invoice_day, due_day, paid_day: 일 번호 (입금 전이면 paid_day 는 _NEVER)
+    invoice_month: 청구월 번호 (1970-01 기준)
+    """
+
+    def __init__(self, df_revenue):
+        has_invoice = 'invoice_date' in df_revenue.columns
+        columns = {
+            'date': df_revenue['date'],
+            'invoice_date': df_revenue['invoice_date'] if has_invoice else df_revenue['date'],
+            'payment_date': df_revenue['payment_date'] if 'payment_date' in df_revenue.columns else pd.NaT,
+            'payment_terms': df_revenue['payment_terms'] if 'payment_terms' in df_revenue.columns else None,
+            'payment_status': df_revenue['payment_status'] if 'payment_status' in df_revenue.columns else None,
+            'amount_krw': df_revenue['amount_krw'],
+        }
+        for dim in AGING_DIMENSIONS:
+            columns[dim] = df_revenue[dim] if dim in df_revenue.columns else 'Unknown'
+        self.engine = FilterEngine(pd.DataFrame(columns), dimensions=AGING_DIMENSIONS)
+        frame = self.engine.frame
+
+        invoice_day, invoice_missing = _days(frame['invoice_date'])
+        date_day, _ = _days(frame['date'])
+        invoice_day = np.where(invoice_missing, date_day, invoice_day)
+        paid_day, unpaid = _days(frame['payment_date'])
+        # 입금일 없이 Paid 로 표시된 건은 청구일에 입금된 것으로 봄 (열린 적 없음)
+        if frame['payment_status'].notna().any():
+            paid_without_date = unpaid & (frame['payment_status'].astype(object) == 'Paid').to_numpy()
+            paid_day = np.where(paid_without_date, invoice_day, paid_day)
+            unpaid &= ~paid_without_date
+        paid_day = np.where(unpaid, _NEVER, np.maximum(paid_day, invoice_day))
+
+        self.invoice_day = invoice_day
+        self.invoice_month = invoice_day.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        self.due_day = invoice_day + term_days(frame['payment_terms'])
+        self.paid_day = paid_day
+        self.amount = np.nan_to_num(frame['amount_krw'].to_numpy(dtype=float))
+        self.last_day = int(date_day.max()) if len(date_day) else 0
+
+    def _breakdown(self, codes, dim, buckets, amounts):
+        """
+        열린 청구 건의 (차원 값 × 구간) 금액 표, 미수금 합계 내림차순
+        """
+        codes = codes.astype(np.int64)
+        categories = np.asarray(self.engine.categories[dim], dtype=object)
+        n_buckets = len(AGING_BUCKETS)
+        valid = codes >= 0
+        table = np.bincount(
+            codes[valid] * n_buckets + buckets[valid], weights=amounts[valid],
+            minlength=len(categories) * n_buckets,
+        ).reshape(len(categories), n_buckets)
+        result = pd.DataFrame(table, columns=AGING_BUCKETS)
+        result.insert(0, dim, categories)
+        result['total'] = table.sum(axis=1)
+        result['past_due'] = table[:, 1:].sum(axis=1)
+        result = result[result['total'] > 0]
+        return result.sort_values('total', ascending=False).reset_index(drop=True)
+
+    def _trend(self, invoice_day, invoice_month, due_day, paid_day, amount, as_of):
+        """
+        월별 추이: 월말(마지막 달은 기준일) 미수금 잔고, DSO, 청구월별 회수율/기한 내 회수율
+        """
+        first = int(invoice_day.min())
+        n_days = as_of - first + 1
+        invoiced = np.bincount(invoice_day - first, weights=amount, minlength=n_days)
+        paid = paid_day <= as_of
+        collected = np.bincount(paid_day[paid] - first, weights=amount[paid], minlength=n_days)
+        cum_invoiced = np.cumsum(invoiced)
+        cum_collected = np.cumsum(collected)
+
+        first_month = np.datetime64(first, 'D').astype('datetime64[M]')
+        last_month = np.datetime64(as_of, 'D').astype('datetime64[M]')
+        months = np.arange(first_month, last_month + 1)
+        n_months = len(months)
+        month_ends = ((months + 1).astype('datetime64[D]') - 1).astype(np.int64)
+        month_ends[-1] = as_of
+        points = month_ends - first
+
+        balance = cum_invoiced[points] - cum_collected[points]
+        window_start = points - DSO_WINDOW_DAYS
+        window_sales = cum_invoiced[points] - np.where(window_start >= 0, cum_invoiced[np.maximum(window_start, 0)], 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dso = np.where(window_sales > 0, balance / window_sales * DSO_WINDOW_DAYS, np.nan)
+
+        # 청구월별 회수율
+        month_ids = invoice_month - int(first_month.astype(np.int64))
+        # 기준일 이후 입금은 아직 입금되지 않은 것으로 봄 (만기일이 기준일 뒤여도 기한 내 회수 아님)
+        on_time = paid & (paid_day <= due_day)
+        month_invoiced = np.bincount(month_ids, weights=amount, minlength=n_months)
+        month_collected = np.bincount(month_ids[paid], weights=amount[paid], minlength=n_months)
+        month_on_time = np.bincount(month_ids[on_time], weights=amount[on_time], minlength=n_months)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            collection_pct = np.where(month_invoiced > 0, month_collected / month_invoiced * 100, np.nan)
+            on_time_pct = np.where(month_invoiced > 0, month_on_time / month_invoiced * 100, np.nan)
+
+        return pd.DataFrame({
+            'year_month': pd.DatetimeIndex(months.astype('datetime64[ns]')).strftime('%Y-%m'),
+            'ar_balance': balance,
+            'dso_days': dso,
+            'invoiced': month_invoiced,
+            'collection_pct': collection_pct,
+            'on_time_pct': on_time_pct,
+        })
+
+    def aging(self, start=None, end=None, countries=None, teams=None):
+        """
+        필터 조건의 미수금 연령 분석
+
+        반환 dict:
+            as_of: 기준일 (Timestamp), has_ar: 열린 청구 건 유무
+            total, past_due: 미수금 합계 / 만기 지난 미수금 합계
+            buckets: bucket + amount_krw + count (AGING_BUCKETS 순)
+            by_client, by_country, by_team: 차원 값 + 구간별 금액 + total + past_due (미수금 있는 값만)
+            dso_days: 기준일 DSO
+            trend: year_month + ar_balance, dso_days, invoiced, collection_pct, on_time_pct
+        """
+        lo, hi = self.engine.date_bounds(start, end)
+        mask = self.engine.mask(lo, hi, country=countries, team=teams)
+        # 차원 필터가 없으면 정렬된 배열의 연속 구간(view) 그대로
+        rows = slice(lo, hi) if mask is None else lo + np.flatnonzero(mask)
+
+        as_of = self.last_day if end is None else int(np.datetime64(pd.Timestamp(end).date(), 'D').astype(np.int64))
+        invoice_day = self.invoice_day[rows]
+        # 기준일 이후 청구 건은 대상에서 제외
+        issued = invoice_day <= as_of
+        if issued.all():
+            issued = slice(None)
+
+        def take(values):
+            return values[rows][issued]
+
+        invoice_day = invoice_day[issued]
+        due_day = take(self.due_day)
+        paid_day = take(self.paid_day)
+        amount = take(self.amount)
+
+        open_rows = paid_day > as_of
+        buckets = aging_bucket(as_of - due_day[open_rows])
+        open_amount = amount[open_rows]
+        n_buckets = len(AGING_BUCKETS)
+        bucket_amounts = np.bincount(buckets, weights=open_amount, minlength=n_buckets)
+        bucket_counts = np.bincount(buckets, minlength=n_buckets)
+
+        def breakdown(dim):
+            return self._breakdown(take(self.engine.codes[dim])[open_rows], dim, buckets, open_amount)
+
+        result = {
+            'as_of': pd.Timestamp(np.datetime64(as_of, 'D')),
+            'has_ar': bool(open_rows.any()),
+            'total': float(bucket_amounts.sum()),
+            'past_due': float(bucket_amounts[1:].sum()),
+            'buckets': pd.DataFrame({'bucket': AGING_BUCKETS, 'amount_krw': bucket_amounts, 'count': bucket_counts}),
+            'by_client': breakdown('client_name'),
+            'by_country': breakdown('country'),
+            'by_team': breakdown('team'),
+        }
+        if len(invoice_day):
+            trend = self._trend(invoice_day, take(self.invoice_month), due_day, paid_day, amount, as_of)
+            result['trend'] = trend
+            result['dso_days'] = float(trend['dso_days'].iloc[-1])
+        else:
+            result['trend'] = pd.DataFrame(
+                columns=['year_month', 'ar_balance', 'dso_days', 'invoiced', 'collection_pct', 'on_time_pct']
+            )
+            result['dso_days'] = np.nan
+        return result
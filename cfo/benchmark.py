@@ -0,0 +1,283 @@
+"""
+대시보드 단계별 벤치마크
+
+합성 원장(RAW_Revenue / RAW_Expense 행 수 = size)을 만들어 각 단계의 실행 시간과 최대 메모리를 측정합니다.
+결과는 JSON 으로 저장되며 이전 결과와 비교해 느려진 단계를 찾을 수 있습니다.
+
+단계:
+    load            CSV 원문 → 타입 지정된 DataFrame (load_all_tabs + LocalCsvSource)
+    parse_dates     날짜 문자열 파싱 (RAW_Revenue.date)
+    validate        CSV 로 읽은 RAW_Revenue 검증/변환 (validate_tab, 날짜/숫자/값 목록 + 격리)
+    fx              환율 환산 (RAW_Revenue 전체, 거래일 기준 as-of 조인)
+    cube            월별 집계 큐브 생성
+    filter          사이드바 필터 (기간 + 국가/팀, 큐브 셀 + 거래 필터 인덱스)
+    ar_index        미수금 연령 분석 배열 생성 (청구/만기/입금일, 정렬 + 코드화)
+    budget_index    예산 대비 실적 (월 × 국가 × 팀) 배열 생성
+    headcount_timeline
+                    시점별 인원 (월 × 국가 × 팀) 배열 생성 (입사/퇴사 스윕)
+    pl_table        PL_Monthly 표 생성 + 빈 저장소에 마감 (pl_monthly_rows, PlMonthlyStore.update)
+    kpi, cash_runway, pl, budget, pipeline, productivity, ar, ar_aging
+                    섹션 계산 (cfo/metrics.py, 결과 캐시 없이)
+                    큐브당 한 번 만드는 배열/표는 첫 반복 뒤 큐브에 남으므로 생성 비용은 위 단계에서 따로 측정
+    trends          일 단위 추이 (일별 누적합 인덱스)
+    runway_mc       Monte Carlo Runway (10만 경로)
+
+예시:
+    python -m cfo.benchmark                                  # 1K / 100K / 10M
+    python -m cfo.benchmark --sizes 1k,100k -o base.json
+    python -m cfo.benchmark --sizes 1k,100k --compare base.json --threshold 1.25
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from cfo.ar_aging import ArAging
+from cfo.budget import BudgetIndex
+from cfo.cube import MonthlyCube
+from cfo.data_sources import TAB_NAMES, LocalCsvSource, load_all_tabs, read_tab_csv
+from cfo.fake_data import generate_fake_data
+from cfo.filters import FilterEngine
+from cfo.fx import FxConverter, RateTable
+from cfo.headcount import HeadcountTimeline
+from cfo.metrics import compute_section, normalize_filters, runway_forecast, trends
+from cfo.pl_store import PlMonthlyStore, pl_monthly_rows
+from cfo.schema import apply_schema
+from cfo.validation import validate_tab
+
+DEFAULT_SIZES = '1k,100k,10m'
+RESULT_FORMAT_VERSION = 1
+
+# 비교 시 이보다 짧은 단계는 측정 잡음으로 보고 무시 (초)
+MIN_COMPARABLE_SECONDS = 0.001
+
+SECTION_STAGES = ['kpi', 'cash_runway', 'pl', 'budget', 'pipeline', 'productivity', 'ar', 'ar_aging']
+
+
+def parse_size(text):
+    """
+    '1k' / '100K' / '10m' / '2500' → 정수
+    """
+    text = text.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def synthetic_data(size, seed=42):
+    """
+    size 행 규모의 합성 탭 (파이프라인/인원은 원장 규모에 비례해 조금씩 늘림)
+    """
+    data = generate_fake_data(
+        n_revenue=size,
+        n_expense=size,
+        n_pipeline=max(50, size // 100),
+        n_employees=max(50, size // 1000),
+        seed=seed,
+    )
+    return {tab: apply_schema(tab, df) for tab, df in data.items()}
+
+
+# 벤치마크 단계: run() 의 실행 시간/메모리를 측정
+Stage = namedtuple('Stage', ['name', 'run'])
+
+
+def build_stages(size, data, workdir):
+    """
+    size 규모 데이터에 대한 단계 목록
+    """
+    cube = MonthlyCube(data['revenue'], data['expense'], tabs=data)
+    filters = normalize_filters(
+        '2023-03-15', '2024-02-10', ['Korea', 'USA'], ['EO School'],
+        min_date=cube.min_date, max_date=cube.max_date,
+    )
+    revenue_filter = FilterEngine(data['revenue'])
+
+    csv_dir = os.path.join(workdir, f'csv-{size}')
+    os.makedirs(csv_dir, exist_ok=True)
+    for tab, df in data.items():
+        df.to_csv(os.path.join(csv_dir, f'{TAB_NAMES[tab]}.csv'), index=False)
+    date_strings = data['revenue']['date'].dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+    raw_revenue = read_tab_csv('revenue', os.path.join(csv_dir, f'{TAB_NAMES["revenue"]}.csv'))
+    rate_table = RateTable(data['exchange_rates'])
+
+    def filter_stage():
+        cube.cells('revenue', filters.start, filters.end, countries=filters.countries, teams=filters.teams)
+        cube.cells('expense', filters.start, filters.end, countries=filters.countries)
+        revenue_filter.count(filters.start, filters.end, country=filters.countries, team=filters.teams)
+
+    def pl_table_stage():
+        # 반복마다 빈 폴더에 새 저장소 (이미 마감한 달을 읽기만 하는 경로가 아니라 처음 마감하는 비용)
+        pl_monthly_rows(cube)
+        PlMonthlyStore(tempfile.mkdtemp(prefix='pl-', dir=workdir)).update(cube)
+
+    def section_stage(name):
+        return lambda: compute_section(name, cube, data, filters)
+
+    stages = [
+        Stage('load', lambda: load_all_tabs(LocalCsvSource(csv_dir), retries=0, timeout=3600)),
+        Stage('parse_dates', lambda: pd.to_datetime(date_strings, format='%Y-%m-%d')),
+        Stage('validate', lambda: validate_tab('revenue', raw_revenue)),
+        Stage('fx', lambda: FxConverter().convert(data['revenue'], rate_table)),
+        Stage('cube', lambda: MonthlyCube(data['revenue'], data['expense'])),
+        Stage('filter', filter_stage),
+        Stage('ar_index', lambda: ArAging(data['revenue'])),
+        Stage('budget_index', lambda: BudgetIndex(data.get('budget'), cube)),
+        Stage('headcount_timeline', lambda: HeadcountTimeline(data.get('headcount'), cube)),
+        Stage('pl_table', pl_table_stage),
+    ]
+    stages += [Stage(name, section_stage(name)) for name in SECTION_STAGES]
+    stages.append(Stage('trends', lambda: trends(cube, filters, 'D')))
+    stages.append(Stage('runway_mc', lambda: runway_forecast(cube, data, filters, n_paths=100_000)))
+    return stages
+
+
+def measure(stage, repeat):
+    """
+    반환: (실행 시간 목록(초), 최대 메모리(바이트))
+    시간은 tracemalloc 없이 repeat 회, 메모리는 tracemalloc 으로 1회 따로 측정
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        stage.run()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        stage.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return timings, peak
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(sizes, repeat=5, stages=None, log=print):
+    """
+    sizes 별로 모든 단계를 측정하고 결과 dict 반환
+    """
+    workdir = tempfile.mkdtemp(prefix='cfo-bench-')
+    results = []
+    try:
+        for size in sizes:
+            started = time.perf_counter()
+            data = synthetic_data(size)
+            log(f'[{size:,} rows] 데이터 생성 {time.perf_counter() - started:.1f}초')
+            # 큰 규모는 반복 횟수를 줄임
+            size_repeat = repeat if size < 1_000_000 else 1
+            for stage in build_stages(size, data, workdir):
+                if stages and stage.name not in stages:
+                    continue
+                timings, peak = measure(stage, size_repeat)
+                row = {
+                    'size': size,
+                    'stage': stage.name,
+                    'repeat': size_repeat,
+                    'wall_min': min(timings),
+                    'wall_median': statistics.median(timings),
+                    'peak_mb': peak / 1024 ** 2,
+                }
+                results.append(row)
+                log(f"  {stage.name:18s} {row['wall_median'] * 1e3:10.2f} ms   peak {row['peak_mb']:9.1f} MB")
+            del data
+            gc.collect()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'format': RESULT_FORMAT_VERSION,
+        'meta': {
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=1.25):
+    """
+    두 결과의 같은 (size, stage) 를 비교 → (비교 표 DataFrame, 느려진 행 DataFrame)
+    ratio = 현재 / 기준 (wall_min — 반복 중 최솟값이 잡음에 가장 덜 민감), threshold 를 넘으면 회귀
+    """
+    keys = ['size', 'stage']
+    now = pd.DataFrame(current['results']).set_index(keys)
+    before = pd.DataFrame(baseline['results']).set_index(keys)
+    table = now[['wall_min', 'peak_mb']].join(
+        before[['wall_min', 'peak_mb']], how='inner', rsuffix='_baseline'
+    )
+    table['ratio'] = table['wall_min'] / table['wall_min_baseline']
+    table['peak_ratio'] = table['peak_mb'] / table['peak_mb_baseline'].where(table['peak_mb_baseline'] > 0)
+    comparable = table['wall_min_baseline'] >= MIN_COMPARABLE_SECONDS
+    regressions = table[comparable & (table['ratio'] > threshold)]
+    return table.reset_index(), regressions.reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CFO 대시보드 단계별 벤치마크')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='원장 행 수 목록 (예: 1k,100k,10m)')
+    parser.add_argument('--repeat', type=int, default=5, help='단계별 반복 횟수 (100만 행 이상은 1회)')
+    parser.add_argument('--stage', action='append', default=[], help='측정할 단계만 지정 (여러 번 가능)')
+    parser.add_argument('-o', '--output', help='결과 JSON 경로 (기본: .cache/benchmarks/<시각>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=1.25, help='회귀로 볼 실행 시간 배율')
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(',') if s.strip()]
+    result = run_benchmarks(sizes, repeat=args.repeat, stages=set(args.stage))
+
+    output = args.output or os.path.join(
+        '.cache', 'benchmarks', datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json'
+    )
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f'결과 저장: {output}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        table, regressions = compare(result, baseline, args.threshold)
+        with pd.option_context('display.width', 120, 'display.float_format', '{:.3f}'.format):
+            print(table[['size', 'stage', 'wall_min_baseline', 'wall_min', 'ratio', 'peak_ratio']].to_string(index=False))
+        if len(regressions):
+            print(f'\n⚠️ {len(regressions)}개 단계가 {args.threshold:.2f}배 이상 느려짐:')
+            print(regressions[['size', 'stage', 'ratio']].to_string(index=False))
+            return 1
+        print('\n✅ 회귀 없음')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
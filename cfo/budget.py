@@ -0,0 +1,181 @@
+"""
+예산 대비 실적 (Budget vs Actual)
+
+Budget 탭(연/월 × 국가 × 팀 목표)과 월별 실적을 데이터 로드 시 한 번
+(월 × 국가 × 팀) 조밀 배열로 만들어 두고, 필터는 배열을 잘라서 합산합니다.
+행 단위 조회나 merge 없이 계산하므로 예산 기간/팀 수가 늘어도 필터 변경 비용이 작습니다.
+
+- 매출: 실적 매출 vs revenue_target_krw (달성률 = 실적 / 목표)
+- 비용: 실적 비용 vs expense_budget_krw (집행률 = 실적 / 예산)
+- 이익: (매출 - 비용) vs profit_target_krw
+차이(variance) = 실적 - 목표, 연도별 누적(YTD) 차이는 1월부터 해당 월까지의 합계입니다.
+예산이 월 단위이므로 기간 필터는 걸친 월 전체로 적용하고, 팀 필터는 매출과 비용 모두에 적용합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+METRICS = ['revenue', 'expense', 'profit']
+
+# 지표 → Budget 탭 컬럼
+TARGET_COLUMNS = {
+    'revenue': 'revenue_target_krw',
+    'expense': 'expense_budget_krw',
+    'profit': 'profit_target_krw',
+}
+
+
+def _month_numbers(months):
+    """
+    datetime64[M] → 1970-01 기준 월 번호
+    """
+    return np.asarray(months, dtype='datetime64[M]').astype(np.int64)
+
+
+def _month_number(day):
+    return int(np.datetime64(pd.Timestamp(day).date(), 'M').astype(np.int64))
+
+
+def _attainment(actual, target):
+    actual, target = np.asarray(actual, dtype=float), np.asarray(target, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(target != 0, actual / target * 100, np.nan)
+
+
+class BudgetIndex:
+    """
+    (월 × 국가 × 팀) 예산/실적 배열
+
+    months: 예산 첫 달부터 마지막 달까지 연속된 datetime64[M]
+    countries, teams: 축 값 목록
+    target[metric], actual[metric]: (월, 국가, 팀) 배열
+    """
+
+    def __init__(self, df_budget, cube):
+        self.has_budget = df_budget is not None and len(df_budget) > 0
+        self.first_month = 0
+        # 기간 필터가 비어 있으면 큐브/인원 타임라인처럼 실적 데이터 기간으로 자름
+        self.min_date, self.max_date = cube.min_date, cube.max_date
+        if not self.has_budget:
+            self.months = np.array([], dtype='datetime64[M]')
+            self.countries = np.array([], dtype=object)
+            self.teams = np.array([], dtype=object)
+            self.target = {metric: np.zeros((0, 0, 0)) for metric in METRICS}
+            self.actual = {metric: np.zeros((0, 0, 0)) for metric in METRICS}
+            return
+
+        budget_months = (
+            (df_budget['year'].to_numpy(dtype=np.int64) - 1970) * 12 + df_budget['month'].to_numpy(dtype=np.int64) - 1
+        )
+        first, last = int(budget_months.min()), int(budget_months.max())
+        self.first_month = first
+        self.months = np.arange(first, last + 1).astype('datetime64[M]')
+        shape_months = last - first + 1
+
+        revenue = cube.monthly['revenue']
+        expense = cube.monthly['expense']
+        self.countries = np.array(sorted(
+            set(df_budget['country'].dropna()) | set(revenue['country'].dropna()) | set(expense['country'].dropna())
+        ), dtype=object)
+        self.teams = np.array(sorted(
+            set(df_budget['team'].dropna()) | set(revenue['team'].dropna()) | set(expense['team'].dropna())
+        ), dtype=object)
+        shape = (shape_months, len(self.countries), len(self.teams))
+
+        def grid(month_numbers, countries, teams, values):
+            """
+            (월 번호, 국가, 팀, 값) 행 → 조밀 배열 (예산 기간 밖/모르는 값은 제외, 같은 칸은 합산)
+            """
+            m = np.asarray(month_numbers, dtype=np.int64) - first
+            c = pd.Index(self.countries).get_indexer(np.asarray(countries, dtype=object))
+            t = pd.Index(self.teams).get_indexer(np.asarray(teams, dtype=object))
+            valid = (m >= 0) & (m < shape_months) & (c >= 0) & (t >= 0)
+            flat = np.ravel_multi_index((m[valid], c[valid], t[valid]), shape)
+            weights = np.nan_to_num(np.asarray(values, dtype=float)[valid])
+            return np.bincount(flat, weights=weights, minlength=np.prod(shape)).reshape(shape)
+
+        self.target = {
+            metric: grid(budget_months, df_budget['country'], df_budget['team'], df_budget[column])
+            for metric, column in TARGET_COLUMNS.items()
+        }
+
+        def actual(cells):
+            months = pd.to_datetime(cells['year_month'], format='%Y-%m').to_numpy().astype('datetime64[M]')
+            return grid(_month_numbers(months), cells['country'], cells['team'], cells['amount_krw'])
+
+        self.actual = {'revenue': actual(revenue), 'expense': actual(expense)}
+        self.actual['profit'] = self.actual['revenue'] - self.actual['expense']
+
+    def _slices(self, start, end, countries, teams):
+        """
+        필터 → (월 구간 slice, 국가 마스크, 팀 마스크), 기간은 걸친 월 전체
+        """
+        # 기간이 비어 있으면 실적 데이터 기간 (실적 없는 뒤쪽 예산 월을 0% 달성으로 합산하지 않도록)
+        start = self.min_date if start is None else start
+        end = self.max_date if end is None else end
+        # 월은 연속이므로 위치 = 월 번호 - 첫 달 번호
+        n_months = len(self.months)
+        lo = 0 if start is None else min(max(_month_number(start) - self.first_month, 0), n_months)
+        hi = n_months if end is None else min(max(_month_number(end) - self.first_month + 1, 0), n_months)
+        country_mask = np.isin(self.countries, list(countries)) if countries else np.ones(len(self.countries), dtype=bool)
+        team_mask = np.isin(self.teams, list(teams)) if teams else np.ones(len(self.teams), dtype=bool)
+        return slice(lo, max(lo, hi)), country_mask, team_mask
+
+    def variance(self, start=None, end=None, countries=None, teams=None):
+        """
+        필터 조건의 예산 대비 실적
+
+        반환 dict:
+            has_budget: 예산 데이터 유무
+            totals: {metric: {'target', 'actual', 'variance', 'attainment_pct'}}
+            monthly: year_month + 지표별 target/actual/variance/attainment_pct/ytd_variance
+            by_team: 팀 + 지표별 target/actual/variance/attainment_pct (기간 합계)
+            heatmap: 팀 × year_month 매출 달성률(%) (예산 없는 칸은 NaN)
+        """
+        months, country_mask, team_mask = self._slices(start, end, countries, teams)
+        labels = pd.DatetimeIndex(self.months[months].astype('datetime64[ns]')).strftime('%Y-%m')
+        team_labels = self.teams[team_mask]
+        years = self.months[months].astype('datetime64[Y]')
+
+        monthly = pd.DataFrame({'year_month': labels})
+        by_team = pd.DataFrame({'team': team_labels})
+        totals = {}
+        heatmap = None
+        for metric in METRICS:
+            # (월, 팀) 으로 줄인 부분 배열 — 이후 계산은 이 작은 배열에서만
+            target = self.target[metric][months][:, country_mask][:, :, team_mask].sum(axis=1)
+            actual = self.actual[metric][months][:, country_mask][:, :, team_mask].sum(axis=1)
+
+            target_month, actual_month = target.sum(axis=1), actual.sum(axis=1)
+            variance_month = actual_month - target_month
+            monthly[f'{metric}_target'] = target_month
+            monthly[f'{metric}_actual'] = actual_month
+            monthly[f'{metric}_variance'] = variance_month
+            monthly[f'{metric}_attainment_pct'] = _attainment(actual_month, target_month)
+            monthly[f'{metric}_ytd_variance'] = pd.Series(variance_month).groupby(years).cumsum().to_numpy()
+
+            target_team, actual_team = target.sum(axis=0), actual.sum(axis=0)
+            by_team[f'{metric}_target'] = target_team
+            by_team[f'{metric}_actual'] = actual_team
+            by_team[f'{metric}_variance'] = actual_team - target_team
+            by_team[f'{metric}_attainment_pct'] = _attainment(actual_team, target_team)
+
+            total_target, total_actual = float(target.sum()), float(actual.sum())
+            totals[metric] = {
+                'target': total_target,
+                'actual': total_actual,
+                'variance': total_actual - total_target,
+                'attainment_pct': float(_attainment(total_actual, total_target)),
+            }
+            if metric == 'revenue':
+                heatmap = pd.DataFrame(_attainment(actual, target).T, index=team_labels, columns=labels)
+
+        # 매출 목표가 없는 팀(Admin 등)은 히트맵에서 제외
+        heatmap = heatmap[heatmap.notna().any(axis=1)]
+        return {
+            'has_budget': self.has_budget,
+            'totals': totals,
+            'monthly': monthly,
+            'by_team': by_team,
+            'heatmap': heatmap,
+        }
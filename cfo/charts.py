@@ -0,0 +1,133 @@
+"""
+차트 전송량 줄이기
+
+일별 데이터나 긴 기간이 들어오면 추이 차트가 모든 점을 브라우저로 보내므로
+서버에서 다음 세 가지를 적용합니다.
+
+    downsample      계열별로 LTTB(Largest-Triangle-Three-Buckets) 다운샘플링 → 계열당 max_points 개 이하
+                    (모양을 유지하도록 구간마다 면적이 가장 큰 점을 고름, 첫/마지막 점은 항상 유지)
+    to_webgl        Scatter 점 수 합계가 threshold 를 넘으면 Scattergl(WebGL) 로 교체
+    cached_figure   완성된 Figure 를 JSON 문자열로 캐시 (키: 차트, 데이터 버전, 필터)
+                    재실행 시 plotly express 로 다시 만들지 않고 JSON 에서 복원
+
+결과적으로 기간이 늘어나도 차트당 전송량과 브라우저 렌더링 시간이 거의 일정합니다.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+DEFAULT_MAX_POINTS = 1000
+DEFAULT_WEBGL_THRESHOLD = 1500
+
+
+def _numeric(values):
+    """
+    x 값 → float 배열 (날짜는 ns 정수, 숫자/날짜가 아니면 순서 위치)
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').view('int64').astype(float)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float)
+    return np.arange(len(values), dtype=float)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    LTTB 로 고른 점의 위치 (오름차순, 길이 n_out)
+    x 는 정렬돼 있어야 함, n_out 이 점 수 이상이거나 3 미만이면 모든 점
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+
+    # 첫/마지막 점을 뺀 n-2 개를 n_out-2 개 구간으로 나눔 (n_out < n 이므로 모든 구간에 점이 있음)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # 각 구간의 '다음 구간 평균' (마지막 구간은 마지막 점)
+    next_x = np.append(mean_x[1:], x[n - 1])
+    next_y = np.append(mean_y[1:], y[n - 1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(df, x, y, max_points=DEFAULT_MAX_POINTS, by=None, shared_x=False):
+    """
+    계열별 LTTB 다운샘플링 (점 수가 max_points 이하인 계열은 그대로)
+
+    by: 계열 구분 컬럼 (예: 'country'), None 이면 df 전체가 한 계열
+    shared_x: True 면 x 별 y 합계로 한 번만 점을 고르고 모든 계열이 같은 x 를 사용
+              (누적 영역/막대처럼 계열끼리 x 가 맞아야 하는 차트)
+    """
+    if df.empty:
+        return df
+    df = df.sort_values(x, kind='stable')
+
+    if shared_x and by is not None:
+        totals = df.groupby(x, sort=True, observed=True)[y].sum()
+        if len(totals) <= max_points:
+            return df
+        keep = totals.index[lttb_indices(_numeric(totals.index), totals.to_numpy(), max_points)]
+        return df[df[x].isin(keep)]
+
+    if by is None:
+        if len(df) <= max_points:
+            return df
+        return df.iloc[lttb_indices(_numeric(df[x]), df[y].to_numpy(), max_points)]
+
+    groups = df.groupby(by, sort=False, observed=True).indices
+    if all(len(positions) <= max_points for positions in groups.values()):
+        return df
+    xs, ys = df[x], df[y].to_numpy()
+    keep = []
+    for positions in groups.values():
+        if len(positions) > max_points:
+            positions = positions[lttb_indices(_numeric(xs.iloc[positions]), ys[positions], max_points)]
+        keep.append(positions)
+    return df.iloc[np.sort(np.concatenate(keep))]
+
+
+def to_webgl(fig, threshold=DEFAULT_WEBGL_THRESHOLD):
+    """
+    Scatter 점 수 합계가 threshold 를 넘으면 Scatter → Scattergl 로 바꾼 Figure 반환
+    누적 영역(stackgroup)/채우기(fill) 계열은 WebGL 이 지원하지 않아 그대로 둠
+    """
+    scatter = [trace for trace in fig.data if trace.type == 'scatter']
+    points = sum(len(trace.y) for trace in scatter if trace.y is not None)
+    if points <= threshold:
+        return fig
+
+    def convert(trace):
+        if trace.type != 'scatter' or trace.stackgroup or (trace.fill and trace.fill != 'none'):
+            return trace
+        return go.Scattergl(trace.to_plotly_json(), skip_invalid=True)
+
+    return go.Figure(data=[convert(trace) for trace in fig.data], layout=fig.layout)
+
+
+def cached_figure(cache, key, build, webgl_threshold=DEFAULT_WEBGL_THRESHOLD):
+    """
+    key 에 해당하는 Figure (cache 가 None 이면 매번 생성)
+
+    cache: ResultCache (JSON 문자열을 저장하므로 크기 추정이 정확함)
+    build: Figure 를 만드는 함수 (다운샘플링은 build 안에서, WebGL 변환은 여기서 적용)
+    """
+    if cache is None:
+        return to_webgl(build(), webgl_threshold)
+    spec = cache.get_or_compute(tuple(key), lambda: to_webgl(build(), webgl_threshold).to_json())
+    return pio.from_json(spec)
@@ -0,0 +1,241 @@
+"""
+KPI 스냅샷 CLI (Streamlit 없이 실행)
+
+예시:
+    # 전체 기준 KPI 를 JSON 으로 출력
+    python -m cfo.cli
+
+    # 기간/국가/팀 필터
+    python -m cfo.cli --start 2024-01-01 --end 2024-06-30 --country Korea --team "EO School" -o kpi.json
+
+    # 국가 × 팀 모든 조합 (야간 배치)
+    python -m cfo.cli --batch -o snapshots/kpi.json
+    python -m cfo.cli --batch -o snapshots/kpi.parquet   # pyarrow 필요, 스칼라 KPI 만 저장
+
+    # SQLite 백엔드 (DB 파일을 저장해 두고, 이후에는 원본 없이 DB 파일로만 계산)
+    python -m cfo.cli --backend sqlite --sql-dir .cache/cfo_sql
+    python -m cfo.cli --sql-db .cache/cfo_sql/cfo-<버전>.sqlite --batch -o snapshots/kpi.json
+
+    # 월별 손익 저장소 (마감한 달 고정, 늦게 들어온 조정은 재오픈/무효화)
+    python -m cfo.cli --pl-store .cache/cfo_pl/fake --pl-status
+    python -m cfo.cli --pl-store .cache/cfo_pl/fake --pl-reopen 2024-03 -o kpi.json
+    python -m cfo.cli --pl-store .cache/cfo_pl/fake --pl-invalidate all
+
+데이터 소스 설정은 대시보드와 같은 환경 변수(CFO_DATA_SOURCE, CFO_DATA_DIR, CFO_SHEET_URL_*)를 사용합니다.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from cfo.data_sources import TAB_NAMES, LoadResult, StreamingCsvSource, load_all_tabs, make_source
+from cfo.fx import FX_MODES, FxConverter
+from cfo.metrics import MetricsEngine
+from cfo.pl_store import PlMonthlyStore
+from cfo.snapshot import load_snapshot
+from cfo.sql_backend import BACKENDS
+
+
+def _to_json(value):
+    if isinstance(value, (pd.Timestamp, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is pd.NaT:
+        return None
+    return str(value)
+
+
+def load(args):
+    """
+    CLI 인자에 맞춰 데이터 로드 (--snapshot-dir 에 스냅샷이 있으면 스냅샷 사용)
+    """
+    if args.snapshot_dir:
+        data, manifest = load_snapshot(os.path.join(args.snapshot_dir, args.source))
+        if data is not None:
+            versions = {tab: info['hash'] for tab, info in manifest['tabs'].items()}
+            return LoadResult(data=data, versions=versions, source='snapshot')
+
+    source = make_source(
+        args.source,
+        sheet_urls={tab: os.environ.get(f'CFO_SHEET_URL_{tab.upper()}', '') for tab in TAB_NAMES},
+        data_dir=args.data_dir,
+        chunk_rows=args.chunk_rows,
+        fx_mode=args.fx_mode if args.fx_mode != 'off' else None,
+        n_revenue=args.fake_revenue_rows,
+        n_expense=args.fake_expense_rows,
+    )
+    if isinstance(source, StreamingCsvSource):
+        source.on_progress = report_progress
+    result = load_all_tabs(source, timeout=args.timeout)
+    if args.fx_mode != 'off':
+        result.data = FxConverter(args.fx_mode).apply(result.data)
+    return result
+
+
+def report_progress(tab, progress):
+    """
+    스트리밍 수집 진행 상황 → stderr
+    """
+    share = progress['bytes'] / progress['total_bytes'] if progress['total_bytes'] else 1.0
+    state = '완료' if progress['done'] else f'{share:.0%}'
+    print(f'{TAB_NAMES[tab]}: {progress["rows"]:,}행 ({state})', file=sys.stderr)
+
+
+def apply_pl_store(args, cube):
+    """
+    --pl-* 명령을 저장소에 적용하고 저장소 기준 손익 표를 큐브에 연결
+    순서: 무효화 → 재오픈 → 마감 (같은 달을 함께 지정하면 마감이 마지막)
+    """
+    store = PlMonthlyStore(args.pl_store, open_months=args.pl_open_months)
+    try:
+        if args.pl_invalidate:
+            store.invalidate(None if 'all' in args.pl_invalidate else args.pl_invalidate)
+        if args.pl_reopen:
+            store.reopen(args.pl_reopen)
+        if args.pl_close:
+            store.close(args.pl_close, cube)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    store.attach(cube)
+    return store.status()
+
+
+def report_pl_status(status):
+    """
+    손익 저장소 상태 → stderr
+    """
+    closed = list(status['closed'])
+    span = f' ({closed[0]} ~ {closed[-1]})' if closed else ''
+    print(f'P&L 마감 {len(closed)}개월{span}, 열린 달 {status["open_months"]}개', file=sys.stderr)
+    if status['reopened']:
+        print('P&L 재오픈: ' + ', '.join(status['reopened']), file=sys.stderr)
+
+
+def snapshot_rows(snapshots):
+    """
+    스냅샷 목록 → 필터 조합당 한 행의 스칼라 KPI DataFrame (Parquet 저장용)
+    """
+    rows = []
+    for snapshot in snapshots:
+        filters = snapshot['filters']
+        rows.append({
+            'start': filters['start'],
+            'end': filters['end'],
+            'countries': ','.join(filters['countries']) if filters['countries'] else None,
+            'teams': ','.join(filters['teams']) if filters['teams'] else None,
+            'data_version': snapshot['data_version'],
+            **snapshot['kpis'],
+        })
+    return pd.DataFrame(rows)
+
+
+def write_output(snapshots, output, fmt, generated_at):
+    if fmt == 'parquet':
+        try:
+            snapshot_rows(snapshots).to_parquet(output, index=False)
+        except ImportError as e:
+            raise SystemExit(f'Parquet 저장에는 pyarrow 가 필요합니다: {e}')
+        return
+
+    document = {'generated_at': generated_at, 'snapshots': snapshots}
+    text = json.dumps(document, ensure_ascii=False, indent=2, default=_to_json)
+    if output in (None, '-'):
+        sys.stdout.write(text + '\n')
+    else:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CFO 대시보드 KPI 스냅샷 생성')
+    parser.add_argument('--source', default=os.environ.get('CFO_DATA_SOURCE', 'fake'), choices=['fake', 'sheets', 'csv'])
+    parser.add_argument('--data-dir', default=os.environ.get('CFO_DATA_DIR', 'data'))
+    parser.add_argument('--chunk-rows', type=int, default=int(os.environ.get('CFO_CSV_CHUNK_ROWS', 0)),
+                        help='로컬 CSV 스트리밍 수집 청크 행 수 (0 이면 파일을 한 번에 읽음)')
+    parser.add_argument('--snapshot-dir', default=None, help='대시보드 스냅샷 폴더 (있으면 원본 대신 사용)')
+    parser.add_argument('--fake-revenue-rows', type=int, default=int(os.environ.get('CFO_FAKE_REVENUE_ROWS', 500)))
+    parser.add_argument('--fake-expense-rows', type=int, default=int(os.environ.get('CFO_FAKE_EXPENSE_ROWS', 800)))
+    parser.add_argument('--timeout', type=float, default=float(os.environ.get('CFO_TAB_TIMEOUT', 10)))
+    parser.add_argument('--fx-mode', default=os.environ.get('CFO_FX_MODE', 'transaction'), choices=FX_MODES + ['off'],
+                        help='amount_krw 환율 기준 (off 면 시트 값 그대로)')
+    parser.add_argument('--backend', default=os.environ.get('CFO_BACKEND', 'memory'), choices=BACKENDS,
+                        help='집계 백엔드 (sqlite/duckdb 는 내장 DB 쿼리로 집계, 결과는 memory 와 같음)')
+    parser.add_argument('--sql-dir', default=os.environ.get('CFO_SQL_DIR'), help='데이터 버전별 DB 파일 폴더 (없으면 메모리 DB)')
+    parser.add_argument('--sql-db', help='이미 저장된 DB 파일 (있으면 원본을 읽지 않고 이 파일로만 계산)')
+    parser.add_argument('--pl-store', default=os.environ.get('CFO_PL_STORE_DIR'),
+                        help='월별 손익 저장소 폴더 (마감한 달은 고정 값 사용, 대시보드는 <폴더>/<소스>)')
+    parser.add_argument('--pl-open-months', type=int, default=int(os.environ.get('CFO_PL_OPEN_MONTHS', 2)),
+                        help='데이터 마지막 달을 포함해 자동 마감하지 않는 달 수')
+    parser.add_argument('--pl-close', action='append', default=[], metavar='YYYY-MM', help='지금 데이터로 마감 (여러 번 지정 가능)')
+    parser.add_argument('--pl-reopen', action='append', default=[], metavar='YYYY-MM',
+                        help='마감 해제 후 열어 둠 (늦게 들어온 조정 반영, 여러 번 지정 가능)')
+    parser.add_argument('--pl-invalidate', action='append', default=[], metavar='YYYY-MM|all',
+                        help='고정 값을 버리고 지금 데이터로 다시 마감 (여러 번 지정 가능)')
+    parser.add_argument('--pl-status', action='store_true', help='손익 저장소 상태(JSON)만 출력하고 종료')
+    parser.add_argument('--start', help='기간 시작 (YYYY-MM-DD)')
+    parser.add_argument('--end', help='기간 끝 (YYYY-MM-DD, 포함)')
+    parser.add_argument('--country', action='append', default=[], help='국가 (여러 번 지정 가능)')
+    parser.add_argument('--team', action='append', default=[], help='팀 (여러 번 지정 가능)')
+    parser.add_argument('--batch', action='store_true', help='국가 × 팀 모든 조합(전체 포함) 계산')
+    parser.add_argument('--no-tables', action='store_true', help='월별 P&L / Cash Flow 표 제외')
+    parser.add_argument('-o', '--output', default='-', help="출력 경로 ('-' 이면 표준 출력)")
+    parser.add_argument('--format', choices=['json', 'parquet'], help='기본값: 출력 확장자로 판단')
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('parquet' if args.output.endswith('.parquet') else 'json')
+    if (args.pl_close or args.pl_reopen or args.pl_invalidate or args.pl_status) and not args.pl_store:
+        parser.error('--pl-* 명령은 --pl-store (또는 CFO_PL_STORE_DIR) 가 필요합니다')
+    if args.pl_status and (args.pl_close or args.pl_reopen or args.pl_invalidate):
+        parser.error('--pl-status 는 상태만 출력하므로 다른 --pl-* 명령과 함께 쓸 수 없습니다')
+    if fmt == 'parquet' and args.output == '-':
+        parser.error('Parquet 은 --output 파일 경로가 필요합니다')
+
+    if args.pl_status:
+        # 저장소 상태만 읽음 (데이터 로드/손익 표 갱신 없이)
+        status = PlMonthlyStore(args.pl_store, open_months=args.pl_open_months).status()
+        report_pl_status(status)
+        sys.stdout.write(json.dumps(status, ensure_ascii=False, indent=2) + '\n')
+        return 0
+
+    started = time.perf_counter()
+    if args.sql_db:
+        if args.backend == 'memory':
+            args.backend = 'duckdb' if args.sql_db.endswith('.duckdb') else 'sqlite'
+        engine = MetricsEngine.from_sql(args.sql_db, args.backend)
+        source = args.sql_db
+    else:
+        result = load(args)
+        if result.missing_required:
+            raise SystemExit('데이터 로드 실패: ' + ', '.join(
+                f'{TAB_NAMES[tab]} ({result.errors.get(tab, "탭 없음")})' for tab in result.missing_required
+            ))
+        for tab, report in result.validation.items():
+            if len(report.quarantined):
+                print(f'{TAB_NAMES[tab]}: 형식 오류 {len(report.quarantined):,}행 제외', file=sys.stderr)
+        engine = MetricsEngine.from_load_result(result, backend=args.backend, sql_dir=args.sql_dir)
+        source = result.source
+    if args.pl_store:
+        report_pl_status(apply_pl_store(args, engine.cube))
+    if args.batch:
+        filter_sets = engine.batch_filters(args.start, args.end)
+    else:
+        filter_sets = [engine.filters(args.start, args.end, args.country or None, args.team or None)]
+
+    snapshots = [engine.snapshot(filters, tables=not args.no_tables) for filters in filter_sets]
+    if args.output not in (None, '-') and os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    write_output(snapshots, args.output, fmt, datetime.datetime.now().isoformat(timespec='seconds'))
+
+    print(f'{len(snapshots)}개 스냅샷, {time.perf_counter() - started:.2f}초 ({source}, {args.backend})', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
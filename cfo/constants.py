@@ -0,0 +1,34 @@
+"""
+대시보드 공통 상수
+SCHEMA_DESIGN.md에 정의된 값 목록과 더미 데이터 분포를 한 곳에서 관리
+"""
+
+COUNTRIES = ['Korea', 'USA', 'Vietnam']
+COUNTRY_WEIGHTS = [0.5, 0.3, 0.2]
+
+TEAMS = ['Video Production', 'Branded Content', 'EO School']
+EXPENSE_TEAMS = TEAMS + ['Admin']
+
+# 국가별 기본 통화
+COUNTRY_CURRENCY = {'Korea': 'KRW', 'USA': 'USD', 'Vietnam': 'VND'}
+CURRENCIES = ['KRW', 'USD', 'VND']
+
+# 통화 → KRW 환산 환율 (Exchange_Rates 탭이 없을 때의 기본값)
+FX_RATES = {'KRW': 1.0, 'USD': 1300, 'VND': 0.055}
+
+PAYMENT_STATUSES = ['Paid', 'Pending', 'Overdue']
+PAYMENT_STATUS_WEIGHTS = [0.7, 0.2, 0.1]
+PAYMENT_TERMS = ['NET 30', 'NET 60']
+
+REVENUE_CATEGORIES = ['Retainer', 'Project-based', 'License']
+
+EXPENSE_CATEGORIES_L1 = ['Personnel', 'Marketing', 'Operations', 'COGS']
+EXPENSE_CATEGORY_WEIGHTS = [0.5, 0.15, 0.2, 0.15]
+PAYMENT_METHODS = ['Bank Transfer', 'Credit Card']
+
+STAGES = ['Proposal', 'Contract', 'Payment Pending', 'Closed Won']
+ALL_STAGES = STAGES + ['Closed Lost']
+
+ROLES = ['Junior', 'Senior', 'Lead', 'Manager']
+EMPLOYMENT_TYPES = ['Full-time', 'Part-time', 'Contractor']
+EMPLOYEE_STATUSES = ['Active', 'Inactive']
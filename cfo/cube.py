@@ -0,0 +1,262 @@
+"""
+월별 집계 큐브
+
+데이터 로드 시 한 번만 RAW_Revenue / RAW_Expense 를 집계해 두고,
+대시보드의 차트와 KPI는 큐브를 잘라서(slice) 다시 합산하는 방식으로 계산합니다.
+필터 변경 비용이 거래 건수가 아니라 (월 수 × 차원 조합 수)에 비례합니다.
+
+- 매출 큐브: year_month × country × team × category × payment_status
+- 비용 큐브: year_month × country × team × category_l1
+기간 필터가 월 중간에서 시작/끝나는 경우 양 끝 월은 일 단위 큐브로 정확히 계산합니다.
+기간 합계(KPI)와 일/주 단위 추이는 일별 누적합 인덱스(cfo/daily_index.py)로 바로 구합니다.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from cfo.daily_index import DailyIndex
+
+REVENUE_DIMENSIONS = ['country', 'team', 'category', 'payment_status']
+EXPENSE_DIMENSIONS = ['country', 'team', 'category_l1']
+CUBE_DIMENSIONS = {'revenue': REVENUE_DIMENSIONS, 'expense': EXPENSE_DIMENSIONS}
+
+# 일별 누적합 인덱스의 차원 (사이드바 필터 차원 + 비용 카테고리)
+INDEX_DIMENSIONS = {'revenue': ['country', 'team'], 'expense': ['country', 'team', 'category_l1']}
+
+VALUE_COLUMNS = ['amount_krw', 'count']
+
+# LoadResult.derive 에 보관하는 월별 큐브 이름
+MONTHLY_CUBE = 'monthly_cube'
+
+
+def _aggregate_daily(df, dimensions):
+    """
+    일 × 차원 단위 합계/건수 (날짜순 정렬)
+    """
+    frame = pd.DataFrame({
+        'date': df['date'].values.astype('datetime64[D]').astype('datetime64[ns]'),
+        **{d: df[d].astype('category') for d in dimensions},
+        'amount_krw': df['amount_krw'].values,
+    })
+    daily = frame.groupby(['date'] + dimensions, observed=True, sort=True)['amount_krw'].agg(['sum', 'count'])
+    daily.columns = VALUE_COLUMNS
+    return daily.reset_index()
+
+
+def aggregate_daily(df, kind):
+    """
+    원장(또는 원장의 일부 청크) → 큐브의 일 단위 셀
+    """
+    return _aggregate_daily(df, CUBE_DIMENSIONS[kind])
+
+
+def regroup_daily(cells, kind):
+    """
+    일 단위 셀을 다시 합산 (청크별로 만든 셀을 이어 붙인 뒤 같은 일 × 차원끼리 합침)
+    """
+    daily = cells.groupby(['date'] + CUBE_DIMENSIONS[kind], observed=True, sort=True)[VALUE_COLUMNS].sum()
+    return daily.reset_index()
+
+
+def _to_monthly(cells, dimensions):
+    """
+    일 단위 셀을 year_month('YYYY-MM') 단위로 재집계
+    """
+    months = cells['date'].values.astype('datetime64[M]')
+    grouped = cells.assign(year_month=months).groupby(['year_month'] + dimensions, observed=True, sort=True)
+    monthly = grouped[VALUE_COLUMNS].sum().reset_index()
+    monthly['year_month'] = monthly['year_month'].dt.strftime('%Y-%m')
+    return monthly
+
+
+def split_period(start, end, min_date, max_date):
+    """
+    기간 [start, end] → (완전히 포함된 월 범위, 걸친 구간 목록)
+    완전히 포함된 월 범위: ('YYYY-MM', 'YYYY-MM') 또는 None, 걸친 구간: [(시작, 끝), ...] (일 단위로 계산할 부분)
+    데이터 범위 밖은 잘라도 결과가 같으므로 데이터 범위로 클램프 (데이터 첫/끝 달은 일부만 있어도 완전한 월로 봄)
+    """
+    lo = max(start, min_date)
+    hi = min(end, max_date)
+
+    first_full = lo.to_period('M')
+    if lo > max(first_full.start_time, min_date):
+        first_full += 1
+    last_full = hi.to_period('M')
+    if hi.normalize() < min(last_full.end_time.normalize(), max_date):
+        last_full -= 1
+
+    if first_full <= last_full:
+        edges = [(lo, first_full.start_time - pd.Timedelta(days=1)),
+                 (last_full.end_time.normalize() + pd.Timedelta(days=1), hi)]
+        full_months = (str(first_full), str(last_full))
+    else:
+        edges = [(lo, hi)]
+        full_months = None
+    return full_months, [(edge_start, edge_end) for edge_start, edge_end in edges if edge_start <= edge_end]
+
+
+class MonthlyCube:
+    """
+    매출/비용 월별 집계 큐브
+
+    tabs: 탭 dict (현금/파이프라인 등 매출/비용 외 탭 집계에 사용, 없으면 매출/비용 원장만)
+    """
+
+    def __init__(self, df_revenue, df_expense, tabs=None):
+        self.tabs = tabs if tabs is not None else {'revenue': df_revenue, 'expense': df_expense}
+        self._build({
+            'revenue': aggregate_daily(df_revenue, 'revenue'),
+            'expense': aggregate_daily(df_expense, 'expense'),
+        })
+
+    @classmethod
+    def from_daily(cls, daily, tabs=None):
+        """
+        미리 만든 일 단위 셀로 생성 (스트리밍 수집처럼 원장을 읽으면서 집계한 경우)
+        daily: {'revenue': 셀, 'expense': 셀} — aggregate_daily / regroup_daily 결과
+        """
+        cube = cls.__new__(cls)
+        cube.tabs = tabs if tabs is not None else {}
+        cube._build(daily)
+        return cube
+
+    def _build(self, daily):
+        self.dimensions = dict(CUBE_DIMENSIONS)
+        self.daily = daily
+        self.monthly = {kind: _to_monthly(cells, self.dimensions[kind]) for kind, cells in self.daily.items()}
+        self._dates = {kind: cells['date'].values for kind, cells in self.daily.items()}
+        self.index = {kind: DailyIndex(cells, INDEX_DIMENSIONS[kind]) for kind, cells in self.daily.items()}
+        self.derived = {}
+        self._derived_lock = threading.Lock()
+
+        all_dates = np.concatenate(list(self._dates.values()))
+        self.min_date = pd.Timestamp(all_dates.min()) if len(all_dates) else None
+        self.max_date = pd.Timestamp(all_dates.max()) if len(all_dates) else None
+
+    def _daily_range(self, kind, start, end):
+        """
+        [start, end] 구간의 일 단위 셀 (정렬된 날짜에 이진 탐색)
+        """
+        dates = self._dates[kind]
+        lo = np.searchsorted(dates, np.datetime64(start, 'ns'), side='left')
+        hi = np.searchsorted(dates, np.datetime64(end, 'ns'), side='right')
+        return self.daily[kind].iloc[lo:hi]
+
+    def derive(self, name, builder):
+        """
+        큐브에서 만든 파생 인덱스를 큐브당 한 번만 생성 (예: 예산 대비 실적 배열)
+        builder: 인자 없이 파생 구조를 반환하는 함수
+        """
+        with self._derived_lock:
+            if name not in self.derived:
+                self.derived[name] = builder()
+            return self.derived[name]
+
+    def total(self, kind, start=None, end=None, countries=None, teams=None, categories=None):
+        """
+        필터 조건의 금액 합계 (일별 누적합 인덱스, 기간 길이와 무관하게 일정한 비용)
+
+        categories: 비용 카테고리(category_l1) 선택 목록 (비용에만 적용)
+        """
+        selections = {'country': countries, 'team': teams}
+        if kind == 'expense':
+            selections['category_l1'] = categories
+        return self.index[kind].total(start, end, **selections)
+
+    def cells(self, kind, start=None, end=None, countries=None, teams=None):
+        """
+        필터 조건에 맞는 월별 셀 반환 (year_month + 차원 + amount_krw, count)
+
+        kind: 'revenue' | 'expense'
+        start, end: 기간 (양 끝 포함, None 이면 전체)
+        countries, teams: 선택 목록 (None 또는 빈 목록이면 전체)
+        """
+        dimensions = self.dimensions[kind]
+        monthly = self.monthly[kind]
+
+        if start is not None or end is not None:
+            start = pd.Timestamp(start) if start is not None else self.min_date
+            end = pd.Timestamp(end) if end is not None else self.max_date
+            monthly = self._slice_period(kind, monthly, dimensions, start, end)
+
+        mask = np.ones(len(monthly), dtype=bool)
+        if countries:
+            mask &= monthly['country'].isin(countries).values
+        if teams:
+            mask &= monthly['team'].isin(teams).values
+        return monthly[mask] if not mask.all() else monthly
+
+    def _slice_period(self, kind, monthly, dimensions, start, end):
+        """
+        기간 안에 완전히 포함된 월은 월 셀을 그대로, 걸친 월은 일 셀을 재집계해서 사용
+        """
+        if self.min_date is None or start > end:
+            return monthly.iloc[0:0]
+
+        full_months, edges = split_period(start, end, self.min_date, self.max_date)
+        parts = []
+        if full_months is not None:
+            first_full, last_full = full_months
+            in_range = (monthly['year_month'] >= first_full) & (monthly['year_month'] <= last_full)
+            parts.append(monthly[in_range.values])
+
+        for edge_start, edge_end in edges:
+            daily = self._daily_range(kind, edge_start, edge_end)
+            if len(daily):
+                parts.append(_to_monthly(daily, dimensions))
+
+        if not parts:
+            return monthly.iloc[0:0]
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts, ignore_index=True).sort_values('year_month', kind='stable')
+
+    # ================================
+    # 매출/비용 외 탭 (SqlCube 와 같은 인터페이스, 결과도 같음)
+    # ================================
+
+    def latest_cash(self):
+        """
+        최신 기준일과 그날의 현금 잔고 행 (balance_krw 합계, 국가별 합계에 사용)
+        """
+        df_cash = self.tabs['cash']
+        latest_date = df_cash['date'].max()
+        return latest_date, df_cash[df_cash['date'] == latest_date]
+
+    def aggregate(self, tab, column, by=(), weight=None, where=None):
+        """
+        tab 의 column 합계를 by 컬럼별로 집계
+        weight: 곱해서 합산할 컬럼, where: {컬럼: 값} 일치 조건
+        by 값이 결측인 행은 제외, 결과는 by 순서(카테고리 순)로 정렬, by 가 없으면 한 행
+        """
+        df = self.tabs[tab]
+        for name, value in (where or {}).items():
+            df = df[df[name] == value]
+        values = df[column] if weight is None else (df[column] * df[weight]).rename(column)
+        if not by:
+            return pd.DataFrame({column: [float(values.sum())]})
+        return values.groupby([df[c] for c in by], observed=True, sort=True).sum().reset_index()
+
+    def revenue_rows(self, columns):
+        """
+        매출 원장의 일부 컬럼 (청구 건 단위 계산용, 예: 미수금 연령 분석)
+        """
+        df_revenue = self.tabs['revenue']
+        return df_revenue[[c for c in columns if c in df_revenue]]
+
+
+def monthly_sum(cells, by=()):
+    """
+    셀을 year_month (+ by 차원) 기준으로 합산한 DataFrame 반환
+    """
+    keys = ['year_month'] + list(by)
+    return cells.groupby(keys, observed=True, sort=True)['amount_krw'].sum().reset_index()
+
+
+def total_by(cells, by):
+    """
+    셀을 by 차원 기준으로 합산한 DataFrame 반환 (기간 전체)
+    """
+    return cells.groupby(by, observed=True, sort=True)['amount_krw'].sum().reset_index()
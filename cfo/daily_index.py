@@ -0,0 +1,161 @@
+"""
+일별 누적합 인덱스
+
+데이터 로드 시 (일 × 차원 조합) 금액을 조밀한 행렬로 만들고 날짜 방향으로 누적합을 구해 둡니다.
+임의의 기간 [start, end] 합계는 누적합 두 행의 차이(C[end + 1] - C[start])로 바로 구하므로
+기간을 바꿔도 비용이 거래 건수나 일수와 무관하고 차원 조합 수에만 비례합니다.
+같은 누적합에서 일/주/월 단위 추이도 구간 경계 행끼리의 차이로 만듭니다.
+
+- 매출: 일 × country × team
+- 비용: 일 × country × team × category_l1
+"""
+
+import numpy as np
+import pandas as pd
+
+# 추이 집계 단위
+GRANULARITIES = {'D': '일', 'W': '주', 'M': '월'}
+
+
+class DailyIndex:
+    """
+    한 종류(매출 또는 비용)의 일별 누적합 인덱스
+
+    cells: 일 단위 셀 (date + 차원 + amount_krw, MonthlyCube.daily)
+    cumsum: (일수 + 1) × 조합 수 행렬, cumsum[i] 는 첫날부터 i 일 전까지의 합계
+    groups: 조합별 차원 값 DataFrame, codes[dim]: 조합별 코드, categories[dim]: 차원별 값 목록
+    """
+
+    def __init__(self, cells, dimensions):
+        self.dimensions = list(dimensions)
+        self.categories = {}
+        self.codes = {}
+
+        days = cells['date'].values.astype('datetime64[D]')
+        if len(days):
+            self.first_day = days.min()
+            n_days = int((days.max() - self.first_day).astype(int)) + 1
+        else:
+            self.first_day = np.datetime64('1970-01-01', 'D')
+            n_days = 0
+        self.n_days = n_days
+
+        # 차원별 코드 → 조합 번호 (실제로 나타난 조합만)
+        dim_codes, dim_values = [], []
+        for dim in self.dimensions:
+            codes, values = pd.factorize(cells[dim], sort=True)
+            dim_codes.append(codes)
+            dim_values.append(np.asarray(values))
+        shape = [max(len(values), 1) for values in dim_values]
+        combined = np.ravel_multi_index(dim_codes, shape) if dim_codes else np.zeros(len(cells), dtype=np.int64)
+        unique, group_ids = np.unique(combined, return_inverse=True)
+        group_codes = np.unravel_index(unique, shape) if dim_codes else ()
+        n_groups = len(unique)
+
+        for dim, codes, values in zip(self.dimensions, group_codes, dim_values):
+            self.codes[dim] = codes
+            self.categories[dim] = values
+        self.groups = pd.DataFrame({dim: self.categories[dim][self.codes[dim]] for dim in self.dimensions})
+
+        day_ids = (days - self.first_day).astype(np.int64)
+        daily = np.bincount(
+            day_ids * n_groups + group_ids,
+            weights=cells['amount_krw'].to_numpy(dtype=float),
+            minlength=n_days * n_groups,
+        ).reshape(n_days, n_groups)
+        self.cumsum = np.zeros((n_days + 1, n_groups))
+        np.cumsum(daily, axis=0, out=self.cumsum[1:])
+
+    def _position(self, day, side):
+        """
+        날짜 → 누적합 행 번호 (start 는 그날 이전, end 는 그날 포함), 데이터 범위로 클램프
+        """
+        if day is None:
+            return 0 if side == 'start' else self.n_days
+        offset = int((np.datetime64(pd.Timestamp(day).date(), 'D') - self.first_day).astype(int))
+        if side == 'end':
+            offset += 1
+        return min(max(offset, 0), self.n_days)
+
+    def _bounds(self, start, end):
+        lo, hi = self._position(start, 'start'), self._position(end, 'end')
+        return lo, max(lo, hi)
+
+    def _mask(self, selections):
+        """
+        조합별 허용 여부 (선택 목록이 None 이거나 비어 있으면 그 차원은 전체)
+        """
+        mask = np.ones(len(self.groups), dtype=bool)
+        for dim, selected in selections.items():
+            if selected is None or dim not in self.codes:
+                continue
+            if isinstance(selected, str):
+                selected = [selected]
+            selected = list(selected)
+            if not selected:
+                continue
+            allowed = np.isin(self.categories[dim], selected)
+            mask &= allowed[self.codes[dim]]
+        return mask
+
+    def total(self, start=None, end=None, **selections):
+        """
+        기간 [start, end] (양 끝 포함) 합계, selections: 차원=선택 목록 (예: country=['Korea'])
+        """
+        lo, hi = self._bounds(start, end)
+        mask = self._mask(selections)
+        return float((self.cumsum[hi, mask] - self.cumsum[lo, mask]).sum())
+
+    def _period_starts(self, lo, hi, freq):
+        """
+        [lo, hi) 일 구간을 freq 단위로 나눈 구간 시작 위치 (첫 구간은 기간 시작일부터)
+        """
+        days = self.first_day + np.arange(lo, hi)
+        if freq == 'D':
+            is_start = np.ones(len(days), dtype=bool)
+        elif freq == 'W':
+            # 1970-01-01 은 목요일 → (일수 + 3) % 7 == 0 이 월요일
+            is_start = (days.astype(np.int64) + 3) % 7 == 0
+        elif freq == 'M':
+            is_start = days == days.astype('datetime64[M]').astype('datetime64[D]')
+        else:
+            raise ValueError(f'지원하지 않는 집계 단위: {freq}')
+        if len(is_start):
+            is_start[0] = True
+        return lo + np.flatnonzero(is_start)
+
+    def series(self, start=None, end=None, freq='D', by=None, **selections):
+        """
+        기간 [start, end] 의 freq('D' | 'W' | 'M') 단위 추이
+
+        반환: period(구간 시작일 — 주는 월요일, 월은 1일) [+ by] + amount_krw DataFrame
+        by 를 주면 그 차원 값별로 나눔 (선택된 조합에 한 번도 금액이 없는 값은 제외)
+        """
+        lo, hi = self._bounds(start, end)
+        starts = self._period_starts(lo, hi, freq)
+        values = self.cumsum[np.append(starts, hi)]
+        values = values[1:] - values[:-1]
+
+        days = self.first_day + starts
+        if freq == 'W':
+            days = days - (days.astype(np.int64) + 3) % 7
+        elif freq == 'M':
+            days = days.astype('datetime64[M]').astype('datetime64[D]')
+        periods = pd.DatetimeIndex(days.astype('datetime64[ns]'))
+
+        mask = self._mask(selections)
+        if by is None:
+            return pd.DataFrame({'period': periods, 'amount_krw': values[:, mask].sum(axis=1)})
+
+        codes = self.codes[by][mask]
+        onehot = np.zeros((len(codes), len(self.categories[by])))
+        onehot[np.arange(len(codes)), codes] = 1.0
+        by_values = values[:, mask] @ onehot
+
+        present = np.flatnonzero(np.abs(by_values).sum(axis=0) > 0)
+        by_values = by_values[:, present]
+        return pd.DataFrame({
+            'period': np.repeat(periods, len(present)),
+            by: np.tile(np.asarray(self.categories[by])[present], len(periods)),
+            'amount_krw': by_values.ravel(),
+        })
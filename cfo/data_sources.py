@@ -0,0 +1,390 @@
+"""
+데이터 소스 레이어
+
+더미 데이터 / 구글 시트(CSV Export) / 로컬 CSV 를 같은 인터페이스로 다루고,
+여러 탭을 스레드 풀로 동시에 가져옵니다.
+탭별 타임아웃, 재시도(지수 백오프), 부분 실패 보고를 지원하므로
+느린 탭 하나 때문에 대시보드 전체가 실패하지 않습니다.
+"""
+
+import io
+import itertools
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from cfo.cube import MONTHLY_CUBE, MonthlyCube
+from cfo.fake_data import generate_fake_data
+from cfo.fx import FxConverter, RateTable
+from cfo.schema import apply_schema
+from cfo.streaming import DailyFold, RowStore, count_rows
+from cfo.validation import csv_dtypes, validate_tab
+
+# 대시보드 내부 키 → 구글 시트 탭 이름 (SCHEMA_DESIGN.md)
+TAB_NAMES = {
+    'revenue': 'RAW_Revenue',
+    'expense': 'RAW_Expense',
+    'cash': 'RAW_Cash',
+    'pipeline': 'Sales_Pipeline',
+    'headcount': 'Headcount',
+    'budget': 'Budget',
+    'exchange_rates': 'Exchange_Rates',
+    'pl_monthly': 'PL_Monthly',
+}
+
+# 이 탭이 없으면 대시보드를 그릴 수 없음
+REQUIRED_TABS = ['revenue', 'expense', 'cash', 'pipeline', 'headcount']
+
+# 스트리밍 수집 대상 탭 (계속 늘어나는 원장, 나머지 탭은 작아서 한 번에 읽음)
+STREAMING_TABS = ['revenue', 'expense']
+
+_DERIVED_LOCK = threading.RLock()
+_LOAD_IDS = itertools.count(1)
+
+def read_tab_csv(tab, source, **kwargs):
+    """
+    탭 CSV 읽기 — 날짜/값 목록 컬럼은 category 로 읽어 parse_tab 이 고유값만 변환 (cfo/validation.py)
+    """
+    return pd.read_csv(source, dtype=csv_dtypes(tab), **kwargs)
+
+
+def parse_tab(tab, df, first_row=2):
+    """
+    CSV로 읽은 탭의 검증/변환 (cfo/validation.py) + 스키마 타입 지정 (cfo/schema.py)
+    반환: (정상 행 DataFrame, ValidationReport) — 쓸 수 없는 행은 리포트의 격리 목록으로
+    """
+    frame, report = validate_tab(tab, df, first_row=first_row)
+    return apply_schema(tab, frame), report
+
+
+class DataSource:
+    """
+    데이터 소스 공통 인터페이스
+    fetch_tab(tab, timeout)은 탭 하나를 DataFrame으로 반환하고, 실패 시 예외를 던집니다.
+    CSV 원문을 제공할 수 있는 소스는 supports_raw = True 와 fetch_raw(tab, timeout)를 구현합니다.
+    CSV 를 검증하는 소스는 validation[tab] 에 마지막 ValidationReport 를 남깁니다.
+    탭을 읽으면서 파생 구조를 미리 만드는 소스는 attach_derived(result) 로 LoadResult 에 붙입니다.
+    """
+
+    name = 'base'
+    supports_raw = False
+
+    def available_tabs(self):
+        return list(TAB_NAMES)
+
+    def fetch_tab(self, tab, timeout=None):
+        raise NotImplementedError
+
+    def fetch_raw(self, tab, timeout=None):
+        raise NotImplementedError
+
+    def attach_derived(self, result):
+        pass
+
+
+class FakeDataSource(DataSource):
+    """
+    더미 데이터 소스 (cfo/fake_data.py)
+    8개 탭을 한 번에 생성하므로 첫 요청 시 한 번만 생성하고 공유
+    """
+
+    name = 'fake'
+
+    def __init__(self, **generator_kwargs):
+        self.generator_kwargs = generator_kwargs
+        self._data = None
+        self._lock = threading.Lock()
+
+    def fetch_tab(self, tab, timeout=None):
+        with self._lock:
+            if self._data is None:
+                data = generate_fake_data(**self.generator_kwargs)
+                self._data = {tab: apply_schema(tab, df) for tab, df in data.items()}
+        return self._data[tab]
+
+
+class SheetCsvSource(DataSource):
+    """
+    구글 시트 "웹에 게시" CSV URL 소스 (GOOGLE_SHEETS_GUIDE.md 방법 1)
+    urls: {'revenue': 'https://...output=csv', ...}
+    """
+
+    name = 'sheets'
+    supports_raw = True
+
+    def __init__(self, urls):
+        self.urls = {tab: url for tab, url in urls.items() if url}
+        self.validation = {}
+
+    def available_tabs(self):
+        return list(self.urls)
+
+    def fetch_raw(self, tab, timeout=None):
+        with urllib.request.urlopen(self.urls[tab], timeout=timeout) as response:
+            return response.read()
+
+    def fetch_tab(self, tab, timeout=None):
+        frame, self.validation[tab] = parse_tab(tab, read_tab_csv(tab, io.BytesIO(self.fetch_raw(tab, timeout))))
+        return frame
+
+
+class LocalCsvSource(DataSource):
+    """
+    로컬 CSV 폴더 소스 (GOOGLE_SHEETS_GUIDE.md 방법 3)
+    data/RAW_Revenue.csv 처럼 탭 이름으로 저장된 파일을 읽음
+    """
+
+    name = 'csv'
+    supports_raw = True
+
+    def __init__(self, data_dir='data'):
+        self.data_dir = data_dir
+        self.validation = {}
+
+    def path_for(self, tab):
+        return os.path.join(self.data_dir, f'{TAB_NAMES[tab]}.csv')
+
+    def available_tabs(self):
+        return [tab for tab in TAB_NAMES if os.path.exists(self.path_for(tab))]
+
+    def fetch_raw(self, tab, timeout=None):
+        with open(self.path_for(tab), 'rb') as f:
+            return f.read()
+
+    def fetch_tab(self, tab, timeout=None):
+        frame, self.validation[tab] = parse_tab(tab, read_tab_csv(tab, self.path_for(tab)))
+        return frame
+
+
+class StreamingCsvSource(LocalCsvSource):
+    """
+    로컬 CSV 폴더 스트리밍 소스 (cfo/streaming.py)
+
+    RAW_Revenue / RAW_Expense 를 chunk_rows 행씩 읽어 청크마다 검증/타입 지정한 뒤 RowStore 에 쌓고,
+    같은 청크로 큐브의 일 단위 셀도 바로 집계합니다 (load_all_tabs 가 LoadResult 에 월별 큐브로 붙임).
+    파싱 중 최대 메모리는 파일 크기가 아니라 청크 크기에 비례합니다.
+
+    fx_mode: 로드 후 적용할 환율 기준 ('transaction' | 'month_end', 환산하지 않으면 None)
+             청크를 먼저 환산해 두어야 미리 집계한 큐브가 환산된 원장과 같음
+    on_progress(tab, progress): 청크마다 호출 — progress = {'rows', 'bytes', 'total_bytes', 'done'}
+    """
+
+    name = 'csv-stream'
+    # 원문을 통째로 제공하지 않음 (IncrementalSource 로 감싸도 fetch_tab 으로 위임)
+    supports_raw = False
+
+    def __init__(self, data_dir='data', chunk_rows=200_000, fx_mode=None, on_progress=None):
+        super().__init__(data_dir)
+        self.chunk_rows = chunk_rows
+        self.fx_mode = fx_mode
+        self.on_progress = on_progress
+        # 탭별 진행 상황 (다른 스레드에서 읽기만 함)
+        self.progress = {}
+        # 탭별 (원장, 일 단위 셀, 환산에 쓴 환율표 digest) — attach_derived 에서 꺼냄
+        self._cells = {}
+        self._cells_lock = threading.Lock()
+
+    def _rate_table(self):
+        if self.fx_mode is None or not os.path.exists(self.path_for('exchange_rates')):
+            return None
+        frame, _ = parse_tab('exchange_rates', read_tab_csv('exchange_rates', self.path_for('exchange_rates')))
+        return RateTable(frame)
+
+    def _report_progress(self, tab):
+        if self.on_progress is not None:
+            self.on_progress(tab, dict(self.progress[tab]))
+
+    def fetch_tab(self, tab, timeout=None):
+        if tab not in STREAMING_TABS:
+            return super().fetch_tab(tab, timeout)
+        path = self.path_for(tab)
+        capacity, total_bytes = count_rows(path)
+        store = RowStore(tab, capacity)
+        fold = DailyFold(tab)
+        table = self._rate_table()
+        converter = FxConverter(self.fx_mode) if table is not None else None
+        report = None
+        progress = self.progress[tab] = {'rows': 0, 'bytes': 0, 'total_bytes': total_bytes, 'done': False}
+        with open(path, 'rb') as f:
+            for chunk in read_tab_csv(tab, f, chunksize=self.chunk_rows):
+                frame, chunk_report = parse_tab(tab, chunk, first_row=progress['rows'] + 2)
+                if converter is not None:
+                    frame = converter.convert(frame, table)
+                store.append(frame)
+                fold.add(frame)
+                report = chunk_report if report is None else report.merge(chunk_report)
+                progress.update(rows=progress['rows'] + len(chunk), bytes=f.tell())
+                self._report_progress(tab)
+        if report is None:
+            # 헤더만 있는 파일 (컬럼 구성만 필요)
+            return super().fetch_tab(tab, timeout)
+        progress.update(bytes=total_bytes, done=True)
+        self._report_progress(tab)
+
+        frame = store.frame()
+        self.validation[tab] = report
+        with self._cells_lock:
+            self._cells[tab] = (frame, fold.cells(), table.digest if table is not None else None)
+        return frame
+
+    def attach_derived(self, result):
+        """
+        스트리밍 중에 집계한 셀 → 월별 큐브 (매출/비용 모두 이번 로드의 원장이고 환율표가 같을 때만)
+        """
+        with self._cells_lock:
+            cells = {tab: self._cells.pop(tab, None) for tab in STREAMING_TABS}
+        if any(entry is None or entry[1] is None or result.data.get(tab) is not entry[0]
+               for tab, entry in cells.items()):
+            return
+        # 로드 후 환산(FxConverter.apply)에 쓰일 환율표와 같아야 환산된 원장과 큐브가 일치
+        rates = result.data.get('exchange_rates')
+        expected = RateTable(rates).digest if self.fx_mode is not None and rates is not None else None
+        if any(digest != expected for _, _, digest in cells.values()):
+            return
+        daily = {tab: entry[1] for tab, entry in cells.items()}
+        result.derived[MONTHLY_CUBE] = MonthlyCube.from_daily(daily, tabs=result.data)
+
+
+@dataclass
+class LoadResult:
+    """
+    load_all_tabs() 결과
+    data: 성공한 탭, errors: 실패한 탭 → 오류 메시지, timings: 탭별 소요 시간(초)
+    versions: 탭별 내용 해시 (스냅샷 저장 시 기록), source: 데이터를 가져온 소스 이름
+    derived: 이 데이터로부터 만든 파생 구조 (집계 큐브 등) — derive() 로 한 번만 생성
+    load_id: 프로세스 안에서 로드마다 증가하는 번호
+    loaded_at: 데이터를 원본에서 읽은 시각 (time.time(), 스냅샷이면 스냅샷 저장 시각)
+    validation: 탭별 스키마 검증 리포트 (CSV 소스만, 격리된 행과 오류 집계)
+    """
+
+    data: dict = field(default_factory=dict)
+    errors: dict = field(default_factory=dict)
+    timings: dict = field(default_factory=dict)
+    attempts: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    versions: dict = field(default_factory=dict)
+    source: str = ''
+    derived: dict = field(default_factory=dict, repr=False)
+    load_id: int = field(default_factory=lambda: next(_LOAD_IDS))
+    loaded_at: float = field(default_factory=time.time)
+    validation: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def missing_required(self):
+        return [tab for tab in REQUIRED_TABS if tab not in self.data]
+
+    @property
+    def data_version(self):
+        """
+        결과 캐시 키에 쓰는 데이터 버전
+        모든 탭의 내용 해시가 있으면 해시 조합(프로세스/재시작 간에도 동일), 없으면 로드 번호
+        """
+        if self.data and all(tab in self.versions for tab in self.data):
+            return '-'.join(self.versions[tab] for tab in sorted(self.data))
+        return f'load-{self.load_id}'
+
+    def derive(self, name, builder):
+        """
+        파생 구조를 데이터 로드당 한 번만 생성 (여러 세션이 동시에 요청해도 한 번)
+        builder: data dict 를 받아 파생 구조를 반환하는 함수
+        """
+        with _DERIVED_LOCK:
+            if name not in self.derived:
+                self.derived[name] = builder(self.data)
+            return self.derived[name]
+
+
+def _fetch_with_retry(source, tab, timeout, retries, backoff, started=None):
+    """
+    탭 하나를 재시도(지수 백오프)하며 가져옴
+    started: 시작한 시도 횟수를 탭별로 기록할 dict (마감 시간까지 끝나지 않은 탭의 시도 횟수용)
+    반환: (DataFrame, 시도 횟수)
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        if started is not None:
+            started[tab] = attempt
+        try:
+            return source.fetch_tab(tab, timeout=timeout), attempt
+        except Exception:
+            if attempt > retries:
+                raise
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+
+def load_all_tabs(source, tabs=None, timeout=10.0, retries=2, backoff=0.5, max_workers=8):
+    """
+    여러 탭을 스레드 풀로 동시에 로드
+
+    전체 소요 시간은 탭별 왕복 시간의 합이 아니라 가장 느린 탭 기준이 됩니다.
+    탭별 마감 시간은 timeout × (retries + 1) + 백오프 합계이며,
+    마감 시간을 넘기거나 재시도 후에도 실패한 탭은 errors 에 기록하고 나머지 탭은 그대로 반환합니다.
+    """
+    tabs = list(tabs) if tabs is not None else source.available_tabs()
+    result = LoadResult(source=source.name)
+    if not tabs:
+        return result
+
+    deadline = timeout * (retries + 1) + backoff * (2 ** retries - 1)
+    started = time.perf_counter()
+    started_attempts = {}
+
+    def task(tab):
+        tab_started = time.perf_counter()
+        df, attempts = _fetch_with_retry(source, tab, timeout, retries, backoff, started_attempts)
+        return df, attempts, time.perf_counter() - tab_started
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(tabs)), thread_name_prefix='cfo-loader')
+    try:
+        futures = {executor.submit(task, tab): tab for tab in tabs}
+        done, not_done = wait(futures, timeout=deadline)
+
+        for future in done:
+            tab = futures[future]
+            try:
+                df, attempts, seconds = future.result()
+            except Exception as e:
+                result.errors[tab] = f'{type(e).__name__}: {e}'
+                result.attempts[tab] = retries + 1
+                continue
+            result.data[tab] = df
+            result.attempts[tab] = attempts
+            result.timings[tab] = seconds
+            report = getattr(source, 'validation', {}).get(tab)
+            if report is not None:
+                result.validation[tab] = report
+
+        for future in not_done:
+            tab = futures[future]
+            future.cancel()
+            result.errors[tab] = f'Timeout: {deadline:.1f}초 안에 응답 없음'
+            result.attempts[tab] = started_attempts.get(tab, 0)
+    finally:
+        # 응답 없는 탭 때문에 호출자가 블로킹되지 않도록 기다리지 않고 종료
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    source.attach_derived(result)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def make_source(kind, sheet_urls=None, data_dir='data', chunk_rows=0, fx_mode=None, **fake_kwargs):
+    """
+    이름으로 데이터 소스 생성 ('fake' | 'sheets' | 'csv')
+    csv 는 chunk_rows 를 주면 청크 단위 스트리밍 수집 (StreamingCsvSource, fx_mode 는 로드 후 환율 기준)
+    """
+    if kind == 'sheets':
+        return SheetCsvSource(sheet_urls or {})
+    if kind == 'csv':
+        if chunk_rows:
+            return StreamingCsvSource(data_dir, chunk_rows, fx_mode)
+        return LocalCsvSource(data_dir)
+    if kind == 'fake':
+        return FakeDataSource(**fake_kwargs)
+    raise ValueError(f'알 수 없는 데이터 소스: {kind}')
@@ -0,0 +1,114 @@
+"""
+프로세스 전역 데이터 저장소 (stale-while-revalidate)
+
+모든 세션이 같은 LoadResult 객체를 복사 없이 읽고, 새로고침은 백그라운드 스레드 하나가 맡습니다.
+새 버전을 다 읽은 뒤에 참조 하나만 바꿔 끼우므로(atomic swap) 세션은 새로고침 중에도
+이전 버전을 그대로 읽고, 만료 직후 첫 세션이 전체 로드를 기다리는 일이 없습니다.
+
+- 주기 새로고침: refresh_seconds 마다 (0 이면 수동 새로고침만)
+- 수동 새로고침: refresh() — 백그라운드 스레드를 깨움 (wait=True 면 호출한 쪽에서 바로 로드)
+- 필수 탭이 빠진 로드 결과나 예외는 버리고 이전 버전을 유지 (last_error 에 기록)
+- 내용 해시가 같은 새 버전은 바꾸지 않음 (파생 구조와 결과 캐시를 그대로 사용)
+
+저장된 LoadResult 와 그 DataFrame 은 읽기 전용으로 다룹니다 (수정이 필요하면 복사해서 사용).
+"""
+
+import threading
+import time
+
+
+class DataStore:
+    """
+    loader: 인자 없이 LoadResult 를 반환하는 함수 (load_all_tabs / SnapshotCache.get 등)
+    current: 현재 버전 (첫 get() 전에는 None)
+    checked_at: 원본을 마지막으로 확인한 시각 (변경 없음 포함, time.time())
+    swaps: 새 버전으로 바꾼 횟수, last_error: 마지막 새로고침 실패 메시지
+    """
+
+    def __init__(self, loader, refresh_seconds=300, clock=time.time):
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+        self.checked_at = None
+        self.swaps = 0
+        self.last_error = None
+        self._current = None
+        self._first_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    @property
+    def current(self):
+        return self._current
+
+    @property
+    def refreshing(self):
+        return self._load_lock.locked()
+
+    def get(self):
+        """
+        현재 버전 (첫 호출만 로드를 기다리고, 이후에는 새로고침 여부와 관계없이 바로 반환)
+        """
+        current = self._current
+        if current is not None:
+            return current
+        with self._first_lock:
+            if self._current is None:
+                with self._load_lock:
+                    self._swap(self.loader(), first=True)
+                self._start()
+        return self._current
+
+    def refresh(self, wait=False):
+        """
+        수동 새로고침 — 기본은 백그라운드 스레드를 깨우고 바로 반환
+        wait=True 면 호출한 스레드에서 로드까지 마치고 반환 (CLI/테스트용)
+        """
+        if wait:
+            self._refresh_once()
+        else:
+            self._wake.set()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name='cfo-data-store')
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.refresh_seconds if self.refresh_seconds > 0 else None)
+            self._wake.clear()
+            if self._stopped:
+                break
+            self._refresh_once()
+
+    def _refresh_once(self):
+        with self._load_lock:
+            try:
+                self._swap(self.loader())
+            except Exception as e:
+                self.last_error = f'{type(e).__name__}: {e}'
+
+    def _swap(self, result, first=False):
+        """
+        로드 결과 → 현재 버전 교체 여부 판단 (호출 시 _load_lock 보유)
+        """
+        current = self._current
+        if not first and result.missing_required and not current.missing_required:
+            self.last_error = '필수 탭 누락: ' + ', '.join(
+                f'{tab} ({result.errors.get(tab, "탭 없음")})' for tab in result.missing_required
+            )
+            return
+        self.checked_at = self.clock()
+        self.last_error = None
+        if current is not None and result.data_version == current.data_version:
+            return
+        # 참조 하나만 바꿈 — 이미 이전 버전을 받은 세션은 그 버전으로 끝까지 실행
+        self._current = result
+        self.swaps += 1
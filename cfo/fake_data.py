@@ -0,0 +1,423 @@
+"""
+더미 데이터 생성기 (벡터화 버전)
+
+행 단위 for 루프 대신 컬럼 전체를 한 번에 난수로 생성하므로
+수백만 ~ 수천만 행 규모의 부하 테스트용 원장도 만들 수 있습니다.
+SCHEMA_DESIGN.md의 8개 탭을 모두 생성합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cfo.constants import (
+    COUNTRIES, COUNTRY_WEIGHTS, TEAMS, EXPENSE_TEAMS, COUNTRY_CURRENCY, FX_RATES,
+    PAYMENT_STATUSES, PAYMENT_STATUS_WEIGHTS, PAYMENT_TERMS, REVENUE_CATEGORIES,
+    EXPENSE_CATEGORIES_L1, EXPENSE_CATEGORY_WEIGHTS, PAYMENT_METHODS,
+    STAGES, ALL_STAGES, ROLES, EMPLOYMENT_TYPES, EMPLOYEE_STATUSES, CURRENCIES,
+)
+
+# 국가별 매출 금액 범위 (원 통화 기준, [low, high))
+REVENUE_AMOUNT_RANGES = {
+    'Korea': (10_000_000, 100_000_000),
+    'USA': (10_000, 80_000),
+    'Vietnam': (200_000_000, 1_500_000_000),
+}
+
+# 비용 카테고리별 금액 범위 (KRW)
+EXPENSE_AMOUNT_RANGES = {
+    'Personnel': (3_000_000, 15_000_000),
+    'Marketing': (500_000, 10_000_000),
+    'Operations': (500_000, 5_000_000),
+    'COGS': (1_000_000, 20_000_000),
+}
+
+# 파이프라인 단계별 성공 확률 범위 (%)
+STAGE_PROBABILITY_RANGES = {
+    'Proposal': (20, 50),
+    'Contract': (60, 80),
+    'Payment Pending': (80, 95),
+    'Closed Won': (100, 101),
+}
+
+
+def _categorical(codes, values, categories=None):
+    """
+    values 목록의 코드 배열 → 고정 카테고리 Categorical (apply_schema 가 변환하는 것과 같은 타입)
+    object 배열을 거치지 않고 코드만 옮기므로 행 수가 많아도 메모리가 작음
+
+    categories: 스키마의 고정 카테고리 목록 (기본 values, 예: TEAMS 값을 EXPENSE_TEAMS 카테고리로)
+    """
+    if categories is None:
+        return pd.Categorical.from_codes(codes, values)
+    positions = np.array([categories.index(v) for v in values])
+    return pd.Categorical.from_codes(positions[codes], categories)
+
+
+def _label(codes, values):
+    """
+    values 목록의 코드 배열 → 'label' 컬럼 (apply_schema 와 같은 규칙)
+    관측된 값만 정렬된 카테고리로, 고유값이 행 수의 절반을 넘으면 문자열 배열
+    """
+    values = np.asarray(values, dtype=object)
+    used = np.flatnonzero(np.bincount(codes, minlength=len(values)))
+    if len(used) > len(codes) // 2:
+        return values[codes]
+    order = used[np.argsort(values[used], kind='stable')]
+    positions = np.full(len(values), -1, dtype=np.int64)
+    positions[order] = np.arange(len(order))
+    return pd.Categorical.from_codes(positions[codes], values[order])
+
+
+def _pick(rng, values, size, p=None, categories=None):
+    """
+    값 목록에서 size개를 뽑아 (코드 배열, Categorical)로 반환
+    """
+    codes = rng.choice(len(values), size=size, p=p)
+    return codes, _categorical(codes, values, categories)
+
+
+def _ranged_ints(rng, codes, ranges):
+    """
+    코드별로 다른 [low, high) 범위의 정수를 한 번에 생성
+    """
+    lows = np.array([r[0] for r in ranges], dtype=np.int64)[codes]
+    highs = np.array([r[1] for r in ranges], dtype=np.int64)[codes]
+    return lows + (rng.random(len(codes)) * (highs - lows)).astype(np.int64)
+
+
+def _numbered(prefix, numbers, width=0):
+    """
+    'REV-0001' 형태의 문자열 배열 생성
+    """
+    numbers = np.asarray(numbers)
+    if numbers.size == 0:
+        return np.array([], dtype=object)
+    digits = np.char.zfill(numbers.astype(str), width)
+    return np.char.add(prefix, digits).astype(object)
+
+
+def _label_pool(prefix, low, high):
+    """
+    'Client 1' ~ 'Client N' 같은 라벨 목록
+    """
+    return [f'{prefix} {k}' for k in range(low, high)]
+
+
+def _random_dates(rng, start, n_days, size, sort=True):
+    """
+    [start, start + n_days) 구간에서 일 단위 날짜를 균등 추출
+    RAW 탭은 거래 순서대로 행이 추가되므로 기본적으로 날짜순 정렬
+    """
+    offsets = rng.integers(0, n_days, size=size)
+    if sort:
+        offsets.sort()
+    return np.datetime64(start, 'D') + offsets.astype('timedelta64[D]')
+
+
+def generate_revenue(rng, n_rows, start, n_days):
+    """
+    RAW_Revenue 탭 생성
+    """
+    dates = _random_dates(rng, start, n_days, n_rows)
+    country_codes, country = _pick(rng, COUNTRIES, n_rows, p=COUNTRY_WEIGHTS)
+    _, team = _pick(rng, TEAMS, n_rows, categories=EXPENSE_TEAMS)
+
+    # 국가별 금액 범위 및 환율 적용
+    amount = _ranged_ints(rng, country_codes, [REVENUE_AMOUNT_RANGES[c] for c in COUNTRIES])
+    currency = _categorical(country_codes, [COUNTRY_CURRENCY[c] for c in COUNTRIES], CURRENCIES)
+    exchange_rate = np.array([FX_RATES[COUNTRY_CURRENCY[c]] for c in COUNTRIES])[country_codes]
+    amount_krw = amount * exchange_rate
+
+    status_codes, payment_status = _pick(rng, PAYMENT_STATUSES, n_rows, p=PAYMENT_STATUS_WEIGHTS)
+    term_codes, payment_terms = _pick(rng, PAYMENT_TERMS, n_rows, p=[0.6, 0.4])
+    term_days = np.array([30, 60])[term_codes]
+
+    # 청구일은 거래일 이전 0~14일, 입금일은 Paid 건만 존재
+    invoice_date = dates - rng.integers(0, 15, size=n_rows).astype('timedelta64[D]')
+    pay_lag = (rng.random(n_rows) * (term_days + 15)).astype(np.int64) + 1
+    payment_date = (invoice_date + pay_lag.astype('timedelta64[D]')).astype('datetime64[ns]')
+    payment_date[status_codes != 0] = np.datetime64('NaT')
+
+    width = max(4, len(str(n_rows)))
+    df = pd.DataFrame({
+        'transaction_id': _numbered('REV-', np.arange(1, n_rows + 1), width),
+        'date': dates.astype('datetime64[ns]'),
+        'country': country,
+        'team': team,
+        'client_name': _label(rng.integers(0, 49, size=n_rows), _label_pool('Client', 1, 50)),
+        'project_name': _label(rng.integers(0, 99, size=n_rows), _label_pool('Project', 1, 100)),
+        'amount_original': amount,
+        'currency': currency,
+        'amount_krw': amount_krw,
+        'exchange_rate': exchange_rate,
+        'payment_status': payment_status,
+        'invoice_date': invoice_date.astype('datetime64[ns]'),
+        'payment_date': payment_date,
+        'payment_terms': payment_terms,
+        'category': _pick(rng, REVENUE_CATEGORIES, n_rows)[1],
+        'notes': _label(np.zeros(n_rows, dtype=np.int64), ['']),
+    })
+    return df
+
+
+def generate_expense(rng, n_rows, start, n_days):
+    """
+    RAW_Expense 탭 생성
+    """
+    dates = _random_dates(rng, start, n_days, n_rows)
+    _, country = _pick(rng, COUNTRIES, n_rows, p=COUNTRY_WEIGHTS)
+    _, team = _pick(rng, EXPENSE_TEAMS, n_rows)
+    cat_codes, category_l1 = _pick(rng, EXPENSE_CATEGORIES_L1, n_rows, p=EXPENSE_CATEGORY_WEIGHTS)
+
+    # 비용 카테고리별 금액 범위
+    amount = _ranged_ints(rng, cat_codes, [EXPENSE_AMOUNT_RANGES[c] for c in EXPENSE_CATEGORIES_L1])
+
+    category_l2 = _label(cat_codes, [f'{c}_sub' for c in EXPENSE_CATEGORIES_L1])
+    # COGS 가 아닌 비용은 프로젝트 없음 ('' = 0번 코드)
+    is_cogs = cat_codes == EXPENSE_CATEGORIES_L1.index('COGS')
+    project_codes = rng.integers(0, 99, size=n_rows) + 1
+    project_codes[~is_cogs] = 0
+    project_related = _label(project_codes, [''] + _label_pool('Project', 1, 100))
+
+    # 인건비는 대부분 정기 지출
+    is_personnel = cat_codes == EXPENSE_CATEGORIES_L1.index('Personnel')
+    is_recurring = np.where(is_personnel, rng.random(n_rows) < 0.9, rng.random(n_rows) < 0.2)
+
+    numbers = np.arange(1, n_rows + 1)
+    width = max(4, len(str(n_rows)))
+    df = pd.DataFrame({
+        'expense_id': _numbered('EXP-', numbers, width),
+        'date': dates.astype('datetime64[ns]'),
+        'country': country,
+        'team': team,
+        'category_l1': category_l1,
+        'category_l2': category_l2,
+        'vendor': _label(rng.integers(0, 29, size=n_rows), _label_pool('Vendor', 1, 30)),
+        'description': _numbered('Expense description ', numbers),
+        'amount_original': amount,
+        'currency': _categorical(np.zeros(n_rows, dtype=np.int64), ['KRW'], CURRENCIES),
+        'amount_krw': amount,
+        'exchange_rate': np.ones(n_rows),
+        'payment_method': _pick(rng, PAYMENT_METHODS, n_rows, p=[0.7, 0.3])[1],
+        'is_recurring': is_recurring,
+        'project_related': project_related,
+        'notes': _label(np.zeros(n_rows, dtype=np.int64), ['']),
+    })
+    return df
+
+
+def generate_cash(rng, month_ends):
+    """
+    RAW_Cash 탭 생성 (월말 × 국가별 잔고 스냅샷)
+    """
+    n_rows = len(month_ends) * len(COUNTRIES)
+    country_codes = np.tile(np.arange(len(COUNTRIES)), len(month_ends))
+    country = _categorical(country_codes, COUNTRIES)
+    currency = _categorical(country_codes, [COUNTRY_CURRENCY[c] for c in COUNTRIES], CURRENCIES)
+    exchange_rate = np.array([FX_RATES[COUNTRY_CURRENCY[c]] for c in COUNTRIES])[country_codes]
+    balance_krw = rng.integers(100_000_000, 800_000_000, size=n_rows)
+
+    df = pd.DataFrame({
+        'date': np.repeat(month_ends.values, len(COUNTRIES)),
+        'country': country,
+        'account_name': _label(country_codes, [f'{c} Main Account' for c in COUNTRIES]),
+        'currency': currency,
+        'balance_original': balance_krw / exchange_rate,
+        'balance_krw': balance_krw,
+        'exchange_rate': exchange_rate,
+    })
+    return df
+
+
+def generate_pipeline(rng, n_rows, today):
+    """
+    Sales_Pipeline 탭 생성
+    """
+    _, country = _pick(rng, COUNTRIES, n_rows)
+    _, team = _pick(rng, TEAMS, n_rows, categories=EXPENSE_TEAMS)
+    stage_codes, stage = _pick(rng, STAGES, n_rows, categories=ALL_STAGES)
+    probability = _ranged_ints(rng, stage_codes, [STAGE_PROBABILITY_RANGES[s] for s in STAGES])
+    amount = rng.integers(20_000_000, 150_000_000, size=n_rows)
+
+    today = np.datetime64(pd.Timestamp(today).normalize().date(), 'D')
+    expected_close = today + rng.integers(30, 180, size=n_rows).astype('timedelta64[D]')
+    created = today - rng.integers(0, 120, size=n_rows).astype('timedelta64[D]')
+
+    numbers = np.arange(1, n_rows + 1)
+    df = pd.DataFrame({
+        'opportunity_id': _numbered('OPP-', numbers, 4),
+        'client_name': _numbered('Prospect ', numbers),
+        'project_name': _numbered('Opportunity ', numbers),
+        'country': country,
+        'team': team,
+        'stage': stage,
+        'probability': probability,
+        'amount_original': amount,
+        'currency': _categorical(np.zeros(n_rows, dtype=np.int64), ['KRW'], CURRENCIES),
+        'amount_krw': amount,
+        'expected_close_date': expected_close.astype('datetime64[ns]'),
+        'expected_payment_date': (expected_close + np.timedelta64(30, 'D')).astype('datetime64[ns]'),
+        'created_date': created.astype('datetime64[ns]'),
+        'last_updated': np.full(n_rows, today).astype('datetime64[ns]'),
+        'notes': _label(np.zeros(n_rows, dtype=np.int64), ['']),
+    })
+    return df
+
+
+def generate_headcount(rng, n_rows, start, n_days, leave_rate=0.15):
+    """
+    Headcount 탭 생성
+    입사일은 데이터 시작 2년 전부터 분포, 일부 인원은 퇴사(Inactive) 처리
+    """
+    _, country = _pick(rng, COUNTRIES, n_rows, p=COUNTRY_WEIGHTS)
+    _, team = _pick(rng, EXPENSE_TEAMS, n_rows)
+
+    first_day = np.datetime64(start, 'D') - np.timedelta64(730, 'D')
+    join_date = first_day + rng.integers(0, 730 + n_days, size=n_rows).astype('timedelta64[D]')
+    last_day = np.datetime64(start, 'D') + np.timedelta64(n_days - 1, 'D')
+
+    # 퇴사자는 입사일 ~ 데이터 종료일 사이에 퇴사
+    has_left = (rng.random(n_rows) < leave_rate) & (join_date < last_day)
+    tenure = (rng.random(n_rows) * (last_day - join_date).astype(np.int64)).astype(np.int64) + 1
+    leave_date = (join_date + tenure.astype('timedelta64[D]')).astype('datetime64[ns]')
+    leave_date[~has_left] = np.datetime64('NaT')
+
+    numbers = np.arange(1, n_rows + 1)
+    df = pd.DataFrame({
+        'employee_id': _numbered('EMP-', numbers, max(3, len(str(n_rows)))),
+        'name': _numbered('Employee ', numbers),
+        'country': country,
+        'team': team,
+        'role': _label(rng.choice(len(ROLES), size=n_rows), ROLES),
+        'employment_type': _pick(rng, EMPLOYMENT_TYPES, n_rows, p=[0.8, 0.1, 0.1])[1],
+        'join_date': join_date.astype('datetime64[ns]'),
+        'leave_date': leave_date,
+        'monthly_salary_krw': rng.integers(3_000_000, 12_000_000, size=n_rows),
+        'status': _categorical(has_left.astype(np.int64), EMPLOYEE_STATUSES),
+    })
+    return df
+
+
+def generate_budget(rng, month_ends, n_revenue, n_expense):
+    """
+    Budget 탭 생성 (연/월 × 국가 × 팀 목표)
+    목표치는 더미 거래 분포의 기대값에 ±20% 노이즈를 준 값
+    """
+    n_months = len(month_ends)
+    n_rows = n_months * len(COUNTRIES) * len(EXPENSE_TEAMS)
+
+    # 월 × 국가 × 팀 격자
+    month_idx = np.repeat(np.arange(n_months), len(COUNTRIES) * len(EXPENSE_TEAMS))
+    country_codes = np.tile(np.repeat(np.arange(len(COUNTRIES)), len(EXPENSE_TEAMS)), n_months)
+    team_codes = np.tile(np.arange(len(EXPENSE_TEAMS)), n_months * len(COUNTRIES))
+
+    # 국가별 건당 평균 매출(KRW) × 월평균 건수 × 국가 비중 / 팀 수
+    mean_revenue = np.array([
+        np.mean(REVENUE_AMOUNT_RANGES[c]) * FX_RATES[COUNTRY_CURRENCY[c]] for c in COUNTRIES
+    ])
+    revenue_base = (mean_revenue * np.array(COUNTRY_WEIGHTS) * n_revenue / n_months / len(TEAMS))[country_codes]
+    revenue_base[team_codes == EXPENSE_TEAMS.index('Admin')] = 0
+
+    mean_expense = np.dot(
+        [np.mean(EXPENSE_AMOUNT_RANGES[c]) for c in EXPENSE_CATEGORIES_L1], EXPENSE_CATEGORY_WEIGHTS
+    )
+    expense_base = (mean_expense * np.array(COUNTRY_WEIGHTS) * n_expense / n_months / len(EXPENSE_TEAMS))[country_codes]
+
+    revenue_target = (revenue_base * rng.uniform(0.9, 1.2, size=n_rows)).round(-4)
+    expense_budget = (expense_base * rng.uniform(0.9, 1.2, size=n_rows)).round(-4)
+
+    df = pd.DataFrame({
+        'year': month_ends.year.values[month_idx],
+        'month': month_ends.month.values[month_idx],
+        'country': _categorical(country_codes, COUNTRIES),
+        'team': _categorical(team_codes, EXPENSE_TEAMS),
+        'revenue_target_krw': revenue_target,
+        'expense_budget_krw': expense_budget,
+        'profit_target_krw': revenue_target - expense_budget,
+    })
+    return df
+
+
+def generate_exchange_rates(month_ends):
+    """
+    Exchange_Rates 탭 생성 (월말 기준 환율)
+    """
+    n_rows = len(month_ends)
+    return pd.DataFrame({
+        'date': month_ends.values,
+        'usd_to_krw': np.full(n_rows, float(FX_RATES['USD'])),
+        'vnd_to_krw': np.full(n_rows, float(FX_RATES['VND'])),
+    })
+
+
+def build_pl_monthly(df_revenue, df_expense):
+    """
+    RAW_Revenue / RAW_Expense로부터 PL_Monthly 탭(연월 × 국가 × 팀 손익) 집계
+    """
+    keys = ['year_month', 'country', 'team']
+
+    # 월 키는 datetime64[M]로 그룹핑하고 문자열 변환은 집계 결과에만 적용
+    rev = df_revenue[['country', 'team', 'amount_krw']].assign(
+        year_month=df_revenue['date'].values.astype('datetime64[M]')
+    )
+    revenue = rev.groupby(keys, observed=True)['amount_krw'].sum().rename('revenue_krw')
+
+    exp = df_expense[['country', 'team', 'amount_krw']].assign(
+        year_month=df_expense['date'].values.astype('datetime64[M]'),
+        is_cogs=(df_expense['category_l1'] == 'COGS').values,
+    )
+    # COGS/비COGS 행이 한쪽만 있어도 (연월, 국가, 팀) 키를 유지하도록 두 컬럼을 항상 만듦
+    by_type = exp.groupby(keys + ['is_cogs'], observed=True)['amount_krw'].sum().unstack('is_cogs', fill_value=0)
+    by_type = by_type.reindex(columns=[True, False], fill_value=0)
+    cogs = by_type[True].rename('cogs_krw')
+    opex = by_type[False].rename('operating_expense_krw')
+
+    pl = pd.concat([revenue, cogs, opex], axis=1).fillna(0).reset_index()
+    pl['year_month'] = pd.to_datetime(pl['year_month']).dt.strftime('%Y-%m')
+    pl['gross_profit_krw'] = pl['revenue_krw'] - pl['cogs_krw']
+    # 감가상각 데이터가 없으므로 EBITDA = 영업이익 = 순이익
+    pl['ebitda_krw'] = pl['gross_profit_krw'] - pl['operating_expense_krw']
+    pl['net_profit_krw'] = pl['ebitda_krw']
+
+    revenue_nonzero = pl['revenue_krw'].where(pl['revenue_krw'] != 0)
+    pl['gross_margin_pct'] = (pl['gross_profit_krw'] / revenue_nonzero * 100).round(1)
+    pl['ebitda_margin_pct'] = (pl['ebitda_krw'] / revenue_nonzero * 100).round(1)
+    pl['net_margin_pct'] = (pl['net_profit_krw'] / revenue_nonzero * 100).round(1)
+
+    columns = [
+        'year_month', 'country', 'team', 'revenue_krw', 'cogs_krw', 'gross_profit_krw',
+        'gross_margin_pct', 'operating_expense_krw', 'ebitda_krw', 'ebitda_margin_pct',
+        'net_profit_krw', 'net_margin_pct',
+    ]
+    return pl[columns].sort_values(keys, ignore_index=True)
+
+
+def generate_fake_data(n_revenue=500, n_expense=800, start_date='2023-01-01', end_date='2024-10-31',
+                       n_pipeline=50, n_employees=50, seed=42, today=None):
+    """
+    SCHEMA_DESIGN.md의 8개 탭 더미 데이터를 한 번에 생성
+
+    n_revenue / n_expense 로 RAW 탭의 행 수를, start_date / end_date 로 기간을 조절합니다.
+    같은 seed 에 대해 항상 같은 결과를 반환합니다 (파이프라인 날짜는 today 기준).
+    """
+    rng = np.random.default_rng(seed)
+
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize()
+    n_days = (end - start).days + 1
+    month_ends = pd.date_range(start=start, end=end, freq=pd.offsets.MonthEnd())
+    today = pd.Timestamp.now() if today is None else pd.Timestamp(today)
+
+    df_revenue = generate_revenue(rng, n_revenue, start, n_days)
+    df_expense = generate_expense(rng, n_expense, start, n_days)
+
+    return {
+        'revenue': df_revenue,
+        'expense': df_expense,
+        'cash': generate_cash(rng, month_ends),
+        'pipeline': generate_pipeline(rng, n_pipeline, today),
+        'headcount': generate_headcount(rng, n_employees, start, n_days),
+        'budget': generate_budget(rng, month_ends, n_revenue, n_expense),
+        'exchange_rates': generate_exchange_rates(month_ends),
+        'pl_monthly': build_pl_monthly(df_revenue, df_expense),
+    }
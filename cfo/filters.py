@@ -0,0 +1,116 @@
+"""
+사이드바 필터 엔진
+
+원장을 날짜순으로 한 번 정렬해 두고 기간 필터는 이진 탐색(searchsorted)으로 구간을 자르며,
+국가/팀 같은 다중 선택 필터는 카테고리 코드 → 허용 여부 비트마스크 조회로 처리합니다.
+국가/팀 제한이 없으면 결과는 복사본이 아니라 정렬된 원장의 연속 구간(view)입니다.
+1,000만 행 이상에서도 필터 변경이 즉시 반영되도록 하는 것이 목적입니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class FilterEngine:
+    """
+    한 탭(RAW_Revenue 또는 RAW_Expense)에 대한 필터 인덱스
+
+    frame: 날짜순으로 정렬된 원장 (입력이 이미 정렬돼 있으면 복사하지 않음)
+    categories[dim]: 차원별 값 목록, codes[dim]: 행별 코드 (결측은 -1)
+    """
+
+    def __init__(self, df, date_column='date', dimensions=('country', 'team')):
+        dates = df[date_column].values
+        if len(dates) > 1 and not (dates[1:] >= dates[:-1]).all():
+            order = np.argsort(dates, kind='stable')
+            df = df.take(order).reset_index(drop=True)
+            dates = df[date_column].values
+
+        self.frame = df
+        self.date_column = date_column
+        self.dates = dates
+        self.categories = {}
+        self.codes = {}
+        for dim in dimensions:
+            column = df[dim]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                codes, categories = column.cat.codes.to_numpy(), column.cat.categories
+            else:
+                codes, categories = pd.factorize(column, sort=True)
+            self.codes[dim] = codes
+            self.categories[dim] = list(categories)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def date_bounds(self, start=None, end=None):
+        """
+        [start, end] 기간에 해당하는 행 구간 (lo, hi) — 양 끝 포함, 날짜 단위
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start), 'ns'), side='left'))
+        if end is None:
+            hi = len(self.dates)
+        else:
+            # 종료일 당일 거래까지 포함
+            end_exclusive = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            hi = int(np.searchsorted(self.dates, np.datetime64(end_exclusive, 'ns'), side='left'))
+        return lo, max(lo, hi)
+
+    def _lookup(self, dim, selected):
+        """
+        선택 값 목록 → 코드별 허용 여부 배열 (마지막 원소는 결측 코드 -1 용, 항상 False)
+        전체 선택이면 None
+        """
+        categories = self.categories[dim]
+        wanted = set(selected)
+        allowed = np.array([c in wanted for c in categories] + [False])
+        if allowed[:-1].all():
+            return None
+        return allowed
+
+    def mask(self, lo, hi, **selections):
+        """
+        [lo, hi) 구간 안에서 차원 선택 조건을 만족하는 행 마스크, 조건이 없으면 None
+        selections: country=[...], team=[...] (None 또는 빈 목록이면 필터 없음)
+        """
+        mask = None
+        for dim, selected in selections.items():
+            if not selected:
+                continue
+            allowed = self._lookup(dim, selected)
+            if allowed is None:
+                continue
+            dim_mask = allowed[self.codes[dim][lo:hi]]
+            mask = dim_mask if mask is None else mask & dim_mask
+        return mask
+
+    def filter(self, start=None, end=None, **selections):
+        """
+        기간 + 차원 필터 적용 결과
+        차원 필터가 없으면 정렬된 원장의 연속 구간(view)을 그대로 반환
+        """
+        lo, hi = self.date_bounds(start, end)
+        view = self.frame.iloc[lo:hi]
+        mask = self.mask(lo, hi, **selections)
+        if mask is None:
+            return view
+        return view.iloc[np.flatnonzero(mask)]
+
+    def count(self, start=None, end=None, **selections):
+        """
+        필터 결과 행 수 (DataFrame을 만들지 않음)
+        """
+        lo, hi = self.date_bounds(start, end)
+        mask = self.mask(lo, hi, **selections)
+        return hi - lo if mask is None else int(np.count_nonzero(mask))
+
+    def latest(self, n, start=None, end=None, **selections):
+        """
+        필터 결과 중 최근 n 행 (최신순) — 뒤에서부터 필요한 만큼만 확인
+        """
+        lo, hi = self.date_bounds(start, end)
+        mask = self.mask(lo, hi, **selections)
+        if mask is None:
+            return self.frame.iloc[max(lo, hi - n):hi].iloc[::-1]
+        positions = np.flatnonzero(mask)[-n:][::-1]
+        return self.frame.iloc[lo + positions]
@@ -0,0 +1,273 @@
+"""
+환율 환산 엔진 (Exchange_Rates 탭 기준)
+
+RAW_Revenue / RAW_Expense 의 amount_original × 환율로 amount_krw 를 다시 계산합니다.
+손으로 입력한 amount_krw 대신 Exchange_Rates 탭의 날짜별 환율(usd_to_krw, vnd_to_krw)을 쓰며,
+통화별로 정렬된 환율 날짜에 이진 탐색(searchsorted)하는 as-of 조인이라 수백만 행도 한 번에 처리합니다.
+
+환율 기준 (mode):
+    transaction     거래일 당일 또는 그 이전 가장 최근 환율
+    month_end       거래가 속한 달의 월말 기준 환율 (월말 또는 그 이전 가장 최근 환율)
+첫 환율 날짜보다 이전 거래는 첫 환율을 사용합니다.
+
+FxConverter 는 탭별로 마지막 환산 결과를 기억해 두었다가,
+원장은 그대로이고 환율만 수정된 경우 환율이 바뀐 구간에 속한 행만 다시 계산합니다.
+"""
+
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from cfo.constants import FX_RATES
+
+FX_MODES = ['transaction', 'month_end']
+
+# 환산 대상 탭
+FX_TABS = ['revenue', 'expense']
+
+# Exchange_Rates 컬럼 → 통화
+RATE_COLUMNS = {'usd_to_krw': 'USD', 'vnd_to_krw': 'VND'}
+
+# 가장 이른 날짜 (첫 환율 이전 구간의 시작)
+_MIN_DAY = np.datetime64('1900-01-01', 'D')
+
+
+def lookup_dates(dates, mode):
+    """
+    거래일 → 환율 조회 기준일 (datetime64[D])
+    """
+    days = np.asarray(dates).astype('datetime64[D]')
+    if mode == 'transaction':
+        return days
+    if mode == 'month_end':
+        return (days.astype('datetime64[M]') + 1).astype('datetime64[D]') - 1
+    raise ValueError(f'알 수 없는 환율 기준: {mode}')
+
+
+class RateTable:
+    """
+    통화별 환율 계단 함수 (날짜 오름차순, 같은 날짜는 마지막 값)
+
+    dates[currency], rates[currency]: 환율이 있는 날짜와 값 (KRW 는 항상 1)
+    digest: 내용 해시 (같은 환율표인지 비교)
+    """
+
+    def __init__(self, df_rates=None):
+        self.dates = {}
+        self.rates = {}
+        if df_rates is not None and len(df_rates) and 'date' in df_rates.columns:
+            days = pd.to_datetime(df_rates['date'], errors='coerce').to_numpy().astype('datetime64[D]')
+            for column, currency in RATE_COLUMNS.items():
+                if column not in df_rates.columns:
+                    continue
+                values = pd.to_numeric(df_rates[column], errors='coerce').to_numpy(dtype=float)
+                valid = ~np.isnat(days) & np.isfinite(values) & (values > 0)
+                if not valid.any():
+                    continue
+                frame = pd.DataFrame({'date': days[valid], 'rate': values[valid]})
+                frame = frame.drop_duplicates('date', keep='last').sort_values('date')
+                self.dates[currency] = frame['date'].to_numpy().astype('datetime64[D]')
+                self.rates[currency] = frame['rate'].to_numpy()
+
+        digest = hashlib.blake2b(digest_size=16)
+        for currency in sorted(self.dates):
+            digest.update(currency.encode())
+            digest.update(self.dates[currency].tobytes())
+            digest.update(self.rates[currency].tobytes())
+        self.digest = digest.hexdigest()
+
+    def __len__(self):
+        return sum(len(dates) for dates in self.dates.values())
+
+    def lookup(self, currency, days):
+        """
+        기준일 배열 → 환율 배열 (as-of: 기준일 또는 그 이전 가장 최근 환율)
+        환율표에 없는 통화는 기본 환율(constants.FX_RATES), 모르는 통화는 NaN
+        """
+        days = np.asarray(days, dtype='datetime64[D]')
+        if currency == 'KRW':
+            return np.ones(len(days))
+        if currency not in self.dates:
+            return np.full(len(days), float(FX_RATES.get(currency, np.nan)))
+        position = np.searchsorted(self.dates[currency], days, side='right') - 1
+        return self.rates[currency][np.maximum(position, 0)]
+
+    def changed_ranges(self, other):
+        """
+        other(이전 환율표) 대비 환율이 달라진 기준일 구간
+        반환: {통화: [(시작일, 끝일 — 미포함, None 이면 끝없음), ...]}
+        """
+        changed = {}
+        for currency in set(self.dates) | set(other.dates):
+            points = np.unique(np.concatenate([
+                [_MIN_DAY], self.dates.get(currency, []), other.dates.get(currency, []),
+            ]).astype('datetime64[D]'))
+            differs = self.lookup(currency, points) != other.lookup(currency, points)
+            if not differs.any():
+                continue
+            ranges = []
+            for i in np.flatnonzero(differs):
+                end = points[i + 1] if i + 1 < len(points) else None
+                if ranges and ranges[-1][1] == points[i]:
+                    ranges[-1] = (ranges[-1][0], end)
+                else:
+                    ranges.append((points[i], end))
+            changed[currency] = ranges
+        return changed
+
+
+class _TabState:
+    """
+    탭별 마지막 환산 결과 (원장 객체, 결과, 환율표, 행별 통화/기준일)
+    """
+
+    def __init__(self, source, result, table, currencies, days):
+        self.source = source
+        self.result = result
+        self.table = table
+        self.currencies = currencies
+        self.days = days
+
+
+class FxConverter:
+    """
+    Exchange_Rates 기준 amount_krw 재계산기 (프로세스당 1개, 새로고침 사이에 상태 유지)
+
+    mode: 'transaction' | 'month_end'
+    last_stats[tab]: 마지막 환산 결과 {'mode': 'full'|'revised'|'unchanged', 'rows': 다시 계산한 행 수}
+    """
+
+    def __init__(self, mode='transaction'):
+        if mode not in FX_MODES:
+            raise ValueError(f'알 수 없는 환율 기준: {mode}')
+        self.mode = mode
+        self.last_stats = {}
+        self._table = None
+        self._table_source = None
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def rate_table(self, df_rates):
+        """
+        Exchange_Rates DataFrame → RateTable (같은 DataFrame 이면 이전 것을 재사용)
+        """
+        if self._table is None or df_rates is not self._table_source:
+            table = RateTable(df_rates)
+            # 내용이 같으면 이전 객체를 유지 (digest 비교로 '변경 없음' 판단)
+            if self._table is None or table.digest != self._table.digest:
+                self._table = table
+            self._table_source = df_rates
+        return self._table
+
+    def _rows(self, df):
+        """
+        행별 통화와 환율 조회 기준일
+        """
+        currencies = df['currency'].astype('category')
+        return currencies, lookup_dates(df['date'].to_numpy(), self.mode)
+
+    def _rates(self, table, currencies, days, rows=None):
+        """
+        행별 환율 (rows 가 있으면 그 행만)
+        """
+        codes = currencies.cat.codes.to_numpy()
+        if rows is not None:
+            codes, days = codes[rows], days[rows]
+        rates = np.full(len(codes), np.nan)
+        for code, currency in enumerate(currencies.cat.categories):
+            selected = codes == code
+            if selected.any():
+                rates[selected] = table.lookup(currency, days[selected])
+        return rates
+
+    @staticmethod
+    def _write(result, rows, rates):
+        """
+        result 의 amount_krw / exchange_rate 를 rows 행만 새 환율로 갱신 (환산할 수 없는 행은 그대로)
+        """
+        original = result['amount_original'].to_numpy(dtype=float)
+        amount_krw = result['amount_krw'].to_numpy(dtype=float, copy=True)
+        exchange_rate = (
+            result['exchange_rate'].to_numpy(dtype=float, copy=True)
+            if 'exchange_rate' in result.columns else np.full(len(result), np.nan)
+        )
+        if rows is None:
+            rows = np.arange(len(result))
+        valid = np.isfinite(rates) & np.isfinite(original[rows])
+        rows, rates = rows[valid], rates[valid]
+        amount_krw[rows] = original[rows] * rates
+        exchange_rate[rows] = rates
+        result['amount_krw'] = amount_krw
+        result['exchange_rate'] = exchange_rate
+        return len(rows)
+
+    def convert(self, df, table):
+        """
+        모든 행을 다시 환산한 DataFrame (원본은 수정하지 않음, 상태와 무관)
+        """
+        if not {'amount_original', 'currency', 'date', 'amount_krw'} <= set(df.columns):
+            return df
+        currencies, days = self._rows(df)
+        result = df.copy(deep=False)
+        self._write(result, None, self._rates(table, currencies, days))
+        return result
+
+    def convert_tab(self, tab, df, table):
+        """
+        탭 환산 — 같은 원장에 환율만 바뀌었으면 바뀐 구간의 행만 다시 계산
+        """
+        if not {'amount_original', 'currency', 'date', 'amount_krw'} <= set(df.columns):
+            return df
+        with self._lock:
+            state = self._states.get(tab)
+            if state is not None and state.source is df:
+                if state.table.digest == table.digest:
+                    self.last_stats[tab] = {'mode': 'unchanged', 'rows': 0}
+                    return state.result
+                rows = self._affected_rows(table.changed_ranges(state.table), state.currencies, state.days)
+                result = state.result.copy(deep=False)
+                count = self._write(result, rows, self._rates(table, state.currencies, state.days, rows))
+                self.last_stats[tab] = {'mode': 'revised', 'rows': count}
+                currencies, days = state.currencies, state.days
+            else:
+                currencies, days = self._rows(df)
+                result = df.copy(deep=False)
+                count = self._write(result, None, self._rates(table, currencies, days))
+                self.last_stats[tab] = {'mode': 'full', 'rows': count}
+            self._states[tab] = _TabState(df, result, table, currencies, days)
+            return result
+
+    @staticmethod
+    def _affected_rows(changed, currencies, days):
+        """
+        환율이 바뀐 구간에 속한 행 번호
+        """
+        codes = currencies.cat.codes.to_numpy()
+        affected = np.zeros(len(codes), dtype=bool)
+        for currency, ranges in changed.items():
+            if currency not in currencies.cat.categories:
+                continue
+            rows = np.flatnonzero(codes == currencies.cat.categories.get_loc(currency))
+            starts = np.array([start for start, _ in ranges], dtype='datetime64[D]')
+            ends = np.array([end if end is not None else np.datetime64('9999-12-31') for _, end in ranges],
+                            dtype='datetime64[D]')
+            # 구간은 겹치지 않고 정렬돼 있으므로 시작일 이진 탐색 한 번으로 소속 구간을 찾음
+            position = np.searchsorted(starts, days[rows], side='right') - 1
+            inside = (position >= 0) & (days[rows] < ends[np.maximum(position, 0)])
+            affected[rows[inside]] = True
+        return np.flatnonzero(affected)
+
+    def apply(self, data):
+        """
+        탭 dict → 매출/비용 탭을 환산한 새 dict (Exchange_Rates 탭이 없으면 그대로)
+        """
+        if 'exchange_rates' not in data:
+            return data
+        table = self.rate_table(data['exchange_rates'])
+        converted = dict(data)
+        for tab in FX_TABS:
+            if tab in data:
+                converted[tab] = self.convert_tab(tab, data[tab], table)
+        return converted
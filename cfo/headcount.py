@@ -0,0 +1,142 @@
+"""
+시점별 인원 (Headcount timeline)
+
+Headcount 탭의 입사일(join_date)/퇴사일(leave_date)로 (월 × 국가 × 팀) 월말 재직 인원과 인건비 배열을
+데이터 로드 시 한 번 만들어 두고, 필터는 배열을 잘라서 합산합니다 (budget.BudgetIndex 와 같은 방식).
+
+- 스윕 라인: 입사 월에 +1, 퇴사 다음 날이 속한 월에 -1 을 (월, 국가, 팀) 칸에 쌓고 월 축으로 누적합 한 번
+  직원 수 N, 월 수 M 이면 O(N + M × 국가 × 팀) — 직원/기간이 늘어도 필터 변경 비용은 배열 크기만큼
+- 월말 재직 기준: 그 달 말일에 재직 중이면 1명, 인건비는 월말 재직자의 monthly_salary_krw 합계
+- 입사일이 없으면 처음부터 재직, 퇴사일 없이 Inactive 인 직원은 퇴사 시점을 모르므로 제외 (이전 Active 기준과 같음)
+기간 필터는 걸친 월 전체로 적용하며, 인당 지표는 기간 평균 인원으로 나눕니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _month_numbers(values):
+    """
+    날짜 → (1970-01 기준 월 번호, 결측 마스크)
+    """
+    dates = pd.to_datetime(pd.Series(values), errors='coerce').to_numpy(dtype='datetime64[ns]')
+    missing = np.isnat(dates)
+    months = np.where(missing, 0, dates.astype('datetime64[M]').astype(np.int64))
+    return months, missing
+
+
+def _month_number(day):
+    return int(np.datetime64(pd.Timestamp(day).date(), 'M').astype(np.int64))
+
+
+def _axis(series):
+    """
+    국가/팀 컬럼 → (코드, 축 값 목록), 결측은 축 마지막 칸(NaN)으로
+    필터를 걸지 않았을 때의 합계에는 포함하고, 국가/팀별 표에서는 뺌
+    """
+    codes, uniques = pd.factorize(series, sort=True)
+    labels = np.append(np.asarray(uniques, dtype=object), np.nan)
+    return np.where(codes < 0, len(uniques), codes), labels
+
+
+class HeadcountTimeline:
+    """
+    (월 × 국가 × 팀) 월말 재직 인원/인건비 배열
+
+    months: 큐브 데이터 첫 달부터 마지막 달까지 연속된 datetime64[M]
+    countries, teams: 축 값 목록 (마지막 칸은 국가/팀이 비어 있는 직원)
+    headcount, salary: (월, 국가, 팀) 배열
+    """
+
+    def __init__(self, df_headcount, cube):
+        if cube.min_date is not None:
+            first, last = _month_number(cube.min_date), _month_number(cube.max_date)
+        else:
+            first, last = 0, -1
+        self.first_month = first
+        self.months = np.arange(first, last + 1).astype('datetime64[M]')
+        n_months = len(self.months)
+
+        if df_headcount is None or not len(df_headcount):
+            self.countries = np.array([np.nan], dtype=object)
+            self.teams = np.array([np.nan], dtype=object)
+            self.headcount = np.zeros((n_months, 1, 1), dtype=np.int64)
+            self.salary = np.zeros((n_months, 1, 1))
+            return
+
+        country, self.countries = _axis(df_headcount['country'])
+        team, self.teams = _axis(df_headcount['team'])
+
+        join, no_join = _month_numbers(df_headcount['join_date'])
+        leave_dates = pd.to_datetime(pd.Series(df_headcount['leave_date']), errors='coerce') + pd.Timedelta(days=1)
+        leave, no_leave = _month_numbers(leave_dates)
+
+        # 타임라인 위치: 0 = 첫 달(이전 입사/퇴사는 첫 달로), n_months = 타임라인 밖 (이후 입사/퇴사, 퇴사 안 함)
+        start = np.where(no_join, 0, np.clip(join - first, 0, n_months))
+        end = np.where(no_leave, n_months, np.clip(leave - first, 0, n_months))
+        inactive = (df_headcount['status'] == 'Inactive').to_numpy() if 'status' in df_headcount else np.zeros(len(start), bool)
+        counted = (start < end) & ~(no_leave & inactive)
+
+        shape = (n_months + 1, len(self.countries), len(self.teams))
+        size = int(np.prod(shape))
+        starts = np.ravel_multi_index((start[counted], country[counted], team[counted]), shape)
+        ends = np.ravel_multi_index((end[counted], country[counted], team[counted]), shape)
+        salary = np.nan_to_num(pd.to_numeric(df_headcount['monthly_salary_krw'], errors='coerce').to_numpy(dtype=float))[counted]
+
+        # 입사 +1 / 퇴사 -1 이벤트를 월 축으로 누적 (마지막 칸은 타임라인 밖 이벤트라 버림)
+        events = np.bincount(starts, minlength=size) - np.bincount(ends, minlength=size)
+        self.headcount = events.reshape(shape).cumsum(axis=0)[:n_months]
+        salary_events = np.bincount(starts, weights=salary, minlength=size) - np.bincount(ends, weights=salary, minlength=size)
+        self.salary = salary_events.reshape(shape).cumsum(axis=0)[:n_months]
+
+    def _slices(self, start, end, countries, teams):
+        """
+        필터 → (월 구간 slice, 국가 마스크, 팀 마스크), 기간은 걸친 월 전체
+        """
+        n_months = len(self.months)
+        lo = 0 if start is None else min(max(_month_number(start) - self.first_month, 0), n_months)
+        hi = n_months if end is None else min(max(_month_number(end) - self.first_month + 1, 0), n_months)
+        country_mask = np.isin(self.countries, list(countries)) if countries else np.ones(len(self.countries), dtype=bool)
+        team_mask = np.isin(self.teams, list(teams)) if teams else np.ones(len(self.teams), dtype=bool)
+        return slice(lo, max(lo, hi)), country_mask, team_mask
+
+    def summary(self, start=None, end=None, countries=None, teams=None):
+        """
+        필터 조건의 시점별 인원
+
+        반환 dict:
+            monthly: year_month + headcount(월말 인원), salary_krw(월말 재직자 인건비)
+            end_headcount: 기간 마지막 달 월말 인원
+            average_headcount: 기간 평균 월말 인원 (달이 없으면 0)
+            by_country: country + headcount (마지막 달 월말, 0명 제외)
+            by_team: team + headcount (마지막 달 월말), average_headcount (기간 평균), 0명 제외
+        """
+        months, country_mask, team_mask = self._slices(start, end, countries, teams)
+        labels = pd.DatetimeIndex(self.months[months].astype('datetime64[ns]')).strftime('%Y-%m')
+        headcount = self.headcount[months][:, country_mask][:, :, team_mask]
+        salary = self.salary[months][:, country_mask][:, :, team_mask]
+
+        monthly_headcount = headcount.sum(axis=(1, 2))
+        monthly = pd.DataFrame({
+            'year_month': labels,
+            'headcount': monthly_headcount,
+            'salary_krw': salary.sum(axis=(1, 2)),
+        })
+        n_months = len(monthly_headcount)
+        last = headcount[-1] if n_months else np.zeros(headcount.shape[1:], dtype=np.int64)
+
+        by_country = pd.DataFrame({'country': self.countries[country_mask], 'headcount': last.sum(axis=1)})
+        by_team = pd.DataFrame({
+            'team': self.teams[team_mask],
+            'headcount': last.sum(axis=0),
+            'average_headcount': headcount.sum(axis=1).mean(axis=0) if n_months else 0.0,
+        })
+        by_country = by_country[by_country['country'].notna() & (by_country['headcount'] > 0)].reset_index(drop=True)
+        by_team = by_team[by_team['team'].notna() & ((by_team['headcount'] > 0) | (by_team['average_headcount'] > 0))]
+        return {
+            'monthly': monthly,
+            'end_headcount': int(monthly_headcount[-1]) if n_months else 0,
+            'average_headcount': float(monthly_headcount.mean()) if n_months else 0.0,
+            'by_country': by_country,
+            'by_team': by_team.reset_index(drop=True),
+        }
@@ -0,0 +1,142 @@
+"""
+RAW_Revenue / RAW_Expense 증분 수집
+
+두 탭은 거래가 발생할 때마다 행이 추가되는 append-only 탭입니다 (SCHEMA_DESIGN.md).
+이전에 읽은 CSV 원문의 길이와 해시, 마지막 ID(워터마크)를 기억해 두었다가
+원문 앞부분이 그대로이면 뒤에 추가된 바이트만 파싱해 기존 DataFrame에 이어 붙입니다.
+앞부분이 바뀌었으면(과거 행 수정/삭제) 전체를 다시 로드합니다.
+"""
+
+import hashlib
+import io
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+
+from cfo.data_sources import DataSource, parse_tab, read_tab_csv
+from cfo.schema import concat_typed
+
+# 증분 수집 대상 탭 → 행 ID 컬럼
+INCREMENTAL_ID_COLUMNS = {
+    'revenue': 'transaction_id',
+    'expense': 'expense_id',
+}
+
+
+def _digest(body):
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+@dataclass
+class TabWatermark:
+    """
+    탭별 증분 수집 상태
+    """
+
+    frame: pd.DataFrame
+    header: bytes
+    byte_length: int
+    prefix_digest: bytes
+    row_count: int
+    last_id: object
+    report: object = None
+
+
+class IncrementalSource(DataSource):
+    """
+    다른 데이터 소스를 감싸 RAW_Revenue / RAW_Expense 를 증분 수집하는 소스
+
+    load_all_tabs(IncrementalSource(source)) 처럼 그대로 끼워 쓸 수 있으며,
+    나머지 탭과 원문을 제공하지 않는 소스(더미 데이터)는 원래 소스로 위임합니다.
+    새로고침 비용(파싱)은 전체 원장 크기가 아니라 새로 추가된 행 수에 비례합니다.
+    """
+
+    def __init__(self, source, id_columns=None):
+        self.source = source
+        self.name = f'{source.name}+incremental'
+        self.id_columns = dict(INCREMENTAL_ID_COLUMNS if id_columns is None else id_columns)
+        self.watermarks = {}
+        # 탭별 마지막 새로고침 결과: {'mode': 'full'|'append'|'unchanged', 'rows_parsed': n, 'reason': ...}
+        self.last_refresh = {}
+        # 탭별 검증 리포트 (증분 수집 탭은 지금까지 읽은 전체 행 기준)
+        self.validation = {}
+        self._locks = {tab: threading.Lock() for tab in self.id_columns}
+
+    def available_tabs(self):
+        return self.source.available_tabs()
+
+    def fetch_raw(self, tab, timeout=None):
+        return self.source.fetch_raw(tab, timeout=timeout)
+
+    def fetch_tab(self, tab, timeout=None):
+        if tab not in self.id_columns or not self.source.supports_raw:
+            frame = self.source.fetch_tab(tab, timeout=timeout)
+            report = getattr(self.source, 'validation', {}).get(tab)
+            if report is not None:
+                self.validation[tab] = report
+            return frame
+        with self._locks[tab]:
+            return self._refresh(tab, self.source.fetch_raw(tab, timeout=timeout))
+
+    def reset(self, tab=None):
+        """
+        워터마크 초기화 (다음 새로고침은 전체 로드)
+        """
+        for key in [tab] if tab else list(self.watermarks):
+            self.watermarks.pop(key, None)
+
+    def _refresh(self, tab, body):
+        mark = self.watermarks.get(tab)
+        if mark is None:
+            return self._full_load(tab, body, 'initial')
+
+        # 이전 원문이 그대로 앞부분에 남아 있어야 append-only
+        if len(body) < mark.byte_length or _digest(body[:mark.byte_length]) != mark.prefix_digest:
+            return self._full_load(tab, body, 'edited')
+
+        if len(body) == mark.byte_length:
+            self.last_refresh[tab] = {'mode': 'unchanged', 'rows_parsed': 0, 'reason': None}
+            return mark.frame
+
+        tail = body[mark.byte_length:]
+        # 이전 원문의 마지막 행이 개행 없이 끝났다면 그 행이 이어서 수정됐을 수 있음
+        if not (body[:mark.byte_length].endswith(b'\n') or tail.startswith((b'\n', b'\r\n'))):
+            return self._full_load(tab, body, 'edited')
+
+        # 줄 번호는 이전에 읽은 행 다음부터 (헤더 1줄 + 이전 행 수)
+        new_rows, report = parse_tab(tab, read_tab_csv(
+            tab, io.BytesIO(mark.header + b'\n' + tail.lstrip(b'\r\n'))
+        ), first_row=mark.row_count + 2)
+
+        # 새 행이 이전 워터마크 ID를 다시 포함하면 행 경계가 어긋난 것으로 보고 전체 로드
+        id_column = self.id_columns[tab]
+        if id_column in new_rows.columns and (new_rows[id_column] == mark.last_id).any():
+            return self._full_load(tab, body, 'watermark')
+
+        frame = concat_typed([mark.frame, new_rows], tab=tab)
+        self._remember(tab, frame, body, mark.report.merge(report), mark.row_count + report.rows)
+        self.last_refresh[tab] = {'mode': 'append', 'rows_parsed': report.rows, 'reason': None}
+        return frame
+
+    def _full_load(self, tab, body, reason):
+        frame, report = parse_tab(tab, read_tab_csv(tab, io.BytesIO(body)))
+        self._remember(tab, frame, body, report, report.rows)
+        self.last_refresh[tab] = {'mode': 'full', 'rows_parsed': report.rows, 'reason': reason}
+        return frame
+
+    def _remember(self, tab, frame, body, report, row_count):
+        """
+        row_count: 원문 행 수 (격리된 행 포함, 다음 증분의 줄 번호 기준)
+        """
+        id_column = self.id_columns[tab]
+        self.watermarks[tab] = TabWatermark(
+            frame=frame,
+            header=body.split(b'\n', 1)[0].rstrip(b'\r'),
+            byte_length=len(body),
+            prefix_digest=_digest(body),
+            row_count=row_count,
+            last_id=frame[id_column].iloc[-1] if len(frame) and id_column in frame.columns else None,
+            report=report,
+        )
+        self.validation[tab] = report
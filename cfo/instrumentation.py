@@ -0,0 +1,182 @@
+"""
+섹션별 지연 시간 계측
+
+대시보드 스크립트 한 번 실행(run) 동안 섹션 경계마다 begin(섹션) 을 호출하면
+이전 섹션이 끝난 것으로 보고 소요 시간(계산 + 차트 직렬화 포함), 결과 캐시 적중/미스, 대상 행 수를 기록합니다.
+프로세스 전체의 최근 기록으로 섹션별 p50/p95 를 집계하고,
+실행마다 JSON 한 줄 로그를, summary_every 회마다 p50/p95 집계 로그를 남깁니다.
+
+로그 예 (logger 'cfo.instrumentation'):
+    {"event": "run", "run_ms": 412.3, "sections": {"kpi": {"ms": 12.1, "cache": "hit", "rows": 500}, ...}}
+    {"event": "summary", "runs": 50, "sections": {"kpi": {"count": 50, "p50_ms": 3.2, "p95_ms": 15.8}, ...}}
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('cfo.instrumentation')
+
+
+class LatencyStats:
+    """
+    섹션별 최근 소요 시간(ms) 저장소 (프로세스 전체, 세션 간 공유)
+    window: 섹션별로 유지하는 최근 기록 수
+    """
+
+    def __init__(self, window=500, summary_every=50):
+        self.window = window
+        self.summary_every = summary_every
+        self.runs = 0
+        self._samples = {}
+        self._cache = {}  # 섹션 → [적중, 미스]
+        self._lock = threading.Lock()
+
+    def record_run(self, sections):
+        """
+        실행 한 번의 섹션 기록 추가, summary_every 회마다 집계 로그 출력
+        """
+        with self._lock:
+            self.runs += 1
+            for name, record in sections.items():
+                self._samples.setdefault(name, deque(maxlen=self.window)).append(record['ms'])
+                counts = self._cache.setdefault(name, [0, 0])
+                counts[0] += record['hits']
+                counts[1] += record['misses']
+            emit_summary = self.summary_every and self.runs % self.summary_every == 0
+        if emit_summary:
+            _log({'event': 'summary', 'runs': self.runs, 'sections': self.summary_dict()})
+
+    def summary_dict(self):
+        with self._lock:
+            samples = {name: np.array(values) for name, values in self._samples.items()}
+            cache = {name: list(counts) for name, counts in self._cache.items()}
+        return {
+            name: {
+                'count': len(values),
+                'p50_ms': round(float(np.percentile(values, 50)), 2),
+                'p95_ms': round(float(np.percentile(values, 95)), 2),
+                'last_ms': round(float(values[-1]), 2),
+                'cache_hits': cache[name][0],
+                'cache_misses': cache[name][1],
+            }
+            for name, values in samples.items() if len(values)
+        }
+
+    def summary(self):
+        """
+        섹션별 집계 DataFrame (section, count, p50_ms, p95_ms, last_ms, cache_hits, cache_misses)
+        """
+        rows = [{'section': name, **values} for name, values in self.summary_dict().items()]
+        return pd.DataFrame(rows, columns=['section', 'count', 'p50_ms', 'p95_ms', 'last_ms', 'cache_hits', 'cache_misses'])
+
+
+class RunRecorder:
+    """
+    스크립트 실행 한 번의 섹션 계측기
+
+    begin(name) 으로 섹션을 시작하면 이전 섹션은 자동으로 끝남, finish() 로 마지막 섹션을 닫고 기록
+    finish() 이후 begin() 을 호출하면 새 실행으로 시작 (fragment 단독 재실행)
+    enabled=False 이면 모든 호출이 아무 일도 하지 않음
+    """
+
+    def __init__(self, stats=None, enabled=True):
+        self.stats = stats
+        self.enabled = enabled
+        self.finished = False
+        self.sections = {}
+        self._current = None
+        self._started = time.perf_counter()
+        self._section_started = None
+
+    def begin(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.finished:
+            self.finished = False
+            self.sections = {}
+            self._started = now
+        self._close(now)
+        self._current = self.sections.setdefault(name, {'ms': 0.0, 'hits': 0, 'misses': 0, 'rows': 0})
+        self._section_started = now
+
+    def add(self, hit=None, rows=0):
+        """
+        현재 섹션에 결과 캐시 적중/미스(hit=True/False)와 대상 행 수 추가
+        """
+        if not self.enabled or self._current is None:
+            return
+        if hit is True:
+            self._current['hits'] += 1
+        elif hit is False:
+            self._current['misses'] += 1
+        self._current['rows'] += int(rows)
+
+    def _close(self, now):
+        if self._current is not None:
+            self._current['ms'] += (now - self._section_started) * 1e3
+            self._current = None
+
+    def finish(self):
+        """
+        마지막 섹션을 닫고 실행 로그 출력 + 공유 통계에 반영, 섹션 기록 반환
+        """
+        if not self.enabled or self.finished:
+            return {}
+        now = time.perf_counter()
+        self._close(now)
+        self.finished = True
+        run_ms = (now - self._started) * 1e3
+        _log({
+            'event': 'run',
+            'run_ms': round(run_ms, 2),
+            'sections': {
+                name: {'ms': round(r['ms'], 2), 'cache': _cache_label(r), 'rows': r['rows']}
+                for name, r in self.sections.items()
+            },
+        })
+        if self.stats is not None:
+            self.stats.record_run(self.sections)
+        return self.sections
+
+    def frame(self):
+        """
+        이번 실행의 섹션 기록 DataFrame (section, ms, cache, rows)
+        """
+        return pd.DataFrame(
+            [{'section': name, 'ms': r['ms'], 'cache': _cache_label(r), 'rows': r['rows']} for name, r in self.sections.items()],
+            columns=['section', 'ms', 'cache', 'rows'],
+        )
+
+
+def configure_logging(level=logging.INFO):
+    """
+    계측 로그를 표준 에러로 출력 (핸들러가 이미 있으면 그대로 사용)
+    """
+    logger.setLevel(level)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+
+
+def _cache_label(record):
+    if record['hits'] and record['misses']:
+        return 'mixed'
+    if record['hits']:
+        return 'hit'
+    if record['misses']:
+        return 'miss'
+    return '-'
+
+
+def _log(payload):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(payload, ensure_ascii=False))
@@ -0,0 +1,322 @@
+"""
+동시 세션 부하 테스트
+
+Streamlit AppTest 로 dashboard.py 를 브라우저 없이 실행하며, 세션 N 개가 동시에 사이드바 필터를 바꾸는
+상황을 재현합니다. 모든 세션이 한 프로세스에서 돌기 때문에 실제 서버 한 대처럼 cache_resource
+(데이터 저장소, 결과/차트 캐시)를 공유합니다.
+
+측정:
+    cold_start      서버 첫 실행 (데이터 로드 + 큐브/인덱스 생성 포함)
+    first_run       세션 접속 후 첫 화면 (세션은 한 명씩 접속)
+    rerun           필터 변경 후 다시 실행 — 동작별/전체 p50/p95/p99, 처리량(rerun/초)
+    per_session_mb  세션 접속 전후 프로세스 RSS 증가량 / 세션 수
+
+세션 동작 (가중치): 기간 변경, 국가 선택, 팀 선택, 추이 단위(일/주/월), 필터 초기화
+
+예시:
+    python -m cfo.loadtest --sessions 8 --actions 20 --rows 100k
+    python -m cfo.loadtest --sessions 1,4,16 --rows 1m -o base.json
+    python -m cfo.loadtest --sessions 1,4,16 --rows 1m --compare base.json --threshold 1.25
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from cfo.benchmark import _git_commit, parse_size
+
+RESULT_FORMAT_VERSION = 1
+
+DEFAULT_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dashboard.py')
+
+# 세션 동작과 선택 가중치
+ACTIONS = ['date_range', 'countries', 'teams', 'granularity', 'reset']
+ACTION_WEIGHTS = [0.4, 0.2, 0.2, 0.1, 0.1]
+
+PERCENTILES = [50, 95, 99]
+
+# 기간 변경 시 최소 기간 (일)
+MIN_RANGE_DAYS = 30
+
+
+def _rss_bytes():
+    """
+    현재 프로세스 RSS (Linux /proc, 없으면 최대 RSS)
+    """
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 는 바이트, Linux 는 KB
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def latency_summary(seconds):
+    """
+    실행 시간 목록(초) → count, mean/max, p50/p95/p99 (ms)
+    """
+    values = np.asarray(seconds, dtype=float) * 1e3
+    if len(values) == 0:
+        return {'count': 0, 'mean_ms': None, 'max_ms': None, **{f'p{p}_ms': None for p in PERCENTILES}}
+    summary = {'count': int(len(values)), 'mean_ms': float(values.mean()), 'max_ms': float(values.max())}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f'p{p}_ms'] = float(value)
+    return summary
+
+
+class Session:
+    """
+    대시보드 세션 하나 (AppTest), seed 로 동작 순서를 재현 가능하게 선택
+    """
+
+    def __init__(self, session_id, script, timeout, seed):
+        from streamlit.testing.v1 import AppTest
+
+        self.session_id = session_id
+        self.app = AppTest.from_file(script, default_timeout=timeout)
+        self.rng = random.Random(seed)
+        self.records = []
+
+    def _run(self, action):
+        started = time.perf_counter()
+        self.app.run()
+        seconds = time.perf_counter() - started
+        # 스크립트 예외이거나 KPI 카드가 하나도 없으면 실패로 기록
+        ok = not self.app.exception and len(self.app.metric) > 0
+        self.records.append({'session': self.session_id, 'action': action, 'seconds': seconds, 'ok': ok})
+        return seconds
+
+    def start(self):
+        return self._run('first_run')
+
+    def _granularity(self):
+        return [w for w in self.app.get('button_group') if w.key == 'granularity'][0]
+
+    def act(self, action):
+        """
+        사이드바 위젯 값을 바꾸고 다시 실행
+        """
+        sidebar = self.app.sidebar
+        if action == 'date_range':
+            date_input = sidebar.date_input[0]
+            lo, hi = date_input.min, date_input.max
+            span = (hi - lo).days
+            start = lo + datetime.timedelta(days=self.rng.randint(0, max(span - MIN_RANGE_DAYS, 0)))
+            end = start + datetime.timedelta(days=self.rng.randint(min(MIN_RANGE_DAYS, span), max((hi - start).days, 0)))
+            date_input.set_value((start, min(end, hi)))
+        elif action in ('countries', 'teams'):
+            widget = sidebar.multiselect[0 if action == 'countries' else 1]
+            options = list(widget.options)
+            widget.set_value(self.rng.sample(options, self.rng.randint(1, len(options))))
+        elif action == 'granularity':
+            self._granularity().set_value(self.rng.choice(['D', 'W', 'M']))
+        elif action == 'reset':
+            date_input = sidebar.date_input[0]
+            date_input.set_value((date_input.min, date_input.max))
+            for widget in sidebar.multiselect:
+                widget.set_value(list(widget.options))
+            self._granularity().set_value('M')
+        else:
+            raise ValueError(f'알 수 없는 동작: {action}')
+        return self._run(action)
+
+    def play(self, n_actions, think_time=0.0):
+        for _ in range(n_actions):
+            self.act(self.rng.choices(ACTIONS, weights=ACTION_WEIGHTS)[0])
+            if think_time > 0:
+                time.sleep(self.rng.uniform(0, 2 * think_time))
+
+
+def configure_environment(rows, open_sections=None):
+    """
+    부하 테스트용 환경 변수 (대시보드는 실행마다 환경 변수를 읽음)
+    합성 원장 규모, 디스크 스냅샷/주기 새로고침 끄기 (측정 중 데이터가 바뀌지 않도록)
+    """
+    os.environ['CFO_DATA_SOURCE'] = 'fake'
+    os.environ['CFO_FAKE_REVENUE_ROWS'] = str(rows)
+    os.environ['CFO_FAKE_EXPENSE_ROWS'] = str(rows)
+    os.environ['CFO_SNAPSHOT_DIR'] = ''
+    os.environ['CFO_DATA_TTL'] = '0'
+    if open_sections is not None:
+        os.environ['CFO_OPEN_SECTIONS'] = open_sections
+
+
+def run_load_test(session_counts, n_actions=20, rows=100_000, script=DEFAULT_SCRIPT, timeout=600,
+                  think_time=0.0, seed=0, open_sections=None, log=print):
+    """
+    세션 수별로 부하 테스트를 실행하고 결과 dict 반환
+    같은 프로세스에서 이어서 실행하므로 데이터/캐시는 첫 실행 이후 공유 (서버 한 대 기준)
+    """
+    configure_environment(rows, open_sections)
+
+    # 서버 첫 실행: 데이터 로드와 파생 구조 생성
+    started = time.perf_counter()
+    warmup = Session(-1, script, timeout, seed)
+    warmup.start()
+    cold_start = time.perf_counter() - started
+    if not warmup.records[-1]['ok']:
+        raise RuntimeError(f'대시보드 첫 실행 실패: {[e.value for e in warmup.app.exception]}')
+    log(f'[{rows:,} rows] 서버 첫 실행 {cold_start:.2f}초')
+    del warmup
+
+    # 동시에 처음 컴파일하면 Streamlit 스크립트 캐시가 깨질 수 있어 첫 실행은 한 세션씩
+    start_lock = threading.Lock()
+    results = []
+    for n_sessions in session_counts:
+        gc.collect()
+        rss_before = _rss_bytes()
+        sessions = []
+        for i in range(n_sessions):
+            session = Session(i, script, timeout, seed=seed * 100_003 + i)
+            with start_lock:
+                session.start()
+            sessions.append(session)
+        gc.collect()
+        per_session_mb = (_rss_bytes() - rss_before) / 1024 ** 2 / max(n_sessions, 1)
+
+        threads = [
+            threading.Thread(target=session.play, args=(n_actions, think_time), name=f'cfo-loadtest-{i}')
+            for i, session in enumerate(sessions)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        records = pd.DataFrame([record for session in sessions for record in session.records])
+        reruns = records[records['action'] != 'first_run']
+        row = {
+            'sessions': n_sessions,
+            'actions_per_session': n_actions,
+            'rows': rows,
+            'wall_seconds': wall,
+            'throughput_rps': len(reruns) / wall if wall > 0 else None,
+            'errors': int((~records['ok']).sum()),
+            'per_session_mb': per_session_mb,
+            'first_run': latency_summary(records.loc[records['action'] == 'first_run', 'seconds']),
+            'rerun': latency_summary(reruns['seconds']),
+            'by_action': {
+                action: latency_summary(group['seconds']) for action, group in reruns.groupby('action')
+            },
+        }
+        results.append(row)
+        rerun = row['rerun']
+        log(
+            f"  {n_sessions:3d} 세션: rerun p50 {rerun['p50_ms']:8.1f} ms  p95 {rerun['p95_ms']:8.1f} ms  "
+            f"p99 {rerun['p99_ms']:8.1f} ms  처리량 {row['throughput_rps']:6.2f} rerun/s  "
+            f"세션당 {per_session_mb:6.1f} MB  오류 {row['errors']}"
+        )
+        del sessions, threads
+        gc.collect()
+
+    return {
+        'format': RESULT_FORMAT_VERSION,
+        'meta': {
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'rows': rows,
+            'think_time': think_time,
+            'open_sections': os.environ.get('CFO_OPEN_SECTIONS'),
+        },
+        'cold_start_seconds': cold_start,
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=1.25):
+    """
+    같은 세션 수끼리 비교 → (비교 표 DataFrame, 회귀 행 DataFrame)
+    rerun p95 가 threshold 배 넘게 늘거나 처리량이 1/threshold 배 아래로 줄면 회귀
+    """
+    def frame(result):
+        return pd.DataFrame([
+            {'sessions': r['sessions'], 'p95_ms': r['rerun']['p95_ms'], 'throughput_rps': r['throughput_rps']}
+            for r in result['results']
+        ]).set_index('sessions')
+
+    table = frame(current).join(frame(baseline), how='inner', rsuffix='_baseline')
+    table['p95_ratio'] = table['p95_ms'] / table['p95_ms_baseline']
+    table['throughput_ratio'] = table['throughput_rps'] / table['throughput_rps_baseline']
+    regressions = table[(table['p95_ratio'] > threshold) | (table['throughput_ratio'] < 1 / threshold)]
+    return table.reset_index(), regressions.reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='CFO 대시보드 동시 세션 부하 테스트')
+    parser.add_argument('--sessions', default='1,4,8', help='동시 세션 수 목록 (예: 1,4,16)')
+    parser.add_argument('--actions', type=int, default=20, help='세션당 필터 변경 횟수')
+    parser.add_argument('--rows', default='100k', help='RAW_Revenue / RAW_Expense 합성 행 수 (예: 100k, 1m)')
+    parser.add_argument('--think-time', type=float, default=0.0, help='동작 사이 평균 대기 시간(초)')
+    parser.add_argument('--open-sections', help='펼쳐 둘 섹션 (CFO_OPEN_SECTIONS, 기본은 대시보드 기본값)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=600, help='실행 한 번의 제한 시간(초)')
+    parser.add_argument('--script', default=DEFAULT_SCRIPT, help='대시보드 스크립트 경로')
+    parser.add_argument('-o', '--output', help='결과 JSON 경로 (기본: .cache/loadtests/<시각>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=1.25, help='회귀로 볼 p95 / 처리량 배율')
+    args = parser.parse_args(argv)
+
+    session_counts = [int(s) for s in args.sessions.split(',') if s.strip()]
+    result = run_load_test(
+        session_counts,
+        n_actions=args.actions,
+        rows=parse_size(args.rows),
+        script=os.path.abspath(args.script),
+        timeout=args.timeout,
+        think_time=args.think_time,
+        seed=args.seed,
+        open_sections=args.open_sections,
+    )
+
+    output = args.output or os.path.join(
+        '.cache', 'loadtests', datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json'
+    )
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f'결과 저장: {output}')
+
+    errors = sum(r['errors'] for r in result['results'])
+    if errors:
+        print(f'⚠️ 실패한 실행 {errors}회')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        table, regressions = compare(result, baseline, args.threshold)
+        with pd.option_context('display.width', 120, 'display.float_format', '{:.2f}'.format):
+            print(table[['sessions', 'p95_ms_baseline', 'p95_ms', 'p95_ratio', 'throughput_ratio']].to_string(index=False))
+        if len(regressions):
+            print(f'\n⚠️ {len(regressions)}개 세션 수에서 {args.threshold:.2f}배 이상 느려짐:')
+            print(regressions[['sessions', 'p95_ratio', 'throughput_ratio']].to_string(index=False))
+            return 1
+        print('\n✅ 회귀 없음')
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
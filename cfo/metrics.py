@@ -0,0 +1,561 @@
+"""
+대시보드 섹션별 지표 계산
+
+각 섹션 함수는 (cube, data, filters) 만 받아 결과를 반환하는 순수 함수입니다.
+Streamlit 에 의존하지 않으며, 같은 입력에는 항상 같은 결과를 돌려주므로
+(섹션, 데이터 버전, 필터) 를 키로 결과를 캐시해 여러 세션이 공유할 수 있습니다.
+반환된 DataFrame 은 캐시에서 공유되므로 호출하는 쪽에서 수정하지 않습니다.
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from cfo.ar_aging import AR_COLUMNS, ArAging
+from cfo.budget import BudgetIndex
+from cfo.cube import MonthlyCube, monthly_sum, split_period, total_by
+from cfo.headcount import HeadcountTimeline
+from cfo.pl_store import PL_MONTHLY, pl_amounts, pl_monthly_rows
+from cfo.runway import DEFAULT_HORIZON, DEFAULT_PATHS, forecast_runway
+from cfo.sql_backend import SqlCube, SqlStore, load_result_cube
+
+# 정규화된 필터 (해시 가능 → 캐시 키로 사용)
+# start, end: 'YYYY-MM-DD' 또는 None(데이터 시작/끝), countries, teams: 정렬된 tuple 또는 None(전체)
+FilterSet = namedtuple('FilterSet', ['start', 'end', 'countries', 'teams'])
+
+ALL_FILTERS = FilterSet(None, None, None, None)
+
+
+def _normalize_selection(selected, options):
+    if not selected:
+        return None
+    selected = set(selected)
+    if options is not None and selected >= set(options):
+        return None
+    return tuple(sorted(selected))
+
+
+def normalize_filters(start=None, end=None, countries=None, teams=None,
+                      min_date=None, max_date=None, country_options=None, team_options=None):
+    """
+    사이드바 선택값 → FilterSet
+    데이터 범위 전체를 덮는 기간, 전체 선택한 국가/팀은 None 으로 바꿔서
+    '필터 없음'과 같은 키가 되도록 함 (기본 화면이 항상 같은 캐시 항목을 사용)
+    """
+    if start is not None:
+        start = pd.Timestamp(start).normalize()
+        if min_date is not None and start <= pd.Timestamp(min_date).normalize():
+            start = None
+    if end is not None:
+        end = pd.Timestamp(end).normalize()
+        if max_date is not None and end >= pd.Timestamp(max_date).normalize():
+            end = None
+    return FilterSet(
+        start=start.strftime('%Y-%m-%d') if start is not None else None,
+        end=end.strftime('%Y-%m-%d') if end is not None else None,
+        countries=_normalize_selection(countries, country_options),
+        teams=_normalize_selection(teams, team_options),
+    )
+
+
+def revenue_cells(cube, filters):
+    return cube.cells('revenue', filters.start, filters.end, countries=filters.countries, teams=filters.teams)
+
+
+def expense_cells(cube, filters):
+    # 팀 필터는 매출에만 적용 (비용에는 Admin 팀이 있음)
+    return cube.cells('expense', filters.start, filters.end, countries=filters.countries)
+
+
+def revenue_total(cube, filters):
+    return cube.total('revenue', filters.start, filters.end, countries=filters.countries, teams=filters.teams)
+
+
+def expense_total(cube, filters):
+    return cube.total('expense', filters.start, filters.end, countries=filters.countries)
+
+
+def _pipeline_total(cube, **options):
+    """
+    파이프라인 amount_krw 합계 (cube.aggregate 옵션: weight, where)
+    """
+    return float(cube.aggregate('pipeline', 'amount_krw', **options)['amount_krw'].iloc[0])
+
+
+def _headcount(cube, data, filters):
+    """
+    필터 기간/국가/팀의 시점별 인원 (큐브당 한 번 만든 (월 × 국가 × 팀) 배열을 잘라서 계산)
+    """
+    timeline = cube.derive('headcount_timeline', lambda: HeadcountTimeline(data.get('headcount'), cube))
+    return timeline.summary(filters.start, filters.end, countries=filters.countries, teams=filters.teams)
+
+
+# ================================
+# 섹션 함수
+# ================================
+
+def kpi_summary(cube, data, filters):
+    """
+    상단 KPI 카드: 총 매출/비용, 순이익/마진, 최신 현금 잔고, 인원/인당 매출
+    인원은 기간 마지막 달 월말 인원, 인당 매출은 기간 매출 / 기간 평균 인원
+    """
+    total_revenue = revenue_total(cube, filters)
+    total_expense = expense_total(cube, filters)
+    net_profit = total_revenue - total_expense
+    latest_cash_date, latest = cube.latest_cash()
+    headcount = _headcount(cube, data, filters)
+    average_headcount = headcount['average_headcount']
+    return {
+        'total_revenue': total_revenue,
+        'total_expense': total_expense,
+        'net_profit': net_profit,
+        'profit_margin': net_profit / total_revenue * 100 if total_revenue > 0 else 0,
+        'latest_cash': float(latest['balance_krw'].sum()),
+        'latest_cash_date': latest_cash_date,
+        'total_headcount': headcount['end_headcount'],
+        'average_headcount': average_headcount,
+        'per_capita_revenue': total_revenue / average_headcount if average_headcount > 0 else 0,
+    }
+
+
+def cash_runway(cube, data, filters):
+    """
+    월별 Cash Flow (매출/비용/순 Cash Flow) 와 Runway = 최신 현금 / 월평균 비용
+    """
+    revenue_monthly = monthly_sum(revenue_cells(cube, filters))
+    expense_monthly = monthly_sum(expense_cells(cube, filters))
+
+    cashflow_monthly = pd.merge(revenue_monthly, expense_monthly, on='year_month', how='outer', suffixes=('_rev', '_exp'))
+    cashflow_monthly = cashflow_monthly.fillna(0)
+    cashflow_monthly['net_cashflow'] = cashflow_monthly['amount_krw_rev'] - cashflow_monthly['amount_krw_exp']
+
+    _, latest = cube.latest_cash()
+    latest_cash = float(latest['balance_krw'].sum())
+    avg_monthly_expense = float(expense_monthly['amount_krw'].mean()) if len(expense_monthly) else 0.0
+    return {
+        'cashflow_monthly': cashflow_monthly,
+        'latest_cash': latest_cash,
+        'avg_monthly_expense': avg_monthly_expense,
+        'runway_months': latest_cash / avg_monthly_expense if avg_monthly_expense > 0 else 0,
+    }
+
+
+def runway_forecast(cube, data, filters, n_paths=DEFAULT_PATHS, horizon=DEFAULT_HORIZON, seed=0, workers=1):
+    """
+    Monte Carlo Runway — 최신 현금에서 시작해 월별 비용(과거 월 비용 복원 추출)과
+    파이프라인 딜(Stage 확률로 성사)을 반영한 현금 경로의 Runway P10/P50/P90 와 월별 현금 분위수
+    시뮬레이션은 최신 현금 기준일의 다음 달부터 시작
+    """
+    latest_date, latest = cube.latest_cash()
+    burn_history = monthly_sum(expense_cells(cube, filters))['amount_krw'].to_numpy(dtype=float)
+    start_month = (pd.Timestamp(latest_date).to_period('M') + 1).to_timestamp()
+    return forecast_runway(
+        float(latest['balance_krw'].sum()), burn_history, data.get('pipeline'), start_month,
+        n_paths=n_paths, horizon=horizon, seed=seed, workers=workers,
+    )
+
+
+def revenue_analysis(cube, data, filters):
+    """
+    매출 추이/국가별/팀별 집계
+    """
+    cells = revenue_cells(cube, filters)
+    return {
+        'by_country_monthly': monthly_sum(cells, by=['country']),
+        'by_country': total_by(cells, 'country'),
+        'by_team': total_by(cells, 'team'),
+        'by_team_monthly': monthly_sum(cells, by=['team']),
+    }
+
+
+def expense_analysis(cube, data, filters):
+    """
+    비용 카테고리별 합계(큰 순)와 월별 추이
+    """
+    cells = expense_cells(cube, filters)
+    return {
+        'by_category': total_by(cells, 'category_l1').sort_values('amount_krw', ascending=False),
+        'by_category_monthly': monthly_sum(cells, by=['category_l1']),
+    }
+
+
+def pl_summary(cube, data, filters):
+    """
+    월별 손익: 매출, COGS, 매출총이익(률), OpEx, 순이익(률)
+    기간에 완전히 포함된 달은 PL_Monthly 표(큐브당 한 번, 저장소가 있으면 마감한 달은 고정 값)를,
+    걸친 달만 큐브 셀에서 계산하므로 회사 이력 길이와 무관하게 표를 합산하는 비용만 듦
+    """
+    table = cube.derive(PL_MONTHLY, lambda: pl_monthly_rows(cube))
+    parts = []
+    if cube.min_date is not None:
+        start = pd.Timestamp(filters.start) if filters.start is not None else cube.min_date
+        end = pd.Timestamp(filters.end) if filters.end is not None else cube.max_date
+        if start <= end:
+            full_months, edges = split_period(start, end, cube.min_date, cube.max_date)
+            if full_months is not None:
+                first_full, last_full = full_months
+                in_range = (table['year_month'] >= first_full) & (table['year_month'] <= last_full)
+                parts.append(table[in_range.to_numpy()])
+            if edges:
+                # 걸친 달은 국가 필터를 먼저 걸어 셀을 줄이고 한 번에 계산
+                edge_cells = [
+                    pd.concat([cube.cells(kind, s, e, countries=filters.countries) for s, e in edges], ignore_index=True)
+                    for kind in ('revenue', 'expense')
+                ]
+                parts.append(pl_amounts(*edge_cells))
+    rows = pd.concat(parts, ignore_index=True) if parts else table.iloc[0:0]
+
+    # 팀 필터는 매출에만 적용 (비용에는 Admin 팀이 있음)
+    in_country = rows['country'].isin(filters.countries).to_numpy() if filters.countries else np.ones(len(rows), dtype=bool)
+    in_team = rows['team'].isin(filters.teams).to_numpy() if filters.teams else np.ones(len(rows), dtype=bool)
+    revenue = rows[in_country & in_team].groupby('year_month', sort=True)[['revenue_krw', 'revenue_count']].sum()
+    expense = rows[in_country].groupby('year_month', sort=True)[['cogs_krw', 'operating_expense_krw']].sum()
+
+    # 매출이 있는 달만 표시
+    pl = revenue[revenue['revenue_count'] > 0].join(expense, how='left').fillna(0).reset_index()
+    pl = pl.rename(columns={'revenue_krw': 'revenue', 'cogs_krw': 'cogs', 'operating_expense_krw': 'opex'})
+
+    pl['gross_profit'] = pl['revenue'] - pl['cogs']
+    pl['gross_margin_pct'] = (pl['gross_profit'] / pl['revenue'] * 100).round(1)
+    pl['net_profit'] = pl['revenue'] - pl['cogs'] - pl['opex']
+    pl['net_margin_pct'] = (pl['net_profit'] / pl['revenue'] * 100).round(1)
+    return pl[['year_month', 'revenue', 'cogs', 'gross_profit', 'gross_margin_pct', 'opex', 'net_profit', 'net_margin_pct']]
+
+
+def budget_variance(cube, data, filters):
+    """
+    예산 대비 실적: 합계/월별(YTD 누적 차이 포함)/팀별 차이와 달성률, 팀 × 월 매출 달성률 히트맵
+    (월 × 국가 × 팀) 예산/실적 배열은 큐브당 한 번 만들고 필터는 배열을 잘라서 계산
+    """
+    index = cube.derive('budget_index', lambda: BudgetIndex(data.get('budget'), cube))
+    return index.variance(filters.start, filters.end, countries=filters.countries, teams=filters.teams)
+
+
+def pipeline_summary(cube, data, filters):
+    """
+    파이프라인 총액/가중 총액/계약 완료와 Stage별/팀별 합계 (필터와 무관)
+    """
+    by_stage = cube.aggregate('pipeline', 'amount_krw', by=['stage'])
+    return {
+        'total_value': _pipeline_total(cube),
+        'weighted_value': _pipeline_total(cube, weight='probability') / 100,
+        'closed_won': _pipeline_total(cube, where={'stage': 'Closed Won'}),
+        'by_stage': by_stage.sort_values('amount_krw', ascending=True),
+        'by_team': cube.aggregate('pipeline', 'amount_krw', by=['team']),
+    }
+
+
+def productivity(cube, data, filters):
+    """
+    국가별/팀별 인원(기간 마지막 달 월말), 팀별 인당 매출(기간 매출 / 기간 평균 인원), 월별 인원/인건비/인당 매출
+    """
+    headcount = _headcount(cube, data, filters)
+    hc_by_team = headcount['by_team']
+
+    team_revenue = total_by(revenue_cells(cube, filters), 'team')
+    team_revenue.columns = ['team', 'revenue']
+    team_revenue['team'] = team_revenue['team'].astype(object)
+    team_productivity = team_revenue.merge(hc_by_team, on='team', how='left')
+    team_productivity['per_capita_revenue'] = (
+        team_productivity['revenue'] / team_productivity['average_headcount'].where(team_productivity['average_headcount'] > 0)
+    )
+
+    monthly = headcount['monthly'].merge(monthly_sum(revenue_cells(cube, filters)), on='year_month', how='left')
+    monthly = monthly.rename(columns={'amount_krw': 'revenue'}).fillna({'revenue': 0.0})
+    monthly['per_capita_revenue'] = monthly['revenue'] / monthly['headcount'].where(monthly['headcount'] > 0)
+    return {
+        'hc_by_country': headcount['by_country'],
+        'hc_by_team': hc_by_team[['team', 'headcount']],
+        'team_productivity': team_productivity.sort_values('per_capita_revenue', ascending=False),
+        'monthly': monthly,
+    }
+
+
+def ar_summary(cube, data, filters):
+    """
+    미수금 (Pending + Overdue) — 기간/국가/팀 필터와 무관하게 전체 기준
+    """
+    ar_cells = cube.monthly['revenue']
+    ar_data = ar_cells[ar_cells['payment_status'].isin(['Pending', 'Overdue']).values]
+    overdue = ar_data[(ar_data['payment_status'] == 'Overdue').values]
+    pending = ar_data[(ar_data['payment_status'] == 'Pending').values]
+    return {
+        'has_ar': bool(ar_data['count'].sum() > 0),
+        'total': float(ar_data['amount_krw'].sum()),
+        'overdue': float(overdue['amount_krw'].sum()),
+        'pending': float(pending['amount_krw'].sum()),
+        'by_status': total_by(ar_data, 'payment_status'),
+    }
+
+
+def ar_aging(cube, data, filters):
+    """
+    미수금 연령 분석 — 사이드바 기간/국가/팀 필터 적용, 기준일은 종료일
+    Current/1-30/31-60/61-90/90+ 구간, 고객/국가/팀별 구간 금액, DSO, 월별 미수금/DSO/회수율 추이
+    """
+    # 청구 건 단위 계산이라 필요한 컬럼만 한 번 읽어서 인덱스를 만듦 (SQL 큐브도 같음)
+    aging = cube.derive('ar_aging', lambda: ArAging(cube.revenue_rows(AR_COLUMNS)))
+    return aging.aging(filters.start, filters.end, countries=filters.countries, teams=filters.teams)
+
+
+def cash_distribution(cube, data, filters):
+    """
+    최신 기준일의 국가별 현금 잔고
+    """
+    _, latest = cube.latest_cash()
+    return latest.groupby('country', observed=True)['balance_krw'].sum().reset_index()
+
+
+def critical_alerts(cube, data, filters):
+    """
+    Critical Alerts: Runway 6/12개월 미만, 만기 지난 미수금 > 매출의 10%, 적자
+    반환: [{'severity', 'category', 'message'}, ...]
+    """
+    kpi = kpi_summary(cube, data, filters)
+    runway_months = cash_runway(cube, data, filters)['runway_months']
+    ar = ar_aging(cube, data, filters)
+    alerts = []
+
+    # Runway 체크
+    if runway_months < 6:
+        alerts.append({
+            'severity': '🔴 Critical',
+            'category': 'Cash',
+            'message': f'Runway가 {runway_months:.1f}개월로 6개월 미만입니다. 긴급 자금 확보 필요!'
+        })
+    elif runway_months < 12:
+        alerts.append({
+            'severity': '🟡 Warning',
+            'category': 'Cash',
+            'message': f'Runway가 {runway_months:.1f}개월입니다. 자금 계획 검토 권장.'
+        })
+
+    # 미수금 체크
+    if ar['has_ar']:
+        total_revenue = kpi['total_revenue']
+        ar_past_due_pct = ar['past_due'] / total_revenue * 100 if total_revenue > 0 else 0
+        if ar_past_due_pct > 10:
+            alerts.append({
+                'severity': '🔴 Critical',
+                'category': 'AR',
+                'message': f'만기 지난 미수금이 매출의 {ar_past_due_pct:.1f}%입니다. 회수 조치 필요!'
+            })
+
+    # 손익 체크
+    if kpi['net_profit'] < 0:
+        alerts.append({
+            'severity': '🔴 Critical',
+            'category': 'P&L',
+            'message': f'선택 기간 동안 순이익이 -₩{abs(kpi["net_profit"])/1e8:.1f}억으로 적자입니다.'
+        })
+    return alerts
+
+
+def trends(cube, filters, freq):
+    """
+    일/주/월(freq: 'D' | 'W' | 'M') 단위 추이 — 일별 누적합 인덱스에서 구간 차이로 계산
+    반환: by_country, by_team (매출), by_category (비용), cashflow (매출/비용/순 Cash Flow), x 컬럼은 period
+    """
+    revenue = cube.index['revenue']
+    expense = cube.index['expense']
+    revenue_selection = dict(country=filters.countries, team=filters.teams)
+    expense_selection = dict(country=filters.countries)
+
+    cashflow = pd.merge(
+        revenue.series(filters.start, filters.end, freq, **revenue_selection),
+        expense.series(filters.start, filters.end, freq, **expense_selection),
+        on='period', how='outer', suffixes=('_rev', '_exp'),
+    ).fillna(0)
+    cashflow['net_cashflow'] = cashflow['amount_krw_rev'] - cashflow['amount_krw_exp']
+    return {
+        'by_country': revenue.series(filters.start, filters.end, freq, by='country', **revenue_selection),
+        'by_team': revenue.series(filters.start, filters.end, freq, by='team', **revenue_selection),
+        'by_category': expense.series(filters.start, filters.end, freq, by='category_l1', **expense_selection),
+        'cashflow': cashflow,
+    }
+
+
+# 섹션 이름 → (함수, 필터 사용 여부)
+# 필터를 쓰지 않는 섹션은 캐시 키에서 필터를 빼서 모든 필터 조합이 한 항목을 공유
+SECTIONS = {
+    'kpi': (kpi_summary, True),
+    'cash_runway': (cash_runway, True),
+    'revenue': (revenue_analysis, True),
+    'expense': (expense_analysis, True),
+    'pl': (pl_summary, True),
+    'budget': (budget_variance, True),
+    'pipeline': (pipeline_summary, False),
+    'productivity': (productivity, True),
+    'ar': (ar_summary, False),
+    'ar_aging': (ar_aging, True),
+    'cash_distribution': (cash_distribution, False),
+    'alerts': (critical_alerts, True),
+}
+
+
+def section_key(name, data_version, filters):
+    """
+    섹션 결과 캐시 키: (섹션, 데이터 버전, 정규화된 필터)
+    """
+    _, uses_filters = SECTIONS[name]
+    return (name, data_version, filters if uses_filters else ALL_FILTERS)
+
+
+def compute_section(name, cube, data, filters, cache=None, data_version=None):
+    """
+    섹션 결과 계산 (cache 가 있으면 캐시 조회 후 없을 때만 계산)
+    """
+    function, _ = SECTIONS[name]
+    if cache is None:
+        return function(cube, data, filters)
+    return cache.get_or_compute(section_key(name, data_version, filters), lambda: function(cube, data, filters))
+
+
+def compute_trends(cube, filters, freq, cache=None, data_version=None):
+    """
+    추이 계산 (cache 가 있으면 ('trends', 집계 단위, 데이터 버전, 필터) 키로 캐시)
+    """
+    if cache is None:
+        return trends(cube, filters, freq)
+    return cache.get_or_compute(('trends', freq, data_version, filters), lambda: trends(cube, filters, freq))
+
+
+def compute_runway_forecast(cube, data, filters, n_paths=DEFAULT_PATHS, horizon=DEFAULT_HORIZON, workers=1,
+                            cache=None, data_version=None):
+    """
+    Monte Carlo Runway (cache 가 있으면 ('runway_forecast', 경로 수, 예측 기간, 데이터 버전, 필터) 키로 캐시)
+    워커 수는 결과에 영향이 없으므로 키에 넣지 않음
+    """
+    def compute():
+        return runway_forecast(cube, data, filters, n_paths=n_paths, horizon=horizon, workers=workers)
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(('runway_forecast', n_paths, horizon, data_version, filters), compute)
+
+
+# ================================
+# 헤드리스 지표 엔진
+# ================================
+
+class MetricsEngine:
+    """
+    Streamlit 없이 대시보드 지표를 계산하는 엔진
+
+    data: 탭 dict (load_all_tabs / load_snapshot 결과), cube 를 주지 않으면 새로 만듦
+    cache: ResultCache (선택) — 있으면 섹션 결과를 (섹션, data_version, 필터) 키로 캐시
+    """
+
+    def __init__(self, data, cube=None, data_version=None, cache=None):
+        self.data = data
+        self.cube = cube if cube is not None else MonthlyCube(data['revenue'], data['expense'], tabs=data)
+        self.data_version = data_version
+        self.cache = cache
+
+    @classmethod
+    def from_load_result(cls, result, cache=None, backend='memory', sql_dir=None):
+        """
+        LoadResult 로부터 생성 (대시보드와 같은 집계 큐브를 공유)
+        backend: 'memory' | 'sqlite' | 'duckdb' (cfo/sql_backend.py, 결과는 같음)
+        """
+        cube = load_result_cube(result, backend, sql_dir)
+        return cls(result.data, cube=cube, data_version=result.data_version, cache=cache)
+
+    @classmethod
+    def from_sql(cls, path, engine='sqlite', cache=None):
+        """
+        이미 저장된 DB 파일로부터 생성 — 매출/비용 원장은 DataFrame 으로 읽지 않고 쿼리로만 집계
+        """
+        store = SqlStore(path, engine)
+        data = store.tabs(exclude=('revenue', 'expense'))
+        return cls(data, cube=SqlCube(store), data_version=os.path.basename(path), cache=cache)
+
+    @property
+    def country_options(self):
+        return list(self.cube.monthly['revenue']['country'].unique())
+
+    @property
+    def team_options(self):
+        return list(self.cube.monthly['revenue']['team'].unique())
+
+    def filters(self, start=None, end=None, countries=None, teams=None):
+        """
+        선택값 → 정규화된 FilterSet (데이터 범위/선택지 기준)
+        """
+        return normalize_filters(
+            start, end, countries, teams,
+            min_date=self.cube.min_date, max_date=self.cube.max_date,
+            country_options=self.country_options, team_options=self.team_options,
+        )
+
+    def section(self, name, filters=ALL_FILTERS):
+        return compute_section(name, self.cube, self.data, filters, cache=self.cache, data_version=self.data_version)
+
+    def kpis(self, filters=ALL_FILTERS):
+        """
+        필터 조합 하나의 스칼라 KPI (flat dict)
+        """
+        kpi = self.section('kpi', filters)
+        runway = self.section('cash_runway', filters)
+        pl = self.section('pl', filters)
+        pipeline = self.section('pipeline', filters)
+        ar = self.section('ar', filters)
+        aging = self.section('ar_aging', filters)
+
+        revenue = float(pl['revenue'].sum())
+        gross_profit = float(pl['gross_profit'].sum())
+        net_profit = float(pl['net_profit'].sum())
+        return {
+            'total_revenue': kpi['total_revenue'],
+            'total_expense': kpi['total_expense'],
+            'net_profit': kpi['net_profit'],
+            'profit_margin_pct': kpi['profit_margin'],
+            'gross_profit': gross_profit,
+            'gross_margin_pct': gross_profit / revenue * 100 if revenue > 0 else 0,
+            'net_margin_pct': net_profit / revenue * 100 if revenue > 0 else 0,
+            'latest_cash': kpi['latest_cash'],
+            'latest_cash_date': kpi['latest_cash_date'].strftime('%Y-%m-%d'),
+            'avg_monthly_expense': runway['avg_monthly_expense'],
+            'runway_months': runway['runway_months'],
+            'total_headcount': kpi['total_headcount'],
+            'average_headcount': kpi['average_headcount'],
+            'per_capita_revenue': kpi['per_capita_revenue'],
+            'pipeline_total': pipeline['total_value'],
+            'pipeline_weighted': pipeline['weighted_value'],
+            'pipeline_closed_won': pipeline['closed_won'],
+            'ar_total': ar['total'],
+            'ar_overdue': ar['overdue'],
+            'ar_pending': ar['pending'],
+            'ar_past_due': aging['past_due'],
+            'dso_days': aging['dso_days'],
+            'alert_count': len(self.section('alerts', filters)),
+        }
+
+    def snapshot(self, filters=ALL_FILTERS, tables=True):
+        """
+        필터 조합 하나의 KPI 스냅샷 (JSON 으로 바로 직렬화 가능한 dict)
+        tables=True 이면 월별 P&L / Cash Flow 표도 포함
+        """
+        result = {
+            'filters': filters._asdict(),
+            'data_version': self.data_version,
+            'kpis': self.kpis(filters),
+            'alerts': self.section('alerts', filters),
+        }
+        if tables:
+            result['tables'] = {
+                'pl_monthly': self.section('pl', filters).to_dict('records'),
+                'cashflow_monthly': self.section('cash_runway', filters)['cashflow_monthly'].to_dict('records'),
+            }
+        return result
+
+    def batch_filters(self, start=None, end=None):
+        """
+        국가 × 팀 모든 조합 (각각 '전체' 포함)의 FilterSet 목록
+        """
+        return [
+            self.filters(start, end, [country] if country else None, [team] if team else None)
+            for country in [None] + self.country_options
+            for team in [None] + self.team_options
+        ]
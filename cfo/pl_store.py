@@ -0,0 +1,300 @@
+"""
+월별 손익(PL_Monthly) 저장소 — 마감한 달은 한 번 계산해서 고정
+
+PL_Monthly 탭 스키마(SCHEMA_DESIGN.md)대로 (연월 × 국가 × 팀) 손익 행을 큐브 월별 셀로부터 만듭니다.
+저장소를 쓰면 지난 달은 마감(close) 시점의 값으로 디스크에 고정하고, 새 거래가 들어와도
+아직 열려 있는 달만 다시 계산합니다. 늦게 들어온 조정은 재오픈(reopen)/무효화(invalidate)로 반영합니다.
+
+- close: 지정한 달을 지금 데이터로 고정
+- reopen: 고정을 풀고 계속 열어 둠 (자동 마감 대상에서 제외, 다시 close 하면 고정)
+- invalidate: 고정한 값을 버림 (다음 update 때 지금 데이터로 다시 고정)
+
+디렉토리 구조:
+    <store_dir>/manifest.json   마감한 달 목록, 재오픈한 달 목록, 리비전
+    <store_dir>/PL_Monthly.csv  마감한 달의 손익 행 (PL_Monthly 컬럼 + 건수)
+"""
+
+import datetime
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+PL_STORE_FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+ROWS_FILE = 'PL_Monthly.csv'
+
+PL_KEYS = ['year_month', 'country', 'team']
+
+PL_COLUMNS = [
+    'year_month', 'country', 'team', 'revenue_krw', 'cogs_krw', 'gross_profit_krw',
+    'gross_margin_pct', 'operating_expense_krw', 'ebitda_krw', 'ebitda_margin_pct',
+    'net_profit_krw', 'net_margin_pct',
+]
+
+# 월별 손익 요약에서 매출이 있는 달을 가리기 위한 건수 (PL_Monthly 스키마 밖의 보조 컬럼)
+COUNT_COLUMNS = ['revenue_count', 'expense_count']
+
+_SUM_COLUMNS = ['revenue_krw', 'revenue_count', 'cogs_krw', 'operating_expense_krw', 'expense_count']
+
+# 큐브 derive 에 보관하는 손익 표 이름
+PL_MONTHLY = 'pl_monthly'
+
+
+def pl_amounts(revenue_cells, expense_cells):
+    """
+    매출/비용 월별 셀 → 손익 금액/건수 행 (셀 단위, 합산 전, 키는 문자열)
+    COGS 는 category_l1 == 'COGS', 나머지 비용은 영업비용
+    """
+    revenue = pd.DataFrame({
+        'revenue_krw': revenue_cells['amount_krw'].to_numpy(dtype=float),
+        'revenue_count': revenue_cells['count'].to_numpy(dtype=np.int64),
+    })
+    amount = expense_cells['amount_krw'].to_numpy(dtype=float)
+    is_cogs = (expense_cells['category_l1'] == 'COGS').to_numpy()
+    expense = pd.DataFrame({
+        'cogs_krw': np.where(is_cogs, amount, 0.0),
+        'operating_expense_krw': np.where(is_cogs, 0.0, amount),
+        'expense_count': expense_cells['count'].to_numpy(dtype=np.int64),
+    })
+    for frame, cells in ((revenue, revenue_cells), (expense, expense_cells)):
+        for key in PL_KEYS:
+            frame[key] = cells[key].to_numpy(dtype=object)
+
+    combined = pd.concat([revenue, expense], ignore_index=True)
+    combined[_SUM_COLUMNS] = combined[_SUM_COLUMNS].fillna(0)
+    return combined
+
+
+def pl_rows(revenue_cells, expense_cells):
+    """
+    매출/비용 월별 셀 → PL_Monthly 행 (연월 × 국가 × 팀, 키 순 정렬)
+    fake_data.build_pl_monthly 와 같은 계산
+    """
+    pl = pl_amounts(revenue_cells, expense_cells).groupby(PL_KEYS, sort=True)[_SUM_COLUMNS].sum().reset_index()
+    pl[COUNT_COLUMNS] = pl[COUNT_COLUMNS].astype(np.int64)
+
+    pl['gross_profit_krw'] = pl['revenue_krw'] - pl['cogs_krw']
+    # 감가상각 데이터가 없으므로 EBITDA = 영업이익 = 순이익
+    pl['ebitda_krw'] = pl['gross_profit_krw'] - pl['operating_expense_krw']
+    pl['net_profit_krw'] = pl['ebitda_krw']
+
+    revenue_nonzero = pl['revenue_krw'].where(pl['revenue_krw'] != 0)
+    pl['gross_margin_pct'] = (pl['gross_profit_krw'] / revenue_nonzero * 100).round(1)
+    pl['ebitda_margin_pct'] = (pl['ebitda_krw'] / revenue_nonzero * 100).round(1)
+    pl['net_margin_pct'] = (pl['net_profit_krw'] / revenue_nonzero * 100).round(1)
+    return pl[PL_COLUMNS + COUNT_COLUMNS]
+
+
+def _months_rows(cube, months=None):
+    """
+    큐브 월별 셀 중 months 에 속한 달(None 이면 전체)의 손익 행
+    """
+    cells = {}
+    for kind in ('revenue', 'expense'):
+        monthly = cube.monthly[kind]
+        if months is not None:
+            monthly = monthly[monthly['year_month'].isin(months).to_numpy()]
+        cells[kind] = monthly
+    return pl_rows(cells['revenue'], cells['expense'])
+
+
+def pl_monthly_rows(cube):
+    """
+    큐브 전체 기간의 PL_Monthly 행 (저장소를 쓰지 않을 때 손익 요약이 쓰는 표)
+    """
+    return _months_rows(cube)
+
+
+def month_key(month):
+    """
+    'YYYY-MM' / 날짜 → 'YYYY-MM' (형식이 잘못되면 ValueError)
+    """
+    try:
+        return str(pd.Period(month, freq='M'))
+    except (TypeError, ValueError):
+        raise ValueError(f'월 형식이 잘못되었습니다 (YYYY-MM): {month}')
+
+
+class PlMonthlyStore:
+    """
+    마감한 달을 고정해 두는 PL_Monthly 저장소 (프로세스 간에는 manifest 리비전으로 동기화)
+
+    directory: 저장 폴더 (None 이면 메모리에만 보관)
+    open_months: 데이터 마지막 달을 포함해 자동 마감하지 않고 열어 두는 달 수
+    """
+
+    def __init__(self, directory=None, open_months=2):
+        self.directory = directory
+        self.open_months = max(int(open_months), 1)
+        self._lock = threading.Lock()
+        self._manifest = self._empty_manifest()
+        self._frozen = pl_rows(*[pd.DataFrame(columns=PL_KEYS + ['category_l1', 'amount_krw', 'count'])] * 2)
+        self._load()
+
+    @staticmethod
+    def _empty_manifest():
+        return {'format': PL_STORE_FORMAT_VERSION, 'revision': 0, 'closed': {}, 'reopened': []}
+
+    # ================================
+    # 저장/불러오기
+    # ================================
+
+    def _read_manifest(self):
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != PL_STORE_FORMAT_VERSION:
+            return None
+        return manifest
+
+    def _load(self):
+        """
+        디스크의 manifest 리비전이 메모리와 다르면(다른 프로세스가 바꿈) 고정 행을 다시 읽음
+        """
+        manifest = self._read_manifest()
+        if manifest is None or manifest['revision'] == self._manifest['revision']:
+            return
+        frozen = pd.read_csv(
+            os.path.join(self.directory, ROWS_FILE),
+            dtype={key: str for key in PL_KEYS}, keep_default_na=False, na_values={
+                column: [''] for column in PL_COLUMNS + COUNT_COLUMNS if column not in PL_KEYS
+            },
+        )
+        frozen[PL_KEYS] = frozen[PL_KEYS].astype(object)
+        frozen[COUNT_COLUMNS] = frozen[COUNT_COLUMNS].astype(np.int64)
+        values = [column for column in PL_COLUMNS if column not in PL_KEYS]
+        frozen[values] = frozen[values].astype(float)
+        self._frozen = frozen[PL_COLUMNS + COUNT_COLUMNS]
+        self._manifest = manifest
+
+    def _write_file(self, name, write):
+        fd, tmp_path = tempfile.mkstemp(prefix=f'.{name}-', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                write(f)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _save(self, frozen, manifest):
+        """
+        고정 행 → manifest 순서로 원자적으로 교체 (manifest 가 가리키는 행 파일이 항상 먼저 준비됨)
+        """
+        manifest = dict(manifest, revision=self._manifest['revision'] + 1)
+        frozen = frozen.sort_values(PL_KEYS, ignore_index=True)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_file(ROWS_FILE, lambda f: frozen.to_csv(f, index=False))
+            self._write_file(MANIFEST_FILE, lambda f: json.dump(manifest, f, ensure_ascii=False, indent=2))
+        self._frozen = frozen
+        self._manifest = manifest
+
+    def _freeze(self, rows, months):
+        """
+        months 의 행을 고정 (이미 고정된 같은 달 행은 교체, 행이 없는 달도 빈 달로 마감)
+        """
+        closed_at = datetime.datetime.now().isoformat(timespec='seconds')
+        kept = self._frozen[~self._frozen['year_month'].isin(months).to_numpy()]
+        closed = dict(self._manifest['closed'])
+        for month in months:
+            closed[month] = {'closed_at': closed_at, 'rows': int((rows['year_month'] == month).sum())}
+        reopened = [m for m in self._manifest['reopened'] if m not in months]
+        self._save(pd.concat([kept, rows], ignore_index=True), dict(self._manifest, closed=closed, reopened=reopened))
+
+    # ================================
+    # 손익 표
+    # ================================
+
+    def _data_months(self, cube):
+        """
+        큐브 데이터 범위의 모든 달 ('YYYY-MM' 목록, 거래가 없는 달 포함)
+        """
+        if cube.min_date is None:
+            return []
+        months = pd.period_range(cube.min_date.to_period('M'), cube.max_date.to_period('M'), freq='M')
+        return [str(m) for m in months]
+
+    def update(self, cube):
+        """
+        큐브 → 전체 기간 PL_Monthly 행
+        마감한 달은 고정 행, 열린 달만 큐브에서 다시 계산
+        데이터 마지막 달에서 open_months 개월 이전의 달은 (재오픈한 달을 빼고) 지금 데이터로 자동 마감
+        """
+        with self._lock:
+            self._load()
+            months = self._data_months(cube)
+            reopened = set(self._manifest['reopened'])
+            to_close = [
+                m for m in months[:max(len(months) - self.open_months, 0)]
+                if m not in self._manifest['closed'] and m not in reopened
+            ]
+            if to_close:
+                self._freeze(_months_rows(cube, to_close), to_close)
+
+            open_months = [m for m in months if m not in self._manifest['closed']]
+            live = _months_rows(cube, open_months)
+            rows = pd.concat([self._frozen, live], ignore_index=True)
+            return rows.sort_values(PL_KEYS, ignore_index=True)
+
+    def attach(self, cube):
+        """
+        저장소 기준 손익 표를 큐브에 연결 (큐브당 한 번, 이후 손익 요약은 이 표를 사용)
+        """
+        return cube.derive(PL_MONTHLY, lambda: self.update(cube))
+
+    def close(self, months, cube):
+        """
+        지정한 달을 큐브의 지금 데이터로 고정 (이미 고정된 달은 다시 계산해서 교체)
+        """
+        months = sorted({month_key(m) for m in months})
+        with self._lock:
+            self._load()
+            self._freeze(_months_rows(cube, months), months)
+
+    def reopen(self, months):
+        """
+        고정을 풀고 열린 달로 유지 (자동 마감하지 않음, 늦게 들어온 조정이 바로 반영됨)
+        """
+        months = sorted({month_key(m) for m in months})
+        with self._lock:
+            self._load()
+            closed = {m: info for m, info in self._manifest['closed'].items() if m not in months}
+            reopened = sorted(set(self._manifest['reopened']) | set(months))
+            kept = self._frozen[~self._frozen['year_month'].isin(months).to_numpy()]
+            self._save(kept, dict(self._manifest, closed=closed, reopened=reopened))
+
+    def invalidate(self, months=None):
+        """
+        고정한 값을 버림 (months 가 None 이면 전체) — 다음 update 때 마감 대상이면 지금 데이터로 다시 고정
+        """
+        with self._lock:
+            self._load()
+            if months is None:
+                months = list(self._manifest['closed'])
+            months = {month_key(m) for m in months}
+            closed = {m: info for m, info in self._manifest['closed'].items() if m not in months}
+            kept = self._frozen[~self._frozen['year_month'].isin(months).to_numpy()]
+            self._save(kept, dict(self._manifest, closed=closed))
+
+    def status(self):
+        """
+        마감/재오픈 상태 dict: closed ({월: {closed_at, rows}}), reopened, open_months, revision
+        """
+        with self._lock:
+            self._load()
+            return {
+                'closed': dict(sorted(self._manifest['closed'].items())),
+                'reopened': list(self._manifest['reopened']),
+                'open_months': self.open_months,
+                'revision': self._manifest['revision'],
+            }
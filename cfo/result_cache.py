@@ -0,0 +1,146 @@
+"""
+섹션 결과 LRU 캐시 (프로세스 전체, 세션 간 공유)
+
+키는 (섹션, 데이터 버전, 정규화된 필터) 튜플이며, 항목 수와 추정 메모리 크기 두 가지 한도로
+가장 오래 사용되지 않은 항목부터 제거합니다. 적중/미스/제거 횟수를 집계합니다.
+데이터가 새로 로드되면 데이터 버전이 바뀌므로 이전 결과는 더 이상 적중하지 않고 차례로 밀려납니다.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_size(value):
+    """
+    결과 객체의 대략적인 메모리 크기 (바이트)
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    스레드 안전 LRU 캐시
+
+    max_entries: 최대 항목 수, max_bytes: 최대 추정 메모리 (None 이면 제한 없음)
+    같은 키를 여러 세션이 동시에 요청하면 한 번만 계산하고 나머지는 결과를 기다림
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 ** 2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key → (value, size)
+        self._lock = threading.Lock()
+        self._pending = {}  # key → 계산 중 Event
+        self._local = threading.local()
+
+    @property
+    def last_hit(self):
+        """
+        이 스레드의 마지막 get_or_compute 가 캐시 적중이었는지 (계측용, 호출 전이면 None)
+        Streamlit 은 세션별 스크립트를 각자의 스레드에서 실행하므로 세션끼리 섞이지 않음
+        """
+        return getattr(self._local, 'hit', None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def get_or_compute(self, key, compute):
+        """
+        캐시된 결과 반환, 없으면 compute() 결과를 저장하고 반환
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self._local.hit = True
+                    return entry[0]
+                event = self._pending.get(key)
+                if event is None:
+                    self.misses += 1
+                    self._local.hit = False
+                    event = self._pending[key] = threading.Event()
+                    break
+            # 다른 세션이 같은 키를 계산 중 → 끝나면 다시 조회 (실패했으면 직접 계산)
+            event.wait()
+
+        try:
+            value = compute()
+            self.put(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            event.set()
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                # 한도보다 큰 결과는 저장하지 않음
+                return
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """
+        적중/미스/제거 횟수, 항목 수, 추정 메모리, 적중률
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'hit_rate': self.hits / requests if requests else 0.0,
+            }
@@ -0,0 +1,148 @@
+"""
+Monte Carlo Runway 예측
+
+'최신 현금 / 월평균 비용' 한 숫자 대신 수만 개의 월별 현금 경로를 시뮬레이션해 Runway 분포를 구합니다.
+
+- 월별 Burn: 과거 월별 비용에서 복원 추출 (월마다, 경로마다 독립)
+- 파이프라인 딜: 예상 계약일(expected_close_date)이 속한 달에 Stage 확률(probability %)로 성사 (베르누이)
+- 현금: 시작 현금 + 누적(딜 입금 - Burn), 처음 0 아래로 내려가는 시점이 그 경로의 Runway (월 단위, 월 내 선형 보간)
+- 예측 기간(horizon) 안에 현금이 바닥나지 않은 경로는 horizon 개월로 기록 (P90 = horizon 이면 'horizon 이상')
+
+경로 × 월 행렬 연산만으로 계산하므로 10만 경로도 1초 안에 끝납니다.
+경로는 고정 크기 묶음(chunk)으로 나누고 묶음마다 SeedSequence 에서 파생한 난수를 쓰므로,
+프로세스 풀(workers > 1)로 나눠 돌려도 같은 seed 면 결과가 같습니다.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 기본 시뮬레이션 경로 수 / 예측 기간(개월)
+DEFAULT_PATHS = 20_000
+DEFAULT_HORIZON = 36
+
+# 묶음당 경로 수 (워커 수와 무관하게 고정 → 결과 재현 가능)
+CHUNK_PATHS = 10_000
+
+PERCENTILES = [10, 50, 90]
+
+
+def deal_schedule(df_pipeline, start_month, horizon):
+    """
+    파이프라인 → (딜 금액, 성사 확률 0~1, 시작 월 기준 입금 월 위치)
+    이미 지난 예상 계약일은 첫 달로, horizon 밖이거나 확률이 0 인 딜은 제외
+    """
+    if df_pipeline is None or len(df_pipeline) == 0:
+        return np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.int64)
+    amounts = df_pipeline['amount_krw'].to_numpy(dtype=float)
+    probabilities = np.clip(df_pipeline['probability'].to_numpy(dtype=float) / 100, 0, 1)
+    close_months = pd.to_datetime(df_pipeline['expected_close_date']).to_numpy().astype('datetime64[M]')
+    offsets = (close_months - np.datetime64(start_month, 'M')).astype(np.int64)
+    valid = ~np.isnat(close_months) & np.isfinite(amounts) & np.isfinite(probabilities) & (probabilities > 0)
+    valid &= offsets < horizon
+    return amounts[valid], probabilities[valid], np.maximum(offsets[valid], 0)
+
+
+def _simulate_chunk(seed, n_paths, start_cash, burn_history, amounts, probabilities, offsets, horizon):
+    """
+    경로 n_paths 개 시뮬레이션 → (경로별 Runway(개월), 경로 × 월 말 현금 float32)
+    """
+    rng = np.random.default_rng(seed)
+    burn = rng.choice(burn_history, size=(n_paths, horizon))
+
+    # 딜 → 월 입금 행렬 (딜 × 월), 성사 여부 (경로 × 딜) 와 곱하면 경로 × 월 입금
+    weights = np.zeros((len(amounts), horizon))
+    weights[np.arange(len(amounts)), offsets] = amounts
+    closes = rng.random((n_paths, len(amounts))) < probabilities
+    inflow = closes.astype(float) @ weights
+
+    cash = start_cash + np.cumsum(inflow - burn, axis=1)
+
+    # 처음 음수가 되는 달 k, 직전 잔고와 그 달 잔고 사이를 선형 보간
+    negative = cash < 0
+    ran_out = negative.any(axis=1)
+    k = negative.argmax(axis=1)
+    before = np.where(k > 0, cash[np.arange(n_paths), np.maximum(k - 1, 0)], start_cash)
+    after = cash[np.arange(n_paths), k]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.clip(np.where(before > after, before / (before - after), 0.0), 0, 1)
+    runway = np.where(ran_out, k + fraction, float(horizon))
+    # 시작부터 현금이 음수면 Runway 0
+    if start_cash < 0:
+        runway[:] = 0.0
+    return runway, cash.astype(np.float32)
+
+
+def simulate_runway(start_cash, burn_history, amounts, probabilities, offsets,
+                    n_paths=DEFAULT_PATHS, horizon=DEFAULT_HORIZON, seed=0, workers=1):
+    """
+    현금 경로 시뮬레이션
+
+    반환: (경로별 Runway 배열, 경로 × 월 말 현금 행렬)
+    workers > 1 이면 묶음을 프로세스 풀로 나눠 계산 (결과는 workers=1 과 동일)
+    """
+    burn_history = np.asarray(burn_history, dtype=float)
+    burn_history = burn_history[np.isfinite(burn_history)]
+    if len(burn_history) == 0:
+        burn_history = np.zeros(1)
+
+    sizes = [CHUNK_PATHS] * (n_paths // CHUNK_PATHS)
+    if n_paths % CHUNK_PATHS:
+        sizes.append(n_paths % CHUNK_PATHS)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [
+        (chunk_seed, size, float(start_cash), burn_history, amounts, probabilities, offsets, horizon)
+        for chunk_seed, size in zip(seeds, sizes)
+    ]
+
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(args))) as pool:
+            chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        chunks = [_simulate_chunk(*chunk_args) for chunk_args in args]
+
+    if not chunks:
+        return np.zeros(0), np.zeros((0, horizon), dtype=np.float32)
+    return np.concatenate([r for r, _ in chunks]), np.concatenate([c for _, c in chunks])
+
+
+def forecast_runway(start_cash, burn_history, df_pipeline, start_month,
+                    n_paths=DEFAULT_PATHS, horizon=DEFAULT_HORIZON, seed=0, workers=1):
+    """
+    Runway 분포 요약
+
+    start_month: 시뮬레이션 첫 달 ('YYYY-MM' 또는 날짜)
+    반환 dict:
+        runway: {10: P10, 50: P50, 90: P90} (개월, 최대 horizon)
+        prob_out_6m, prob_out_12m: 6/12개월 안에 현금이 바닥날 확률
+        fan: month('YYYY-MM') + cash_p10/cash_p50/cash_p90 (월 말 현금 분위수)
+        n_paths, horizon, n_deals
+    """
+    start_month = np.datetime64(pd.Timestamp(start_month).date(), 'M')
+    amounts, probabilities, offsets = deal_schedule(df_pipeline, start_month, horizon)
+    runway, cash = simulate_runway(
+        start_cash, burn_history, amounts, probabilities, offsets,
+        n_paths=n_paths, horizon=horizon, seed=seed, workers=workers,
+    )
+
+    months = pd.DatetimeIndex((start_month + np.arange(horizon)).astype('datetime64[ns]')).strftime('%Y-%m')
+    fan = pd.DataFrame({'month': months})
+    if len(runway):
+        cash_percentiles = np.percentile(cash, PERCENTILES, axis=0)
+        runway_percentiles = np.percentile(runway, PERCENTILES)
+    else:
+        cash_percentiles = np.full((len(PERCENTILES), horizon), np.nan)
+        runway_percentiles = np.full(len(PERCENTILES), np.nan)
+    for p, values in zip(PERCENTILES, cash_percentiles):
+        fan[f'cash_p{p}'] = values
+
+    return {
+        'runway': {p: float(value) for p, value in zip(PERCENTILES, runway_percentiles)},
+        'prob_out_6m': float((runway < 6).mean()) if len(runway) else np.nan,
+        'prob_out_12m': float((runway < 12).mean()) if len(runway) else np.nan,
+        'fan': fan,
+        'n_paths': n_paths,
+        'horizon': horizon,
+        'n_deals': len(amounts),
+    }
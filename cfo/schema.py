@@ -0,0 +1,275 @@
+"""
+탭 스키마 타입 지정
+
+SCHEMA_DESIGN.md 의 컬럼 표를 기준으로 로드한 탭의 메모리 표현을 정합니다.
+- 값 목록이 정해진 텍스트(국가, 팀, 통화, 상태, 카테고리 등)는 고정 카테고리 집합의 Categorical
+- 반복되는 이름/메모(고객사, 거래처, 계좌, 비고 등)는 관측값으로 만든 Categorical
+- 금액은 float64 로 통일 (CSV 에서 정수/실수가 섞여 들어와도 합계가 같도록)
+- 확률/연/월 같은 작은 정수는 가장 작은 정수 타입
+ID, 비고처럼 행마다 값이 다른 텍스트는 그대로 둡니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cfo.constants import (
+    ALL_STAGES,
+    COUNTRIES,
+    CURRENCIES,
+    EMPLOYEE_STATUSES,
+    EMPLOYMENT_TYPES,
+    EXPENSE_CATEGORIES_L1,
+    EXPENSE_TEAMS,
+    PAYMENT_METHODS,
+    PAYMENT_STATUSES,
+    PAYMENT_TERMS,
+    REVENUE_CATEGORIES,
+)
+
+# 컬럼 타입 표기
+#   list       고정 카테고리 집합 (목록에 없는 값은 뒤에 추가)
+#   'label'    관측값 카테고리 (고유값이 행 수의 절반을 넘으면 문자열 유지)
+#   'amount'   float64 금액/비율
+#   'small'    가장 작은 정수 타입 (결측이 있으면 float64)
+#   'bool'     TRUE/FALSE
+TAB_SCHEMAS = {
+    'revenue': {
+        'country': COUNTRIES,
+        'team': EXPENSE_TEAMS,
+        'client_name': 'label',
+        'project_name': 'label',
+        'amount_original': 'amount',
+        'currency': CURRENCIES,
+        'amount_krw': 'amount',
+        'exchange_rate': 'amount',
+        'payment_status': PAYMENT_STATUSES,
+        'payment_terms': PAYMENT_TERMS,
+        'category': REVENUE_CATEGORIES,
+        'notes': 'label',
+    },
+    'expense': {
+        'country': COUNTRIES,
+        'team': EXPENSE_TEAMS,
+        'category_l1': EXPENSE_CATEGORIES_L1,
+        'category_l2': 'label',
+        'vendor': 'label',
+        'description': 'label',
+        'amount_original': 'amount',
+        'currency': CURRENCIES,
+        'amount_krw': 'amount',
+        'exchange_rate': 'amount',
+        'payment_method': PAYMENT_METHODS,
+        'is_recurring': 'bool',
+        'project_related': 'label',
+        'notes': 'label',
+    },
+    'cash': {
+        'country': COUNTRIES,
+        'account_name': 'label',
+        'currency': CURRENCIES,
+        'balance_original': 'amount',
+        'balance_krw': 'amount',
+        'exchange_rate': 'amount',
+    },
+    'pipeline': {
+        'client_name': 'label',
+        'project_name': 'label',
+        'country': COUNTRIES,
+        'team': EXPENSE_TEAMS,
+        'stage': ALL_STAGES,
+        'probability': 'small',
+        'amount_original': 'amount',
+        'currency': CURRENCIES,
+        'amount_krw': 'amount',
+        'notes': 'label',
+    },
+    'headcount': {
+        'country': COUNTRIES,
+        'team': EXPENSE_TEAMS,
+        'role': 'label',
+        'employment_type': EMPLOYMENT_TYPES,
+        'monthly_salary_krw': 'amount',
+        'status': EMPLOYEE_STATUSES,
+    },
+    'budget': {
+        'year': 'small',
+        'month': 'small',
+        'country': COUNTRIES,
+        'team': EXPENSE_TEAMS,
+        'revenue_target_krw': 'amount',
+        'expense_budget_krw': 'amount',
+        'profit_target_krw': 'amount',
+    },
+    'exchange_rates': {
+        'usd_to_krw': 'amount',
+        'vnd_to_krw': 'amount',
+    },
+    'pl_monthly': {
+        'year_month': 'label',
+        'country': COUNTRIES,
+        'team': EXPENSE_TEAMS,
+    },
+}
+
+# TRUE/FALSE 컬럼 값 (소문자, 앞뒤 공백 제거 후 비교, validation.py 도 같은 목록 사용)
+TRUE_VALUES = ['true', '1', 'yes', 'y', 't']
+FALSE_VALUES = ['false', '0', 'no', 'n', 'f']
+
+
+def _fixed_categorical(series, categories):
+    """
+    고정 카테고리 집합으로 변환, 집합에 없는 값은 정렬해서 뒤에 추가 (값 손실 없음)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and list(series.cat.categories[:len(categories)]) == list(categories):
+        return series
+    values = series.astype(object)
+    known = set(categories)
+    extra = sorted({v for v in pd.unique(values.dropna()) if v not in known}, key=str)
+    return pd.Categorical(values, categories=list(categories) + extra)
+
+
+def _label_categorical(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    # 고유값 계산과 카테고리 변환을 factorize 한 번으로, 정렬은 고유값에만 (astype('category') 와 같은 카테고리)
+    codes, uniques = pd.factorize(series)
+    if len(uniques) > len(series) // 2:
+        return series
+    order = uniques.argsort()
+    # 마지막 칸은 결측 코드 -1 → -1
+    positions = np.full(len(order) + 1, -1, dtype=codes.dtype)
+    positions[order] = np.arange(len(order), dtype=codes.dtype)
+    codes = positions[codes]
+    return pd.Series(pd.Categorical.from_codes(codes, uniques[order]), index=series.index, name=series.name)
+
+
+def _small_int(series):
+    numeric = pd.to_numeric(series, errors='coerce')
+    if numeric.isna().any() or not np.array_equal(numeric, np.floor(numeric)):
+        return numeric.astype('float64')
+    return pd.to_numeric(numeric.astype('int64'), downcast='integer')
+
+
+def _bool(series):
+    if series.dtype == bool:
+        return series
+    return series.astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+
+
+def apply_schema(tab, df):
+    """
+    탭의 컬럼을 TAB_SCHEMAS 기준 타입으로 변환 (스키마에 없는 컬럼은 그대로)
+    이미 변환된 컬럼은 다시 변환하지 않으므로 여러 번 호출해도 비용이 거의 없음
+    """
+    schema = TAB_SCHEMAS.get(tab, {})
+    columns = {}
+    for column, spec in schema.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if isinstance(spec, list):
+            converted = _fixed_categorical(series, spec)
+        elif spec == 'label':
+            converted = _label_categorical(series)
+        elif spec == 'amount':
+            converted = series if series.dtype == np.float64 else pd.to_numeric(series, errors='coerce').astype('float64')
+        elif spec == 'small':
+            converted = series if series.dtype.kind in 'iu' and series.dtype.itemsize <= 2 else _small_int(series)
+        elif spec == 'bool':
+            converted = _bool(series)
+        else:
+            raise ValueError(f'알 수 없는 컬럼 타입: {tab}.{column} = {spec}')
+        if converted is not series:
+            columns[column] = converted
+    if not columns:
+        return df
+    # 얕은 복사에 변환한 컬럼만 바꿔 끼움 (DataFrame.assign 은 전체 컬럼을 복사)
+    frame = df.copy(deep=False)
+    for column, converted in columns.items():
+        frame[column] = converted
+    return frame
+
+
+def canonical_categories(tab, column, categories):
+    """
+    나눠 읽으면서 쌓인 카테고리를 한 번에 읽었을 때와 같은 순서로 정렬
+    고정 목록 컬럼은 목록 순서 + 나머지 정렬, 관측값 컬럼은 정렬 (apply_schema 와 같은 규칙)
+    """
+    spec = TAB_SCHEMAS.get(tab, {}).get(column)
+    if isinstance(spec, list):
+        known = set(spec)
+        return list(spec) + sorted((c for c in categories if c not in known), key=str)
+    try:
+        return list(pd.Index(categories).sort_values())
+    except TypeError:
+        # 청크마다 숫자/문자열로 다르게 읽힌 값이 섞인 경우
+        return sorted(categories, key=str)
+
+
+def concat_typed(frames, tab=None):
+    """
+    타입이 지정된 프레임 이어 붙이기
+    카테고리 집합이 다른 Categorical 컬럼은 합집합 카테고리로 맞춰서 Categorical 을 유지
+
+    tab: 주면 결과를 한 번에 읽은 탭과 같게 맞춤 (카테고리 순서, 관측값 컬럼의 Categorical/문자열 여부)
+    """
+    frames = [f for f in frames if len(f)] or frames[:1]
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    aligned = [frame.copy(deep=False) for frame in frames]
+    schema = TAB_SCHEMAS.get(tab, {})
+    for column in frames[0].columns:
+        if not all(column in frame.columns for frame in aligned):
+            continue
+        if not isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            if schema.get(column) == 'label':
+                # 앞 프레임은 행 수가 적어 문자열로 남았을 수 있음 → 이어 붙인 뒤 전체 행 기준으로 다시 판단
+                for frame in aligned:
+                    if isinstance(frame[column].dtype, pd.CategoricalDtype):
+                        frame[column] = frame[column].astype(object)
+            continue
+        # 뒤 프레임(새로 추가된 행)은 행 수가 적어 문자열로 남았을 수 있음
+        for frame in aligned[1:]:
+            if not isinstance(frame[column].dtype, pd.CategoricalDtype):
+                frame[column] = frame[column].astype('category')
+        categories = list(aligned[0][column].cat.categories)
+        seen = set(categories)
+        for frame in aligned[1:]:
+            new = [c for c in frame[column].cat.categories if c not in seen]
+            categories += new
+            seen.update(new)
+        if tab is not None and categories:
+            categories = canonical_categories(tab, column, categories)
+        # 값이 하나도 없으면 첫 프레임의 빈 카테고리 dtype 유지 (빈 목록은 object 가 됨)
+        categories = pd.Index(categories) if categories else aligned[0][column].cat.categories[:0]
+        for frame in aligned:
+            frame[column] = frame[column].cat.set_categories(categories)
+    result = pd.concat(aligned, ignore_index=True)
+    for column, spec in schema.items():
+        if spec != 'label' or column not in result.columns:
+            continue
+        series = result[column]
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            result[column] = _label_categorical(series)
+        elif len(series.cat.categories) > len(series) // 2:
+            # 행마다 값이 다른 컬럼은 문자열 유지 (_label_categorical 과 같은 기준)
+            result[column] = series.astype(object)
+    return result
+
+
+def memory_report(data):
+    """
+    탭별 메모리 사용량 (문자열 포함 실제 바이트) DataFrame
+    컬럼: tab, rows, columns, memory_mb, bytes_per_row
+    """
+    rows = []
+    for tab, df in data.items():
+        total = int(df.memory_usage(index=True, deep=True).sum())
+        rows.append({
+            'tab': tab,
+            'rows': len(df),
+            'columns': len(df.columns),
+            'memory_mb': total / 1024 ** 2,
+            'bytes_per_row': total / len(df) if len(df) else 0.0,
+        })
+    return pd.DataFrame(rows, columns=['tab', 'rows', 'columns', 'memory_mb', 'bytes_per_row'])
@@ -0,0 +1,99 @@
+"""
+구글 시트 CSV Export 대역(stand-in) HTTP 서버
+
+더미 데이터 탭을 CSV로 제공하며, 탭별로 인위적인 지연이나 실패를 넣을 수 있어
+동시 로더(cfo/data_sources.py)의 타임아웃/재시도 동작을 로컬에서 확인할 수 있습니다.
+
+실행 방법:
+python -m cfo.sheet_stub --latency 0.5 --slow expense=3
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cfo.data_sources import TAB_NAMES
+from cfo.fake_data import generate_fake_data
+
+
+def _make_handler(payloads, latency, tab_latency, fail_tabs):
+    by_path = {f'/{TAB_NAMES[tab]}.csv': tab for tab in payloads}
+
+    class SheetStubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            tab = by_path.get(self.path.split('?')[0])
+            if tab is None:
+                self.send_error(404)
+                return
+
+            time.sleep(tab_latency.get(tab, latency))
+            if tab in fail_tabs:
+                self.send_error(503)
+                return
+
+            body = payloads[tab]
+            try:
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/csv; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 타임아웃으로 먼저 연결을 끊은 경우
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return SheetStubHandler
+
+
+def start_stub_server(frames, latency=0.0, tab_latency=None, fail_tabs=(), host='127.0.0.1', port=0):
+    """
+    탭별 DataFrame을 CSV로 제공하는 서버를 백그라운드 스레드로 시작
+
+    반환: (server, urls) — urls 는 SheetCsvSource 에 그대로 넘길 수 있는 {tab: url}
+    종료 시 server.shutdown() 호출
+    """
+    payloads = {tab: df.to_csv(index=False).encode('utf-8') for tab, df in frames.items()}
+    handler = _make_handler(payloads, latency, dict(tab_latency or {}), set(fail_tabs))
+
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name='cfo-sheet-stub').start()
+
+    base = f'http://{host}:{server.server_address[1]}'
+    urls = {tab: f'{base}/{TAB_NAMES[tab]}.csv' for tab in frames}
+    return server, urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description='구글 시트 CSV Export 대역 서버')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='모든 탭 공통 응답 지연(초)')
+    parser.add_argument('--slow', action='append', default=[], help='탭별 지연, 예: expense=3')
+    parser.add_argument('--fail', action='append', default=[], help='항상 503을 반환할 탭')
+    parser.add_argument('--revenue-rows', type=int, default=500)
+    parser.add_argument('--expense-rows', type=int, default=800)
+    args = parser.parse_args()
+
+    tab_latency = {}
+    for item in args.slow:
+        tab, seconds = item.split('=')
+        tab_latency[tab] = float(seconds)
+
+    frames = generate_fake_data(n_revenue=args.revenue_rows, n_expense=args.expense_rows)
+    server, urls = start_stub_server(frames, args.latency, tab_latency, args.fail, port=args.port)
+    for tab, url in urls.items():
+        print(f'{tab:15s} {url}')
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+"""
+컬럼 단위 디스크 스냅샷 캐시
+
+로드한 탭을 컬럼별 NumPy 파일(.npy)로 저장하고, 서버 재시작 시 다시 수집/파싱하지 않고
+memory-map 으로 바로 엽니다. Categorical 컬럼은 (코드 배열 + 카테고리 목록)으로, 행마다 값이 다른 문자열 컬럼(ID, 메모 등)은
+(UTF-8 바이트 + offsets)로 저장하며 pyarrow 가 있으면 복사 없이 Arrow 문자열 컬럼으로 엽니다.
+manifest.json 에 탭별 행 수, 컬럼 타입, 내용 해시(버전)를 기록하며
+내용이 같은 탭은 다시 쓰지 않습니다.
+
+디렉토리 구조:
+    <snapshot_dir>/manifest.json
+    <snapshot_dir>/tabs/<tab>-<hash>/columns.json, <컬럼 번호>.npy
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_FORMAT_VERSION = 2
+MANIFEST_FILE = 'manifest.json'
+
+
+def _is_plain_numpy(series):
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufmM'
+
+
+def _is_all_strings(values):
+    return pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')
+
+
+# 'text' 컬럼 값 구분자 (값에 들어 있으면 pickle 로 저장)
+TEXT_SEPARATOR = '\x00'
+
+
+def _encode_text(values):
+    """
+    문자열 배열 → (UTF-8 바이트, 값별 바이트 offsets (n + 1), 결측 마스크), 값에 구분자가 있으면 None
+    값을 한 번에 이어 붙여 인코딩하고 구분자 위치로 offsets 를 계산 (행 단위 인코딩 없음)
+    """
+    missing = np.asarray(pd.isna(values), dtype=bool)
+    strings = np.asarray(values, dtype=object).copy()
+    strings[missing] = ''
+    joined = np.frombuffer(TEXT_SEPARATOR.join(strings.tolist()).encode('utf-8'), dtype=np.uint8)
+    separators = np.flatnonzero(joined == 0)
+    n = len(strings)
+    if len(separators) != max(n - 1, 0):
+        return None
+    if n == 0:
+        return joined, np.zeros(1, dtype=np.int64), missing
+    # 구분자를 뺀 바이트에서 i 번째 값의 시작 = 구분자 포함 위치 - i
+    starts = np.concatenate([[0], separators + 1]) - np.arange(n)
+    offsets = np.append(starts, len(joined) - (n - 1)).astype(np.int64)
+    return joined[joined != 0], offsets, missing
+
+
+def _text_array(data, offsets, missing):
+    """
+    (UTF-8 바이트, offsets, 결측 마스크) → 문자열 배열
+    pyarrow 가 있으면 파일 버퍼를 그대로 쓰는 Arrow 문자열 배열 (행마다 파이썬 문자열을 만들지 않음),
+    없으면 object 배열
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+
+    if pa is not None:
+        large = int(offsets[-1]) >= 2 ** 31
+        array_type = pa.LargeStringArray if large else pa.StringArray
+        buffers = [
+            pa.py_buffer(np.packbits(~missing, bitorder='little')),
+            pa.py_buffer(np.ascontiguousarray(offsets, dtype=np.int64 if large else np.int32)),
+            pa.py_buffer(data),
+        ]
+        array = array_type.from_buffers(len(missing), buffers[1], buffers[2], buffers[0], int(missing.sum()))
+        return pd.arrays.ArrowStringArray(array)
+
+    values = np.empty(len(missing), dtype=object)
+    if len(missing):
+        # 값 사이에 구분자를 다시 넣고 한 번에 디코딩
+        joined = np.insert(np.asarray(data), np.asarray(offsets[1:-1]), 0)
+        values[:] = joined.tobytes().decode('utf-8').split(TEXT_SEPARATOR)
+        values[missing] = np.nan
+    return values
+
+
+def _encode_column(series):
+    """
+    컬럼 하나 → (manifest 용 메타데이터, [(파일 접미사, 배열 또는 pickle 바이트)])
+    문자열 카테고리 목록은 pickle 없이 고정폭 유니코드 배열로 저장
+    """
+    meta = {'name': str(series.name)}
+
+    if _is_plain_numpy(series):
+        meta['kind'] = 'array'
+        return meta, [('.npy', series.to_numpy())]
+    if isinstance(series.dtype, pd.CategoricalDtype) and _is_all_strings(series.cat.categories):
+        meta.update(kind='category', ordered=bool(series.cat.ordered))
+        return meta, [
+            ('.npy', series.cat.codes.to_numpy()),
+            ('.categories.npy', np.asarray(series.cat.categories, dtype=str)),
+        ]
+    if isinstance(series.dtype, pd.StringDtype) or (series.dtype == object and _is_all_strings(series)):
+        encoded = _encode_text(series.to_numpy(dtype=object))
+        if encoded is not None:
+            meta['kind'] = 'text'
+            data, offsets, missing = encoded
+            return meta, [('.npy', data), ('.offsets.npy', offsets), ('.missing.npy', missing)]
+    # 그 외 타입(혼합 object, 확장 타입)은 pickle 로 저장 (memory-map 불가)
+    meta['kind'] = 'pickle'
+    return meta, [('.pkl', pickle.dumps(series, protocol=pickle.HIGHEST_PROTOCOL))]
+
+
+def encode_tab(df):
+    """
+    탭 → (컬럼 메타데이터 목록, 컬럼별 파일 내용, 내용 해시)
+    해시는 파일을 쓰기 전에 정해지므로 저장을 기다리지 않고 LoadResult.versions 에 쓸 수 있음
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    columns, parts = [], []
+    for column in df.columns:
+        meta, files = _encode_column(df[column])
+        for suffix, content in files:
+            if isinstance(content, bytes):
+                digest.update(content)
+            else:
+                content = np.ascontiguousarray(content)
+                digest.update(str(content.dtype).encode('utf-8'))
+                digest.update(content.view(np.uint8) if content.size else b'')
+            digest.update(suffix.encode('utf-8'))
+        digest.update(json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+        columns.append(meta)
+        parts.append(files)
+    return columns, parts, digest.hexdigest()
+
+
+def _read_column(tab_dir, position, meta, mmap):
+    base = os.path.join(tab_dir, str(position))
+    mmap_mode = 'r' if mmap else None
+    kind = meta['kind']
+
+    if kind == 'array':
+        return np.load(f'{base}.npy', mmap_mode=mmap_mode)
+
+    if kind == 'category':
+        categories = np.load(f'{base}.categories.npy').astype(object)
+        dtype = pd.CategoricalDtype(categories, ordered=meta.get('ordered', False))
+        return pd.Categorical.from_codes(np.load(f'{base}.npy', mmap_mode=mmap_mode), dtype=dtype)
+
+    if kind == 'text':
+        return _text_array(
+            np.load(f'{base}.npy', mmap_mode=mmap_mode),
+            np.load(f'{base}.offsets.npy', mmap_mode=mmap_mode),
+            np.load(f'{base}.missing.npy'),
+        )
+
+    # 확장 타입(숫자 카테고리 등)을 유지하도록 numpy 변환 없이 배열 그대로
+    return pd.read_pickle(f'{base}.pkl').array
+
+
+def _write_tab(directory, tab, encoded):
+    """
+    인코딩한 탭을 임시 폴더에 쓴 뒤 tabs/<tab>-<hash> 로 원자적으로 이동
+    같은 해시의 폴더가 이미 있으면(내용 변화 없음) 쓰지 않음
+    반환: 탭 폴더
+    """
+    columns, parts, digest = encoded
+    tabs_dir = os.path.join(directory, 'tabs')
+    final_dir = os.path.join(tabs_dir, f'{tab}-{digest}')
+    if os.path.isdir(final_dir):
+        return final_dir
+    os.makedirs(tabs_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=f'.{tab}-', dir=tabs_dir)
+
+    for position, files in enumerate(parts):
+        base = os.path.join(tmp_dir, str(position))
+        for suffix, content in files:
+            if isinstance(content, bytes):
+                with open(base + suffix, 'wb') as f:
+                    f.write(content)
+            else:
+                np.save(base + suffix, np.ascontiguousarray(content), allow_pickle=False)
+    with open(os.path.join(tmp_dir, 'columns.json'), 'w', encoding='utf-8') as f:
+        json.dump(columns, f, ensure_ascii=False)
+
+    try:
+        os.rename(tmp_dir, final_dir)
+    except OSError:
+        # 다른 프로세스가 같은 내용을 이미 저장함
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return final_dir
+
+
+def read_manifest(directory):
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def save_snapshot(data, directory, encoded=None):
+    """
+    탭 dict 를 스냅샷으로 저장하고 manifest 반환
+    이전 스냅샷과 해시가 같은 탭은 기존 폴더를 그대로 사용
+    encoded: 이미 인코딩한 탭 ({탭: encode_tab() 결과}, 없으면 여기서 인코딩)
+    """
+    os.makedirs(directory, exist_ok=True)
+    previous = read_manifest(directory) or {'tabs': {}}
+    encoded = encoded or {}
+    tabs = {}
+
+    for tab, df in data.items():
+        tab_encoded = encoded.get(tab) or encode_tab(df)
+        columns, _, digest = tab_encoded
+        tab_dir = _write_tab(directory, tab, tab_encoded)
+        old = previous['tabs'].get(tab)
+        if old and old['hash'] == digest:
+            tabs[tab] = old
+            continue
+        tabs[tab] = {
+            'path': os.path.relpath(tab_dir, directory),
+            'hash': digest,
+            'rows': int(len(df)),
+            'columns': columns,
+            'saved_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+    manifest = {'format': SNAPSHOT_FORMAT_VERSION, 'created_at': time.time(), 'tabs': tabs}
+
+    # manifest 교체는 원자적으로 (읽는 쪽은 항상 완전한 스냅샷만 봄)
+    fd, tmp_path = tempfile.mkstemp(prefix='.manifest-', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_FILE))
+
+    _remove_unreferenced(directory, manifest, previous)
+    return manifest
+
+
+def _remove_unreferenced(directory, manifest, previous):
+    """
+    현재/직전 manifest 어디에도 없는 탭 폴더 삭제
+    (직전 버전은 아직 memory-map 으로 열려 있을 수 있으므로 한 세대 유지)
+    """
+    keep = {t['path'] for t in manifest['tabs'].values()} | {t['path'] for t in previous['tabs'].values()}
+    tabs_dir = os.path.join(directory, 'tabs')
+    for name in os.listdir(tabs_dir):
+        path = os.path.join('tabs', name)
+        if path not in keep and not name.startswith('.'):
+            shutil.rmtree(os.path.join(directory, path), ignore_errors=True)
+
+
+def load_snapshot(directory, mmap=True):
+    """
+    스냅샷 로드 → (탭 dict, manifest), 스냅샷이 없으면 (None, None)
+    mmap=True 이면 숫자/날짜 컬럼과 문자열 코드는 파일을 memory-map 으로 열어 복사 없이 사용
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None, None
+
+    data = {}
+    for tab, info in manifest['tabs'].items():
+        tab_dir = os.path.join(directory, info['path'])
+        columns = {
+            meta['name']: _read_column(tab_dir, i, meta, mmap)
+            for i, meta in enumerate(info['columns'])
+        }
+        data[tab] = pd.DataFrame(columns, copy=False)
+    return data, manifest
+
+
+class SnapshotCache:
+    """
+    스냅샷 기반 로더
+
+    첫 get() 호출 시 스냅샷이 있으면 즉시 memory-map 으로 반환하고 백그라운드에서 원본을 다시 로드합니다.
+    이후 get() 은 loader() 로 새로 로드하며, 결과는 백그라운드에서 스냅샷으로 저장합니다.
+    loader: 인자 없이 LoadResult 를 반환하는 함수
+    on_refresh: 백그라운드 새로고침 완료 시 호출 (예: DataStore.refresh)
+    """
+
+    def __init__(self, directory, loader, on_refresh=None):
+        self.directory = directory
+        self.loader = loader
+        self.on_refresh = on_refresh
+        self.manifest = None
+        self.last_error = None
+        self._fresh = None
+        self._served_snapshot = False
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+
+    @property
+    def refreshing(self):
+        return self._refresh_thread is not None and self._refresh_thread.is_alive()
+
+    def get(self):
+        with self._lock:
+            if self._fresh is not None:
+                fresh, self._fresh = self._fresh, None
+                return fresh
+
+            if not self._served_snapshot:
+                self._served_snapshot = True
+                data, manifest = load_snapshot(self.directory)
+                if data is not None:
+                    self.manifest = manifest
+                    self._start_refresh()
+                    return self._snapshot_result(data, manifest)
+
+        result = self.loader()
+        self._save_in_background(result)
+        return result
+
+    def _snapshot_result(self, data, manifest):
+        from cfo.data_sources import LoadResult
+
+        return LoadResult(
+            data=data,
+            versions={tab: info['hash'] for tab, info in manifest['tabs'].items()},
+            source='snapshot',
+            loaded_at=manifest.get('created_at', time.time()),
+        )
+
+    def _start_refresh(self):
+        def refresh():
+            try:
+                result = self.loader()
+                if not result.missing_required:
+                    self._save(result, self._encode(result))
+                    with self._lock:
+                        self._fresh = result
+                    if self.on_refresh is not None:
+                        self.on_refresh()
+            except Exception as e:
+                self.last_error = f'{type(e).__name__}: {e}'
+
+        self._refresh_thread = threading.Thread(target=refresh, daemon=True, name='cfo-snapshot-refresh')
+        self._refresh_thread.start()
+
+    @staticmethod
+    def _encode(result):
+        """
+        탭 인코딩 + 내용 해시를 결과를 넘기기 전에 versions 에 기록
+        (넘긴 뒤에 바꾸면 세션/DataStore 가 보는 data_version 이 도중에 바뀜)
+        """
+        encoded = {tab: encode_tab(df) for tab, df in result.data.items()}
+        result.versions = {tab: digest for tab, (_, _, digest) in encoded.items()}
+        return encoded
+
+    def _save(self, result, encoded):
+        self.manifest = save_snapshot(result.data, self.directory, encoded)
+
+    def _save_in_background(self, result):
+        if result.missing_required:
+            return
+        encoded = self._encode(result)
+
+        def save():
+            try:
+                self._save(result, encoded)
+            except Exception as e:
+                self.last_error = f'{type(e).__name__}: {e}'
+
+        threading.Thread(target=save, daemon=True, name='cfo-snapshot-save').start()
@@ -0,0 +1,435 @@
+"""
+내장 분석 DB 백엔드 (SQLite / DuckDB)
+
+탭을 로컬 내장 DB 테이블로 저장하고, 대시보드 필터(기간/국가/팀)와 집계(월별 합계, 카테고리/Stage 별 합계,
+최신 현금 잔고)를 쿼리로 내려 보냅니다(pushdown). pandas 로는 작은 집계 결과만 돌아옵니다.
+
+- SqlStore: 탭 → 테이블 저장/조회 (컬럼 타입과 Categorical 순서는 메타 테이블에 기록해 그대로 복원)
+- SqlCube: MonthlyCube 와 같은 인터페이스 (cells / total / monthly / index / derive / latest_cash / aggregate / revenue_rows)
+  → cfo/metrics.py 의 섹션 함수를 그대로 쓰고, 메모리 백엔드와 같은 결과를 반환
+- open_store: 데이터 버전별 DB 파일 (같은 버전이면 다시 쓰지 않고 재사용, 빈 폴더면 메모리 DB)
+
+SQLite 는 표준 라이브러리라 항상 사용 가능하고, DuckDB 는 duckdb 패키지가 설치된 경우에만 선택할 수 있습니다.
+날짜는 일 단위 'YYYY-MM-DD' 텍스트로 저장하므로(큐브와 같은 정밀도) 두 엔진에서 같은 SQL 을 씁니다.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from cfo.cube import EXPENSE_DIMENSIONS, INDEX_DIMENSIONS, MONTHLY_CUBE, REVENUE_DIMENSIONS, MonthlyCube
+from cfo.daily_index import DailyIndex
+
+ENGINES = ('sqlite', 'duckdb')
+
+# 대시보드/CLI 백엔드 선택지 (memory: pandas 큐브)
+BACKENDS = ('memory',) + ENGINES
+
+FILE_EXTENSIONS = {'sqlite': 'sqlite', 'duckdb': 'duckdb'}
+
+# 컬럼 타입/카테고리 메타 테이블
+META_TABLE = '_cfo_columns'
+
+CUBE_DIMENSIONS = {'revenue': REVENUE_DIMENSIONS, 'expense': EXPENSE_DIMENSIONS}
+
+
+def connect(path=':memory:', engine='sqlite'):
+    """
+    DB 연결 (여러 세션 스레드가 공유하므로 조회는 SqlStore 의 잠금으로 직렬화)
+    """
+    if engine == 'duckdb':
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError(f'DuckDB 백엔드에는 duckdb 패키지가 필요합니다 (pip install duckdb): {e}') from e
+        return duckdb.connect(path)
+    if engine != 'sqlite':
+        raise ValueError(f'알 수 없는 엔진: {engine} (가능: {", ".join(ENGINES)})')
+    return sqlite3.connect(path, check_same_thread=False)
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _column_meta(series):
+    """
+    컬럼 → (저장 종류, 원래 dtype, 카테고리 목록)
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return 'category', str(dtype.categories.dtype), [str(c) for c in dtype.categories]
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'date', str(dtype), None
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool', str(dtype), None
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'int', str(dtype), None
+    if pd.api.types.is_float_dtype(dtype):
+        return 'float', str(dtype), None
+    return 'text', str(dtype), None
+
+
+def _sql_values(series, kind):
+    """
+    컬럼 → DB 에 넣을 값 (날짜는 일 단위 텍스트, 결측은 NULL)
+    """
+    if kind == 'date':
+        days = series.to_numpy().astype('datetime64[D]')
+        text = days.astype(str).astype(object)
+        text[np.isnat(days)] = None
+        return pd.Series(text, index=series.index)
+    if kind in ('category', 'text'):
+        return series.astype(object).where(series.notna(), None)
+    if kind == 'bool':
+        return series.astype('int64')
+    return series
+
+
+SQL_TYPES = {'date': 'TEXT', 'category': 'TEXT', 'text': 'TEXT', 'bool': 'INTEGER', 'int': 'BIGINT', 'float': 'DOUBLE'}
+
+
+class SqlStore:
+    """
+    내장 DB 하나에 저장한 탭 테이블
+
+    engine: 'sqlite' | 'duckdb'
+    tables: 저장된 탭 이름 목록, columns[tab]: {컬럼: (종류, dtype, 카테고리)}
+    """
+
+    def __init__(self, path=':memory:', engine='sqlite'):
+        self.path = path
+        self.engine = engine
+        self.connection = connect(path, engine)
+        self._lock = threading.Lock()
+        self.columns = {}
+        if self._has_table(META_TABLE):
+            for tab, column, kind, dtype, categories in self._execute(
+                f'SELECT tab, "column", kind, dtype, categories FROM {META_TABLE} ORDER BY position'
+            ):
+                self.columns.setdefault(tab, {})[column] = (kind, dtype, json.loads(categories) if categories else None)
+
+    @property
+    def tables(self):
+        return list(self.columns)
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self.connection.execute(sql, list(params)).fetchall()
+
+    def _has_table(self, name):
+        if self.engine == 'duckdb':
+            sql = 'SELECT count(*) FROM information_schema.tables WHERE table_name = ?'
+        else:
+            sql = "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = ?"
+        return self._execute(sql, [name])[0][0] > 0
+
+    def write(self, data):
+        """
+        탭 dict → 테이블 (이미 있는 탭은 교체), 매출/비용 테이블에는 큐브 조회용 인덱스 생성
+        """
+        with self._lock:
+            connection = self.connection
+            if self.engine == 'sqlite':
+                # open_store 는 임시 파일에 다 쓴 뒤 이름을 바꾸므로 쓰는 동안의 저널/동기화는 생략
+                connection.execute('PRAGMA journal_mode = OFF')
+                connection.execute('PRAGMA synchronous = OFF')
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {META_TABLE} '
+                '(tab TEXT, "column" TEXT, position INTEGER, kind TEXT, dtype TEXT, categories TEXT)'
+            )
+            for tab, df in data.items():
+                if df is None:
+                    continue
+                meta = {column: _column_meta(df[column]) for column in df.columns}
+                values = pd.DataFrame({column: _sql_values(df[column], meta[column][0]) for column in df.columns})
+                connection.execute(f'DROP TABLE IF EXISTS {_quote(tab)}')
+                connection.execute(f'DELETE FROM {META_TABLE} WHERE tab = ?', [tab])
+                definition = ', '.join(f'{_quote(column)} {SQL_TYPES[kind]}' for column, (kind, _, _) in meta.items())
+                connection.execute(f'CREATE TABLE {_quote(tab)} ({definition})')
+                if len(values):
+                    self._insert(tab, values)
+                connection.executemany(
+                    f'INSERT INTO {META_TABLE} VALUES (?, ?, ?, ?, ?, ?)',
+                    [
+                        (tab, column, position, kind, dtype, json.dumps(categories, ensure_ascii=False) if categories else None)
+                        for position, (column, (kind, dtype, categories)) in enumerate(meta.items())
+                    ],
+                )
+                dimensions = CUBE_DIMENSIONS.get(tab)
+                if self.engine == 'sqlite' and dimensions and {'date', 'amount_krw', *dimensions} <= set(df.columns):
+                    # 기간 조건 + 집계 컬럼을 담은 커버링 인덱스 (테이블을 읽지 않고 인덱스만 범위 스캔)
+                    indexed = ', '.join(_quote(c) for c in ['date', *dimensions, 'amount_krw'])
+                    connection.execute(f'CREATE INDEX {_quote(tab + "_cube")} ON {_quote(tab)} ({indexed})')
+                self.columns[tab] = meta
+            connection.commit()
+
+    def _insert(self, tab, values):
+        if self.engine == 'duckdb':
+            self.connection.register('_cfo_frame', values)
+            self.connection.execute(f'INSERT INTO {_quote(tab)} SELECT * FROM _cfo_frame')
+            self.connection.unregister('_cfo_frame')
+            return
+        placeholders = ', '.join('?' * len(values.columns))
+        rows = zip(*(values[column].tolist() for column in values.columns))
+        self.connection.executemany(f'INSERT INTO {_quote(tab)} VALUES ({placeholders})', rows)
+
+    def restore(self, tab, frame):
+        """
+        쿼리 결과 컬럼 → 원래 dtype (Categorical 은 저장 시 카테고리 순서 그대로)
+        """
+        meta = self.columns.get(tab, {})
+        for column in frame.columns:
+            if column not in meta:
+                continue
+            kind, dtype, categories = meta[column]
+            series = frame[column]
+            if kind == 'category':
+                if dtype != 'object':
+                    # 숫자 카테고리는 텍스트로 저장했으므로 원래 타입으로
+                    series = pd.to_numeric(series, errors='coerce').astype(dtype)
+                    categories = pd.Index(categories).astype(dtype)
+                frame[column] = pd.Categorical(series, categories=categories)
+            elif kind == 'date':
+                frame[column] = pd.to_datetime(series, format='%Y-%m-%d').astype(dtype)
+            elif kind in ('bool', 'int') and series.notna().all():
+                frame[column] = series.astype(dtype)
+            elif kind == 'float':
+                frame[column] = series.astype('float64')
+        return frame
+
+    def query(self, sql, params=(), tab=None):
+        """
+        SQL → DataFrame (tab 을 주면 같은 이름의 컬럼 타입을 그 탭 기준으로 복원)
+        """
+        with self._lock:
+            if self.engine == 'duckdb':
+                frame = self.connection.execute(sql, list(params)).df()
+            else:
+                cursor = self.connection.execute(sql, list(params))
+                frame = pd.DataFrame.from_records(cursor.fetchall(), columns=[c[0] for c in cursor.description])
+        return self.restore(tab, frame) if tab else frame
+
+    def frame(self, tab, columns=None):
+        """
+        탭 전체 (또는 일부 컬럼) 를 DataFrame 으로 (행 단위 계산이 필요한 경우에만 사용)
+        """
+        columns = [c for c in (columns or self.columns[tab]) if c in self.columns[tab]]
+        return self.query(f'SELECT {", ".join(_quote(c) for c in columns)} FROM {_quote(tab)}', tab=tab)
+
+    def tabs(self, exclude=()):
+        """
+        저장된 탭 dict (exclude 탭 제외) — 매출/비용처럼 큰 탭은 빼고 작은 탭만 읽을 때 사용
+        """
+        return {tab: self.frame(tab) for tab in self.tables if tab not in exclude}
+
+
+def _where(conditions):
+    return ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+
+
+def _day(value):
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+class SqlCube:
+    """
+    MonthlyCube 와 같은 인터페이스의 SQL 큐브 — 필터와 집계를 쿼리로 실행
+
+    monthly: 전체 월별 셀 (year_month + 차원 + amount_krw, count, 생성 시 한 번 조회)
+    index: 일별 누적합 인덱스 (일/주 추이용, 처음 쓸 때 일 단위 집계를 한 번 조회)
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.dimensions = dict(CUBE_DIMENSIONS)
+        self.derived = {}
+        self._derived_lock = threading.Lock()
+        self.monthly = {kind: self.cells(kind) for kind in self.dimensions}
+
+        bounds = [
+            self.store.query(f'SELECT min(date) AS lo, max(date) AS hi FROM {kind}{_where(self._conditions(kind))}')
+            for kind in self.dimensions
+        ]
+        dates = pd.to_datetime(pd.concat(bounds)[['lo', 'hi']].stack(), format='%Y-%m-%d')
+        self.min_date = dates.min() if len(dates) else None
+        self.max_date = dates.max() if len(dates) else None
+
+    def derive(self, name, builder):
+        """
+        큐브에서 만든 파생 인덱스를 큐브당 한 번만 생성 (MonthlyCube.derive 와 같음)
+        """
+        with self._derived_lock:
+            if name not in self.derived:
+                self.derived[name] = builder()
+            return self.derived[name]
+
+    @property
+    def index(self):
+        return self.derive('daily_index', lambda: {
+            kind: DailyIndex(self._daily(kind), INDEX_DIMENSIONS[kind]) for kind in self.dimensions
+        })
+
+    def _conditions(self, kind, start=None, end=None, params=None, **selections):
+        """
+        WHERE 조건 — 날짜/차원 결측 행 제외 (MonthlyCube 집계와 같음) + 기간/선택 목록
+        """
+        conditions = [f'{_quote(c)} IS NOT NULL' for c in ['date', *self.dimensions[kind]]]
+        if start is not None:
+            conditions.append('date >= ?')
+            params.append(_day(start))
+        if end is not None:
+            conditions.append('date <= ?')
+            params.append(_day(end))
+        for dim, selected in selections.items():
+            if selected:
+                selected = [str(value) for value in selected]
+                conditions.append(f'{_quote(dim)} IN ({", ".join("?" * len(selected))})')
+                params.extend(selected)
+        return conditions
+
+    def _grouped(self, kind, keys, conditions, params):
+        """
+        키별 합계/건수 쿼리 → 차원 dtype 복원 후 키 순서(카테고리 순)로 정렬
+        """
+        dimensions = self.dimensions[kind]
+        select = ', '.join(keys + [_quote(d) for d in dimensions])
+        group = ', '.join(str(i + 1) for i in range(len(keys) + len(dimensions)))
+        frame = self.store.query(
+            f'SELECT {select}, coalesce(sum(amount_krw), 0.0) AS amount_krw, count(amount_krw) AS count '
+            f'FROM {kind}{_where(conditions)} GROUP BY {group}',
+            params, tab=kind,
+        )
+        frame['amount_krw'] = frame['amount_krw'].astype('float64')
+        frame['count'] = frame['count'].astype('int64')
+        names = [key.rsplit(' AS ', 1)[-1] for key in keys]
+        return frame.sort_values(names + dimensions, kind='stable').reset_index(drop=True)
+
+    def _daily(self, kind):
+        frame = self._grouped(kind, ['date'], self._conditions(kind), [])
+        frame['date'] = pd.to_datetime(frame['date'], format='%Y-%m-%d')
+        return frame
+
+    def total(self, kind, start=None, end=None, countries=None, teams=None, categories=None):
+        """
+        필터 조건의 금액 합계 (SUM 쿼리)
+        """
+        params = []
+        selections = {'country': countries, 'team': teams}
+        if kind == 'expense':
+            selections['category_l1'] = categories
+        conditions = self._conditions(kind, start, end, params, **selections)
+        rows = self.store._execute(f'SELECT coalesce(sum(amount_krw), 0.0) FROM {kind}{_where(conditions)}', params)
+        return float(rows[0][0])
+
+    def cells(self, kind, start=None, end=None, countries=None, teams=None):
+        """
+        필터 조건에 맞는 월별 셀 (year_month + 차원 + amount_krw, count) — MonthlyCube.cells 와 같은 형태
+        기간 조건을 일 단위로 바로 걸 수 있어 걸친 월을 따로 다시 집계할 필요가 없음
+        """
+        params = []
+        conditions = self._conditions(kind, start, end, params, country=countries, team=teams)
+        return self._grouped(kind, ['substr(date, 1, 7) AS year_month'], conditions, params)
+
+    # ================================
+    # 매출/비용 외 탭 (작은 탭이지만 같은 방식으로 쿼리)
+    # ================================
+
+    def latest_cash(self):
+        """
+        최신 기준일과 그날의 국가별 현금 잔고 (국가로 미리 합산한 행, 합계와 국가별 합계는 원본 행과 같음)
+        """
+        latest = self.store.query(
+            'SELECT country, sum(balance_krw) AS balance_krw FROM cash '
+            'WHERE date = (SELECT max(date) FROM cash) GROUP BY country',
+            tab='cash',
+        ).sort_values('country').reset_index(drop=True)
+        latest_date = self.store._execute('SELECT max(date) FROM cash')[0][0]
+        return pd.Timestamp(latest_date), latest
+
+    def aggregate(self, tab, column, by=(), weight=None, where=None):
+        """
+        tab 의 column 합계를 by 컬럼별로 집계 (MonthlyCube.aggregate 와 같은 결과)
+        weight: 곱해서 합산할 컬럼, where: {컬럼: 값} 일치 조건
+        by 값이 결측인 행은 제외 (pandas groupby 와 같음), 결과는 by 순서(카테고리 순)로 정렬, by 가 없으면 한 행
+        """
+        by = list(by)
+        params = []
+        conditions = [f'{_quote(c)} IS NOT NULL' for c in by]
+        for name, value in (where or {}).items():
+            conditions.append(f'{_quote(name)} = ?')
+            params.append(value)
+        value = _quote(column) if weight is None else f'{_quote(column)} * {_quote(weight)}'
+        select = ', '.join([_quote(c) for c in by] + [f'coalesce(sum({value}), 0.0) AS {_quote(column)}'])
+        group = ' GROUP BY ' + ', '.join(_quote(c) for c in by) if by else ''
+        frame = self.store.query(f'SELECT {select} FROM {_quote(tab)}{_where(conditions)}{group}', params, tab=tab)
+        return frame.sort_values(by).reset_index(drop=True) if by else frame
+
+    def revenue_rows(self, columns):
+        """
+        매출 원장의 일부 컬럼 (청구 건 단위 계산용, 예: 미수금 연령 분석)
+        """
+        return self.store.frame('revenue', columns)
+
+
+def store_path(directory, data_version, engine='sqlite'):
+    """
+    데이터 버전별 DB 파일 경로
+    """
+    digest = hashlib.sha1(str(data_version).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f'cfo-{digest}.{FILE_EXTENSIONS[engine]}')
+
+
+def open_store(data, data_version, engine='sqlite', directory=None):
+    """
+    탭 dict → SqlStore
+    directory 가 있으면 데이터 버전별 파일에 저장 (같은 버전 파일이 있으면 그대로 열고, 다른 버전 파일은 삭제)
+    없으면 메모리 DB
+    """
+    if not directory:
+        store = SqlStore(':memory:', engine)
+        store.write(data)
+        return store
+
+    os.makedirs(directory, exist_ok=True)
+    path = store_path(directory, data_version, engine)
+    if not os.path.exists(path):
+        # 임시 파일에 다 쓴 뒤 이름을 바꿔서, 중간에 실패해도 반쯤 쓴 파일을 열지 않도록
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        store = SqlStore(temp_path, engine)
+        store.write(data)
+        store.connection.close()
+        os.replace(temp_path, path)
+        for old in glob.glob(os.path.join(directory, f'cfo-*.{FILE_EXTENSIONS[engine]}')):
+            if old != path:
+                # 이미 열린 연결은 (POSIX 에서) 삭제 후에도 계속 읽을 수 있음
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+    return SqlStore(path, engine)
+
+
+def make_cube(data, data_version=None, backend='memory', directory=None):
+    """
+    백엔드 이름 → 큐브 (memory: MonthlyCube, sqlite/duckdb: SqlCube)
+    """
+    if backend == 'memory':
+        return MonthlyCube(data['revenue'], data['expense'], tabs=data)
+    if backend not in ENGINES:
+        raise ValueError(f'알 수 없는 백엔드: {backend} (가능: {", ".join(BACKENDS)})')
+    return SqlCube(open_store(data, data_version, backend, directory))
+
+
+def load_result_cube(result, backend='memory', directory=None):
+    """
+    LoadResult 의 큐브 (로드당 한 번, 백엔드별로 따로 보관)
+    """
+    name = MONTHLY_CUBE if backend == 'memory' else f'{backend}_cube'
+    return result.derive(name, lambda data: make_cube(data, result.data_version, backend, directory))
@@ -0,0 +1,220 @@
+"""
+대용량 로컬 CSV 스트리밍 수집
+
+여러 해 분량의 비용/매출 내보내기(CSV)를 한 번에 읽으면 파싱 중에 원본 크기의 몇 배가 되는
+문자열(object) DataFrame 이 통째로 메모리에 올라갑니다. 스트리밍 수집은 파일을 chunk_rows 행씩 읽어
+청크마다 검증/타입 지정을 끝내고, 타입이 지정된 작은 표현으로만 쌓아 둡니다.
+
+- RowStore: 컬럼 단위 행 저장소 (행 수 상한만큼 배열을 미리 잡고 청크를 제자리에 복사, 마지막 concat 없음)
+- DailyFold: 청크별 일 단위 집계를 바로 합쳐 두는 큐브 셀 누적기 (원장을 다시 훑지 않고 MonthlyCube 생성)
+- count_rows: 파일을 작은 블록으로 한 번 훑어 행 수 상한과 파일 크기를 구함
+
+파싱 중 최대 메모리는 파일 크기가 아니라 청크 크기(+ 타입이 지정된 저장소)에 비례합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cfo.cube import aggregate_daily, regroup_daily
+from cfo.schema import TAB_SCHEMAS, canonical_categories, concat_typed
+
+# 행 수를 셀 때 한 번에 읽는 바이트 수
+_SCAN_BLOCK_BYTES = 1 << 20
+
+
+def count_rows(path):
+    """
+    CSV 파일 → (데이터 행 수 상한, 파일 바이트 수)
+    줄바꿈 수를 세므로 따옴표 안의 줄바꿈/빈 줄이 있으면 실제보다 클 수 있음 (작아지지는 않음)
+    """
+    lines = 0
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(_SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            lines += block.count(b'\n')
+            size += len(block)
+    return max(lines, 1), size
+
+
+class _CategoryList:
+    """
+    컬럼의 전체 카테고리 목록 (쌓인 순서) + 값 → 위치 조회용 Index (값이 추가될 때만 다시 만듦)
+    """
+
+    def __init__(self, empty):
+        self.values = []
+        self.empty = empty
+        self._index = None
+
+    def positions(self, uniques):
+        """
+        고유값 배열 → 목록 위치 (처음 보는 값은 목록 뒤에 추가)
+        """
+        if self._index is None:
+            self._index = pd.Index(self.values, dtype=object)
+        positions = self._index.get_indexer(uniques)
+        new = positions < 0
+        if new.any():
+            positions[new] = len(self.values) + np.arange(int(new.sum()))
+            self.values.extend(np.asarray(uniques, dtype=object)[new])
+            self._index = None
+        return positions
+
+
+class RowStore:
+    """
+    타입이 지정된 청크를 이어 붙이는 컬럼 단위 행 저장소
+
+    capacity: 행 수 상한 (count_rows), 모자라면 두 배씩 늘림
+    Categorical/관측값('label') 컬럼은 전체 카테고리 목록 + int32 코드 배열로, 나머지는 첫 청크의 dtype 배열로 보관하고
+    뒤 청크의 dtype 이 더 넓으면(int8 → int16, 숫자 → 문자열 등) 그 컬럼만 넓힘
+    관측값 컬럼의 Categorical/문자열 여부는 청크가 아니라 전체 행 기준으로 frame() 에서 정함 (schema 와 같은 규칙)
+    """
+
+    def __init__(self, tab, capacity):
+        self.tab = tab
+        self.capacity = max(int(capacity), 1)
+        self.rows = 0
+        self.columns = None
+        self._arrays = {}
+        self._categories = {}
+        # capacity 가 실제 행 수 상한인지 (한 번이라도 늘렸으면 상한을 모르므로 끝까지 읽은 뒤 frame() 에서 판단)
+        self._bounded = True
+
+    def _allocate(self, frame):
+        self.columns = list(frame.columns)
+        schema = TAB_SCHEMAS.get(self.tab, {})
+        for column in self.columns:
+            series = frame[column]
+            if isinstance(series.dtype, pd.CategoricalDtype) or schema.get(column) == 'label':
+                # 빈 카테고리 목록의 dtype 도 첫 청크와 같게 (값이 하나도 없는 컬럼)
+                empty = series.cat.categories[:0] if isinstance(series.dtype, pd.CategoricalDtype) else pd.Index(
+                    [], dtype=series.dtype)
+                self._categories[column] = _CategoryList(empty)
+                self._arrays[column] = np.full(self.capacity, -1, dtype=np.int32)
+            else:
+                self._arrays[column] = np.empty(self.capacity, dtype=series.to_numpy().dtype)
+
+    def _grow(self, rows):
+        capacity = max(rows, self.capacity * 2)
+        for column, array in self._arrays.items():
+            grown = np.full(capacity, -1, dtype=array.dtype) if column in self._categories else np.empty(
+                capacity, dtype=array.dtype)
+            grown[:self.rows] = array[:self.rows]
+            self._arrays[column] = grown
+        self.capacity = capacity
+        self._bounded = False
+
+    def _codes(self, column, series):
+        """
+        청크의 값 → 전체 카테고리 목록 기준 코드 (처음 보는 값은 목록 뒤에 추가)
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        # 마지막 칸: 결측 코드 -1 → -1
+        mapping = np.append(self._categories[column].positions(uniques), -1).astype(np.int32)
+        return mapping[codes]
+
+    def _labels(self, column, rows):
+        """
+        코드 배열 → 값 배열 (object, 결측은 NaN, 앞 rows 행만 채움)
+        """
+        categories = self._categories[column].values
+        lookup = np.empty(len(categories) + 1, dtype=object)
+        lookup[:-1] = categories
+        lookup[-1] = np.nan
+        codes = self._arrays[column]
+        values = np.empty(self.capacity, dtype=object)
+        values[:rows] = lookup[codes[:rows]]
+        return values
+
+    def append(self, frame):
+        if self.columns is None:
+            self._allocate(frame)
+        start, end = self.rows, self.rows + len(frame)
+        if end > self.capacity:
+            self._grow(end)
+        for column in self.columns:
+            series = frame[column]
+            if column in self._categories:
+                self._arrays[column][start:end] = self._codes(column, series)
+                if self._bounded and len(self._categories[column].values) > self.capacity // 2:
+                    # 전체 행 수(≤ capacity)의 절반을 이미 넘음 → 끝까지 읽어도 문자열 컬럼, 목록/사전은 버림
+                    self._arrays[column] = self._labels(column, end)
+                    del self._categories[column]
+                continue
+            values = series.to_numpy()
+            array = self._arrays[column]
+            if not np.can_cast(values.dtype, array.dtype, casting='safe'):
+                array = self._arrays[column] = array.astype(np.result_type(array.dtype, values.dtype))
+            array[start:end] = values
+        self.rows = end
+
+    def frame(self):
+        """
+        쌓인 행 → DataFrame (배열을 복사하지 않고 그대로 사용, 카테고리는 한 번에 읽었을 때와 같은 순서)
+        """
+        schema = TAB_SCHEMAS.get(self.tab, {})
+        columns = {}
+        for column in self.columns or []:
+            values = self._arrays[column][:self.rows]
+            if column in self._categories:
+                categories = self._categories[column]
+                if schema.get(column) == 'label' and len(categories.values) > self.rows // 2:
+                    # 행마다 값이 다른 컬럼은 문자열 유지 (schema._label_categorical 과 같은 기준)
+                    columns[column] = self._labels(column, self.rows)[:self.rows]
+                    continue
+                if categories.values:
+                    ordered = canonical_categories(self.tab, column, categories.values)
+                else:
+                    ordered = categories.empty
+                # 쌓인 순서 → 정렬된 순서 (마지막 칸은 결측 코드 -1)
+                mapping = np.full(len(categories.values) + 1, -1, dtype=np.int32)
+                mapping[categories.positions(ordered)] = np.arange(len(ordered), dtype=np.int32)
+                values = pd.Categorical.from_codes(mapping[values], categories=ordered)
+            columns[column] = values
+        return pd.DataFrame(columns, copy=False)
+
+
+class DailyFold:
+    """
+    청크별 큐브 일 단위 셀 누적기
+
+    청크마다 aggregate_daily 로 (일 × 차원) 합계/건수를 만들고,
+    쌓인 셀이 compact_rows 를 넘으면 다시 합산해서 누적 셀 크기를 (일 수 × 차원 조합 수) 안으로 유지
+    """
+
+    def __init__(self, kind, compact_rows=200_000):
+        self.kind = kind
+        self.compact_rows = compact_rows
+        self._parts = []
+        self._rows = 0
+
+    def add(self, chunk):
+        if not len(chunk):
+            return
+        cells = aggregate_daily(chunk, self.kind)
+        self._parts.append(cells)
+        self._rows += len(cells)
+        if self._rows > self.compact_rows and len(self._parts) > 1:
+            self._parts = [regroup_daily(concat_typed(self._parts), self.kind)]
+            self._rows = len(self._parts[0])
+
+    def cells(self):
+        """
+        누적한 일 단위 셀 (MonthlyCube.from_daily 입력, 카테고리는 한 번에 읽었을 때와 같은 순서)
+        """
+        if not self._parts:
+            return None
+        cells = concat_typed(self._parts)
+        for column in cells.columns:
+            if isinstance(cells[column].dtype, pd.CategoricalDtype):
+                cells[column] = cells[column].cat.set_categories(
+                    canonical_categories(self.kind, column, cells[column].cat.categories)
+                )
+        return regroup_daily(cells, self.kind)
@@ -0,0 +1,350 @@
+"""
+수집 단계 스키마 검증
+
+CSV 로 읽은 탭을 SCHEMA_DESIGN.md 의 컬럼 표(TEXT / DATE / NUMBER / BOOLEAN) 기준으로 한 번에 변환하고,
+쓸 수 없는 행은 격리(quarantine)해서 리포트로 돌려줍니다.
+
+- DATE: 고정 형식(DATE_FORMATS)을 차례로 적용, 고유값만 파싱해서 행에 펼침 (형식 추론/행 단위 파싱 없음)
+  CSV 를 csv_dtypes() 로 읽으면 날짜/값 목록 컬럼은 파서가 만든 (고유값 + 코드)를 그대로 씀
+- NUMBER: 벡터화 숫자 변환, 실패한 값만 천 단위 구분 기호/통화 기호를 지우고 다시 변환
+- BOOLEAN: TRUE/FALSE (대소문자, 1/0, Y/N 포함)
+- 값 목록 컬럼(cfo/schema.py): 앞뒤 공백/대소문자만 다른 값은 목록 값으로 맞춤, 목록에 없는 값은 리포트에만 기록
+- 필수 컬럼(REQUIRED_COLUMNS)이 비었거나 형식이 틀린 행은 데이터에서 빼고 격리 목록으로
+  (예: 날짜가 깨진 매출 행이 KPI 에 조용히 빠지거나 잘못 합산되지 않도록)
+- 필수가 아닌 컬럼의 형식 오류는 빈 값으로 두고 리포트에 기록
+
+'', '-' 는 빈 값으로 봅니다 (SCHEMA_DESIGN.md 샘플의 '-').
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from cfo.schema import FALSE_VALUES, TAB_SCHEMAS, TRUE_VALUES
+
+# SCHEMA_DESIGN.md 컬럼 표의 데이터 타입
+COLUMN_TYPES = {
+    'revenue': {
+        'transaction_id': 'TEXT', 'date': 'DATE', 'country': 'TEXT', 'team': 'TEXT', 'client_name': 'TEXT',
+        'project_name': 'TEXT', 'amount_original': 'NUMBER', 'currency': 'TEXT', 'amount_krw': 'NUMBER',
+        'exchange_rate': 'NUMBER', 'payment_status': 'TEXT', 'invoice_date': 'DATE', 'payment_date': 'DATE',
+        'payment_terms': 'TEXT', 'category': 'TEXT', 'notes': 'TEXT',
+    },
+    'expense': {
+        'expense_id': 'TEXT', 'date': 'DATE', 'country': 'TEXT', 'team': 'TEXT', 'category_l1': 'TEXT',
+        'category_l2': 'TEXT', 'vendor': 'TEXT', 'description': 'TEXT', 'amount_original': 'NUMBER',
+        'currency': 'TEXT', 'amount_krw': 'NUMBER', 'exchange_rate': 'NUMBER', 'payment_method': 'TEXT',
+        'is_recurring': 'BOOLEAN', 'project_related': 'TEXT', 'notes': 'TEXT',
+    },
+    'cash': {
+        'date': 'DATE', 'country': 'TEXT', 'account_name': 'TEXT', 'currency': 'TEXT',
+        'balance_original': 'NUMBER', 'balance_krw': 'NUMBER', 'exchange_rate': 'NUMBER',
+    },
+    'pipeline': {
+        'opportunity_id': 'TEXT', 'client_name': 'TEXT', 'project_name': 'TEXT', 'country': 'TEXT', 'team': 'TEXT',
+        'stage': 'TEXT', 'probability': 'NUMBER', 'amount_original': 'NUMBER', 'currency': 'TEXT',
+        'amount_krw': 'NUMBER', 'expected_close_date': 'DATE', 'expected_payment_date': 'DATE',
+        'created_date': 'DATE', 'last_updated': 'DATE', 'notes': 'TEXT',
+    },
+    'headcount': {
+        'employee_id': 'TEXT', 'name': 'TEXT', 'country': 'TEXT', 'team': 'TEXT', 'role': 'TEXT',
+        'employment_type': 'TEXT', 'join_date': 'DATE', 'leave_date': 'DATE', 'monthly_salary_krw': 'NUMBER',
+        'status': 'TEXT',
+    },
+    'budget': {
+        'year': 'NUMBER', 'month': 'NUMBER', 'country': 'TEXT', 'team': 'TEXT',
+        'revenue_target_krw': 'NUMBER', 'expense_budget_krw': 'NUMBER', 'profit_target_krw': 'NUMBER',
+    },
+    'exchange_rates': {
+        'date': 'DATE', 'usd_to_krw': 'NUMBER', 'vnd_to_krw': 'NUMBER',
+    },
+    'pl_monthly': {
+        'year_month': 'TEXT', 'country': 'TEXT', 'team': 'TEXT', 'revenue_krw': 'NUMBER', 'cogs_krw': 'NUMBER',
+        'gross_profit_krw': 'NUMBER', 'gross_margin_pct': 'NUMBER', 'operating_expense_krw': 'NUMBER',
+        'ebitda_krw': 'NUMBER', 'ebitda_margin_pct': 'NUMBER', 'net_profit_krw': 'NUMBER', 'net_margin_pct': 'NUMBER',
+    },
+}
+
+# 비었거나 형식이 틀리면 행을 격리하는 컬럼 (KPI 계산에 꼭 필요한 값)
+REQUIRED_COLUMNS = {
+    'revenue': ['date', 'amount_krw'],
+    'expense': ['date', 'amount_krw'],
+    'cash': ['date', 'balance_krw'],
+    'pipeline': ['amount_krw'],
+    'headcount': [],
+    'budget': ['year', 'month'],
+    'exchange_rates': ['date'],
+    'pl_monthly': ['year_month'],
+}
+
+# 날짜 형식 (앞에서부터 적용, 구글 시트 내보내기에서 흔한 형식)
+DATE_FORMATS = ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y/%m/%d', '%Y. %m. %d', '%Y.%m.%d', '%m/%d/%Y']
+
+MISSING_VALUES = ['', '-']
+
+# 리포트의 오류 종류
+ISSUE_DATE = '날짜 형식 오류'
+ISSUE_NUMBER = '숫자 형식 오류'
+ISSUE_BOOL = 'TRUE/FALSE 아님'
+ISSUE_MISSING = '필수 값 없음'
+ISSUE_UNKNOWN = '목록에 없는 값'
+
+ISSUE_COLUMNS = ['column', 'issue', 'count', 'examples', 'quarantined']
+
+
+@dataclass
+class ValidationReport:
+    """
+    탭 하나의 검증 결과
+
+    rows: 읽은 행 수, quarantined: 격리된 원본 행 (+ row: CSV 줄 번호, reason: 사유)
+    issues: 컬럼별 오류 집계 (column, issue, count, examples, quarantined: 해당 오류로 격리했는지)
+    """
+
+    tab: str
+    rows: int = 0
+    quarantined: pd.DataFrame = field(default_factory=pd.DataFrame)
+    issues: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=ISSUE_COLUMNS))
+
+    @property
+    def valid_rows(self):
+        return self.rows - len(self.quarantined)
+
+    @property
+    def ok(self):
+        return len(self.issues) == 0
+
+    def merge(self, other):
+        """
+        이어서 읽은 부분(증분 수집)의 리포트를 합친 새 리포트
+        """
+        issues = pd.concat([self.issues, other.issues], ignore_index=True)
+        if len(issues):
+            issues = issues.groupby(['column', 'issue', 'quarantined'], sort=False, as_index=False).agg(
+                count=('count', 'sum'), examples=('examples', lambda e: list(dict.fromkeys(sum(e, [])))[:3]),
+            )[ISSUE_COLUMNS]
+        frames = [f for f in (self.quarantined, other.quarantined) if len(f)]
+        quarantined = pd.concat(frames, ignore_index=True) if frames else self.quarantined
+        return ValidationReport(self.tab, self.rows + other.rows, quarantined, issues)
+
+
+def csv_dtypes(tab):
+    """
+    pd.read_csv 의 dtype 인자 — 날짜/값 목록 컬럼은 'category' 로 읽음
+    CSV 파서가 고유값 + 코드로 넘겨주므로 검증에서 행마다 문자열을 다시 해시하지 않음
+    """
+    schema = TAB_SCHEMAS.get(tab, {})
+    return {
+        column: 'category' for column, kind in COLUMN_TYPES.get(tab, {}).items()
+        if kind == 'DATE' or isinstance(schema.get(column), list)
+    }
+
+
+def _blank(values):
+    """
+    object 배열의 빈 값 마스크 (NaN, '', '-', 공백만 있는 값)
+    """
+    missing = pd.isna(values)
+    text = ~missing & np.array([isinstance(v, str) for v in values], dtype=bool)
+    if text.any():
+        missing[text] = pd.Index(values[text]).str.strip().isin(MISSING_VALUES)
+    return missing
+
+
+def _by_unique(series, parse):
+    """
+    고유값만 parse 로 변환해서 행에 펼침 (날짜/값 목록처럼 반복이 많은 컬럼)
+    반환: (변환된 배열, 원래 고유값 배열, 행별 고유값 번호, 빈 값 여부 배열(고유값 기준))
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # category 로 읽은 컬럼은 카테고리가 고유값, 코드가 행별 번호 (결측 -1)
+        codes = series.cat.codes.to_numpy()
+        uniques = np.asarray(series.cat.categories, dtype=object)
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        uniques = np.asarray(uniques, dtype=object)
+    blank = _blank(uniques)
+    return parse(uniques, blank), uniques, codes, blank
+
+
+def parse_dates(series):
+    """
+    날짜 컬럼 → (datetime64 Series, 형식 오류 마스크, 빈 값 마스크)
+    """
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        missing = series.isna().to_numpy()
+        return series, np.zeros(len(series), dtype=bool), missing
+
+    def parse(uniques, blank):
+        text = pd.Index(uniques.astype(str)).str.strip()
+        parsed = pd.Series(pd.NaT, index=range(len(uniques)), dtype='datetime64[ns]')
+        pending = ~blank
+        for fmt in DATE_FORMATS:
+            if not pending.any():
+                break
+            attempt = pd.to_datetime(text[pending], format=fmt, errors='coerce')
+            parsed.iloc[np.flatnonzero(pending)] = attempt
+            pending &= parsed.isna().to_numpy()
+        return parsed.to_numpy()
+
+    parsed, _, codes, blank = _by_unique(series, parse)
+    # 고유값 → 행 (결측 코드 -1 은 NaT)
+    values = np.where(codes >= 0, parsed[np.maximum(codes, 0)], np.datetime64('NaT'))
+    missing = np.where(codes >= 0, blank[np.maximum(codes, 0)], True)
+    invalid = np.isnat(values) & ~missing
+    return pd.Series(values, index=series.index, name=series.name), invalid, missing
+
+
+def parse_numbers(series):
+    """
+    숫자 컬럼 → (float64 Series, 형식 오류 마스크, 빈 값 마스크)
+    '1,234', '₩1,234', '12%' 처럼 서식이 붙은 값은 기호를 지우고 변환
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        values = series.astype('float64')
+        return values, np.zeros(len(series), dtype=bool), values.isna().to_numpy()
+
+    values = pd.to_numeric(series, errors='coerce').astype('float64')
+    failed = values.isna().to_numpy()
+    if not failed.any():
+        return values, failed, failed
+
+    raw = series.to_numpy(dtype=object)
+    missing = np.zeros(len(series), dtype=bool)
+    missing[failed] = _blank(raw[failed])
+    retry = failed & ~missing
+    if retry.any():
+        cleaned = pd.Series(raw[retry]).astype(str).str.replace(r'[,\s₩$%]', '', regex=True)
+        values.iloc[np.flatnonzero(retry)] = pd.to_numeric(cleaned, errors='coerce').to_numpy()
+    invalid = values.isna().to_numpy() & ~missing
+    return values, invalid, missing
+
+
+def parse_bools(series):
+    """
+    TRUE/FALSE 컬럼 → (bool Series, 형식 오류 마스크, 빈 값 마스크) — 빈 값/오류는 False
+    """
+    if series.dtype == bool:
+        return series, np.zeros(len(series), dtype=bool), np.zeros(len(series), dtype=bool)
+
+    def parse(uniques, blank):
+        text = pd.Index(uniques.astype(str)).str.strip().str.lower()
+        return np.where(text.isin(TRUE_VALUES), 1, np.where(text.isin(FALSE_VALUES) | blank, 0, -1))
+
+    parsed, _, codes, _ = _by_unique(series, parse)
+    values = np.where(codes >= 0, parsed[np.maximum(codes, 0)], 0)
+    return pd.Series(values == 1, index=series.index, name=series.name), values == -1, codes < 0
+
+
+def normalize_labels(series, categories):
+    """
+    값 목록 컬럼 → (Categorical Series, 목록에 없는 값 마스크)
+    공백/대소문자만 다른 값은 목록 값으로 맞추고, 목록에 없는 값은 정렬해서 뒤에 추가
+    (schema._fixed_categorical 과 같은 카테고리 구성 → apply_schema 에서 다시 변환하지 않음)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) and list(series.cat.categories[:len(categories)]) == list(categories):
+        # 이미 목록 순서로 변환된 컬럼 (더미 데이터, 다시 검증하는 프레임)
+        known = series.isin(categories).to_numpy() | series.isna().to_numpy()
+        return series, ~known
+    lookup = {str(c).lower(): i for i, c in enumerate(categories)}
+
+    def parse(uniques, blank):
+        text = pd.Index(uniques.astype(str)).str.strip()
+        positions = np.array([lookup.get(t.lower(), -1) for t in text], dtype=np.int64)
+        unknown = (positions < 0) & ~blank
+        extra = sorted(set(text[unknown]), key=str)
+        positions[unknown] = len(categories) + pd.Index(extra).get_indexer(text[unknown])
+        return positions, unknown, list(categories) + extra
+
+    (positions, unknown, all_categories), _, codes, _ = _by_unique(series, parse)
+    rows = np.maximum(codes, 0)
+    # 결측/빈 값은 -1 (NaN)
+    values = pd.Categorical.from_codes(np.where(codes >= 0, positions[rows], -1), categories=all_categories)
+    return pd.Series(values, index=series.index, name=series.name), (codes >= 0) & unknown[rows]
+
+
+def _examples(series, mask, limit=3):
+    return [str(v) for v in pd.unique(series.to_numpy()[mask])[:limit]]
+
+
+def validate_tab(tab, df, first_row=2):
+    """
+    탭 변환 + 검증 → (정상 행 DataFrame, ValidationReport)
+    first_row: 첫 데이터 행의 CSV 줄 번호 (헤더가 1번 줄, 증분 수집이면 이어지는 번호)
+    스키마에 없는 탭/컬럼은 그대로 통과
+    """
+    types = COLUMN_TYPES.get(tab, {})
+    required = set(REQUIRED_COLUMNS.get(tab, []))
+    schema = TAB_SCHEMAS.get(tab, {})
+    columns = {}
+    issues = []
+    reject = np.zeros(len(df), dtype=bool)
+    reasons = []
+
+    for column, kind in types.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        invalid = None
+        if kind == 'DATE':
+            converted, invalid, missing = parse_dates(series)
+            issue = ISSUE_DATE
+        elif kind == 'NUMBER':
+            converted, invalid, missing = parse_numbers(series)
+            issue = ISSUE_NUMBER
+        elif kind == 'BOOLEAN':
+            converted, invalid, missing = parse_bools(series)
+            issue = ISSUE_BOOL
+        elif isinstance(schema.get(column), list):
+            converted, unknown = normalize_labels(series, schema[column])
+            if unknown.any():
+                issues.append([column, ISSUE_UNKNOWN, int(unknown.sum()), _examples(series, unknown), False])
+            missing = None
+            if column in required:
+                missing = series.isna().to_numpy()
+        else:
+            converted, missing = series, (series.isna().to_numpy() if column in required else None)
+
+        if converted is not series:
+            columns[column] = converted
+        if invalid is not None and invalid.any():
+            issues.append([column, issue, int(invalid.sum()), _examples(series, invalid), column in required])
+            if column in required:
+                reject |= invalid
+                reasons.append((invalid, f'{column}: {issue}'))
+        if column in required and missing is not None and missing.any():
+            issues.append([column, ISSUE_MISSING, int(missing.sum()), [], True])
+            reject |= missing
+            reasons.append((missing, f'{column}: {ISSUE_MISSING}'))
+
+    frame = df
+    if columns:
+        # 얕은 복사에 변환한 컬럼만 바꿔 끼움 (DataFrame.assign 은 전체 컬럼을 복사)
+        frame = df.copy(deep=False)
+        for column, values in columns.items():
+            frame[column] = values
+    report = ValidationReport(tab, rows=len(df), issues=pd.DataFrame(issues, columns=ISSUE_COLUMNS))
+    if reject.any():
+        positions = np.flatnonzero(reject)
+        quarantined = df.iloc[positions].copy()
+        quarantined.insert(0, 'row', positions + first_row)
+        # 사유는 격리된 행에 대해서만 문자열로 조합
+        quarantined.insert(1, 'reason', [
+            '; '.join(reason for mask, reason in reasons if mask[position]) for position in positions
+        ])
+        report.quarantined = quarantined.reset_index(drop=True)
+        frame = frame[~reject].reset_index(drop=True)
+    return frame, report
+
+
+def issues_table(reports):
+    """
+    탭별 리포트 dict → 한 표 (tab + ISSUE_COLUMNS)
+    """
+    rows = [
+        {'tab': tab, **issue}
+        for tab, report in reports.items() if report is not None
+        for issue in report.issues.to_dict('records')
+    ]
+    return pd.DataFrame(rows, columns=['tab'] + ISSUE_COLUMNS)
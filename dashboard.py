@@ -6,14 +6,33 @@ EO Studio CFO Dashboard
 streamlit run dashboard.py
 """
 
+import os
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from cfo.charts import cached_figure, downsample
+from cfo.daily_index import GRANULARITIES
+from cfo.data_store import DataStore
+from cfo.data_sources import TAB_NAMES, StreamingCsvSource, load_all_tabs, make_source
+from cfo.filters import FilterEngine
+from cfo.fx import FxConverter
+from cfo.incremental import IncrementalSource
+from cfo.instrumentation import LatencyStats, RunRecorder, configure_logging
+from cfo.metrics import compute_runway_forecast, compute_section, compute_trends, normalize_filters
+from cfo.pl_store import PlMonthlyStore
+from cfo.result_cache import ResultCache
+from cfo.schema import memory_report
+from cfo.snapshot import SnapshotCache
+from cfo.sql_backend import load_result_cube
+from cfo.validation import issues_table
+
 # ================================
 # 페이지 설정
 # ================================
@@ -25,193 +44,269 @@ st.set_page_config(
 )
 
 # ================================
-# 더미 데이터 생성 함수
-# 나중에 구글 시트 연결 시 이 함수만 교체하면 됩니다
+# 데이터 소스 설정
+# CFO_DATA_SOURCE: fake(더미 데이터) | sheets(구글 시트 CSV Export) | csv(로컬 CSV)
 # ================================
+DATA_SOURCE = os.environ.get('CFO_DATA_SOURCE', 'fake')
+DATA_DIR = os.environ.get('CFO_DATA_DIR', 'data')
+# 로컬 CSV 스트리밍 수집: RAW_Revenue/RAW_Expense 를 이 행 수씩 읽어 타입 지정/집계 (0 이면 파일을 한 번에 읽음)
+CSV_CHUNK_ROWS = int(os.environ.get('CFO_CSV_CHUNK_ROWS', 0))
+# 백그라운드 새로고침 주기(초) — 세션은 새로고침 중에도 이전 버전을 바로 읽음 (0 이면 수동 새로고침만)
+DATA_TTL_SECONDS = int(os.environ.get('CFO_DATA_TTL', 300))
+
+# 구글 시트 CSV URL (각 탭별로 웹에 게시한 URL, 예: CFO_SHEET_URL_REVENUE)
+SHEET_URLS = {tab: os.environ.get(f'CFO_SHEET_URL_{tab.upper()}', '') for tab in TAB_NAMES}
+
+# 탭별 타임아웃(초) / 재시도 횟수
+TAB_TIMEOUT_SECONDS = float(os.environ.get('CFO_TAB_TIMEOUT', 10))
+TAB_RETRIES = int(os.environ.get('CFO_TAB_RETRIES', 2))
+
+# 더미 데이터 규모 (부하 테스트 시 환경 변수로 조절)
+FAKE_REVENUE_ROWS = int(os.environ.get('CFO_FAKE_REVENUE_ROWS', 500))
+FAKE_EXPENSE_ROWS = int(os.environ.get('CFO_FAKE_EXPENSE_ROWS', 800))
+FAKE_START_DATE = os.environ.get('CFO_FAKE_START_DATE', '2023-01-01')
+FAKE_END_DATE = os.environ.get('CFO_FAKE_END_DATE', '2024-10-31')
+
+# 환율 환산 기준: transaction(거래일 환율) | month_end(월말 환율) | off(시트의 amount_krw 그대로 사용)
+FX_MODE = os.environ.get('CFO_FX_MODE', 'transaction')
+
+# RAW_Revenue / RAW_Expense 증분 수집 (새로 추가된 행만 파싱, 과거 행 수정 시 전체 로드)
+INCREMENTAL_INGEST = os.environ.get('CFO_INCREMENTAL', '1') == '1'
+
+@st.cache_resource
+def get_data_source(source_kind=DATA_SOURCE, incremental=INCREMENTAL_INGEST):
+    """
+    데이터 소스 생성 (프로세스당 1개)
+    증분 수집 워터마크가 TTL 새로고침 사이에 유지되도록 cache_resource 로 보관
+    스트리밍 수집 소스는 원문을 통째로 읽지 않으므로 증분 수집으로 감싸지 않음
+    """
+    source = make_source(
+        source_kind,
+        sheet_urls=SHEET_URLS,
+        data_dir=DATA_DIR,
+        chunk_rows=CSV_CHUNK_ROWS,
+        fx_mode=FX_MODE if FX_MODE != 'off' else None,
+        n_revenue=FAKE_REVENUE_ROWS,
+        n_expense=FAKE_EXPENSE_ROWS,
+        start_date=FAKE_START_DATE,
+        end_date=FAKE_END_DATE,
+        seed=42
+    )
+    if not incremental or isinstance(source, StreamingCsvSource):
+        return source
+    return IncrementalSource(source)
 
-@st.cache_data
-def load_fake_data():
+@st.cache_resource
+def get_fx_converter(mode=FX_MODE):
     """
-    더미 데이터 생성
-    실제 환경에서는 이 함수를 구글 시트 또는 CSV에서 읽어오는 함수로 교체
+    환율 환산기 (프로세스당 1개)
+    환율만 수정된 경우 바뀐 구간의 행만 다시 계산하도록 이전 환산 결과를 새로고침 사이에 유지
     """
-    np.random.seed(42)
-
-    # 날짜 범위 생성 (2023년 1월 ~ 2024년 10월)
-    start_date = datetime(2023, 1, 1)
-    end_date = datetime(2024, 10, 31)
-    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-
-    countries = ['Korea', 'USA', 'Vietnam']
-    teams = ['Video Production', 'Branded Content', 'EO School']
-
-    # ============ RAW_Revenue 데이터 생성 ============
-    revenue_data = []
-    for i in range(500):  # 500개의 매출 거래
-        date = np.random.choice(date_range)
-        country = np.random.choice(countries, p=[0.5, 0.3, 0.2])
-        team = np.random.choice(teams)
-
-        # 국가별 금액 범위 조정
-        if country == 'Korea':
-            amount = np.random.randint(10_000_000, 100_000_000)
-            currency = 'KRW'
-            amount_krw = amount
-        elif country == 'USA':
-            amount = np.random.randint(10_000, 80_000)
-            currency = 'USD'
-            amount_krw = amount * 1300
-        else:  # Vietnam
-            amount = np.random.randint(200_000_000, 1_500_000_000)
-            currency = 'VND'
-            amount_krw = amount * 0.055
-
-        payment_status = np.random.choice(['Paid', 'Pending', 'Overdue'], p=[0.7, 0.2, 0.1])
-
-        revenue_data.append({
-            'transaction_id': f'REV-{i+1:04d}',
-            'date': date,
-            'country': country,
-            'team': team,
-            'client_name': f'Client {np.random.randint(1, 50)}',
-            'project_name': f'Project {np.random.randint(1, 100)}',
-            'amount_original': amount,
-            'currency': currency,
-            'amount_krw': amount_krw,
-            'payment_status': payment_status,
-            'category': np.random.choice(['Retainer', 'Project-based', 'License'])
-        })
+    return FxConverter(mode)
 
-    df_revenue = pd.DataFrame(revenue_data)
-    df_revenue['date'] = pd.to_datetime(df_revenue['date'])
-
-    # ============ RAW_Expense 데이터 생성 ============
-    expense_data = []
-    categories_l1 = ['Personnel', 'Marketing', 'Operations', 'COGS']
-
-    for i in range(800):  # 800개의 비용 거래
-        date = np.random.choice(date_range)
-        country = np.random.choice(countries, p=[0.5, 0.3, 0.2])
-        team = np.random.choice(teams + ['Admin'])
-        category_l1 = np.random.choice(categories_l1, p=[0.5, 0.15, 0.2, 0.15])
-
-        # 비용 카테고리별 금액 범위
-        if category_l1 == 'Personnel':
-            amount = np.random.randint(3_000_000, 15_000_000)
-        elif category_l1 == 'Marketing':
-            amount = np.random.randint(500_000, 10_000_000)
-        elif category_l1 == 'COGS':
-            amount = np.random.randint(1_000_000, 20_000_000)
-        else:
-            amount = np.random.randint(500_000, 5_000_000)
-
-        expense_data.append({
-            'expense_id': f'EXP-{i+1:04d}',
-            'date': date,
-            'country': country,
-            'team': team,
-            'category_l1': category_l1,
-            'category_l2': f'{category_l1}_sub',
-            'vendor': f'Vendor {np.random.randint(1, 30)}',
-            'description': f'Expense description {i+1}',
-            'amount_krw': amount,
-            'currency': 'KRW'
-        })
+# 집계 백엔드: memory(pandas 큐브) | sqlite | duckdb(내장 DB 에 탭을 저장하고 필터/집계를 쿼리로 실행, 결과는 같음)
+# CFO_SQL_DIR: 데이터 버전별 DB 파일 폴더 (빈 값이면 메모리 DB)
+BACKEND = os.environ.get('CFO_BACKEND', 'memory')
+SQL_DIR = os.environ.get('CFO_SQL_DIR', os.path.join('.cache', 'cfo_sql'))
 
-    df_expense = pd.DataFrame(expense_data)
-    df_expense['date'] = pd.to_datetime(df_expense['date'])
-
-    # ============ Cash 데이터 생성 ============
-    cash_data = []
-    cash_dates = pd.date_range(start='2023-01-31', end='2024-10-31', freq='M')
-
-    for date in cash_dates:
-        for country in countries:
-            balance = np.random.randint(100_000_000, 800_000_000)
-            cash_data.append({
-                'date': date,
-                'country': country,
-                'balance_krw': balance
-            })
-
-    df_cash = pd.DataFrame(cash_data)
-    df_cash['date'] = pd.to_datetime(df_cash['date'])
-
-    # ============ Sales Pipeline 데이터 생성 ============
-    pipeline_data = []
-    stages = ['Proposal', 'Contract', 'Payment Pending', 'Closed Won']
-
-    for i in range(50):
-        country = np.random.choice(countries)
-        team = np.random.choice(teams)
-        stage = np.random.choice(stages)
-
-        amount = np.random.randint(20_000_000, 150_000_000)
-        probability = {
-            'Proposal': np.random.randint(20, 50),
-            'Contract': np.random.randint(60, 80),
-            'Payment Pending': np.random.randint(80, 95),
-            'Closed Won': 100
-        }[stage]
-
-        pipeline_data.append({
-            'opportunity_id': f'OPP-{i+1:04d}',
-            'client_name': f'Prospect {i+1}',
-            'project_name': f'Opportunity {i+1}',
-            'country': country,
-            'team': team,
-            'stage': stage,
-            'probability': probability,
-            'amount_krw': amount,
-            'expected_close_date': datetime.now() + timedelta(days=np.random.randint(30, 180))
-        })
+# 컬럼 단위 디스크 스냅샷 (서버 재시작 시 memory-map 으로 즉시 시작, 빈 값이면 사용 안 함)
+SNAPSHOT_DIR = os.environ.get('CFO_SNAPSHOT_DIR', os.path.join('.cache', 'cfo_snapshot'))
 
-    df_pipeline = pd.DataFrame(pipeline_data)
-
-    # ============ Headcount 데이터 생성 ============
-    headcount_data = []
-    for i in range(50):
-        country = np.random.choice(countries, p=[0.5, 0.3, 0.2])
-        team = np.random.choice(teams + ['Admin'])
-
-        headcount_data.append({
-            'employee_id': f'EMP-{i+1:03d}',
-            'name': f'Employee {i+1}',
-            'country': country,
-            'team': team,
-            'role': np.random.choice(['Junior', 'Senior', 'Lead', 'Manager']),
-            'monthly_salary_krw': np.random.randint(3_000_000, 12_000_000),
-            'status': 'Active'
-        })
+def fetch_all_tabs(source_kind=DATA_SOURCE):
+    """
+    데이터 소스에서 모든 탭을 동시에 로드
+    실패한 탭은 LoadResult.errors 에 담겨 반환됨
+    """
+    result = load_all_tabs(get_data_source(source_kind), timeout=TAB_TIMEOUT_SECONDS, retries=TAB_RETRIES)
+    if FX_MODE != 'off':
+        # amount_krw 를 Exchange_Rates 탭 기준으로 다시 계산
+        result.data = get_fx_converter().apply(result.data)
+    return result
+
+@st.cache_resource
+def get_snapshot_cache(source_kind=DATA_SOURCE):
+    """
+    스냅샷 캐시 (프로세스당 1개)
+    """
+    return SnapshotCache(
+        os.path.join(SNAPSHOT_DIR, source_kind),
+        loader=lambda: fetch_all_tabs(source_kind)
+    )
+
+# 월별 손익 저장소 (마감한 달은 고정 값 사용, 빈 값이면 사용 안 함 → 매 로드마다 전체 기간 계산)
+# CFO_PL_OPEN_MONTHS: 데이터 마지막 달을 포함해 자동 마감하지 않는 달 수
+PL_STORE_DIR = os.environ.get('CFO_PL_STORE_DIR', '')
+PL_OPEN_MONTHS = int(os.environ.get('CFO_PL_OPEN_MONTHS', 2))
+
+@st.cache_resource
+def get_pl_store(source_kind=DATA_SOURCE):
+    """
+    월별 손익 저장소 (프로세스당 1개, 마감/재오픈은 CLI 로 실행하고 다음 데이터 갱신부터 반영)
+    """
+    if not PL_STORE_DIR:
+        return None
+    return PlMonthlyStore(os.path.join(PL_STORE_DIR, source_kind), open_months=PL_OPEN_MONTHS)
+
+# 섹션 결과 캐시 한도 (세션 간 공유, LRU)
+RESULT_CACHE_ENTRIES = int(os.environ.get('CFO_RESULT_CACHE_ENTRIES', 256))
+RESULT_CACHE_MB = float(os.environ.get('CFO_RESULT_CACHE_MB', 64))
+
+@st.cache_resource
+def get_result_cache():
+    """
+    섹션 결과 캐시 (프로세스당 1개, 모든 세션이 공유)
+    """
+    return ResultCache(max_entries=RESULT_CACHE_ENTRIES, max_bytes=int(RESULT_CACHE_MB * 1024 ** 2))
 
-    df_headcount = pd.DataFrame(headcount_data)
+# 차트 전송량: 계열당 최대 점 수(LTTB 다운샘플링), WebGL 로 그릴 점 수 기준, Figure JSON 캐시 한도
+CHART_MAX_POINTS = int(os.environ.get('CFO_CHART_MAX_POINTS', 1000))
+CHART_WEBGL_POINTS = int(os.environ.get('CFO_CHART_WEBGL_POINTS', 1500))
+FIGURE_CACHE_MB = float(os.environ.get('CFO_FIGURE_CACHE_MB', 64))
 
-    return {
-        'revenue': df_revenue,
-        'expense': df_expense,
-        'cash': df_cash,
-        'pipeline': df_pipeline,
-        'headcount': df_headcount
-    }
+@st.cache_resource
+def get_figure_cache():
+    """
+    차트 Figure JSON 캐시 (프로세스당 1개, 모든 세션이 공유)
+    """
+    return ResultCache(max_entries=RESULT_CACHE_ENTRIES, max_bytes=int(FIGURE_CACHE_MB * 1024 ** 2))
+
+# Monte Carlo Runway: 시뮬레이션 경로 수, 예측 기간(개월), 프로세스 수 (1 이면 현재 프로세스에서 계산)
+RUNWAY_PATHS = int(os.environ.get('CFO_RUNWAY_PATHS', 20000))
+RUNWAY_HORIZON = int(os.environ.get('CFO_RUNWAY_HORIZON', 36))
+RUNWAY_WORKERS = int(os.environ.get('CFO_RUNWAY_WORKERS', 1))
+
+# 섹션 지연 렌더링: 각 섹션을 fragment 로 분리하고 펼친 섹션만 계산/차트 생성 (0 이면 모든 섹션을 항상 렌더링)
+LAZY_SECTIONS = os.environ.get('CFO_LAZY_SECTIONS', '1') == '1'
+# 처음부터 펼쳐 둘 섹션 (cash_runway, revenue, expense, pl, budget, pipeline, headcount, risk)
+OPEN_SECTIONS = set(os.environ.get('CFO_OPEN_SECTIONS', 'cash_runway,risk').split(','))
+
+# 섹션별 계측 (CFO_INSTRUMENTATION=1 또는 URL ?instrument=1)
+INSTRUMENTATION = os.environ.get('CFO_INSTRUMENTATION', '0') == '1'
+INSTRUMENTATION_SUMMARY_EVERY = int(os.environ.get('CFO_INSTRUMENTATION_SUMMARY_EVERY', 50))
+
+@st.cache_resource
+def get_latency_stats():
+    """
+    섹션별 소요 시간 집계 (프로세스당 1개, p50/p95 는 모든 세션 기준)
+    """
+    configure_logging()
+    return LatencyStats(summary_every=INSTRUMENTATION_SUMMARY_EVERY)
+
+@st.cache_resource
+def get_data_store(source_kind=DATA_SOURCE):
+    """
+    프로세스 전역 데이터 저장소 (프로세스당 1개, 모든 세션이 같은 LoadResult 를 복사 없이 읽기 전용으로 공유)
+    스냅샷이 있으면 스냅샷으로 바로 시작하고, 스냅샷 새로고침이 끝나면 저장소 새로고침을 깨워 새 버전으로 교체
+    """
+    if not SNAPSHOT_DIR:
+        return DataStore(lambda: fetch_all_tabs(source_kind), refresh_seconds=DATA_TTL_SECONDS)
+    snapshot_cache = get_snapshot_cache(source_kind)
+    store = DataStore(snapshot_cache.get, refresh_seconds=DATA_TTL_SECONDS)
+    snapshot_cache.on_refresh = store.refresh
+    return store
+
+def load_data(source_kind=DATA_SOURCE):
+    """
+    현재 데이터 버전 (첫 로드만 기다리고, 이후에는 백그라운드 새로고침과 관계없이 바로 반환)
+    """
+    store = get_data_store(source_kind)
+    if store.current is not None:
+        return store.get()
+    source = get_data_source(source_kind)
+    with st.spinner("데이터 로드 중..."):
+        if not isinstance(source, StreamingCsvSource):
+            return store.get()
+        # 스트리밍 수집은 청크 단위 진행 상황을 표시 (로드는 별도 스레드, 화면은 이 스레드에서 갱신)
+        loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cfo-first-load')
+        future = loader.submit(store.get)
+        loader.shutdown(wait=False)
+        bar = st.progress(0.0, text="CSV 읽는 중...")
+        while not future.done():
+            progress = list(source.progress.values())
+            total = sum(p['total_bytes'] for p in progress)
+            if total:
+                bar.progress(
+                    min(sum(p['bytes'] for p in progress) / total, 1.0),
+                    text="CSV 읽는 중... " + ", ".join(
+                        f"{TAB_NAMES[tab]} {p['rows']:,}행" for tab, p in source.progress.items()
+                    ),
+                )
+            wait([future], timeout=0.25)
+        bar.empty()
+        return future.result()
 
 # ================================
 # 데이터 로드
 # ================================
-data = load_fake_data()
+instrument = RunRecorder(
+    get_latency_stats(),
+    enabled=INSTRUMENTATION or st.query_params.get('instrument') == '1'
+)
+instrument.begin('data_load')
+
+load_result = load_data(DATA_SOURCE)
+
+if load_result.missing_required:
+    st.error(
+        "데이터 로드 실패: "
+        + ", ".join(f"{TAB_NAMES[tab]} ({load_result.errors.get(tab, '탭 없음')})"
+                    for tab in load_result.missing_required)
+    )
+    st.stop()  # 필수 탭이 없으면 중단
+
+if load_result.errors:
+    st.sidebar.warning(
+        "⚠️ 일부 탭 로드 실패 (나머지 데이터로 표시):\n\n"
+        + "\n".join(f"- {TAB_NAMES[tab]}: {message}" for tab, message in load_result.errors.items())
+    )
+
+quarantined = {tab: len(report.quarantined) for tab, report in load_result.validation.items() if len(report.quarantined)}
+if quarantined:
+    st.sidebar.warning(
+        "⚠️ 형식 오류로 제외한 행 (필수 값 없음/날짜·금액 형식 오류):\n\n"
+        + "\n".join(f"- {TAB_NAMES[tab]}: {count:,}행" for tab, count in quarantined.items())
+    )
+validation_issues = issues_table(load_result.validation)
+if len(validation_issues):
+    with st.sidebar.expander(f"🧾 데이터 검증 리포트 ({len(validation_issues)}건)"):
+        st.dataframe(
+            validation_issues.assign(
+                tab=validation_issues['tab'].map(TAB_NAMES),
+                examples=validation_issues['examples'].map(', '.join),
+            ).rename(columns={
+                'tab': '탭', 'column': '컬럼', 'issue': '오류', 'count': '행 수',
+                'examples': '예시', 'quarantined': '제외',
+            }),
+            hide_index=True,
+        )
+
+data = load_result.data
 df_revenue = data['revenue']
 df_expense = data['expense']
 df_cash = data['cash']
 df_pipeline = data['pipeline']
 df_headcount = data['headcount']
 
+# 월별 집계 큐브 (데이터 로드당 한 번 생성, 모든 섹션이 큐브를 잘라서 사용, SQL 백엔드면 쿼리로 집계)
+cube = load_result_cube(load_result, BACKEND, SQL_DIR)
+pl_store = get_pl_store()
+if pl_store is not None:
+    pl_store.attach(cube)
+
+# 거래 단위 필터 인덱스 (날짜순 정렬 + 국가/팀 코드)
+revenue_filter = load_result.derive('revenue_filter', lambda d: FilterEngine(d['revenue']))
+expense_filter = load_result.derive('expense_filter', lambda d: FilterEngine(d['expense']))
+instrument.add(rows=sum(len(df) for df in data.values()))
+
 # ================================
 # 사이드바 - 필터
 # ================================
+instrument.begin('sidebar_filter')
 st.sidebar.title("🎛️ 필터 설정")
 
 # 날짜 범위 필터
-min_date = min(df_revenue['date'].min(), df_expense['date'].min())
-max_date = max(df_revenue['date'].max(), df_expense['date'].max())
+min_date = cube.min_date
+max_date = cube.max_date
 
 date_range = st.sidebar.date_input(
     "기간 선택",
@@ -221,39 +316,182 @@ date_range = st.sidebar.date_input(
 )
 
 if len(date_range) == 2:
-    start_date, end_date = date_range
-    df_revenue_filtered = df_revenue[(df_revenue['date'] >= pd.Timestamp(start_date)) &
-                                      (df_revenue['date'] <= pd.Timestamp(end_date))]
-    df_expense_filtered = df_expense[(df_expense['date'] >= pd.Timestamp(start_date)) &
-                                      (df_expense['date'] <= pd.Timestamp(end_date))]
+    start_date, end_date = (pd.Timestamp(d) for d in date_range)
 else:
-    df_revenue_filtered = df_revenue
-    df_expense_filtered = df_expense
+    start_date, end_date = None, None
 
 # 국가 필터
+country_options = list(cube.monthly['revenue']['country'].unique())
 countries = st.sidebar.multiselect(
     "국가 선택",
-    options=df_revenue['country'].unique(),
-    default=df_revenue['country'].unique()
+    options=country_options,
+    default=country_options
 )
 
-if countries:
-    df_revenue_filtered = df_revenue_filtered[df_revenue_filtered['country'].isin(countries)]
-    df_expense_filtered = df_expense_filtered[df_expense_filtered['country'].isin(countries)]
-
 # 팀 필터
+team_options = list(cube.monthly['revenue']['team'].unique())
 teams = st.sidebar.multiselect(
     "팀 선택",
-    options=df_revenue['team'].unique(),
-    default=df_revenue['team'].unique()
+    options=team_options,
+    default=team_options
 )
 
-if teams:
-    df_revenue_filtered = df_revenue_filtered[df_revenue_filtered['team'].isin(teams)]
+# 추이 차트 집계 단위 (일/주 단위는 일별 누적합 인덱스에서 계산)
+granularity = st.sidebar.segmented_control(
+    "추이 단위",
+    options=list(GRANULARITIES),
+    format_func=GRANULARITIES.get,
+    default='M',
+    key='granularity'
+) or 'M'
+TREND_UNIT = {'D': '일간', 'W': '주간', 'M': '월간'}[granularity]
+
+# 정규화된 필터 (전체 기간/전체 선택은 '필터 없음'과 같은 키)
+filters = normalize_filters(
+    start_date, end_date, countries, teams,
+    min_date=min_date, max_date=max_date,
+    country_options=country_options, team_options=team_options
+)
+result_cache = get_result_cache()
+figure_cache = get_figure_cache()
+
+# 섹션별 대상 행 수 (계측용, 캐시 적중이면 0으로 기록)
+SECTION_ROWS = {
+    'kpi': lambda: revenue_rows + expense_rows,
+    'cash_runway': lambda: revenue_rows + expense_rows,
+    'revenue': lambda: revenue_rows,
+    'expense': lambda: expense_rows,
+    'pl': lambda: revenue_rows + expense_rows,
+    'budget': lambda: len(data.get('budget', ())),
+    'pipeline': lambda: len(df_pipeline),
+    'productivity': lambda: revenue_rows + len(df_headcount),
+    'ar': lambda: len(df_revenue),
+    'ar_aging': lambda: revenue_rows,
+    'cash_distribution': lambda: len(df_cash),
+    'alerts': lambda: revenue_rows + expense_rows + len(df_revenue),
+}
+
+def section(name):
+    """
+    섹션 결과 (cfo/metrics.py) — (섹션, 데이터 버전, 필터) 키로 세션 간 캐시 공유
+    """
+    result = compute_section(name, cube, data, filters, cache=result_cache, data_version=load_result.data_version)
+    hit = result_cache.last_hit
+    instrument.add(hit=hit, rows=0 if hit else SECTION_ROWS[name]())
+    return result
+
+def trend_data(name, monthly):
+    """
+    추이 차트 데이터와 x 컬럼
+    월 단위는 섹션 결과(monthly, year_month) 그대로, 일/주 단위는 compute_trends()[name] (period)
+    """
+    if granularity == 'M':
+        return monthly, 'year_month'
+    trends = compute_trends(cube, filters, granularity, cache=result_cache, data_version=load_result.data_version)
+    return trends[name], 'period'
+
+def plot(name, build, uses_filters=True):
+    """
+    차트 출력 — build() 로 만든 Figure 를 (차트, 데이터 버전, 필터) 키로 세션 간 캐시 (cfo/charts.py)
+    """
+    key = ('figure', name, load_result.data_version, filters if uses_filters else None)
+    fig = cached_figure(figure_cache, key, build, webgl_threshold=CHART_WEBGL_POINTS)
+    st.plotly_chart(fig, use_container_width=True)
+
+# 거래 단위 필터 조건 (FilterEngine.filter / count / latest 에 그대로 전달)
+revenue_selection = dict(start=start_date, end=end_date, country=countries, team=teams)
+expense_selection = dict(start=start_date, end=end_date, country=countries)
+
+revenue_rows = revenue_filter.count(**revenue_selection)
+expense_rows = expense_filter.count(**expense_selection)
+instrument.add(rows=revenue_rows + expense_rows)
+
+st.sidebar.caption(f"선택된 거래: 매출 {revenue_rows:,}건 / 비용 {expense_rows:,}건")
+
+# 데이터 기준 시각 + 수동 새로고침 (프로세스 전역 저장소, 완료되면 다음 실행부터 새 버전)
+# load_data() 와 같은 인자로 호출해야 같은 저장소 (cache_resource 는 전달한 인자로 구분)
+data_store = get_data_store(DATA_SOURCE)
+data_as_of = datetime.fromtimestamp(load_result.loaded_at).strftime('%Y-%m-%d %H:%M')
+checked_at = datetime.fromtimestamp(data_store.checked_at).strftime('%H:%M:%S') if data_store.checked_at else '-'
+st.sidebar.caption(
+    f"🕒 데이터 기준: {data_as_of} ({load_result.source or DATA_SOURCE}), 마지막 확인 {checked_at}"
+    + (" · 새로고침 중..." if data_store.refreshing else "")
+)
+if st.sidebar.button("🔄 데이터 새로고침", help="백그라운드에서 원본을 다시 읽고, 끝나면 새 데이터로 바꿉니다"):
+    data_store.refresh()
+    st.sidebar.caption("백그라운드 새로고침을 시작했습니다. 완료 후 화면을 다시 실행하면 반영됩니다.")
+if data_store.last_error:
+    st.sidebar.warning(f"⚠️ 마지막 새로고침 실패 (이전 데이터 유지): {data_store.last_error}")
 
 st.sidebar.markdown("---")
 st.sidebar.info("💡 **Tip**: 필터를 조정하여 원하는 데이터를 확인하세요.")
 
+if instrument.enabled:
+    # 스크립트 끝에서 채움 (모든 섹션의 소요 시간이 기록된 뒤)
+    instrument_panel = st.sidebar.expander("⏱️ 섹션별 소요 시간", expanded=False)
+
+with st.sidebar.expander("🧮 탭별 메모리 사용량"):
+    memory = load_result.derive('memory_report', memory_report)
+    st.dataframe(
+        memory[['tab', 'rows', 'memory_mb']].rename(columns={'tab': '탭', 'rows': '행 수', 'memory_mb': 'MB'}),
+        hide_index=True,
+        column_config={'MB': st.column_config.NumberColumn(format="%.2f")},
+    )
+    st.caption(f"합계 {memory['memory_mb'].sum():,.1f} MB")
+    cache_stats = result_cache.stats()
+    st.caption(
+        f"결과 캐시: 적중 {cache_stats['hits']:,} / 미스 {cache_stats['misses']:,} "
+        f"({cache_stats['hit_rate']:.0%}), {cache_stats['entries']}개 항목, "
+        f"{cache_stats['bytes'] / 1024 ** 2:.1f} MB"
+    )
+    fx_stats = get_fx_converter().last_stats if FX_MODE != 'off' else {}
+    if fx_stats:
+        st.caption(
+            f"환율 환산 ({'거래일' if FX_MODE == 'transaction' else '월말'} 기준, 마지막 새로고침): "
+            + ", ".join(f"{TAB_NAMES[tab]} {stats['rows']:,}행" for tab, stats in fx_stats.items())
+        )
+
+def render_section(key, title, render):
+    """
+    섹션 렌더링
+    지연 모드에서는 섹션을 fragment 로 감싸 펼쳤을 때만 render() 를 실행하고,
+    섹션 안의 조작(펼치기, 보기 전환)은 해당 섹션만 다시 실행
+    """
+    st.markdown("---")
+    st.subheader(title)
+    if not LAZY_SECTIONS:
+        instrument.begin(key)
+        render()
+        return
+
+    @st.fragment
+    def fragment():
+        # 전체 실행이 이미 끝났다면 이 섹션만 단독으로 다시 실행된 것
+        standalone = instrument.finished
+        instrument.begin(key)
+        if st.toggle("섹션 표시", value=key in OPEN_SECTIONS, key=f'section_open_{key}'):
+            render()
+        if standalone:
+            instrument.finish()
+
+    fragment()
+
+def render_views(key, views):
+    """
+    섹션 안의 보기 전환 (views: {라벨: 렌더 함수})
+    지연 모드에서는 선택한 보기만 렌더링, 아니면 st.tabs 로 모든 보기를 렌더링
+    """
+    labels = list(views)
+    if LAZY_SECTIONS:
+        selected = st.segmented_control(
+            "보기", labels, default=labels[0], key=f'view_{key}', label_visibility='collapsed'
+        )
+        views[selected or labels[0]]()
+        return
+    for tab, render in zip(st.tabs(labels), views.values()):
+        with tab:
+            render()
+
 # ================================
 # 메인 대시보드
 # ================================
@@ -264,22 +502,25 @@ st.markdown("### 실시간 재무 및 경영 지표")
 # ================================
 # 1. 상단 KPI 카드
 # ================================
+instrument.begin('kpi')
 st.markdown("---")
 st.subheader("🎯 핵심 KPI")
 
 # 계산
-total_revenue = df_revenue_filtered['amount_krw'].sum()
-total_expense = df_expense_filtered['amount_krw'].sum()
-net_profit = total_revenue - total_expense
-profit_margin = (net_profit / total_revenue * 100) if total_revenue > 0 else 0
+kpi = section('kpi')
+total_revenue = kpi['total_revenue']
+total_expense = kpi['total_expense']
+net_profit = kpi['net_profit']
+profit_margin = kpi['profit_margin']
 
 # 현금 잔고 (최신)
-latest_cash_date = df_cash['date'].max()
-latest_cash = df_cash[df_cash['date'] == latest_cash_date]['balance_krw'].sum()
+latest_cash_date = kpi['latest_cash_date']
+latest_cash = kpi['latest_cash']
 
-# 인원 수
-total_headcount = len(df_headcount[df_headcount['status'] == 'Active'])
-per_capita_revenue = total_revenue / total_headcount if total_headcount > 0 else 0
+# 인원 수 (기간 마지막 달 월말 인원, 인당 매출은 기간 평균 인원 기준)
+total_headcount = kpi['total_headcount']
+average_headcount = kpi['average_headcount']
+per_capita_revenue = kpi['per_capita_revenue']
 
 # KPI 카드 표시
 col1, col2, col3, col4, col5 = st.columns(5)
@@ -316,541 +557,815 @@ with col5:
     st.metric(
         label="👥 인당 매출",
         value=f"₩{per_capita_revenue/1e7:.1f}천만",
-        delta=f"{total_headcount}명"
+        delta=f"{total_headcount}명 (기간 평균 {average_headcount:.1f}명)"
     )
 
 # ================================
 # 2. Cash & Runway
 # ================================
-st.markdown("---")
-st.subheader("💵 Cash Flow & Runway")
+def render_cash_runway():
+    cash_runway = section('cash_runway')
 
-col1, col2 = st.columns(2)
+    col1, col2 = st.columns(2)
 
-with col1:
-    # 월별 Cash Flow
-    df_revenue_monthly = df_revenue_filtered.copy()
-    df_revenue_monthly['year_month'] = df_revenue_monthly['date'].dt.to_period('M')
-    revenue_monthly = df_revenue_monthly.groupby('year_month')['amount_krw'].sum().reset_index()
-    revenue_monthly['year_month'] = revenue_monthly['year_month'].astype(str)
-
-    df_expense_monthly = df_expense_filtered.copy()
-    df_expense_monthly['year_month'] = df_expense_monthly['date'].dt.to_period('M')
-    expense_monthly = df_expense_monthly.groupby('year_month')['amount_krw'].sum().reset_index()
-    expense_monthly['year_month'] = expense_monthly['year_month'].astype(str)
-
-    # 합치기
-    cashflow_monthly = pd.merge(revenue_monthly, expense_monthly, on='year_month', how='outer', suffixes=('_rev', '_exp'))
-    cashflow_monthly = cashflow_monthly.fillna(0)
-    cashflow_monthly['net_cashflow'] = cashflow_monthly['amount_krw_rev'] - cashflow_monthly['amount_krw_exp']
-
-    fig_cashflow = go.Figure()
-    fig_cashflow.add_trace(go.Bar(
-        x=cashflow_monthly['year_month'],
-        y=cashflow_monthly['amount_krw_rev'] / 1e8,
-        name='매출',
-        marker_color='#28a745'
-    ))
-    fig_cashflow.add_trace(go.Bar(
-        x=cashflow_monthly['year_month'],
-        y=-cashflow_monthly['amount_krw_exp'] / 1e8,
-        name='비용',
-        marker_color='#dc3545'
-    ))
-    fig_cashflow.add_trace(go.Scatter(
-        x=cashflow_monthly['year_month'],
-        y=cashflow_monthly['net_cashflow'] / 1e8,
-        name='순 Cash Flow',
-        mode='lines+markers',
-        line=dict(color='#007bff', width=3),
-        yaxis='y2'
-    ))
-
-    fig_cashflow.update_layout(
-        title="월별 Cash Flow",
-        xaxis_title="월",
-        yaxis_title="금액 (억 원)",
-        yaxis2=dict(
-            title="순 Cash Flow (억 원)",
-            overlaying='y',
-            side='right'
-        ),
-        barmode='relative',
-        hovermode='x unified',
-        height=400
+    with col1:
+        # Cash Flow 추이 (사이드바 추이 단위)
+        cashflow, cashflow_x = trend_data('cashflow', cash_runway['cashflow_monthly'])
+
+        def build_cashflow():
+            cashflow_points = downsample(cashflow, cashflow_x, 'net_cashflow', CHART_MAX_POINTS)
+
+            fig_cashflow = go.Figure()
+            fig_cashflow.add_trace(go.Bar(
+                x=cashflow_points[cashflow_x],
+                y=cashflow_points['amount_krw_rev'] / 1e8,
+                name='매출',
+                marker_color='#28a745'
+            ))
+            fig_cashflow.add_trace(go.Bar(
+                x=cashflow_points[cashflow_x],
+                y=-cashflow_points['amount_krw_exp'] / 1e8,
+                name='비용',
+                marker_color='#dc3545'
+            ))
+            fig_cashflow.add_trace(go.Scatter(
+                x=cashflow_points[cashflow_x],
+                y=cashflow_points['net_cashflow'] / 1e8,
+                name='순 Cash Flow',
+                mode='lines+markers',
+                line=dict(color='#007bff', width=3),
+                yaxis='y2'
+            ))
+
+            fig_cashflow.update_layout(
+                title=f"{TREND_UNIT} Cash Flow",
+                xaxis_title=GRANULARITIES[granularity],
+                yaxis_title="금액 (억 원)",
+                yaxis2=dict(
+                    title="순 Cash Flow (억 원)",
+                    overlaying='y',
+                    side='right'
+                ),
+                barmode='relative',
+                hovermode='x unified',
+                height=400
+            )
+            return fig_cashflow
+
+        plot(f'cashflow_{granularity}', build_cashflow)
+
+    with col2:
+        # Runway = 최신 현금 / 월평균 비용
+        avg_monthly_expense = cash_runway['avg_monthly_expense']
+        runway_months = cash_runway['runway_months']
+
+        # Runway 게이지 차트
+        def build_runway():
+            fig_runway = go.Figure(go.Indicator(
+                mode="gauge+number+delta",
+                value=runway_months,
+                domain={'x': [0, 1], 'y': [0, 1]},
+                title={'text': "Runway (개월)", 'font': {'size': 24}},
+                delta={'reference': 12, 'increasing': {'color': "green"}},
+                gauge={
+                    'axis': {'range': [None, 24], 'tickwidth': 1, 'tickcolor': "darkblue"},
+                    'bar': {'color': "darkblue"},
+                    'bgcolor': "white",
+                    'borderwidth': 2,
+                    'bordercolor': "gray",
+                    'steps': [
+                        {'range': [0, 6], 'color': '#ffcccc'},
+                        {'range': [6, 12], 'color': '#ffffcc'},
+                        {'range': [12, 24], 'color': '#ccffcc'}
+                    ],
+                    'threshold': {
+                        'line': {'color': "red", 'width': 4},
+                        'thickness': 0.75,
+                        'value': 6
+                    }
+                }
+            ))
+
+            fig_runway.update_layout(height=400)
+            return fig_runway
+
+        plot('runway', build_runway)
+
+        st.info(f"""
+        **💡 Runway 분석:**
+        - 현재 현금: ₩{latest_cash/1e8:.1f}억
+        - 월평균 Burn Rate: ₩{avg_monthly_expense/1e8:.1f}억
+        - 예상 Runway: **{runway_months:.1f}개월**
+        """)
+
+    # Monte Carlo Runway (월별 Burn 변동 + 파이프라인 딜 성사 확률)
+    forecast = compute_runway_forecast(
+        cube, data, filters, n_paths=RUNWAY_PATHS, horizon=RUNWAY_HORIZON, workers=RUNWAY_WORKERS,
+        cache=result_cache, data_version=load_result.data_version
     )
 
-    st.plotly_chart(fig_cashflow, use_container_width=True)
+    def runway_text(months):
+        if pd.isna(months):
+            return "-"
+        return f"{RUNWAY_HORIZON}개월 이상" if months >= RUNWAY_HORIZON else f"{months:.1f}개월"
 
-with col2:
-    # Runway 계산
-    avg_monthly_expense = df_expense_monthly.groupby('year_month')['amount_krw'].sum().mean()
-    runway_months = latest_cash / avg_monthly_expense if avg_monthly_expense > 0 else 0
-
-    # Runway 게이지 차트
-    fig_runway = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=runway_months,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': "Runway (개월)", 'font': {'size': 24}},
-        delta={'reference': 12, 'increasing': {'color': "green"}},
-        gauge={
-            'axis': {'range': [None, 24], 'tickwidth': 1, 'tickcolor': "darkblue"},
-            'bar': {'color': "darkblue"},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 6], 'color': '#ffcccc'},
-                {'range': [6, 12], 'color': '#ffffcc'},
-                {'range': [12, 24], 'color': '#ccffcc'}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 6
-            }
-        }
-    ))
-
-    fig_runway.update_layout(height=400)
-    st.plotly_chart(fig_runway, use_container_width=True)
-
-    st.info(f"""
-    **💡 Runway 분석:**
-    - 현재 현금: ₩{latest_cash/1e8:.1f}억
-    - 월평균 Burn Rate: ₩{avg_monthly_expense/1e8:.1f}억
-    - 예상 Runway: **{runway_months:.1f}개월**
-    """)
+    col3, col4 = st.columns([1, 2])
+
+    with col3:
+        st.metric("Runway P10 (비관)", runway_text(forecast['runway'][10]))
+        st.metric("Runway P50 (중앙)", runway_text(forecast['runway'][50]))
+        st.metric("Runway P90 (낙관)", runway_text(forecast['runway'][90]))
+        st.caption(
+            f"{forecast['n_paths']:,}개 경로 · 파이프라인 딜 {forecast['n_deals']}건 · "
+            f"12개월 내 현금 소진 확률 {forecast['prob_out_12m']*100:.0f}%"
+        )
+
+    with col4:
+        fan = forecast['fan']
+        def build_runway_fan():
+            fig_fan = go.Figure()
+            fig_fan.add_trace(go.Scatter(
+                x=fan['month'],
+                y=fan['cash_p90'] / 1e8,
+                name='P90',
+                mode='lines',
+                line=dict(color='#7fb3e6', width=1)
+            ))
+            fig_fan.add_trace(go.Scatter(
+                x=fan['month'],
+                y=fan['cash_p10'] / 1e8,
+                name='P10',
+                mode='lines',
+                line=dict(color='#7fb3e6', width=1),
+                fill='tonexty',
+                fillcolor='rgba(0, 123, 255, 0.15)'
+            ))
+            fig_fan.add_trace(go.Scatter(
+                x=fan['month'],
+                y=fan['cash_p50'] / 1e8,
+                name='P50',
+                mode='lines',
+                line=dict(color='#007bff', width=3)
+            ))
+            fig_fan.add_hline(y=0, line_dash='dash', line_color='red')
+            fig_fan.update_layout(
+                title="현금 잔고 예측 (Monte Carlo P10–P90)",
+                xaxis_title="월",
+                yaxis_title="현금 (억 원)",
+                hovermode='x unified',
+                height=400
+            )
+            return fig_fan
+
+        plot(f'runway_fan_{RUNWAY_PATHS}_{RUNWAY_HORIZON}', build_runway_fan)
+
+render_section('cash_runway', "💵 Cash Flow & Runway", render_cash_runway)
 
 # ================================
 # 3. Revenue 분석
 # ================================
-st.markdown("---")
-st.subheader("💵 Revenue 분석")
-
-tab1, tab2, tab3 = st.tabs(["📈 추이 분석", "🌍 국가별", "👥 팀별"])
-
-with tab1:
-    # 월별 매출 추이 (국가별)
-    df_rev_country = df_revenue_filtered.copy()
-    df_rev_country['year_month'] = df_rev_country['date'].dt.to_period('M').astype(str)
-    rev_country_monthly = df_rev_country.groupby(['year_month', 'country'])['amount_krw'].sum().reset_index()
-
-    fig_rev_trend = px.line(
-        rev_country_monthly,
-        x='year_month',
-        y='amount_krw',
-        color='country',
-        markers=True,
-        title="국가별 월간 매출 추이",
-        labels={'amount_krw': '매출 (원)', 'year_month': '월', 'country': '국가'}
-    )
-    fig_rev_trend.update_yaxis(tickformat=".2s")
-    fig_rev_trend.update_layout(height=450)
-    st.plotly_chart(fig_rev_trend, use_container_width=True)
+def render_revenue():
+    revenue_analysis = section('revenue')
+
+    def render_trend():
+        # 매출 추이 (국가별)
+        rev_country_trend, trend_x = trend_data('by_country', revenue_analysis['by_country_monthly'])
+
+        def build_rev_trend():
+            fig_rev_trend = px.line(
+                downsample(rev_country_trend, trend_x, 'amount_krw', CHART_MAX_POINTS, by='country'),
+                x=trend_x,
+                y='amount_krw',
+                color='country',
+                markers=True,
+                title=f"국가별 {TREND_UNIT} 매출 추이",
+                labels={'amount_krw': '매출 (원)', trend_x: GRANULARITIES[granularity], 'country': '국가'}
+            )
+            fig_rev_trend.update_yaxes(tickformat=".2s")
+            fig_rev_trend.update_layout(height=450)
+            return fig_rev_trend
+
+        plot(f'rev_trend_{granularity}', build_rev_trend)
+
+    def render_by_country():
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # 국가별 매출 합계 (파이 차트)
+            rev_by_country = revenue_analysis['by_country']
+
+            def build_country_pie():
+                fig_country_pie = px.pie(
+                    rev_by_country,
+                    values='amount_krw',
+                    names='country',
+                    title="국가별 매출 비중",
+                    hole=0.4
+                )
+                fig_country_pie.update_traces(textposition='inside', textinfo='percent+label')
+                return fig_country_pie
+
+            plot('country_pie', build_country_pie)
+
+        with col2:
+            # 국가별 매출 합계 (바 차트)
+            def build_country_bar():
+                fig_country_bar = px.bar(
+                    rev_by_country,
+                    x='country',
+                    y='amount_krw',
+                    title="국가별 매출 합계",
+                    labels={'amount_krw': '매출 (원)', 'country': '국가'},
+                    text='amount_krw'
+                )
+                fig_country_bar.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
+                fig_country_bar.update_yaxes(tickformat=".2s")
+                return fig_country_bar
+
+            plot('country_bar', build_country_bar)
+
+    def render_by_team():
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # 팀별 매출 합계
+            rev_by_team = revenue_analysis['by_team']
+
+            def build_team_bar():
+                fig_team_bar = px.bar(
+                    rev_by_team,
+                    x='team',
+                    y='amount_krw',
+                    title="팀별 매출 합계",
+                    labels={'amount_krw': '매출 (원)', 'team': '팀'},
+                    text='amount_krw',
+                    color='team'
+                )
+                fig_team_bar.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
+                fig_team_bar.update_yaxes(tickformat=".2s")
+                return fig_team_bar
+
+            plot('team_bar', build_team_bar)
+
+        with col2:
+            # 팀별 매출 추이
+            rev_team_trend, trend_x = trend_data('by_team', revenue_analysis['by_team_monthly'])
+
+            def build_team_trend():
+                fig_team_trend = px.line(
+                    downsample(rev_team_trend, trend_x, 'amount_krw', CHART_MAX_POINTS, by='team'),
+                    x=trend_x,
+                    y='amount_krw',
+                    color='team',
+                    markers=True,
+                    title=f"팀별 {TREND_UNIT} 매출 추이",
+                    labels={'amount_krw': '매출 (원)', trend_x: GRANULARITIES[granularity], 'team': '팀'}
+                )
+                fig_team_trend.update_yaxes(tickformat=".2s")
+                return fig_team_trend
+
+            plot(f'team_trend_{granularity}', build_team_trend)
+
+    render_views('revenue', {
+        "📈 추이 분석": render_trend,
+        "🌍 국가별": render_by_country,
+        "👥 팀별": render_by_team,
+    })
 
-with tab2:
-    col1, col2 = st.columns(2)
+    with st.expander("📄 매출 거래 내역 (필터 적용, 최근 1,000건)"):
+        st.dataframe(revenue_filter.latest(1000, **revenue_selection), use_container_width=True, hide_index=True)
 
-    with col1:
-        # 국가별 매출 합계 (파이 차트)
-        rev_by_country = df_revenue_filtered.groupby('country')['amount_krw'].sum().reset_index()
-        fig_country_pie = px.pie(
-            rev_by_country,
-            values='amount_krw',
-            names='country',
-            title="국가별 매출 비중",
-            hole=0.4
-        )
-        fig_country_pie.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_country_pie, use_container_width=True)
+render_section('revenue', "💵 Revenue 분석", render_revenue)
 
-    with col2:
-        # 국가별 매출 합계 (바 차트)
-        fig_country_bar = px.bar(
-            rev_by_country,
-            x='country',
-            y='amount_krw',
-            title="국가별 매출 합계",
-            labels={'amount_krw': '매출 (원)', 'country': '국가'},
-            text='amount_krw'
-        )
-        fig_country_bar.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
-        fig_country_bar.update_yaxis(tickformat=".2s")
-        st.plotly_chart(fig_country_bar, use_container_width=True)
+# ================================
+# 4. Expense 분석
+# ================================
+def render_expense():
+    expense_analysis = section('expense')
 
-with tab3:
     col1, col2 = st.columns(2)
 
     with col1:
-        # 팀별 매출 합계
-        rev_by_team = df_revenue_filtered.groupby('team')['amount_krw'].sum().reset_index()
-        fig_team_bar = px.bar(
-            rev_by_team,
-            x='team',
-            y='amount_krw',
-            title="팀별 매출 합계",
-            labels={'amount_krw': '매출 (원)', 'team': '팀'},
-            text='amount_krw',
-            color='team'
-        )
-        fig_team_bar.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
-        fig_team_bar.update_yaxis(tickformat=".2s")
-        st.plotly_chart(fig_team_bar, use_container_width=True)
+        # 비용 카테고리별 합계
+        exp_by_category = expense_analysis['by_category']
+
+        def build_exp_category():
+            fig_exp_category = px.bar(
+                exp_by_category,
+                x='category_l1',
+                y='amount_krw',
+                title="비용 카테고리별 합계",
+                labels={'amount_krw': '비용 (원)', 'category_l1': '카테고리'},
+                text='amount_krw',
+                color='category_l1'
+            )
+            fig_exp_category.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
+            fig_exp_category.update_yaxes(tickformat=".2s")
+            return fig_exp_category
+
+        plot('exp_category', build_exp_category)
 
     with col2:
-        # 팀별 월간 매출 추이
-        df_rev_team = df_revenue_filtered.copy()
-        df_rev_team['year_month'] = df_rev_team['date'].dt.to_period('M').astype(str)
-        rev_team_monthly = df_rev_team.groupby(['year_month', 'team'])['amount_krw'].sum().reset_index()
-
-        fig_team_trend = px.line(
-            rev_team_monthly,
-            x='year_month',
+        # 비용 카테고리별 비중 (파이 차트)
+        def build_exp_pie():
+            fig_exp_pie = px.pie(
+                exp_by_category,
+                values='amount_krw',
+                names='category_l1',
+                title="비용 카테고리별 비중",
+                hole=0.4
+            )
+            fig_exp_pie.update_traces(textposition='inside', textinfo='percent+label')
+            return fig_exp_pie
+
+        plot('exp_pie', build_exp_pie)
+
+    # 비용 추이 (카테고리별)
+    exp_trend, trend_x = trend_data('by_category', expense_analysis['by_category_monthly'])
+
+    def build_exp_trend():
+        # 누적 영역은 카테고리끼리 x 가 맞아야 하므로 같은 월을 공유하도록 다운샘플링
+        fig_exp_trend = px.area(
+            downsample(exp_trend, trend_x, 'amount_krw', CHART_MAX_POINTS, by='category_l1', shared_x=True),
+            x=trend_x,
             y='amount_krw',
-            color='team',
-            markers=True,
-            title="팀별 월간 매출 추이",
-            labels={'amount_krw': '매출 (원)', 'year_month': '월', 'team': '팀'}
+            color='category_l1',
+            title=f"{TREND_UNIT} 비용 카테고리별 추이 (Stacked Area)",
+            labels={'amount_krw': '비용 (원)', trend_x: GRANULARITIES[granularity], 'category_l1': '카테고리'}
         )
-        fig_team_trend.update_yaxis(tickformat=".2s")
-        st.plotly_chart(fig_team_trend, use_container_width=True)
+        fig_exp_trend.update_yaxes(tickformat=".2s")
+        fig_exp_trend.update_layout(height=450)
+        return fig_exp_trend
 
-# ================================
-# 4. Expense 분석
-# ================================
-st.markdown("---")
-st.subheader("💸 Expense 분석")
+    plot(f'exp_trend_{granularity}', build_exp_trend)
 
-col1, col2 = st.columns(2)
+    with st.expander("📄 비용 거래 내역 (필터 적용, 최근 1,000건)"):
+        st.dataframe(expense_filter.latest(1000, **expense_selection), use_container_width=True, hide_index=True)
 
-with col1:
-    # 비용 카테고리별 합계
-    exp_by_category = df_expense_filtered.groupby('category_l1')['amount_krw'].sum().reset_index()
-    exp_by_category = exp_by_category.sort_values('amount_krw', ascending=False)
-
-    fig_exp_category = px.bar(
-        exp_by_category,
-        x='category_l1',
-        y='amount_krw',
-        title="비용 카테고리별 합계",
-        labels={'amount_krw': '비용 (원)', 'category_l1': '카테고리'},
-        text='amount_krw',
-        color='category_l1'
-    )
-    fig_exp_category.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
-    fig_exp_category.update_yaxis(tickformat=".2s")
-    st.plotly_chart(fig_exp_category, use_container_width=True)
-
-with col2:
-    # 비용 카테고리별 비중 (파이 차트)
-    fig_exp_pie = px.pie(
-        exp_by_category,
-        values='amount_krw',
-        names='category_l1',
-        title="비용 카테고리별 비중",
-        hole=0.4
-    )
-    fig_exp_pie.update_traces(textposition='inside', textinfo='percent+label')
-    st.plotly_chart(fig_exp_pie, use_container_width=True)
-
-# 월별 비용 추이
-df_exp_monthly = df_expense_filtered.copy()
-df_exp_monthly['year_month'] = df_exp_monthly['date'].dt.to_period('M').astype(str)
-exp_monthly = df_exp_monthly.groupby(['year_month', 'category_l1'])['amount_krw'].sum().reset_index()
-
-fig_exp_trend = px.area(
-    exp_monthly,
-    x='year_month',
-    y='amount_krw',
-    color='category_l1',
-    title="월별 비용 카테고리별 추이 (Stacked Area)",
-    labels={'amount_krw': '비용 (원)', 'year_month': '월', 'category_l1': '카테고리'}
-)
-fig_exp_trend.update_yaxis(tickformat=".2s")
-fig_exp_trend.update_layout(height=450)
-st.plotly_chart(fig_exp_trend, use_container_width=True)
+render_section('expense', "💸 Expense 분석", render_expense)
 
 # ================================
 # 5. P&L 요약
 # ================================
-st.markdown("---")
-st.subheader("📊 손익계산서 (P&L) 요약")
-
-# 월별 P&L 계산
-df_rev_pl = df_revenue_filtered.copy()
-df_rev_pl['year_month'] = df_rev_pl['date'].dt.to_period('M').astype(str)
-pl_revenue = df_rev_pl.groupby('year_month')['amount_krw'].sum().reset_index()
-pl_revenue.columns = ['year_month', 'revenue']
-
-df_exp_pl = df_expense_filtered.copy()
-df_exp_pl['year_month'] = df_exp_pl['date'].dt.to_period('M').astype(str)
-
-# COGS와 Operating Expense 분리
-pl_cogs = df_exp_pl[df_exp_pl['category_l1'] == 'COGS'].groupby('year_month')['amount_krw'].sum().reset_index()
-pl_cogs.columns = ['year_month', 'cogs']
-
-pl_opex = df_exp_pl[df_exp_pl['category_l1'] != 'COGS'].groupby('year_month')['amount_krw'].sum().reset_index()
-pl_opex.columns = ['year_month', 'opex']
-
-# 합치기
-pl_summary = pl_revenue.merge(pl_cogs, on='year_month', how='left').merge(pl_opex, on='year_month', how='left')
-pl_summary = pl_summary.fillna(0)
-
-pl_summary['gross_profit'] = pl_summary['revenue'] - pl_summary['cogs']
-pl_summary['gross_margin_pct'] = (pl_summary['gross_profit'] / pl_summary['revenue'] * 100).round(1)
-pl_summary['net_profit'] = pl_summary['revenue'] - pl_summary['cogs'] - pl_summary['opex']
-pl_summary['net_margin_pct'] = (pl_summary['net_profit'] / pl_summary['revenue'] * 100).round(1)
-
-# 금액을 억 원 단위로 변환
-pl_display = pl_summary.copy()
-pl_display['revenue'] = (pl_display['revenue'] / 1e8).round(1)
-pl_display['cogs'] = (pl_display['cogs'] / 1e8).round(1)
-pl_display['gross_profit'] = (pl_display['gross_profit'] / 1e8).round(1)
-pl_display['opex'] = (pl_display['opex'] / 1e8).round(1)
-pl_display['net_profit'] = (pl_display['net_profit'] / 1e8).round(1)
-
-pl_display.columns = ['월', '매출 (억)', 'COGS (억)', '매출총이익 (억)', '매출총이익률 (%)', 'OpEx (억)', '순이익 (억)', '순이익률 (%)']
-
-st.dataframe(pl_display, use_container_width=True, height=400)
-
-# 월별 마진율 추이
-fig_margin = go.Figure()
-fig_margin.add_trace(go.Scatter(
-    x=pl_summary['year_month'],
-    y=pl_summary['gross_margin_pct'],
-    name='매출총이익률 (%)',
-    mode='lines+markers',
-    line=dict(color='#28a745', width=3)
-))
-fig_margin.add_trace(go.Scatter(
-    x=pl_summary['year_month'],
-    y=pl_summary['net_margin_pct'],
-    name='순이익률 (%)',
-    mode='lines+markers',
-    line=dict(color='#007bff', width=3)
-))
-fig_margin.update_layout(
-    title="월별 마진율 추이",
-    xaxis_title="월",
-    yaxis_title="마진율 (%)",
-    hovermode='x unified',
-    height=400
-)
-st.plotly_chart(fig_margin, use_container_width=True)
+def render_pl():
+    # 월별 P&L (매출, COGS, 매출총이익, OpEx, 순이익)
+    pl_summary = section('pl')
+
+    # 금액을 억 원 단위로 변환
+    pl_display = pl_summary.copy()
+    pl_display['revenue'] = (pl_display['revenue'] / 1e8).round(1)
+    pl_display['cogs'] = (pl_display['cogs'] / 1e8).round(1)
+    pl_display['gross_profit'] = (pl_display['gross_profit'] / 1e8).round(1)
+    pl_display['opex'] = (pl_display['opex'] / 1e8).round(1)
+    pl_display['net_profit'] = (pl_display['net_profit'] / 1e8).round(1)
+
+    pl_display = pl_display[['year_month', 'revenue', 'cogs', 'gross_profit', 'gross_margin_pct', 'opex', 'net_profit', 'net_margin_pct']]
+    pl_display.columns = ['월', '매출 (억)', 'COGS (억)', '매출총이익 (억)', '매출총이익률 (%)', 'OpEx (억)', '순이익 (억)', '순이익률 (%)']
+
+    st.dataframe(pl_display, use_container_width=True, height=400)
+    if pl_store is not None:
+        pl_status = pl_store.status()
+        closed_months = list(pl_status['closed'])
+        st.caption(
+            f"마감 {len(closed_months)}개월" + (f" (~{closed_months[-1]})" if closed_months else "")
+            + (f" · 재오픈 {', '.join(pl_status['reopened'])}" if pl_status['reopened'] else "")
+            + " · 마감한 달은 고정 값, 열린 달만 새 거래로 다시 계산"
+        )
+
+    # 월별 마진율 추이
+    def build_margin():
+        margin_points = downsample(pl_summary, 'year_month', 'net_margin_pct', CHART_MAX_POINTS)
+        fig_margin = go.Figure()
+        fig_margin.add_trace(go.Scatter(
+            x=margin_points['year_month'],
+            y=margin_points['gross_margin_pct'],
+            name='매출총이익률 (%)',
+            mode='lines+markers',
+            line=dict(color='#28a745', width=3)
+        ))
+        fig_margin.add_trace(go.Scatter(
+            x=margin_points['year_month'],
+            y=margin_points['net_margin_pct'],
+            name='순이익률 (%)',
+            mode='lines+markers',
+            line=dict(color='#007bff', width=3)
+        ))
+        fig_margin.update_layout(
+            title="월별 마진율 추이",
+            xaxis_title="월",
+            yaxis_title="마진율 (%)",
+            hovermode='x unified',
+            height=400
+        )
+        return fig_margin
+
+    plot('margin', build_margin)
+
+render_section('pl', "📊 손익계산서 (P&L) 요약", render_pl)
 
 # ================================
-# 6. Sales Pipeline
+# 6. 예산 대비 실적
 # ================================
-st.markdown("---")
-st.subheader("🎯 Sales Pipeline")
+def render_budget():
+    budget = section('budget')
+    if not budget['has_budget']:
+        st.info("Budget 탭 데이터가 없습니다. 연/월 × 국가 × 팀 목표를 입력하면 예산 대비 실적이 표시됩니다.")
+        return
 
-col1, col2, col3 = st.columns(3)
+    totals = budget['totals']
+    col1, col2, col3, col4 = st.columns(4)
 
-with col1:
-    total_pipeline_value = df_pipeline['amount_krw'].sum()
-    st.metric("총 파이프라인 가치", f"₩{total_pipeline_value/1e8:.1f}억")
+    def attainment_text(metric):
+        pct = totals[metric]['attainment_pct']
+        return "-" if pd.isna(pct) else f"{pct:.1f}%"
 
-with col2:
-    weighted_pipeline = (df_pipeline['amount_krw'] * df_pipeline['probability'] / 100).sum()
-    st.metric("가중 파이프라인 가치", f"₩{weighted_pipeline/1e8:.1f}억", delta="확률 반영")
+    with col1:
+        st.metric(
+            "매출 달성률",
+            attainment_text('revenue'),
+            delta=f"₩{totals['revenue']['variance']/1e8:+.1f}억"
+        )
 
-with col3:
-    closed_won = df_pipeline[df_pipeline['stage'] == 'Closed Won']['amount_krw'].sum()
-    st.metric("계약 완료", f"₩{closed_won/1e8:.1f}억")
-
-# Stage별 파이프라인
-pipeline_by_stage = df_pipeline.groupby('stage')['amount_krw'].sum().reset_index()
-pipeline_by_stage = pipeline_by_stage.sort_values('amount_krw', ascending=True)
-
-fig_pipeline = px.funnel(
-    pipeline_by_stage,
-    x='amount_krw',
-    y='stage',
-    title="Sales Pipeline by Stage",
-    labels={'amount_krw': '금액 (원)', 'stage': 'Stage'}
-)
-fig_pipeline.update_traces(texttemplate='₩%{x:.2s}')
-st.plotly_chart(fig_pipeline, use_container_width=True)
-
-# 팀별 파이프라인
-pipeline_by_team = df_pipeline.groupby('team')['amount_krw'].sum().reset_index()
-fig_pipeline_team = px.bar(
-    pipeline_by_team,
-    x='team',
-    y='amount_krw',
-    title="팀별 파이프라인 가치",
-    labels={'amount_krw': '금액 (원)', 'team': '팀'},
-    text='amount_krw',
-    color='team'
-)
-fig_pipeline_team.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
-fig_pipeline_team.update_yaxis(tickformat=".2s")
-st.plotly_chart(fig_pipeline_team, use_container_width=True)
+    with col2:
+        st.metric(
+            "비용 집행률",
+            attainment_text('expense'),
+            delta=f"₩{totals['expense']['variance']/1e8:+.1f}억",
+            delta_color="inverse"
+        )
+
+    with col3:
+        st.metric(
+            "이익 달성률",
+            attainment_text('profit'),
+            delta=f"₩{totals['profit']['variance']/1e8:+.1f}억"
+        )
+
+    monthly = budget['monthly']
+    with col4:
+        ytd = monthly['profit_ytd_variance'].iloc[-1] if len(monthly) else 0.0
+        st.metric("이익 YTD 차이", f"₩{ytd/1e8:+.1f}억")
+
+    # 팀 × 월 매출 달성률 히트맵 (100% 기준 빨강-초록)
+    heatmap = budget['heatmap']
+    def build_budget_heatmap():
+        fig_heatmap = go.Figure(go.Heatmap(
+            z=heatmap.to_numpy(),
+            x=list(heatmap.columns),
+            y=list(heatmap.index),
+            colorscale='RdYlGn',
+            zmid=100,
+            colorbar=dict(title='달성률 (%)'),
+            hovertemplate='%{y} %{x}<br>달성률 %{z:.1f}%<extra></extra>'
+        ))
+        fig_heatmap.update_layout(
+            title="팀별 월 매출 목표 달성률",
+            xaxis_title="월",
+            yaxis_title="팀",
+            height=max(300, 60 * len(heatmap) + 150)
+        )
+        return fig_heatmap
+
+    plot('budget_heatmap', build_budget_heatmap)
+
+    # 월별 차이 + 연도별 누적(YTD) 차이
+    budget_metric = st.segmented_control(
+        "지표",
+        options=['revenue', 'expense', 'profit'],
+        format_func={'revenue': '매출', 'expense': '비용', 'profit': '이익'}.get,
+        default='revenue',
+        key='budget_metric'
+    ) or 'revenue'
+    def build_budget_variance():
+        fig_variance = go.Figure()
+        fig_variance.add_trace(go.Bar(
+            x=monthly['year_month'],
+            y=monthly[f'{budget_metric}_variance'],
+            name='월별 차이',
+            marker_color=np.where(monthly[f'{budget_metric}_variance'] >= 0, '#28a745', '#dc3545')
+        ))
+        fig_variance.add_trace(go.Scatter(
+            x=monthly['year_month'],
+            y=monthly[f'{budget_metric}_ytd_variance'],
+            name='YTD 누적 차이',
+            mode='lines+markers',
+            line=dict(color='#007bff', width=3)
+        ))
+        fig_variance.update_layout(
+            title="월별 예산 대비 차이 (실적 - 목표)",
+            xaxis_title="월",
+            yaxis_title="금액 (원)",
+            hovermode='x unified',
+            height=400
+        )
+        fig_variance.update_yaxes(tickformat=".2s")
+        return fig_variance
+
+    plot(f'budget_variance_{budget_metric}', build_budget_variance)
+
+    with st.expander("팀별 예산 대비 실적"):
+        by_team = budget['by_team']
+        team_display = pd.DataFrame({
+            '팀': by_team['team'],
+            '매출 목표 (억)': (by_team['revenue_target'] / 1e8).round(1),
+            '매출 실적 (억)': (by_team['revenue_actual'] / 1e8).round(1),
+            '매출 달성률 (%)': by_team['revenue_attainment_pct'].round(1),
+            '비용 예산 (억)': (by_team['expense_target'] / 1e8).round(1),
+            '비용 실적 (억)': (by_team['expense_actual'] / 1e8).round(1),
+            '비용 집행률 (%)': by_team['expense_attainment_pct'].round(1),
+            '이익 차이 (억)': (by_team['profit_variance'] / 1e8).round(1),
+        })
+        st.dataframe(team_display, use_container_width=True, hide_index=True)
+
+render_section('budget', "📋 예산 대비 실적 (Budget vs Actual)", render_budget)
 
 # ================================
-# 7. Headcount & Productivity
+# 7. Sales Pipeline
 # ================================
-st.markdown("---")
-st.subheader("👥 인력 & 생산성")
+def render_pipeline():
+    pipeline = section('pipeline')
 
-col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
 
-with col1:
-    # 국가별 인원
-    hc_by_country = df_headcount[df_headcount['status'] == 'Active'].groupby('country').size().reset_index()
-    hc_by_country.columns = ['country', 'headcount']
-
-    fig_hc_country = px.bar(
-        hc_by_country,
-        x='country',
-        y='headcount',
-        title="국가별 인원",
-        labels={'headcount': '인원 수', 'country': '국가'},
-        text='headcount',
-        color='country'
-    )
-    fig_hc_country.update_traces(textposition='outside')
-    st.plotly_chart(fig_hc_country, use_container_width=True)
+    with col1:
+        total_pipeline_value = pipeline['total_value']
+        st.metric("총 파이프라인 가치", f"₩{total_pipeline_value/1e8:.1f}억")
 
-with col2:
-    # 팀별 인원
-    hc_by_team = df_headcount[df_headcount['status'] == 'Active'].groupby('team').size().reset_index()
-    hc_by_team.columns = ['team', 'headcount']
-
-    fig_hc_team = px.bar(
-        hc_by_team,
-        x='team',
-        y='headcount',
-        title="팀별 인원",
-        labels={'headcount': '인원 수', 'team': '팀'},
-        text='headcount',
-        color='team'
-    )
-    fig_hc_team.update_traces(textposition='outside')
-    st.plotly_chart(fig_hc_team, use_container_width=True)
-
-# 팀별 생산성
-team_revenue = df_revenue_filtered.groupby('team')['amount_krw'].sum().reset_index()
-team_revenue.columns = ['team', 'revenue']
-
-team_productivity = team_revenue.merge(hc_by_team, on='team', how='left')
-team_productivity['per_capita_revenue'] = team_productivity['revenue'] / team_productivity['headcount']
-team_productivity = team_productivity.sort_values('per_capita_revenue', ascending=False)
-
-fig_productivity = px.bar(
-    team_productivity,
-    x='team',
-    y='per_capita_revenue',
-    title="팀별 인당 매출 (생산성)",
-    labels={'per_capita_revenue': '인당 매출 (원)', 'team': '팀'},
-    text='per_capita_revenue',
-    color='team'
-)
-fig_productivity.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
-fig_productivity.update_yaxis(tickformat=".2s")
-st.plotly_chart(fig_productivity, use_container_width=True)
+    with col2:
+        weighted_pipeline = pipeline['weighted_value']
+        st.metric("가중 파이프라인 가치", f"₩{weighted_pipeline/1e8:.1f}억", delta="확률 반영")
+
+    with col3:
+        closed_won = pipeline['closed_won']
+        st.metric("계약 완료", f"₩{closed_won/1e8:.1f}억")
+
+    # Stage별 파이프라인
+    pipeline_by_stage = pipeline['by_stage']
+
+    def build_pipeline():
+        fig_pipeline = px.funnel(
+            pipeline_by_stage,
+            x='amount_krw',
+            y='stage',
+            title="Sales Pipeline by Stage",
+            labels={'amount_krw': '금액 (원)', 'stage': 'Stage'}
+        )
+        fig_pipeline.update_traces(texttemplate='₩%{x:.2s}')
+        return fig_pipeline
+
+    plot('pipeline', build_pipeline)
+
+    # 팀별 파이프라인
+    pipeline_by_team = pipeline['by_team']
+    def build_pipeline_team():
+        fig_pipeline_team = px.bar(
+            pipeline_by_team,
+            x='team',
+            y='amount_krw',
+            title="팀별 파이프라인 가치",
+            labels={'amount_krw': '금액 (원)', 'team': '팀'},
+            text='amount_krw',
+            color='team'
+        )
+        fig_pipeline_team.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
+        fig_pipeline_team.update_yaxes(tickformat=".2s")
+        return fig_pipeline_team
+
+    plot('pipeline_team', build_pipeline_team)
+
+render_section('pipeline', "🎯 Sales Pipeline", render_pipeline)
 
 # ================================
-# 8. Risk Management
+# 8. Headcount & Productivity
 # ================================
-st.markdown("---")
-st.subheader("⚠️ Risk Management")
+def render_headcount():
+    productivity = section('productivity')
 
-col1, col2 = st.columns(2)
+    col1, col2 = st.columns(2)
 
-with col1:
-    st.markdown("#### 💰 미수금 현황")
-
-    # 미수금 (Pending + Overdue)
-    ar_data = df_revenue[df_revenue['payment_status'].isin(['Pending', 'Overdue'])].copy()
-
-    if len(ar_data) > 0:
-        ar_total = ar_data['amount_krw'].sum()
-        ar_overdue = ar_data[ar_data['payment_status'] == 'Overdue']['amount_krw'].sum()
-        ar_pending = ar_data[ar_data['payment_status'] == 'Pending']['amount_krw'].sum()
-
-        st.metric("총 미수금", f"₩{ar_total/1e8:.1f}억")
-        st.metric("연체 미수금", f"₩{ar_overdue/1e8:.1f}억", delta="⚠️ 주의 필요")
-        st.metric("정상 미수금", f"₩{ar_pending/1e8:.1f}억")
-
-        # 미수금 상태별 차트
-        ar_by_status = ar_data.groupby('payment_status')['amount_krw'].sum().reset_index()
-        fig_ar = px.pie(
-            ar_by_status,
-            values='amount_krw',
-            names='payment_status',
-            title="미수금 상태별 비중",
-            hole=0.4,
-            color_discrete_map={'Pending': '#ffc107', 'Overdue': '#dc3545'}
+    with col1:
+        # 국가별 인원
+        hc_by_country = productivity['hc_by_country']
+
+        def build_hc_country():
+            fig_hc_country = px.bar(
+                hc_by_country,
+                x='country',
+                y='headcount',
+                title="국가별 인원",
+                labels={'headcount': '인원 수', 'country': '국가'},
+                text='headcount',
+                color='country'
+            )
+            fig_hc_country.update_traces(textposition='outside')
+            return fig_hc_country
+
+        plot('hc_country', build_hc_country)
+
+    with col2:
+        # 팀별 인원
+        hc_by_team = productivity['hc_by_team']
+
+        def build_hc_team():
+            fig_hc_team = px.bar(
+                hc_by_team,
+                x='team',
+                y='headcount',
+                title="팀별 인원",
+                labels={'headcount': '인원 수', 'team': '팀'},
+                text='headcount',
+                color='team'
+            )
+            fig_hc_team.update_traces(textposition='outside')
+            return fig_hc_team
+
+        plot('hc_team', build_hc_team)
+
+    # 팀별 생산성
+    team_productivity = productivity['team_productivity']
+
+    def build_productivity():
+        fig_productivity = px.bar(
+            team_productivity,
+            x='team',
+            y='per_capita_revenue',
+            title="팀별 인당 매출 (생산성)",
+            labels={'per_capita_revenue': '인당 매출 (원)', 'team': '팀'},
+            text='per_capita_revenue',
+            color='team'
         )
-        st.plotly_chart(fig_ar, use_container_width=True)
-    else:
-        st.success("✅ 미수금이 없습니다!")
+        fig_productivity.update_traces(texttemplate='₩%{text:.2s}', textposition='outside')
+        fig_productivity.update_yaxes(tickformat=".2s")
+        return fig_productivity
+
+    plot('productivity', build_productivity)
+
+    # 월별 인원 & 인당 매출 (입사/퇴사일 기준 월말 인원)
+    hc_monthly = productivity['monthly']
+
+    def build_hc_monthly():
+        fig_hc_monthly = go.Figure()
+        fig_hc_monthly.add_trace(go.Bar(
+            x=hc_monthly['year_month'],
+            y=hc_monthly['headcount'],
+            name='월말 인원',
+            marker_color='#6c757d'
+        ))
+        fig_hc_monthly.add_trace(go.Scatter(
+            x=hc_monthly['year_month'],
+            y=hc_monthly['per_capita_revenue'],
+            name='인당 매출 (원)',
+            mode='lines+markers',
+            line=dict(color='#007bff', width=3),
+            yaxis='y2'
+        ))
+        fig_hc_monthly.update_layout(
+            title="월별 인원 & 인당 매출",
+            xaxis_title="월",
+            yaxis=dict(title="인원 수"),
+            yaxis2=dict(title="인당 매출 (원)", overlaying='y', side='right', tickformat=".2s"),
+            hovermode='x unified',
+            height=400
+        )
+        return fig_hc_monthly
 
-with col2:
-    st.markdown("#### 🏦 현금 분산 (국가별)")
+    plot('hc_monthly', build_hc_monthly)
 
-    cash_by_country = df_cash[df_cash['date'] == latest_cash_date].groupby('country')['balance_krw'].sum().reset_index()
+render_section('headcount', "👥 인력 & 생산성", render_headcount)
 
-    fig_cash_dist = px.pie(
-        cash_by_country,
-        values='balance_krw',
-        names='country',
-        title="국가별 현금 보유 비중",
-        hole=0.4
-    )
-    fig_cash_dist.update_traces(textposition='inside', textinfo='percent+label')
-    st.plotly_chart(fig_cash_dist, use_container_width=True)
+# ================================
+# 9. Risk Management
+# ================================
+def render_risk():
+    col1, col2 = st.columns(2)
 
-    st.dataframe(
-        cash_by_country.style.format({'balance_krw': '₩{:,.0f}'}),
-        use_container_width=True
-    )
+    with col1:
+        st.markdown("#### 💰 미수금 현황")
+
+        # 미수금 연령 분석 (사이드바 필터 적용, 기준일 = 종료일)
+        ar = section('ar_aging')
+
+        if ar['has_ar']:
+            st.metric("총 미수금", f"₩{ar['total']/1e8:.1f}억", help=f"기준일 {ar['as_of']:%Y-%m-%d}")
+            st.metric("만기 지난 미수금", f"₩{ar['past_due']/1e8:.1f}억", delta="⚠️ 주의 필요", delta_color="off")
+            st.metric("DSO (매출채권 회수 기간)", "-" if pd.isna(ar['dso_days']) else f"{ar['dso_days']:.0f}일")
+
+            # 연체 구간별 미수금
+            ar_buckets = ar['buckets']
+            def build_ar():
+                fig_ar = px.bar(
+                    ar_buckets,
+                    x='bucket',
+                    y='amount_krw',
+                    title="연체 구간별 미수금 (Aging)",
+                    labels={'amount_krw': '금액 (원)', 'bucket': '연체 일수'},
+                    text='count',
+                    color='bucket',
+                    color_discrete_map={
+                        'Current': '#28a745', '1-30': '#ffc107', '31-60': '#fd7e14',
+                        '61-90': '#dc3545', '90+': '#8b0000'
+                    }
+                )
+                fig_ar.update_traces(texttemplate='%{text}건', textposition='outside')
+                fig_ar.update_yaxes(tickformat=".2s")
+                fig_ar.update_layout(showlegend=False)
+                return fig_ar
+
+            plot('ar', build_ar)
+        else:
+            st.success("✅ 미수금이 없습니다!")
 
-# Critical Alerts
-st.markdown("#### 🚨 Critical Alerts")
+    with col2:
+        st.markdown("#### 🏦 현금 분산 (국가별)")
+
+        cash_by_country = section('cash_distribution')
+
+        def build_cash_dist():
+            fig_cash_dist = px.pie(
+                cash_by_country,
+                values='balance_krw',
+                names='country',
+                title="국가별 현금 보유 비중",
+                hole=0.4
+            )
+            fig_cash_dist.update_traces(textposition='inside', textinfo='percent+label')
+            return fig_cash_dist
+
+        plot('cash_dist', build_cash_dist)
+
+        st.dataframe(
+            cash_by_country.style.format({'balance_krw': '₩{:,.0f}'}),
+            use_container_width=True
+        )
 
-alerts = []
+    if ar['has_ar']:
+        # 고객/국가/팀별 연령 분석과 DSO/회수율 추이
+        def aging_table(name, dim, label):
+            def render():
+                table = ar[name].rename(columns={dim: label, 'total': '합계', 'past_due': '만기 경과'})
+                amount_columns = [c for c in table.columns if c != label]
+                st.dataframe(
+                    table.style.format({c: '₩{:,.0f}' for c in amount_columns}),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            return render
+
+        def render_ar_trend():
+            ar_trend = ar['trend']
+            def build_ar_trend():
+                fig_ar_trend = make_subplots(specs=[[{"secondary_y": True}]])
+                fig_ar_trend.add_trace(go.Bar(
+                    x=ar_trend['year_month'],
+                    y=ar_trend['ar_balance'] / 1e8,
+                    name='월말 미수금 (억)',
+                    marker_color='#ffc107'
+                ), secondary_y=False)
+                fig_ar_trend.add_trace(go.Scatter(
+                    x=ar_trend['year_month'],
+                    y=ar_trend['dso_days'],
+                    name='DSO (일)',
+                    mode='lines+markers',
+                    line=dict(color='#dc3545', width=3)
+                ), secondary_y=True)
+                fig_ar_trend.add_trace(go.Scatter(
+                    x=ar_trend['year_month'],
+                    y=ar_trend['on_time_pct'],
+                    name='기한 내 회수율 (%)',
+                    mode='lines',
+                    line=dict(color='#28a745', width=2, dash='dot')
+                ), secondary_y=True)
+                fig_ar_trend.update_layout(
+                    title="월별 미수금 · DSO · 기한 내 회수율",
+                    hovermode='x unified',
+                    height=400
+                )
+                fig_ar_trend.update_yaxes(title_text="미수금 (억 원)", secondary_y=False)
+                fig_ar_trend.update_yaxes(title_text="일 / %", secondary_y=True)
+                return fig_ar_trend
+
+            plot('ar_trend', build_ar_trend)
+
+        st.markdown("#### 📅 미수금 연령 분석")
+        render_views('ar_aging', {
+            "고객별": aging_table('by_client', 'client_name', '고객'),
+            "국가별": aging_table('by_country', 'country', '국가'),
+            "팀별": aging_table('by_team', 'team', '팀'),
+            "DSO · 회수율 추이": render_ar_trend,
+        })
 
-# Runway 체크
-if runway_months < 6:
-    alerts.append({
-        'severity': '🔴 Critical',
-        'category': 'Cash',
-        'message': f'Runway가 {runway_months:.1f}개월로 6개월 미만입니다. 긴급 자금 확보 필요!'
-    })
-elif runway_months < 12:
-    alerts.append({
-        'severity': '🟡 Warning',
-        'category': 'Cash',
-        'message': f'Runway가 {runway_months:.1f}개월입니다. 자금 계획 검토 권장.'
-    })
+    # Critical Alerts
+    st.markdown("#### 🚨 Critical Alerts")
 
-# 미수금 체크
-if len(ar_data) > 0:
-    ar_overdue_pct = ar_overdue / total_revenue * 100 if total_revenue > 0 else 0
-    if ar_overdue_pct > 10:
-        alerts.append({
-            'severity': '🔴 Critical',
-            'category': 'AR',
-            'message': f'연체 미수금이 매출의 {ar_overdue_pct:.1f}%입니다. 회수 조치 필요!'
-        })
+    alerts = section('alerts')
 
-# 손익 체크
-if net_profit < 0:
-    alerts.append({
-        'severity': '🔴 Critical',
-        'category': 'P&L',
-        'message': f'선택 기간 동안 순이익이 -₩{abs(net_profit)/1e8:.1f}억으로 적자입니다.'
-    })
+    if len(alerts) > 0:
+        df_alerts = pd.DataFrame(alerts)
+        st.dataframe(df_alerts, use_container_width=True, hide_index=True)
+    else:
+        st.success("✅ 현재 Critical Alert가 없습니다!")
 
-if len(alerts) > 0:
-    df_alerts = pd.DataFrame(alerts)
-    st.dataframe(df_alerts, use_container_width=True, hide_index=True)
-else:
-    st.success("✅ 현재 Critical Alert가 없습니다!")
+render_section('risk', "⚠️ Risk Management", render_risk)
 
 # ================================
 # Footer
@@ -859,6 +1374,25 @@ st.markdown("---")
 st.markdown("""
 <div style='text-align: center; color: gray; font-size: 12px;'>
     <p>EO Studio CFO Dashboard v1.0 | 데이터 기준: 더미 데이터 (샘플)</p>
-    <p>실제 구글 시트 연결 시 load_fake_data() 함수를 교체하세요.</p>
+    <p>실제 구글 시트 연결 시 CFO_DATA_SOURCE=sheets 와 탭별 CFO_SHEET_URL_* 를 설정하세요.</p>
 </div>
 """, unsafe_allow_html=True)
+
+# ================================
+# 계측 결과 (사이드바 패널)
+# ================================
+if instrument.enabled:
+    instrument.finish()
+    with instrument_panel:
+        st.caption("이번 실행")
+        st.dataframe(
+            instrument.frame().round({'ms': 1}),
+            hide_index=True,
+            column_config={'ms': st.column_config.NumberColumn(format="%.1f")},
+        )
+        st.caption("전체 세션 누적 (p50 / p95, ms)")
+        st.dataframe(get_latency_stats().summary(), hide_index=True)
+        st.caption(
+            f"원본 로드 {load_result.elapsed:.2f}초 ({load_result.source}), "
+            + ", ".join(f"{tab} {seconds:.2f}초" for tab, seconds in load_result.timings.items())
+        )
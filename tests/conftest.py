@@ -0,0 +1,34 @@
+"""
+공용 fixture — 빠른 경로(인덱스/큐브/SQL 등)를 같은 더미 데이터의 pandas 계산과 비교
+"""
+
+import pandas as pd
+import pytest
+
+from cfo.fake_data import generate_fake_data
+
+
+@pytest.fixture(scope='session')
+def fake_data():
+    """
+    더미 데이터 (세션당 한 번 생성, 테스트에서 수정하지 않음)
+    """
+    return generate_fake_data(n_revenue=3000, n_expense=4000, n_employees=300, seed=7)
+
+
+@pytest.fixture(scope='session')
+def periods(fake_data):
+    """
+    (start, end) 기간 목록 — 전체, 월 경계, 월 중간, 데이터 범위 밖, 하루
+    """
+    dates = pd.concat([fake_data['revenue']['date'], fake_data['expense']['date']])
+    lo, hi = dates.min(), dates.max()
+    return [
+        (None, None),
+        ('2023-03-01', '2023-08-31'),
+        ('2023-03-17', '2024-02-09'),
+        ((lo - pd.Timedelta(days=40)).strftime('%Y-%m-%d'), '2023-05-20'),
+        ('2024-06-11', (hi + pd.Timedelta(days=40)).strftime('%Y-%m-%d')),
+        ('2024-01-15', '2024-01-15'),
+        (None, '2024-03-10'),
+    ]
@@ -0,0 +1,81 @@
+"""
+ArAging (bincount/누적합) vs 청구 건 단위 pandas 계산
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.ar_aging import AGING_BUCKETS, ArAging, term_days
+
+
+def reference_invoices(df_revenue, start, end):
+    """
+    필터 기간의 청구 건 (청구일/만기일/입금일, 기준일 이전 청구만) — ArAging 과 같은 규칙을 행 단위로
+    """
+    as_of = pd.Timestamp(end) if end is not None else df_revenue['date'].max()
+    rows = df_revenue
+    if start is not None:
+        rows = rows[rows['date'] >= pd.Timestamp(start)]
+    if end is not None:
+        rows = rows[rows['date'] <= pd.Timestamp(end)]
+    invoice = rows['invoice_date'].fillna(rows['date'])
+    paid = rows['payment_date']
+    paid = paid.mask(paid.isna() & (rows['payment_status'].astype(object) == 'Paid'), invoice)
+    paid = paid.where(paid.isna() | (paid >= invoice), invoice)
+    invoices = pd.DataFrame({
+        'country': rows['country'].astype(object),
+        'invoice': invoice,
+        'due': invoice + pd.to_timedelta(term_days(rows['payment_terms']), unit='D'),
+        'paid': paid,
+        'amount': rows['amount_krw'],
+    })
+    return invoices[invoices['invoice'] <= as_of], as_of
+
+
+@pytest.fixture(scope='module')
+def aging(fake_data):
+    return ArAging(fake_data['revenue'])
+
+
+def test_buckets_match_reference(fake_data, aging, periods):
+    for start, end in periods:
+        result = aging.aging(start, end)
+        invoices, as_of = reference_invoices(fake_data['revenue'], start, end)
+        open_rows = invoices[invoices['paid'].isna() | (invoices['paid'] > as_of)]
+        days_past_due = (as_of - open_rows['due']).dt.days
+        bucket = pd.cut(days_past_due, [-np.inf, 0, 30, 60, 90, np.inf], labels=AGING_BUCKETS)
+        expected = open_rows.groupby(bucket, observed=False)['amount'].sum().reindex(AGING_BUCKETS)
+        np.testing.assert_allclose(result['buckets']['amount_krw'], expected.to_numpy(), rtol=1e-9)
+        assert result['total'] == pytest.approx(open_rows['amount'].sum(), rel=1e-9)
+
+        by_country = result['by_country'].set_index('country')['total']
+        expected_country = open_rows.groupby('country', observed=True)['amount'].sum()
+        expected_country = expected_country[expected_country > 0]
+        pd.testing.assert_series_equal(
+            by_country.sort_index(), expected_country.sort_index(), check_names=False, check_index_type=False
+        )
+
+
+def test_trend_collection_matches_reference(fake_data, aging, periods):
+    for start, end in periods:
+        trend = aging.aging(start, end)['trend'].set_index('year_month')
+        invoices, as_of = reference_invoices(fake_data['revenue'], start, end)
+        collected = invoices['paid'].notna() & (invoices['paid'] <= as_of)
+        on_time = collected & (invoices['paid'] <= invoices['due'])
+        months = invoices['invoice'].dt.strftime('%Y-%m')
+        invoiced = invoices.groupby(months)['amount'].sum()
+        expected = pd.DataFrame({
+            'collection_pct': invoices['amount'].where(collected, 0).groupby(months).sum() / invoiced * 100,
+            'on_time_pct': invoices['amount'].where(on_time, 0).groupby(months).sum() / invoiced * 100,
+        })
+        actual = trend.loc[expected.index, ['collection_pct', 'on_time_pct']]
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+
+def test_on_time_never_exceeds_collection_for_past_as_of(aging):
+    # 기준일 이후 입금은 기한 내 회수로도 세지 않음
+    trend = aging.aging(end='2024-03-10')['trend'].dropna(subset=['collection_pct'])
+    assert len(trend)
+    assert (trend['on_time_pct'] <= trend['collection_pct'] + 1e-9).all()
+    assert trend['on_time_pct'].iloc[-1] <= trend['collection_pct'].iloc[-1]
@@ -0,0 +1,97 @@
+"""
+BudgetIndex (월 × 국가 × 팀 배열) 예산 대비 실적 vs Budget 탭 + 원장 pandas merge
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.budget import METRICS, TARGET_COLUMNS, BudgetIndex
+from cfo.cube import MonthlyCube
+
+
+@pytest.fixture(scope='module')
+def budget(fake_data):
+    """
+    실적 기간 앞뒤로 두 달씩 더 잡힌 예산 (연말까지 미리 세운 목표)
+    """
+    df = fake_data['budget']
+    first, last = df[(df['year'] == df['year'].min())], df[(df['year'] == df['year'].max())]
+    before = first[first['month'] <= 2].assign(year=first['year'] - 1, month=first['month'] + 10)
+    after = last[last['month'] >= 9].assign(month=last['month'] + 2)
+    assert after['month'].max() == 12
+    return pd.concat([before, df, after], ignore_index=True)
+
+
+@pytest.fixture(scope='module')
+def cube(fake_data):
+    return MonthlyCube(fake_data['revenue'], fake_data['expense'])
+
+
+def reference_monthly(fake_data, budget, start, end, countries=None, teams=None):
+    """
+    기간이 걸친 월 (비어 있으면 원장 기간) 중 예산이 있는 월의 월별 목표/실적
+    """
+    dates = pd.concat([fake_data['revenue']['date'], fake_data['expense']['date']])
+    lo = pd.Timestamp(start) if start is not None else dates.min()
+    hi = pd.Timestamp(end) if end is not None else dates.max()
+    budget_months = pd.PeriodIndex.from_fields(year=budget['year'], month=budget['month'], freq='M')
+    months = pd.period_range(max(lo.to_period('M'), budget_months.min()), min(hi.to_period('M'), budget_months.max()))
+
+    def selected(df):
+        keep = pd.Series(True, index=df.index)
+        if countries:
+            keep &= df['country'].isin(countries)
+        if teams:
+            keep &= df['team'].isin(teams)
+        return df[keep]
+
+    rows = selected(budget.assign(year_month=budget_months))
+    monthly = pd.DataFrame(index=months)
+    for metric, column in TARGET_COLUMNS.items():
+        monthly[f'{metric}_target'] = rows.groupby('year_month')[column].sum()
+    for kind in ('revenue', 'expense'):
+        ledger = selected(fake_data[kind])
+        monthly[f'{kind}_actual'] = ledger.groupby(ledger['date'].dt.to_period('M'))['amount_krw'].sum()
+    monthly = monthly.fillna(0.0)
+    monthly['profit_actual'] = monthly['revenue_actual'] - monthly['expense_actual']
+    return monthly
+
+
+FILTERS = [
+    (None, None, None, None),
+    ('2023-06-10', None, ['Korea'], None),
+    (None, '2023-09-30', None, ['EO School', 'Admin']),
+    ('2022-01-01', '2025-12-31', ['USA', 'Vietnam'], ['Video Production']),
+]
+
+
+@pytest.mark.parametrize('start, end, countries, teams', FILTERS)
+def test_variance_matches_reference(fake_data, budget, cube, start, end, countries, teams):
+    result = BudgetIndex(budget, cube).variance(start, end, countries=countries, teams=teams)
+    expected = reference_monthly(fake_data, budget, start, end, countries, teams)
+
+    monthly = result['monthly']
+    assert list(monthly['year_month']) == list(expected.index.strftime('%Y-%m'))
+    for metric in METRICS:
+        for part in ('target', 'actual'):
+            column = f'{metric}_{part}'
+            np.testing.assert_allclose(monthly[column], expected[column], rtol=1e-12, atol=1e-3)
+            assert result['totals'][metric][part] == pytest.approx(expected[column].sum(), rel=1e-12)
+
+
+def test_default_period_stops_at_last_actual_month(fake_data, budget, cube):
+    index = BudgetIndex(budget, cube)
+    result = index.variance()
+    last_actual = cube.max_date.strftime('%Y-%m')
+    first_actual = cube.min_date.strftime('%Y-%m')
+
+    # 예산만 있고 실적이 아직 없는 달은 기본 기간에서 빠짐 (0% 달성으로 합산되지 않음)
+    assert result['monthly']['year_month'].iloc[0] == first_actual
+    assert result['monthly']['year_month'].iloc[-1] == last_actual
+    assert result['totals'] == index.variance(cube.min_date, cube.max_date)['totals']
+
+    # 기간을 직접 주면 예산만 있는 달도 포함
+    future = index.variance(None, '2024-12-31')['monthly'].set_index('year_month')
+    assert future.index[-1] == '2024-12'
+    assert (future.loc[['2024-11', '2024-12'], 'revenue_actual'] == 0).all()
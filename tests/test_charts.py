@@ -0,0 +1,128 @@
+"""
+LTTB 다운샘플링 (구간 평균 벡터화) vs 점 하나씩 도는 파이썬 LTTB 기준 구현
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from cfo.charts import cached_figure, downsample, lttb_indices, to_webgl
+from cfo.result_cache import ResultCache
+
+
+def reference_lttb(x, y, n_out):
+    """
+    원 논문(Steinarsson, 2013) 방식 — 첫/마지막 점 고정, 나머지 n-2 개를 n_out-2 개 구간으로
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return list(range(n))
+    x = [float(v) for v in x]
+    y = [0.0 if np.isnan(v) else float(v) for v in y]
+    every = (n - 2) / (n_out - 2)
+    selected, a = [0], 0
+    for i in range(n_out - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        if i == n_out - 3:
+            next_start, next_end = n - 1, n
+        avg_x = sum(x[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    return selected + [n - 1]
+
+
+def random_walk(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=float) * 86400.0, np.cumsum(rng.normal(size=n))
+
+
+@pytest.mark.parametrize('n, n_out', [(10, 3), (10, 9), (101, 10), (1000, 37), (5000, 1000), (4097, 1024), (731, 500)])
+def test_lttb_matches_reference(n, n_out):
+    for seed in range(3):
+        x, y = random_walk(n, seed)
+        indices = lttb_indices(x, y, n_out)
+        assert list(indices) == reference_lttb(x, y, n_out), seed
+        # 첫/마지막 점 유지, 오름차순, 정확히 n_out 개
+        assert indices[0] == 0 and indices[-1] == n - 1
+        assert len(indices) == n_out and (np.diff(indices) > 0).all()
+
+
+@pytest.mark.parametrize('n_out', [0, 2, 10, 11])
+def test_small_outputs_keep_every_point(n_out):
+    x, y = random_walk(10, 0)
+    assert list(lttb_indices(x, y, n_out)) == list(range(10))
+
+
+def test_missing_values_and_flat_series():
+    x, y = random_walk(300, 1)
+    y[[0, 10, 11, 299]] = np.nan
+    assert list(lttb_indices(x, y, 40)) == reference_lttb(x, y, 40)
+    flat = lttb_indices(x, np.zeros(300), 40)
+    assert flat[0] == 0 and flat[-1] == 299 and len(flat) == 40
+
+
+def daily_series(days, groups):
+    dates = pd.date_range('2023-01-01', periods=days, freq='D')
+    rng = np.random.default_rng(days)
+    return pd.DataFrame({
+        'period': np.tile(dates, len(groups)),
+        'country': np.repeat(groups, days),
+        'amount_krw': rng.gamma(2.0, 1e6, size=days * len(groups)),
+    }).sample(frac=1.0, random_state=0)
+
+
+def test_downsample_by_series_matches_reference():
+    df = daily_series(900, ['Korea', 'USA', 'Vietnam'])
+    small = daily_series(50, ['Japan'])
+    result = downsample(pd.concat([df, small]), 'period', 'amount_krw', max_points=120, by='country')
+
+    for country, series in pd.concat([df, small]).groupby('country'):
+        series = series.sort_values('period')
+        kept = result[result['country'] == country]
+        if len(series) <= 120:
+            pd.testing.assert_frame_equal(kept, series)
+            continue
+        x = series['period'].to_numpy(dtype='datetime64[ns]').view('int64').astype(float)
+        expected = series.iloc[reference_lttb(x, series['amount_krw'].to_numpy(), 120)]
+        pd.testing.assert_frame_equal(kept, expected, obj=country)
+    assert result['period'].is_monotonic_increasing
+
+
+def test_downsample_shared_x_picks_from_totals():
+    df = daily_series(700, ['Korea', 'USA'])
+    result = downsample(df, 'period', 'amount_krw', max_points=100, by='country', shared_x=True)
+    totals = df.groupby('period')['amount_krw'].sum().sort_index()
+    x = totals.index.to_numpy(dtype='datetime64[ns]').view('int64').astype(float)
+    expected = set(totals.index[reference_lttb(x, totals.to_numpy(), 100)])
+    for _, series in result.groupby('country'):
+        assert set(series['period']) == expected
+
+    # 점이 적거나 비어 있으면 그대로
+    few = downsample(df, 'period', 'amount_krw', max_points=1000, by='country', shared_x=True)
+    assert len(few) == len(df)
+    assert downsample(df.iloc[:0], 'period', 'amount_krw').empty
+
+
+def test_webgl_and_cached_figure():
+    x, y = random_walk(2000, 0)
+    fig = go.Figure([go.Scatter(x=x, y=y), go.Scatter(x=x, y=y, stackgroup='one')])
+    assert [t.type for t in to_webgl(fig, threshold=5000).data] == ['scatter', 'scatter']
+    assert [t.type for t in to_webgl(fig, threshold=1000).data] == ['scattergl', 'scatter']
+
+    cache, builds = ResultCache(), []
+
+    def build():
+        builds.append(1)
+        return fig
+    first = cached_figure(cache, ('chart', 'v1'), build, webgl_threshold=1000)
+    second = cached_figure(cache, ('chart', 'v1'), build, webgl_threshold=1000)
+    assert len(builds) == 1
+    assert first.to_json() == second.to_json() == to_webgl(fig, 1000).to_json()
@@ -0,0 +1,149 @@
+"""
+KPI 스냅샷 CLI (JSON/Parquet 출력) vs 원장 행 단위 pandas 계산
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo import cli
+from cfo.data_sources import LoadResult
+
+FILTERS = [
+    (None, None, [], []),
+    ('2024-01-10', '2024-05-20', ['Korea'], []),
+    ('2023-03-17', '2024-02-09', ['USA', 'Vietnam'], ['EO School']),
+]
+
+
+@pytest.fixture
+def run(fake_data, monkeypatch, tmp_path):
+    """
+    원본 대신 더미 데이터로 CLI 실행 → 출력 파일 경로
+    """
+    monkeypatch.setattr(cli, 'load', lambda args: LoadResult(data=dict(fake_data), source='test'))
+
+    def run_cli(*argv, output='kpi.json'):
+        path = str(tmp_path / output)
+        assert cli.main(list(argv) + ['-o', path]) == 0
+        return path
+    return run_cli
+
+
+def cli_args(start, end, countries, teams):
+    args = []
+    if start:
+        args += ['--start', start]
+    if end:
+        args += ['--end', end]
+    for country in countries:
+        args += ['--country', country]
+    for team in teams:
+        args += ['--team', team]
+    return args
+
+
+def in_period(df, start, end, countries, teams=()):
+    rows = df
+    if start:
+        rows = rows[rows['date'] >= pd.Timestamp(start)]
+    if end:
+        rows = rows[rows['date'] <= pd.Timestamp(end)]
+    if countries:
+        rows = rows[rows['country'].isin(countries)]
+    if teams:
+        rows = rows[rows['team'].isin(teams)]
+    return rows
+
+
+def reference_snapshot(data, start, end, countries, teams):
+    """
+    KPI 와 월별 P&L / Cash Flow — 팀 필터는 매출에만 적용
+    """
+    revenue = in_period(data['revenue'], start, end, countries, teams)
+    expense = in_period(data['expense'], start, end, countries)
+    cash = data['cash'][data['cash']['date'] == data['cash']['date'].max()]
+    pipeline = data['pipeline']
+    ar = data['revenue']['payment_status'].astype(object)
+
+    def monthly(df):
+        return df.groupby(df['date'].dt.strftime('%Y-%m'))['amount_krw'].sum()
+
+    is_cogs = expense['category_l1'] == 'COGS'
+    pl = pd.DataFrame({'revenue': monthly(revenue)})
+    pl['cogs'] = monthly(expense[is_cogs])
+    pl['opex'] = monthly(expense[~is_cogs])
+    pl = pl.fillna(0)
+    pl['net_profit'] = pl['revenue'] - pl['cogs'] - pl['opex']
+
+    total_revenue = revenue['amount_krw'].sum()
+    expense_monthly = monthly(expense)
+    kpis = {
+        'total_revenue': total_revenue,
+        'total_expense': expense['amount_krw'].sum(),
+        'net_profit': total_revenue - expense['amount_krw'].sum(),
+        'gross_profit': total_revenue - expense.loc[is_cogs, 'amount_krw'].sum(),
+        'latest_cash': cash['balance_krw'].sum(),
+        'latest_cash_date': cash['date'].max().strftime('%Y-%m-%d'),
+        'avg_monthly_expense': expense_monthly.mean(),
+        'runway_months': cash['balance_krw'].sum() / expense_monthly.mean(),
+        'pipeline_total': pipeline['amount_krw'].sum(),
+        'pipeline_weighted': (pipeline['amount_krw'] * pipeline['probability']).sum() / 100,
+        'pipeline_closed_won': pipeline.loc[pipeline['stage'] == 'Closed Won', 'amount_krw'].sum(),
+        'ar_total': data['revenue'].loc[ar.isin(['Pending', 'Overdue']), 'amount_krw'].sum(),
+        'ar_overdue': data['revenue'].loc[ar == 'Overdue', 'amount_krw'].sum(),
+        'ar_pending': data['revenue'].loc[ar == 'Pending', 'amount_krw'].sum(),
+    }
+    return kpis, pl, expense_monthly
+
+
+@pytest.mark.parametrize('start, end, countries, teams', FILTERS)
+def test_json_snapshot_matches_reference(fake_data, run, start, end, countries, teams):
+    with open(run(*cli_args(start, end, countries, teams)), encoding='utf-8') as f:
+        document = json.load(f)
+    [snapshot] = document['snapshots']
+    kpis, pl, expense_monthly = reference_snapshot(fake_data, start, end, countries, teams)
+
+    assert snapshot['filters']['countries'] == (countries or None)
+    assert snapshot['filters']['teams'] == (teams or None)
+    for name, expected in kpis.items():
+        if isinstance(expected, str):
+            assert snapshot['kpis'][name] == expected, name
+        else:
+            assert snapshot['kpis'][name] == pytest.approx(expected, rel=1e-9), name
+
+    table = pd.DataFrame(snapshot['tables']['pl_monthly']).set_index('year_month')
+    assert list(table.index) == list(pl.index)
+    for column in pl.columns:
+        np.testing.assert_allclose(table[column], pl[column], rtol=1e-12, err_msg=column)
+    cashflow = pd.DataFrame(snapshot['tables']['cashflow_monthly']).set_index('year_month')
+    np.testing.assert_allclose(cashflow['amount_krw_exp'].loc[expense_monthly.index], expense_monthly, rtol=1e-12)
+
+
+def test_batch_covers_every_combination(fake_data, run):
+    with open(run('--batch', '--no-tables'), encoding='utf-8') as f:
+        snapshots = json.load(f)['snapshots']
+    countries = list(fake_data['revenue']['country'].unique())
+    teams = list(fake_data['revenue']['team'].unique())
+    assert len(snapshots) == (len(countries) + 1) * (len(teams) + 1)
+    assert all('tables' not in snapshot for snapshot in snapshots)
+
+    for snapshot in snapshots[:: len(teams) + 2]:
+        filters = snapshot['filters']
+        kpis, _, _ = reference_snapshot(fake_data, None, None, filters['countries'], filters['teams'])
+        assert snapshot['kpis']['total_revenue'] == pytest.approx(kpis['total_revenue'], rel=1e-9), filters
+        assert snapshot['kpis']['total_expense'] == pytest.approx(kpis['total_expense'], rel=1e-9), filters
+
+
+def test_parquet_rows_match_json(run):
+    pytest.importorskip('pyarrow')
+    with open(run('--batch', '--no-tables'), encoding='utf-8') as f:
+        snapshots = json.load(f)['snapshots']
+    rows = pd.read_parquet(run('--batch', output='kpi.parquet'))
+    assert len(rows) == len(snapshots)
+    for row, snapshot in zip(rows.to_dict('records'), snapshots):
+        assert row['countries'] == (','.join(snapshot['filters']['countries']) if snapshot['filters']['countries'] else None)
+        for name, value in snapshot['kpis'].items():
+            assert row[name] == (value if isinstance(value, str) else pytest.approx(value)), name
@@ -0,0 +1,114 @@
+"""
+MonthlyCube 기간 자르기 (완전한 월은 월 셀, 걸친 월은 일 셀) vs 원장 행 단위 pandas groupby
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.cube import CUBE_DIMENSIONS, MonthlyCube, split_period
+
+# 월 경계 전후, 데이터 범위 밖, 같은 달 안, 하루, 윤일, 거꾸로 된 기간
+EDGE_PERIODS = [
+    ('2023-03-01', '2023-03-31'),
+    ('2023-02-28', '2023-04-01'),
+    ('2023-03-31', '2023-05-01'),
+    ('2023-04-02', '2023-04-29'),
+    ('2024-02-29', '2024-02-29'),
+    ('2024-01-31', '2024-03-01'),
+    ('2022-11-15', '2023-01-10'),
+    ('2022-01-01', '2022-12-31'),
+    ('2024-10-20', '2025-03-01'),
+    ('2025-01-01', '2025-02-01'),
+    ('2000-01-01', '2099-12-31'),
+    ('2023-06-10', '2023-06-01'),
+]
+
+
+@pytest.fixture(scope='module')
+def ledgers(fake_data):
+    """
+    전체 원장 + 첫/끝 달이 일부만 있는 원장 (데이터 범위가 월 중간에서 시작/끝)
+    """
+    trimmed = {}
+    for kind in ('revenue', 'expense'):
+        df = fake_data[kind]
+        trimmed[kind] = df[(df['date'] >= '2023-01-17') & (df['date'] <= '2024-10-12')]
+    return {'full': fake_data, 'trimmed': trimmed}
+
+
+@pytest.fixture(scope='module')
+def cubes(ledgers):
+    return {name: MonthlyCube(data['revenue'], data['expense']) for name, data in ledgers.items()}
+
+
+def reference_cells(df, kind, start, end, countries=None, teams=None):
+    """
+    기간/차원 조건의 원장 행을 (year_month, 차원)별로 합산
+    """
+    dimensions = CUBE_DIMENSIONS[kind]
+    rows = df[(df['date'] >= pd.Timestamp(start)) & (df['date'] <= pd.Timestamp(end))]
+    if countries:
+        rows = rows[rows['country'].isin(countries)]
+    if teams:
+        rows = rows[rows['team'].isin(teams)]
+    rows = rows.assign(year_month=rows['date'].dt.strftime('%Y-%m'))
+    return rows.groupby(['year_month'] + dimensions, observed=True)['amount_krw'].agg(['sum', 'count'])
+
+
+def as_cells(cells, kind):
+    grouped = cells.groupby(['year_month'] + CUBE_DIMENSIONS[kind], observed=True)
+    return grouped.agg(sum=('amount_krw', 'sum'), count=('count', 'sum'))
+
+
+@pytest.mark.parametrize('name', ['full', 'trimmed'])
+@pytest.mark.parametrize('start, end', EDGE_PERIODS)
+def test_split_period_covers_each_day_once(cubes, name, start, end):
+    cube = cubes[name]
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if start > end:
+        return
+    full_months, edges = split_period(start, end, cube.min_date, cube.max_date)
+
+    days = []
+    if full_months is not None:
+        first_full, last_full = (pd.Period(m, 'M') for m in full_months)
+        assert first_full <= last_full
+        for month in pd.period_range(first_full, last_full):
+            # 완전한 월은 기간 안에 전부 있거나, 데이터 첫/끝 달이라 기간 밖 부분에 데이터가 없어야 함
+            assert month.start_time >= start or month.start_time <= cube.min_date <= start, month
+            assert month.end_time.normalize() <= end or end >= cube.max_date >= month.start_time, month
+            days.append(pd.date_range(max(month.start_time, cube.min_date), min(month.end_time.normalize(), cube.max_date)))
+    for edge_start, edge_end in edges:
+        assert edge_start <= edge_end
+        days.append(pd.date_range(edge_start, edge_end))
+
+    covered = pd.DatetimeIndex(np.concatenate([d.values for d in days])) if days else pd.DatetimeIndex([])
+    expected = pd.date_range(max(start, cube.min_date), min(end, cube.max_date))
+    assert covered.is_unique
+    assert list(covered.sort_values()) == list(expected)
+
+
+@pytest.mark.parametrize('name', ['full', 'trimmed'])
+@pytest.mark.parametrize('kind', ['revenue', 'expense'])
+def test_cells_match_reference(ledgers, cubes, periods, name, kind):
+    df, cube = ledgers[name][kind], cubes[name]
+    for start, end in EDGE_PERIODS + [p for p in periods if None not in p]:
+        for countries, teams in [(None, None), (['Korea', 'USA'], None), (None, ['EO School'])]:
+            expected = reference_cells(df, kind, start, end, countries, teams)
+            cells = cube.cells(kind, start, end, countries=countries, teams=teams)
+            assert list(cells['year_month']) == sorted(cells['year_month']), (start, end)
+            actual = as_cells(cells, kind)
+            assert len(actual) == len(expected), (start, end, countries, teams)
+            actual = actual.loc[expected.index]
+            np.testing.assert_allclose(actual['sum'], expected['sum'], rtol=1e-12, atol=1e-3)
+            assert (actual['count'].values == expected['count'].values).all(), (start, end)
+
+
+def test_open_period_uses_data_range(ledgers, cubes):
+    df, cube = ledgers['trimmed']['revenue'], cubes['trimmed']
+    expected = reference_cells(df, 'revenue', df['date'].min(), '2023-07-14')
+    actual = as_cells(cube.cells('revenue', None, '2023-07-14'), 'revenue')
+    assert len(actual) == len(expected)
+    np.testing.assert_allclose(actual.loc[expected.index, 'sum'], expected['sum'], rtol=1e-12)
+    assert len(cube.cells('revenue')) == len(cube.monthly['revenue'])
@@ -0,0 +1,86 @@
+"""
+DailyIndex (일별 누적합) 합계/추이 vs 원장 pandas groupby
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.cube import INDEX_DIMENSIONS, MonthlyCube
+
+SELECTIONS = {
+    'revenue': [{}, {'country': ['Korea']}, {'country': ['USA', 'Vietnam'], 'team': ['EO School']}],
+    'expense': [{}, {'team': ['Branded Content']}, {'country': ['Korea'], 'category_l1': ['COGS', 'Marketing']}],
+}
+
+
+def reference_rows(df, kind, start=None, end=None, **selections):
+    """
+    기간/차원 조건의 원장 행 (인덱스 차원이 비어 있는 행은 큐브처럼 제외)
+    """
+    rows = df.dropna(subset=['date'] + INDEX_DIMENSIONS[kind])
+    if start is not None:
+        rows = rows[rows['date'] >= pd.Timestamp(start)]
+    if end is not None:
+        rows = rows[rows['date'] <= pd.Timestamp(end)]
+    for dim, selected in selections.items():
+        rows = rows[rows[dim].isin(selected)]
+    return rows
+
+
+def period_labels(dates, freq):
+    dates = pd.DatetimeIndex(dates).normalize()
+    if freq == 'W':
+        return dates - pd.to_timedelta(dates.weekday, unit='D')
+    if freq == 'M':
+        return dates.to_period('M').to_timestamp()
+    return dates
+
+
+@pytest.fixture(scope='module')
+def cube(fake_data):
+    return MonthlyCube(fake_data['revenue'], fake_data['expense'])
+
+
+@pytest.mark.parametrize('kind', ['revenue', 'expense'])
+def test_total_matches_reference(fake_data, cube, periods, kind):
+    for start, end in periods:
+        for selections in SELECTIONS[kind]:
+            expected = reference_rows(fake_data[kind], kind, start, end, **selections)['amount_krw'].sum()
+            actual = cube.index[kind].total(start, end, **selections)
+            assert np.isclose(actual, expected, rtol=1e-12, atol=1e-3), (start, end, selections)
+
+
+@pytest.mark.parametrize('freq', ['D', 'W', 'M'])
+@pytest.mark.parametrize('kind', ['revenue', 'expense'])
+def test_series_matches_reference(fake_data, cube, periods, kind, freq):
+    df = fake_data[kind]
+    first, last = df['date'].min(), df['date'].max()
+    for start, end in periods:
+        for selections in SELECTIONS[kind]:
+            actual = cube.index[kind].series(start, end, freq=freq, **selections)
+
+            # 구간은 데이터 범위로 자른 기간의 모든 날짜가 속한 구간 (금액이 없는 구간도 0 으로 포함)
+            lo = max(pd.Timestamp(start), first) if start is not None else first
+            hi = min(pd.Timestamp(end), last) if end is not None else last
+            expected_periods = period_labels(pd.date_range(lo, hi), freq).unique()
+            assert list(actual['period']) == list(expected_periods)
+
+            rows = reference_rows(df, kind, start, end, **selections)
+            expected = rows.groupby(period_labels(rows['date'], freq))['amount_krw'].sum()
+            expected = expected.reindex(expected_periods, fill_value=0.0)
+            np.testing.assert_allclose(actual['amount_krw'].to_numpy(), expected.to_numpy(), rtol=1e-12, atol=1e-3)
+
+
+@pytest.mark.parametrize('by', ['country', 'team'])
+def test_series_by_dimension_matches_reference(fake_data, cube, periods, by):
+    df = fake_data['revenue']
+    for start, end in periods:
+        actual = cube.index['revenue'].series(start, end, freq='M', by=by, country=['Korea', 'USA'])
+        actual = actual.pivot(index='period', columns=by, values='amount_krw')
+
+        rows = reference_rows(df, 'revenue', start, end, country=['Korea', 'USA'])
+        expected = rows.groupby([period_labels(rows['date'], 'M'), rows[by]], observed=True)['amount_krw'].sum().unstack(fill_value=0.0)
+        assert set(expected.columns) == set(actual.columns)
+        expected = expected.reindex(index=actual.index, columns=actual.columns, fill_value=0.0)
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-12, atol=1e-3)
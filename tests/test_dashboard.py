@@ -0,0 +1,113 @@
+"""
+대시보드 섹션 지연 렌더링 vs 모든 섹션을 한 번에 렌더링한 결과 (Streamlit AppTest)
+"""
+
+import os
+
+import pytest
+
+from cfo import metrics
+
+testing = pytest.importorskip('streamlit.testing.v1')
+import streamlit as st  # noqa: E402
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dashboard.py')
+SECTION_KEYS = ['cash_runway', 'revenue', 'expense', 'pl', 'budget', 'pipeline', 'headcount', 'risk']
+# 지연 모드 보기 전환 (segmented_control 키 → 보기 라벨)
+VIEWS = {
+    'view_revenue': ["📈 추이 분석", "🌍 국가별", "👥 팀별"],
+    'view_ar_aging': ["고객별", "국가별", "팀별", "DSO · 회수율 추이"],
+}
+
+
+@pytest.fixture
+def dashboard(tmp_path, monkeypatch):
+    """
+    환경 변수로 모드를 정해 대시보드 실행 → (AppTest, 이번 실행에서 계산을 요청한 섹션 목록)
+    """
+    calls = []
+    compute_section = metrics.compute_section
+
+    def recorded(name, *args, **kwargs):
+        calls.append(name)
+        return compute_section(name, *args, **kwargs)
+
+    monkeypatch.setattr(metrics, 'compute_section', recorded)
+    monkeypatch.setenv('CFO_DATA_SOURCE', 'fake')
+    monkeypatch.setenv('CFO_FAKE_REVENUE_ROWS', '500')
+    monkeypatch.setenv('CFO_FAKE_EXPENSE_ROWS', '800')
+    monkeypatch.setenv('CFO_SNAPSHOT_DIR', str(tmp_path / 'snapshot'))
+    monkeypatch.delenv('CFO_PL_STORE_DIR', raising=False)
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+    def run(open_sections=(), lazy=True):
+        monkeypatch.setenv('CFO_LAZY_SECTIONS', '1' if lazy else '0')
+        monkeypatch.setenv('CFO_OPEN_SECTIONS', ','.join(open_sections))
+        app = testing.AppTest.from_file(DASHBOARD, default_timeout=120)
+        calls.clear()
+        app.run()
+        assert not app.exception, [e.value for e in app.exception]
+        return app, calls
+
+    yield run
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+def rendered(app):
+    """
+    비교용 렌더링 결과: 지표, 표(CSV), 차트(Plotly JSON)
+    """
+    return {
+        'metrics': [(m.label, m.value) for m in app.metric],
+        'tables': [d.value.to_csv() for d in app.dataframe],
+        'charts': [c.proto.spec for c in app.get('plotly_chart')],
+    }
+
+
+def test_closed_sections_compute_nothing(dashboard):
+    app, calls = dashboard()
+    assert set(calls) == {'kpi'}
+    assert not app.get('plotly_chart')
+    assert [t.key for t in app.toggle] == [f'section_open_{key}' for key in SECTION_KEYS]
+    assert not any(t.value for t in app.toggle)
+
+
+def test_opening_a_section_computes_only_that_section(dashboard):
+    _, eager_calls = dashboard(lazy=False)
+    eager = set(eager_calls)
+    # 섹션 하나만 펼쳤을 때 필요한 섹션 결과
+    solo = {key: set(dashboard(open_sections=[key])[1]) - {'kpi'} for key in SECTION_KEYS}
+    assert all(solo.values())
+
+    app, calls = dashboard()
+    opened = set()
+    for key in SECTION_KEYS:
+        calls.clear()
+        app.toggle(key=f'section_open_{key}').set_value(True).run()
+        assert not app.exception
+        # 새로 계산을 요청한 결과는 방금 펼친 섹션 것뿐
+        assert set(calls) - {'kpi'} - opened == solo[key] - opened, key
+        opened |= solo[key]
+    assert opened | {'kpi'} == eager
+
+
+def test_lazy_output_matches_eager(dashboard):
+    eager, _ = dashboard(lazy=False)
+    expected = rendered(eager)
+
+    app, _ = dashboard(open_sections=SECTION_KEYS)
+    actual = rendered(app)
+    assert actual['metrics'] == expected['metrics']
+    # 선택하지 않은 보기는 렌더링하지 않음 → 보기를 하나씩 바꿔 가며 모은 결과가 한 번에 렌더링한 결과와 같아야 함
+    assert len(actual['charts']) < len(expected['charts']) or len(actual['tables']) < len(expected['tables'])
+    for key, labels in VIEWS.items():
+        for label in labels[1:]:
+            app.button_group(key=key).set_value(label).run()
+            assert not app.exception
+            view = rendered(app)
+            actual['tables'] += [t for t in view['tables'] if t not in actual['tables']]
+            actual['charts'] += [c for c in view['charts'] if c not in actual['charts']]
+    assert sorted(actual['tables']) == sorted(set(expected['tables']))
+    assert sorted(actual['charts']) == sorted(set(expected['charts']))
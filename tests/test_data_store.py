@@ -0,0 +1,178 @@
+"""
+DataStore (백그라운드 새로고침 + 참조 교체) vs 로드 결과를 순서대로 적용하는 기준 모델
+"""
+
+import threading
+import time
+
+import pytest
+
+from cfo.data_sources import REQUIRED_TABS, LoadResult
+from cfo.data_store import DataStore
+
+
+def load_result(version, missing=()):
+    """
+    탭 내용 해시가 모두 version 인 로드 결과 (missing 탭은 실패로 기록)
+    """
+    tabs = [tab for tab in REQUIRED_TABS if tab not in missing]
+    return LoadResult(
+        data={tab: object() for tab in tabs},
+        versions={tab: version for tab in tabs},
+        errors={tab: 'HTTP 503' for tab in missing},
+        source='test',
+    )
+
+
+class ScriptedLoader:
+    """
+    미리 정한 결과를 순서대로 반환 (Exception 이면 발생시킴)
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.calls = 0
+
+    def __call__(self):
+        step = self.steps[self.calls]
+        self.calls += 1
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+
+def reference_current(steps):
+    """
+    단계별로 저장소가 들고 있어야 할 결과와 교체 횟수, 마지막 오류 여부
+    실패/필수 탭 누락은 이전 버전 유지, 같은 버전은 이전 객체 유지
+    """
+    current, swaps, states = None, 0, []
+    for step in steps:
+        failed = isinstance(step, Exception) or bool(
+            current is not None and step.missing_required and not current.missing_required)
+        if not failed and (current is None or step.data_version != current.data_version):
+            current, swaps = step, swaps + 1
+        states.append((current, swaps, failed))
+    return states
+
+
+STEPS = [
+    load_result('a'),
+    load_result('a'),
+    RuntimeError('timeout'),
+    load_result('b'),
+    load_result('c', missing=['cash']),
+    load_result('b'),
+    load_result('c'),
+    ValueError('bad csv'),
+    load_result('d', missing=['revenue', 'pipeline']),
+    load_result('d'),
+]
+
+
+def test_refresh_sequence_matches_reference():
+    now = [0.0]
+    loader = ScriptedLoader(STEPS)
+    store = DataStore(loader, refresh_seconds=0, clock=lambda: now[0])
+    try:
+        checked_at = None
+        for i, (expected, swaps, failed) in enumerate(reference_current(STEPS)):
+            now[0] = float(i)
+            if i == 0:
+                assert store.get() is expected
+            else:
+                store.refresh(wait=True)
+            assert store.current is expected, i
+            assert store.swaps == swaps, i
+            assert (store.last_error is not None) == failed, i
+            if not failed:
+                checked_at = float(i)
+            assert store.checked_at == checked_at, i
+        assert loader.calls == len(STEPS)
+    finally:
+        store.stop()
+
+
+def test_failure_messages_and_first_load():
+    # 첫 로드는 필수 탭이 빠져도 그대로 사용 (보여 줄 이전 버전이 없음)
+    partial = load_result('a', missing=['cash'])
+    store = DataStore(ScriptedLoader([partial, load_result('b', missing=['pipeline']), RuntimeError('timeout')]),
+                      refresh_seconds=0)
+    try:
+        assert store.get() is partial and store.swaps == 1
+        # 이전 버전도 필수 탭이 빠져 있었으면 새 버전으로 교체
+        store.refresh(wait=True)
+        assert store.current.data_version != partial.data_version and store.last_error is None
+
+        store.refresh(wait=True)
+        assert store.last_error == 'RuntimeError: timeout'
+
+        full = DataStore(ScriptedLoader([load_result('a'), load_result('b', missing=['cash'])]), refresh_seconds=0)
+        full.get()
+        full.refresh(wait=True)
+        assert full.last_error == '필수 탭 누락: cash (HTTP 503)'
+        full.stop()
+    finally:
+        store.stop()
+
+
+def test_sessions_read_old_version_while_refreshing():
+    release = threading.Event()
+    old, new = load_result('a'), load_result('b')
+
+    def loader():
+        if loader.calls:
+            release.wait(5)
+        loader.calls += 1
+        return new if loader.calls > 1 else old
+    loader.calls = 0
+
+    store = DataStore(loader, refresh_seconds=0)
+    try:
+        assert store.get() is old
+        store.refresh()
+        deadline = time.time() + 5
+        while not store.refreshing and time.time() < deadline:
+            time.sleep(0.01)
+        assert store.refreshing
+
+        # 새로고침이 끝나기 전에는 기다리지 않고 이전 버전
+        started = time.perf_counter()
+        assert store.get() is old
+        assert time.perf_counter() - started < 0.1
+
+        release.set()
+        while store.current is not new and time.time() < deadline:
+            time.sleep(0.01)
+        assert store.get() is new and store.swaps == 2
+    finally:
+        release.set()
+        store.stop()
+
+
+def test_periodic_refresh_and_single_first_load():
+    versions = iter('abcdefghijklmnopqrstuvwxyz')
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.02)
+        return load_result(next(versions))
+
+    store = DataStore(loader, refresh_seconds=0.05)
+    try:
+        # 여러 세션이 동시에 첫 get() 을 불러도 로드는 한 번
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(store.get())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(result) for result in results}) == 1 and len(calls) == 1
+
+        deadline = time.time() + 5
+        while store.swaps < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert store.swaps >= 3
+    finally:
+        store.stop()
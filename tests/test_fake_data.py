@@ -0,0 +1,75 @@
+"""
+build_pl_monthly (PL_Monthly 탭) vs 원장 행 단위 pandas 집계 — 작은/빈 원장 포함
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.fake_data import build_pl_monthly, generate_fake_data
+from cfo.schema import TAB_SCHEMAS, apply_schema
+
+KEYS = ['year_month', 'country', 'team']
+
+
+def reference_pl(df_revenue, df_expense):
+    """
+    (연월, 국가, 팀)별 매출/COGS/판관비를 행 단위 문자열 키로 직접 합산
+    """
+    def monthly(df, column):
+        rows = df.assign(year_month=df['date'].dt.strftime('%Y-%m'))
+        return rows.groupby(KEYS, observed=True)['amount_krw'].sum().rename(column)
+
+    is_cogs = df_expense['category_l1'] == 'COGS'
+    parts = [
+        monthly(df_revenue, 'revenue_krw'),
+        monthly(df_expense[is_cogs], 'cogs_krw'),
+        monthly(df_expense[~is_cogs], 'operating_expense_krw'),
+    ]
+    return pd.concat(parts, axis=1).fillna(0).sort_index()
+
+
+@pytest.mark.parametrize('sizes', [
+    {'n_expense': 3, 'seed': 1},
+    {'n_revenue': 1, 'n_expense': 1},
+    {'n_revenue': 0},
+    {'n_expense': 0},
+    {'n_revenue': 0, 'n_expense': 0},
+    {'n_revenue': 3000, 'n_expense': 4000},
+])
+def test_pl_monthly_matches_ledgers(sizes):
+    data = generate_fake_data(**sizes)
+    pl = data['pl_monthly']
+    expected = reference_pl(data['revenue'], data['expense'])
+
+    assert len(pl) == len(expected)
+    assert pl['year_month'].map(type).eq(str).all()
+    actual = pl.set_index(KEYS)[expected.columns].sort_index()
+    if len(expected):
+        np.testing.assert_allclose(actual.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+        assert list(actual.index) == list(expected.index)
+
+    np.testing.assert_allclose(pl['gross_profit_krw'], pl['revenue_krw'] - pl['cogs_krw'])
+    np.testing.assert_allclose(pl['ebitda_krw'], pl['gross_profit_krw'] - pl['operating_expense_krw'])
+    assert pl.loc[pl['revenue_krw'] == 0, 'gross_margin_pct'].isna().all()
+
+
+def test_pl_monthly_single_expense_type():
+    data = generate_fake_data(n_revenue=0, n_expense=50, seed=3)
+    only_cogs = data['expense'][data['expense']['category_l1'] == 'COGS']
+    pl = build_pl_monthly(data['revenue'], only_cogs)
+
+    assert len(pl) == only_cogs.groupby([only_cogs['date'].dt.to_period('M'), 'country', 'team'], observed=True).ngroups
+    assert (pl['operating_expense_krw'] == 0).all()
+    assert pl['cogs_krw'].sum() == pytest.approx(only_cogs['amount_krw'].sum())
+
+
+@pytest.mark.parametrize('sizes', [{}, {'n_revenue': 60, 'n_expense': 1, 'n_employees': 1}])
+def test_label_columns_match_schema_conversion(sizes):
+    data = generate_fake_data(today='2024-10-31', **sizes)
+    for tab, df in data.items():
+        labels = [c for c in TAB_SCHEMAS[tab] if c in df.columns and (
+            df[c].dtype == object or isinstance(df[c].dtype, pd.CategoricalDtype))]
+        # 문자열로 되돌린 뒤 스키마 변환한 결과와 타입/카테고리 순서까지 같아야 함
+        expected = apply_schema(tab, df.astype({c: object for c in labels}))
+        pd.testing.assert_frame_equal(apply_schema(tab, df)[labels], expected[labels], obj=tab)
@@ -0,0 +1,67 @@
+"""
+FilterEngine (정렬 + 이진 탐색 + 코드 마스크) vs pandas 불리언 필터
+"""
+
+import pandas as pd
+import pytest
+
+from cfo.filters import FilterEngine
+
+SELECTIONS = [
+    {},
+    {'country': ['Korea']},
+    {'country': ['USA', 'Vietnam'], 'team': ['EO School']},
+    {'team': ['Video Production', 'Branded Content']},
+    {'country': ['Korea', 'USA', 'Vietnam']},
+    {'country': ['Nowhere']},
+]
+
+
+def reference_filter(df, start=None, end=None, **selections):
+    """
+    날짜순(같은 날은 원래 순서) 정렬 후 조건을 그대로 적용 — 종료일은 그날 거래까지 포함
+    """
+    rows = df.sort_values('date', kind='stable')
+    mask = pd.Series(True, index=rows.index)
+    if start is not None:
+        mask &= rows['date'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= rows['date'] < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    for dim, selected in selections.items():
+        if selected:
+            mask &= rows[dim].isin(selected)
+    return rows[mask]
+
+
+@pytest.fixture(scope='module', params=['revenue', 'expense'])
+def ledger(request, fake_data):
+    # 정렬되지 않은 입력도 다루는지 보기 위해 행 순서를 섞음
+    return fake_data[request.param].sample(frac=1.0, random_state=3)
+
+
+@pytest.mark.parametrize('selections', SELECTIONS)
+def test_filter_and_count_match_reference(ledger, periods, selections):
+    engine = FilterEngine(ledger)
+    for start, end in periods:
+        expected = reference_filter(ledger, start, end, **selections).reset_index(drop=True)
+        actual = engine.filter(start, end, **selections).reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual, expected)
+        assert engine.count(start, end, **selections) == len(expected)
+
+
+@pytest.mark.parametrize('selections', SELECTIONS)
+def test_latest_matches_reference(ledger, periods, selections):
+    engine = FilterEngine(ledger)
+    for start, end in periods:
+        expected = reference_filter(ledger, start, end, **selections).iloc[::-1].head(25)
+        actual = engine.latest(25, start, end, **selections)
+        pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_categorical_columns_match_object_columns(fake_data, periods):
+    df = fake_data['revenue']
+    categorical = FilterEngine(df.astype({'country': 'category', 'team': 'category'}))
+    plain = FilterEngine(df)
+    for start, end in periods:
+        for selections in SELECTIONS:
+            assert categorical.count(start, end, **selections) == plain.count(start, end, **selections)
@@ -0,0 +1,106 @@
+"""
+FxConverter (통화별 as-of 이진 탐색) vs 행 단위 환율 조회
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.constants import FX_RATES
+from cfo.fx import RATE_COLUMNS, FxConverter, RateTable
+
+
+def make_rates(seed, dates):
+    """
+    날짜마다 다른 환율표 — 같은 날짜 중복(마지막 값), 결측/0 (무시)을 섞음
+    """
+    rng = np.random.default_rng(seed)
+    rates = pd.DataFrame({
+        'date': dates,
+        'usd_to_krw': rng.uniform(1100, 1500, len(dates)).round(2),
+        'vnd_to_krw': rng.uniform(0.04, 0.07, len(dates)).round(5),
+    })
+    rates.loc[rates.index[::7], 'usd_to_krw'] = np.nan
+    rates.loc[rates.index[::11], 'vnd_to_krw'] = 0.0
+    duplicate = rates.iloc[[5]].assign(usd_to_krw=1234.5)
+    return pd.concat([rates, duplicate], ignore_index=True)
+
+
+def reference_rates(rates):
+    """
+    통화별 유효한 환율 (날짜순, 같은 날짜는 마지막 행) — 결측/0 은 제외
+    """
+    tables = {}
+    for column, currency in RATE_COLUMNS.items():
+        if column not in rates:
+            continue
+        valid = rates[rates[column].notna() & (rates[column] > 0)]
+        if len(valid):
+            tables[currency] = valid.drop_duplicates('date', keep='last').sort_values('date')[['date', column]]
+    return tables
+
+
+def reference_rate(tables, currency, day):
+    """
+    기준일 또는 그 이전 가장 최근 환율 (첫 환율 이전은 첫 환율, 환율표에 없는 통화는 기본 환율)
+    """
+    if currency == 'KRW':
+        return 1.0
+    if currency not in tables:
+        return float(FX_RATES[currency])
+    table = tables[currency]
+    before = table[table['date'] <= day]
+    return float((before if len(before) else table.head(1)).iloc[-1, 1])
+
+
+def reference_convert(df, rates, mode):
+    days = df['date'].dt.normalize()
+    if mode == 'month_end':
+        days = days + pd.offsets.MonthEnd(0)
+    tables = reference_rates(rates)
+    exchange_rate = np.array([reference_rate(tables, c, d) for c, d in zip(df['currency'], days)])
+    return df['amount_original'].to_numpy(dtype=float) * exchange_rate, exchange_rate
+
+
+@pytest.fixture(scope='module')
+def rates():
+    dates = pd.date_range('2023-01-20', '2024-09-30', freq='9D')
+    return make_rates(0, dates)
+
+
+@pytest.mark.parametrize('mode', ['transaction', 'month_end'])
+@pytest.mark.parametrize('kind', ['revenue', 'expense'])
+def test_convert_matches_reference(fake_data, rates, mode, kind):
+    df = fake_data[kind]
+    result = FxConverter(mode).convert(df, RateTable(rates))
+    amount_krw, exchange_rate = reference_convert(df, rates, mode)
+    np.testing.assert_allclose(result['exchange_rate'].to_numpy(), exchange_rate, rtol=1e-15)
+    np.testing.assert_allclose(result['amount_krw'].to_numpy(), amount_krw, rtol=1e-15)
+    # 원본은 그대로
+    assert df['amount_krw'].equals(fake_data[kind]['amount_krw'])
+
+
+def test_missing_currency_column_uses_default_rate(fake_data, rates):
+    df = fake_data['revenue']
+    usd_only = rates.drop(columns=['vnd_to_krw'])
+    result = FxConverter().convert(df, RateTable(usd_only))
+    amount_krw, _ = reference_convert(df, usd_only, 'transaction')
+    np.testing.assert_allclose(result['amount_krw'].to_numpy(), amount_krw, rtol=1e-15)
+
+
+@pytest.mark.parametrize('mode', ['transaction', 'month_end'])
+def test_revised_rates_only_touch_changed_rows(fake_data, rates, mode):
+    df = fake_data['revenue']
+    revised = rates.copy()
+    revised.loc[revised.index[20:24], 'usd_to_krw'] = 999.0
+
+    converter = FxConverter(mode)
+    converter.convert_tab('revenue', df, RateTable(rates))
+    result = converter.convert_tab('revenue', df, RateTable(revised))
+    assert converter.last_stats['revenue']['mode'] == 'revised'
+    assert 0 < converter.last_stats['revenue']['rows'] < len(df)
+
+    amount_krw, _ = reference_convert(df, revised, mode)
+    np.testing.assert_allclose(result['amount_krw'].to_numpy(), amount_krw, rtol=1e-15)
+    assert converter.convert_tab('revenue', df, RateTable(revised)) is result
+    assert converter.last_stats['revenue']['mode'] == 'unchanged'
@@ -0,0 +1,113 @@
+"""
+HeadcountTimeline (입사/퇴사 스윕 라인 배열) vs 월말마다 직원 한 명씩 재직 여부를 보는 pandas 계산
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.cube import MonthlyCube
+from cfo.headcount import HeadcountTimeline
+
+SELECTIONS = [(None, None), (['Korea'], None), (None, ['EO School', 'Admin']), (['USA', 'Vietnam'], ['Video Production'])]
+
+
+@pytest.fixture(scope='module')
+def cube(fake_data):
+    return MonthlyCube(fake_data['revenue'], fake_data['expense'])
+
+
+@pytest.fixture(scope='module')
+def employees(fake_data):
+    """
+    더미 직원 + 월 경계/데이터 범위 밖/결측 입사·퇴사일 직원
+    """
+    edge = pd.DataFrame([
+        ('2023-03-31', '2023-06-30', 'Active', 'Korea', 'EO School'),     # 말일 입사, 말일 퇴사 → 6월까지
+        ('2023-03-01', '2023-06-01', 'Inactive', 'Korea', 'EO School'),   # 1일 퇴사 → 5월까지
+        ('2020-01-01', None, 'Active', 'USA', 'Video Production'),       # 데이터 이전 입사
+        ('2026-01-01', None, 'Active', 'USA', 'Video Production'),       # 데이터 이후 입사
+        (None, '2023-09-15', 'Inactive', 'Vietnam', 'Admin'),             # 입사일 없음 → 처음부터
+        ('2023-05-10', None, 'Inactive', 'Korea', 'Admin'),               # 퇴사일 없이 Inactive → 제외
+        ('2023-08-01', '2023-07-01', 'Inactive', 'Korea', 'EO School'),   # 퇴사가 입사보다 빠름 → 제외
+        ('2023-02-14', '2022-12-31', 'Inactive', 'Korea', 'EO School'),   # 데이터 이전 퇴사
+        ('2024-10-31', None, 'Active', None, 'EO School'),                # 마지막 날 입사, 국가 없음
+        ('2023-01-01', '2024-10-30', 'Inactive', 'Korea', None),          # 마지막 날 전날 퇴사, 팀 없음
+    ], columns=['join_date', 'leave_date', 'status', 'country', 'team'])
+    edge['join_date'] = pd.to_datetime(edge['join_date'])
+    edge['leave_date'] = pd.to_datetime(edge['leave_date'])
+    edge['monthly_salary_krw'] = np.arange(1, len(edge) + 1) * 1e6
+    df = fake_data['headcount']
+    df = df.astype({'country': object, 'team': object})
+    return pd.concat([df, edge], ignore_index=True)
+
+
+def reference_monthly(df, cube, start, end, countries, teams):
+    """
+    월말마다 재직 직원(입사일 <= 말일 <= 퇴사일) 수와 월급 합계
+    """
+    first = cube.min_date.to_period('M') if start is None else max(pd.Period(start, 'M'), cube.min_date.to_period('M'))
+    last = cube.max_date.to_period('M') if end is None else min(pd.Period(end, 'M'), cube.max_date.to_period('M'))
+    rows = df
+    if countries:
+        rows = rows[rows['country'].isin(countries)]
+    if teams:
+        rows = rows[rows['team'].isin(teams)]
+    rows = rows[~(rows['leave_date'].isna() & (rows['status'] == 'Inactive'))]
+
+    records = []
+    for month in pd.period_range(first, last, freq='M'):
+        month_end = month.end_time.normalize()
+        employed = rows[(rows['join_date'].isna() | (rows['join_date'] <= month_end))
+                        & (rows['leave_date'].isna() | (rows['leave_date'] >= month_end))]
+        records.append((str(month), employed))
+    return records
+
+
+@pytest.mark.parametrize('countries, teams', SELECTIONS)
+def test_summary_matches_reference(employees, cube, periods, countries, teams):
+    timeline = HeadcountTimeline(employees, cube)
+    for start, end in periods + [('2023-06-30', '2023-07-01'), ('2026-01-01', '2026-03-31')]:
+        result = timeline.summary(start, end, countries=countries, teams=teams)
+        expected = reference_monthly(employees, cube, start, end, countries, teams)
+
+        monthly = result['monthly']
+        assert list(monthly['year_month']) == [month for month, _ in expected], (start, end)
+        assert list(monthly['headcount']) == [len(rows) for _, rows in expected], (start, end)
+        np.testing.assert_allclose(monthly['salary_krw'], [rows['monthly_salary_krw'].sum() for _, rows in expected])
+        if not expected:
+            assert result['end_headcount'] == 0 and result['average_headcount'] == 0.0
+            continue
+
+        last = expected[-1][1]
+        assert result['end_headcount'] == len(last)
+        assert result['average_headcount'] == pytest.approx(np.mean([len(rows) for _, rows in expected]))
+        by_country = last['country'].value_counts()
+        assert dict(zip(result['by_country']['country'], result['by_country']['headcount'])) == by_country.to_dict()
+
+        team_average = pd.concat([rows['team'] for _, rows in expected]).value_counts() / len(expected)
+        by_team = result['by_team'].set_index('team')
+        assert set(by_team.index) == set(team_average.index)
+        assert by_team['headcount'].to_dict() == {t: int((last['team'] == t).sum()) for t in by_team.index}
+        np.testing.assert_allclose(by_team['average_headcount'], team_average[by_team.index])
+
+
+def test_edge_employees(employees, cube):
+    summary = HeadcountTimeline(employees.iloc[-10:], cube).summary('2023-01-01', '2024-10-31')
+    monthly = summary['monthly'].set_index('year_month')['headcount']
+    # 처음부터 재직 2명 (데이터 이전 입사, 입사일 없음) + 팀 없는 직원 1명
+    assert monthly['2023-01'] == 3
+    # 3/31 입사 → 3월 말부터, 6/1 퇴사 → 5월 말까지, 6/30 퇴사 → 6월 말까지
+    assert monthly['2023-03'] - monthly['2023-02'] == 2
+    assert monthly['2023-05'] - monthly['2023-06'] == 1
+    assert monthly['2023-06'] - monthly['2023-07'] == 1
+    # 마지막 달: 10/31 입사(국가 없음) +1, 10/30 퇴사(팀 없음) -1
+    assert monthly['2024-10'] == monthly['2024-09']
+    assert summary['by_country']['country'].notna().all()
+
+
+def test_empty_headcount(cube):
+    for df in (None, pd.DataFrame(columns=['join_date', 'leave_date', 'country', 'team', 'monthly_salary_krw'])):
+        summary = HeadcountTimeline(df, cube).summary()
+        assert (summary['monthly']['headcount'] == 0).all()
+        assert summary['end_headcount'] == 0 and summary['by_team'].empty
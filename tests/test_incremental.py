@@ -0,0 +1,27 @@
+"""
+IncrementalSource 증분 추가(append) 결과 vs 같은 파일 전체 재로드
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from cfo.data_sources import TAB_NAMES, LocalCsvSource
+from cfo.incremental import IncrementalSource
+
+
+@pytest.mark.parametrize('tab', ['revenue', 'expense'])
+@pytest.mark.parametrize('splits', [[5], [1, 2], [100, 101, 300], [10, 20, 30, 40]])
+def test_append_matches_full_reload(tmp_path, fake_data, tab, splits):
+    path = os.path.join(tmp_path, TAB_NAMES[tab] + '.csv')
+    df = fake_data[tab].iloc[:600]
+    source = IncrementalSource(LocalCsvSource(str(tmp_path)))
+    for n in splits:
+        df.iloc[:n].to_csv(path, index=False)
+        source.fetch_tab(tab)
+    df.to_csv(path, index=False)
+    appended = source.fetch_tab(tab)
+
+    assert source.last_refresh[tab]['mode'] == 'append'
+    pd.testing.assert_frame_equal(appended, LocalCsvSource(str(tmp_path)).fetch_tab(tab))
@@ -0,0 +1,116 @@
+"""
+PL_Monthly 손익 표 / PlMonthlyStore (마감한 달 고정) vs 원장 pandas 계산
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo import cli
+from cfo.cube import MonthlyCube
+from cfo.pl_store import COUNT_COLUMNS, PL_COLUMNS, PL_KEYS, PlMonthlyStore, pl_monthly_rows
+
+
+def reference_pl(df_revenue, df_expense):
+    """
+    원장 → (연월 × 국가 × 팀) 손익 행 — COGS 는 category_l1 == 'COGS', 나머지 비용은 영업비용
+    """
+    def keyed(df):
+        df = df.dropna(subset=['date', 'country', 'team'])
+        return df.assign(year_month=df['date'].dt.strftime('%Y-%m'))
+
+    revenue = keyed(df_revenue).groupby(PL_KEYS, observed=True)['amount_krw'].agg(revenue_krw='sum', revenue_count='count')
+    expense = keyed(df_expense)
+    cogs = expense['category_l1'] == 'COGS'
+    expense = expense.assign(
+        cogs_krw=expense['amount_krw'].where(cogs, 0.0),
+        operating_expense_krw=expense['amount_krw'].where(~cogs, 0.0),
+    ).groupby(PL_KEYS, observed=True).agg(
+        cogs_krw=('cogs_krw', 'sum'),
+        operating_expense_krw=('operating_expense_krw', 'sum'),
+        expense_count=('amount_krw', 'count'),
+    )
+    pl = revenue.join(expense, how='outer').fillna(0).reset_index()
+    pl['gross_profit_krw'] = pl['revenue_krw'] - pl['cogs_krw']
+    pl['ebitda_krw'] = pl['gross_profit_krw'] - pl['operating_expense_krw']
+    pl['net_profit_krw'] = pl['ebitda_krw']
+    revenue_nonzero = pl['revenue_krw'].where(pl['revenue_krw'] != 0)
+    for margin, profit in [('gross_margin_pct', 'gross_profit_krw'), ('ebitda_margin_pct', 'ebitda_krw'),
+                           ('net_margin_pct', 'net_profit_krw')]:
+        pl[margin] = (pl[profit] / revenue_nonzero * 100).round(1)
+    return normalized(pl)
+
+
+def normalized(pl):
+    pl = pl[PL_COLUMNS + COUNT_COLUMNS].astype({key: object for key in PL_KEYS})
+    pl = pl.astype({column: np.int64 for column in COUNT_COLUMNS})
+    values = [column for column in PL_COLUMNS if column not in PL_KEYS]
+    return pl.astype({column: float for column in values}).sort_values(PL_KEYS, ignore_index=True)
+
+
+def assert_pl_equal(actual, expected):
+    pd.testing.assert_frame_equal(normalized(actual), expected, check_exact=False, rtol=1e-12)
+
+
+@pytest.fixture(scope='module')
+def revised(fake_data):
+    """
+    마감 뒤에 모든 거래 금액이 조정된 원장 (마감한 달은 그대로여야 함)
+    """
+    return {
+        kind: fake_data[kind].assign(amount_krw=fake_data[kind]['amount_krw'] * 1.5)
+        for kind in ('revenue', 'expense')
+    }
+
+
+def test_pl_monthly_rows_matches_reference(fake_data):
+    cube = MonthlyCube(fake_data['revenue'], fake_data['expense'])
+    assert_pl_equal(pl_monthly_rows(cube), reference_pl(fake_data['revenue'], fake_data['expense']))
+
+
+def test_store_keeps_closed_months_and_recomputes_open_months(tmp_path, fake_data, revised):
+    before = MonthlyCube(fake_data['revenue'], fake_data['expense'])
+    after = MonthlyCube(revised['revenue'], revised['expense'])
+    expected_before = reference_pl(fake_data['revenue'], fake_data['expense'])
+    expected_after = reference_pl(revised['revenue'], revised['expense'])
+
+    store = PlMonthlyStore(str(tmp_path), open_months=2)
+    assert_pl_equal(store.update(before), expected_before)
+    closed = list(store.status()['closed'])
+    months = sorted(expected_before['year_month'].unique())
+    assert closed == months[:-2]
+
+    def expected_with(frozen_months):
+        frozen = expected_before['year_month'].isin(frozen_months)
+        live = ~expected_after['year_month'].isin(frozen_months)
+        return normalized(pd.concat([expected_before[frozen], expected_after[live]]))
+
+    # 새 데이터: 마감한 달은 마감 시점 값, 열린 달만 새 값 (다른 프로세스처럼 디스크에서 다시 읽어도 같음)
+    assert_pl_equal(store.update(after), expected_with(closed))
+    assert_pl_equal(PlMonthlyStore(str(tmp_path), open_months=2).update(after), expected_with(closed))
+
+    # 재오픈한 달은 새 값으로 계속 열려 있음
+    store.reopen([closed[3]])
+    assert_pl_equal(store.update(after), expected_with(closed[:3] + closed[4:]))
+
+    # 무효화하면 다음 update 때 지금 데이터로 다시 마감 (재오픈한 달은 제외)
+    store.invalidate()
+    assert_pl_equal(store.update(after), expected_after)
+    assert list(store.status()['closed']) == [m for m in months[:-2] if m != closed[3]]
+
+
+def test_cli_pl_status_is_read_only(tmp_path, fake_data, monkeypatch, capsys):
+    store = PlMonthlyStore(str(tmp_path), open_months=2)
+    store.update(MonthlyCube(fake_data['revenue'], fake_data['expense']))
+    files = {path.name: path.read_bytes() for path in tmp_path.iterdir()}
+
+    # 상태 조회는 데이터를 로드하지 않아야 함
+    monkeypatch.setattr(cli, 'load', lambda args: pytest.fail('--pl-status loaded data'))
+    assert cli.main(['--pl-store', str(tmp_path), '--pl-status', '--pl-open-months', '1']) == 0
+
+    status = json.loads(capsys.readouterr().out)
+    assert list(status['closed']) == list(store.status()['closed'])
+    assert status['open_months'] == 1
+    assert {path.name: path.read_bytes() for path in tmp_path.iterdir()} == files
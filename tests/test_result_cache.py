@@ -0,0 +1,157 @@
+"""
+ResultCache (LRU + 메모리 한도) vs 리스트로 직접 관리하는 LRU, 섹션 캐시 키 (데이터 버전/필터)
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.cube import MonthlyCube
+from cfo.metrics import ALL_FILTERS, SECTIONS, FilterSet, compute_section, section_key
+from cfo.result_cache import ResultCache, estimate_size
+
+
+class ReferenceLRU:
+    """
+    가장 최근에 쓴 키가 끝에 오는 리스트 + 크기 dict
+    """
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries, self.max_bytes = max_entries, max_bytes
+        self.order, self.sizes = [], {}
+        self.hits = self.misses = self.evictions = 0
+
+    def touch(self, key):
+        self.order.remove(key)
+        self.order.append(key)
+
+    def put(self, key, size):
+        if key in self.sizes:
+            self.order.remove(key)
+            del self.sizes[key]
+        if size > self.max_bytes:
+            return
+        self.order.append(key)
+        self.sizes[key] = size
+        while len(self.order) > self.max_entries or sum(self.sizes.values()) > self.max_bytes:
+            del self.sizes[self.order.pop(0)]
+            self.evictions += 1
+
+    def get_or_compute(self, key, size):
+        if key in self.sizes:
+            self.hits += 1
+            self.touch(key)
+        else:
+            self.misses += 1
+            self.put(key, size)
+
+
+def value_of(size):
+    return np.zeros(size, dtype=np.uint8)
+
+
+@pytest.mark.parametrize('max_entries, max_bytes', [(4, 10 ** 9), (50, 3000), (8, 2500)])
+def test_random_operations_match_reference(max_entries, max_bytes):
+    rng = np.random.default_rng(max_entries)
+    cache = ResultCache(max_entries=max_entries, max_bytes=max_bytes)
+    reference = ReferenceLRU(max_entries, max_bytes)
+    for _ in range(2000):
+        key = ('section', int(rng.integers(12)))
+        size = int(rng.choice([100, 400, 1200, 4000]))
+        op = rng.random()
+        if op < 0.6:
+            cache.get_or_compute(key, lambda: value_of(size))
+            reference.get_or_compute(key, estimate_size(value_of(size)))
+        elif op < 0.8:
+            cache.put(key, value_of(size))
+            reference.put(key, estimate_size(value_of(size)))
+        elif cache.get(key) is not None:
+            reference.touch(key)
+
+        assert list(cache._entries) == reference.order
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (reference.hits, reference.misses, reference.evictions)
+    assert stats['bytes'] == sum(reference.sizes.values())
+    assert stats['entries'] <= max_entries and stats['bytes'] <= max_bytes
+
+
+def test_oversized_value_is_not_kept():
+    cache = ResultCache(max_entries=10, max_bytes=1000)
+    cache.put('small', value_of(100))
+    assert len(cache.get_or_compute('big', lambda: value_of(5000))) == 5000
+    assert 'big' not in cache and 'small' in cache
+    assert cache.stats()['evictions'] == 0
+
+
+def test_same_key_is_computed_once():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['value'] * 8
+    assert len(calls) == 1
+    assert cache.stats()['misses'] == 1 and cache.stats()['hits'] == 7
+
+
+def test_failed_compute_is_retried():
+    cache = ResultCache()
+    with pytest.raises(ZeroDivisionError):
+        cache.get_or_compute('key', lambda: 1 / 0)
+    assert 'key' not in cache
+    assert cache.get_or_compute('key', lambda: 2) == 2
+
+
+@pytest.fixture(scope='module')
+def cube(fake_data):
+    return MonthlyCube(fake_data['revenue'], fake_data['expense'], tabs=fake_data)
+
+
+FILTERS = [ALL_FILTERS, FilterSet(pd.Timestamp('2023-03-17'), pd.Timestamp('2024-02-09'), ('Korea',), None)]
+
+
+def assert_same_result(actual, expected):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            assert_same_result(actual[key], expected[key])
+    elif isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(actual, expected)
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(actual, expected)
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize('name', list(SECTIONS))
+def test_cached_sections_match_uncached(fake_data, cube, name):
+    cache = ResultCache()
+    for filters in FILTERS:
+        expected = compute_section(name, cube, fake_data, filters)
+        first = compute_section(name, cube, fake_data, filters, cache=cache, data_version='v1')
+        assert_same_result(first, expected)
+        # 같은 버전/필터는 같은 객체, 다른 버전은 새로 계산
+        assert compute_section(name, cube, fake_data, filters, cache=cache, data_version='v1') is first
+        second = compute_section(name, cube, fake_data, filters, cache=cache, data_version='v2')
+        assert second is not first
+        assert_same_result(second, expected)
+
+
+def test_section_key_drops_unused_filters():
+    filters = FILTERS[1]
+    for name, (_, uses_filters) in SECTIONS.items():
+        key = section_key(name, 'v1', filters)
+        assert key == (name, 'v1', filters if uses_filters else ALL_FILTERS)
+        assert key != section_key(name, 'v2', filters)
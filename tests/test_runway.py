@@ -0,0 +1,147 @@
+"""
+Monte Carlo Runway (경로 × 월 행렬, 묶음별 시드) vs 경로 하나씩 도는 파이썬 시뮬레이션
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo import runway as runway_module
+from cfo.runway import CHUNK_PATHS, PERCENTILES, deal_schedule, forecast_runway, simulate_runway
+
+HORIZON = 24
+
+
+@pytest.fixture(scope='module')
+def inputs(fake_data):
+    """
+    더미 데이터의 월별 비용 이력 + 파이프라인 딜 일정 (첫 예상 계약일이 있는 달부터)
+    """
+    expense = fake_data['expense']
+    burn = expense.groupby(expense['date'].dt.to_period('M'))['amount_krw'].sum().to_numpy()
+    start_month = np.datetime64(fake_data['pipeline']['expected_close_date'].min(), 'M')
+    amounts, probabilities, offsets = deal_schedule(fake_data['pipeline'], start_month, HORIZON)
+    assert len(amounts)
+    return {
+        'start_month': start_month,
+        'start_cash': 4 * burn.mean(),
+        'burn_history': burn,
+        'amounts': amounts,
+        'probabilities': probabilities,
+        'offsets': offsets,
+    }
+
+
+def simulation_inputs(inputs):
+    return {name: value for name, value in inputs.items() if name != 'start_month'}
+
+
+def reference_paths(seed, n_paths, start_cash, burn_history, amounts, probabilities, offsets, horizon):
+    """
+    같은 난수 순서로 경로마다 월을 하나씩 진행 (처음 음수가 되는 달 안에서 선형 보간)
+    """
+    rng = np.random.default_rng(seed)
+    burn = rng.choice(burn_history, size=(n_paths, horizon))
+    closes = rng.random((n_paths, len(amounts))) < probabilities
+    runways, paths = [], []
+    for p in range(n_paths):
+        cash, path, runway = start_cash, [], None
+        for month in range(horizon):
+            inflow = sum(amount for amount, month_offset, closed in zip(amounts, offsets, closes[p])
+                         if closed and month_offset == month)
+            previous, cash = cash, cash + inflow - burn[p, month]
+            path.append(cash)
+            if runway is None and cash < 0:
+                runway = month + (previous / (previous - cash) if previous > cash else 0.0)
+        runways.append(0.0 if start_cash < 0 else (horizon if runway is None else runway))
+        paths.append(path)
+    return np.array(runways, dtype=float), np.array(paths)
+
+
+def test_chunk_matches_reference(inputs):
+    inputs = simulation_inputs(inputs)
+    seed = np.random.SeedSequence(3).spawn(1)[0]
+    args = (inputs['start_cash'], inputs['burn_history'], inputs['amounts'], inputs['probabilities'],
+            inputs['offsets'], HORIZON)
+    runway, cash = runway_module._simulate_chunk(seed, 300, *args)
+    expected_runway, expected_cash = reference_paths(seed, 300, *args)
+    np.testing.assert_allclose(runway, expected_runway, rtol=1e-9)
+    np.testing.assert_allclose(cash, expected_cash.astype(np.float32), rtol=1e-6)
+    assert 0 < (runway < 6).mean() < 1
+
+
+@pytest.mark.parametrize('n_paths', [CHUNK_PATHS // 2, 2 * CHUNK_PATHS + 17])
+def test_workers_do_not_change_result(inputs, n_paths):
+    inputs = simulation_inputs(inputs)
+    single = simulate_runway(n_paths=n_paths, horizon=HORIZON, seed=11, workers=1, **inputs)
+    for workers in (2, 3):
+        runway, cash = simulate_runway(n_paths=n_paths, horizon=HORIZON, seed=11, workers=workers, **inputs)
+        np.testing.assert_array_equal(runway, single[0])
+        np.testing.assert_array_equal(cash, single[1])
+    assert single[0].shape == (n_paths,) and single[1].shape == (n_paths, HORIZON)
+
+    again = simulate_runway(n_paths=n_paths, horizon=HORIZON, seed=11, **inputs)
+    other = simulate_runway(n_paths=n_paths, horizon=HORIZON, seed=12, **inputs)
+    np.testing.assert_array_equal(again[0], single[0])
+    assert not np.array_equal(other[0], single[0])
+
+
+def test_chunks_are_prefix_stable(inputs):
+    inputs = simulation_inputs(inputs)
+    # 경로 수를 늘려도 앞 묶음의 경로는 같음 (묶음 크기 고정)
+    small, _ = simulate_runway(n_paths=CHUNK_PATHS, horizon=HORIZON, seed=5, **inputs)
+    large, _ = simulate_runway(n_paths=CHUNK_PATHS + 100, horizon=HORIZON, seed=5, **inputs)
+    np.testing.assert_array_equal(large[:CHUNK_PATHS], small)
+
+
+@pytest.mark.parametrize('start_cash, burn, expected', [
+    (1000.0, [300.0], 1000 / 300),
+    (1000.0, [0.0], HORIZON),
+    (-5.0, [300.0], 0.0),
+    (900.0, [300.0], 3.0),
+    (1000.0, [np.nan, 250.0], 4.0),
+])
+def test_constant_burn_runway(start_cash, burn, expected):
+    runway, cash = simulate_runway(start_cash, burn, np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.int64),
+                                   n_paths=50, horizon=HORIZON, workers=2)
+    np.testing.assert_allclose(runway, expected)
+    np.testing.assert_allclose(cash[0], start_cash - np.nanmax(burn) * np.arange(1, HORIZON + 1))
+
+
+def reference_schedule(df_pipeline, start_month, horizon):
+    rows = []
+    for deal in df_pipeline.itertuples():
+        close = pd.Timestamp(deal.expected_close_date)
+        probability = min(max(deal.probability / 100, 0), 1)
+        if pd.isna(close) or not np.isfinite(deal.amount_krw) or not probability > 0:
+            continue
+        offset = (close.year - start_month.year) * 12 + close.month - start_month.month
+        if offset < horizon:
+            rows.append((deal.amount_krw, probability, max(offset, 0)))
+    return rows
+
+
+def test_deal_schedule_matches_reference(fake_data):
+    pipeline = fake_data['pipeline'].copy()
+    pipeline.loc[pipeline.index[0], 'expected_close_date'] = None
+    pipeline.loc[pipeline.index[1], 'probability'] = 0
+    pipeline.loc[pipeline.index[2], 'probability'] = 150
+    first = pipeline['expected_close_date'].min().strftime('%Y-%m')
+    for start, horizon in [(first, 24), ('2023-06', 6), ('2030-01', 12), (first, 3)]:
+        amounts, probabilities, offsets = deal_schedule(pipeline, np.datetime64(start, 'M'), horizon)
+        expected = reference_schedule(pipeline, pd.Timestamp(start), horizon)
+        assert list(zip(amounts, probabilities, offsets)) == expected, start
+    assert len(deal_schedule(None, np.datetime64('2024-11', 'M'), HORIZON)[0]) == 0
+
+
+def test_forecast_summary_matches_paths(fake_data, inputs):
+    start_month = pd.Timestamp(inputs['start_month']) + pd.Timedelta(days=14)
+    result = forecast_runway(inputs['start_cash'], inputs['burn_history'], fake_data['pipeline'], start_month,
+                             n_paths=3000, horizon=HORIZON, seed=2, workers=2)
+    runway, cash = simulate_runway(n_paths=3000, horizon=HORIZON, seed=2, **simulation_inputs(inputs))
+    assert result['runway'] == {p: pytest.approx(np.percentile(runway, p)) for p in PERCENTILES}
+    assert result['prob_out_6m'] == pytest.approx((runway < 6).mean())
+    assert result['prob_out_12m'] == pytest.approx((runway < 12).mean())
+    assert result['fan']['month'].iloc[0] == start_month.strftime('%Y-%m')
+    np.testing.assert_allclose(result['fan']['cash_p50'], np.percentile(cash, 50, axis=0), rtol=1e-6)
+    assert result['n_deals'] == len(inputs['amounts'])
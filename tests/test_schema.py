@@ -0,0 +1,116 @@
+"""
+apply_schema / concat_typed (나눠 읽은 청크 이어 붙이기) vs 문자열 원본을 한 번에 pandas 로 변환한 결과
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.schema import TAB_SCHEMAS, TRUE_VALUES, apply_schema, concat_typed
+
+
+def as_raw(df):
+    """
+    시트에서 막 읽은 것처럼 Categorical 컬럼을 문자열로
+    """
+    return df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+
+
+def reference_column(series, spec):
+    """
+    컬럼 하나를 스키마 규칙대로 직접 변환
+    """
+    if isinstance(spec, list):
+        extra = sorted({v for v in series.dropna() if v not in spec}, key=str)
+        return pd.Series(pd.Categorical(series, categories=spec + extra), index=series.index, name=series.name)
+    if spec == 'label':
+        if series.nunique(dropna=True) > len(series) // 2:
+            return series
+        return series.astype('category')
+    if spec == 'amount':
+        return pd.to_numeric(series, errors='coerce').astype('float64')
+    if spec == 'small':
+        numeric = pd.to_numeric(series, errors='coerce')
+        if numeric.isna().any() or (numeric != np.floor(numeric)).any():
+            return numeric.astype('float64')
+        return pd.to_numeric(numeric.astype('int64'), downcast='integer')
+    return series.astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+
+
+def reference_schema(tab, df):
+    frame = df.copy()
+    for column, spec in TAB_SCHEMAS[tab].items():
+        if column in frame.columns:
+            frame[column] = reference_column(frame[column], spec)
+    return frame
+
+
+@pytest.fixture(scope='module')
+def raw(fake_data):
+    """
+    문자열 탭 + 목록에 없는 값/결측값이 섞인 매출 탭
+    """
+    data = {tab: as_raw(df) for tab, df in fake_data.items()}
+    revenue = data['revenue'].copy()
+    revenue.loc[revenue.index[5], 'country'] = 'Zambia'
+    revenue.loc[revenue.index[6], 'country'] = 'Austria'
+    revenue.loc[revenue.index[7], 'team'] = None
+    revenue.loc[revenue.index[8], 'client_name'] = np.nan
+    data['revenue'] = revenue
+    return data
+
+
+@pytest.mark.parametrize('tab', list(TAB_SCHEMAS))
+def test_apply_schema_matches_reference(raw, tab):
+    df = raw[tab]
+    actual = apply_schema(tab, df)
+    pd.testing.assert_frame_equal(actual, reference_schema(tab, df), obj=tab)
+    # 이미 변환된 탭은 그대로 반환
+    assert apply_schema(tab, actual) is actual
+
+
+def test_fixed_categories_keep_list_order(raw):
+    country = apply_schema('revenue', raw['revenue'])['country']
+    known = TAB_SCHEMAS['revenue']['country']
+    assert list(country.cat.categories) == known + ['Austria', 'Zambia']
+
+
+def chunked(df, bounds):
+    return [df.iloc[lo:hi] for lo, hi in zip([0] + bounds, bounds + [len(df)])]
+
+
+@pytest.mark.parametrize('tab', list(TAB_SCHEMAS))
+@pytest.mark.parametrize('bounds', [[1], [3, 10], [500, 1000, 1001], [-4]])
+def test_concat_typed_matches_single_read(raw, tab, bounds):
+    df = raw[tab]
+    bounds = [b % len(df) if b < 0 else min(b, len(df)) for b in bounds]
+    chunks = [apply_schema(tab, chunk) for chunk in chunked(df, bounds)]
+    actual = concat_typed(chunks, tab=tab)
+    pd.testing.assert_frame_equal(actual, apply_schema(tab, df.reset_index(drop=True)), obj=tab)
+
+
+def test_unknown_value_in_later_chunk_goes_after_list(raw):
+    df = raw['revenue'].iloc[:200].copy()
+    df.loc[df.index[150], 'currency'] = 'AAA'
+    chunks = [apply_schema('revenue', chunk) for chunk in chunked(df, [100])]
+    assert 'AAA' not in chunks[0]['currency'].cat.categories
+
+    currency = concat_typed(chunks, tab='revenue')['currency']
+    assert list(currency.cat.categories) == TAB_SCHEMAS['revenue']['currency'] + ['AAA']
+    assert list(currency.astype(object)) == list(df['currency'])
+
+
+def test_concat_without_tab_uses_first_seen_order():
+    first = pd.DataFrame({'label': pd.Categorical(['b', 'a'], categories=['b', 'a'])})
+    second = pd.DataFrame({'label': pd.Categorical(['c', 'a'], categories=['c', 'a'])})
+    third = pd.DataFrame({'label': ['d', 'b']})
+    label = concat_typed([first, second, third])['label']
+    assert list(label.cat.categories) == ['b', 'a', 'c', 'd']
+    assert list(label.astype(object)) == ['b', 'a', 'c', 'a', 'd', 'b']
+
+
+def test_concat_empty_chunks(raw):
+    df = apply_schema('expense', raw['expense'])
+    assert concat_typed([df.iloc[:0], df, df.iloc[:0]], tab='expense').equals(df.reset_index(drop=True))
+    empty = concat_typed([df.iloc[:0], df.iloc[:0]], tab='expense')
+    assert len(empty) == 0 and list(empty.dtypes) == list(df.dtypes)
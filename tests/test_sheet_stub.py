@@ -0,0 +1,42 @@
+"""
+load_all_tabs + 구글 시트 대역 서버 — 느린 탭(타임아웃)과 503 탭이 있어도 나머지 탭은 마감 시간 안에 반환
+"""
+
+import time
+
+import pytest
+
+from cfo.data_sources import SheetCsvSource, load_all_tabs
+from cfo.fake_data import generate_fake_data
+from cfo.sheet_stub import start_stub_server
+
+TIMEOUT = 0.3
+RETRIES = 1
+BACKOFF = 0.1
+
+
+@pytest.fixture(scope='module')
+def stub():
+    frames = generate_fake_data(n_revenue=200, n_expense=200, n_employees=20, seed=1)
+    server, urls = start_stub_server(frames, tab_latency={'cash': 5.0}, fail_tabs=['pipeline'])
+    yield frames, urls
+    server.shutdown()
+    server.server_close()
+
+
+def test_slow_and_failing_tabs_are_reported_without_blocking(stub):
+    frames, urls = stub
+    started = time.perf_counter()
+    result = load_all_tabs(SheetCsvSource(urls), timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 2.5
+    assert set(result.errors) == {'cash', 'pipeline'}
+    assert '503' in result.errors['pipeline']
+    assert set(result.data) == set(frames) - {'cash', 'pipeline'}
+
+    # 실패한 탭은 재시도까지 모두 시도, 성공한 탭은 한 번에
+    assert result.attempts['pipeline'] == RETRIES + 1
+    assert result.attempts['cash'] == RETRIES + 1
+    assert all(result.attempts[tab] == 1 for tab in result.data)
+    assert len(result.data['revenue']) == len(frames['revenue'])
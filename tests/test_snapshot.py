@@ -0,0 +1,134 @@
+"""
+스냅샷 저장 → 다시 읽기 vs 원래 탭 (타입, 카테고리, 결측값, 형식 버전)
+"""
+
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo import snapshot
+from cfo.data_sources import LoadResult
+from cfo.schema import apply_schema
+from cfo.snapshot import MANIFEST_FILE, SnapshotCache, load_snapshot, read_manifest, save_snapshot
+
+
+@pytest.fixture(scope='module')
+def tabs(fake_data):
+    """
+    스키마 변환한 더미 탭 + 결측값/특수 타입이 섞인 탭
+    """
+    data = {tab: apply_schema(tab, df) for tab, df in fake_data.items()}
+    data['mixed'] = pd.DataFrame({
+        'text': ['가나다', None, '', 'EXP-0001', 'line\nbreak'],
+        'amount': [1.5, np.nan, 0.0, -2.0, 3.25],
+        'day': pd.to_datetime(['2024-01-01', None, '2024-02-29', '2023-12-31', '2024-03-01']),
+        'label': pd.Categorical(['b', None, 'a', 'b', 'c'], categories=['c', 'b', 'a'], ordered=True),
+        'number_label': pd.Categorical([3, 1, None, 3, 2]),
+        'flag': [True, False, True, True, False],
+        'mixed': ['a', 1, None, 2.5, 'b'],
+        'nul': ['a\x00b', 'c', 'd', None, 'e'],
+    })
+    return data
+
+
+def assert_same_tab(actual, expected):
+    assert list(actual.columns) == list(expected.columns)
+    for column in expected.columns:
+        a, e = actual[column], expected[column]
+        if isinstance(a.values, np.memmap):
+            # memory-map 으로 연 컬럼은 일반 배열로 복사해서 비교
+            a = pd.Series(np.array(a), index=a.index, name=a.name)
+        if isinstance(a.dtype, pd.StringDtype) or a.dtype == object:
+            # 문자열 컬럼은 pyarrow 가 있으면 Arrow 문자열로 열리고 결측은 한 가지 값으로 (값/결측 위치는 같아야 함)
+            assert e.dtype == object or isinstance(e.dtype, pd.StringDtype), column
+            a = a.astype(object).where(a.notna(), np.nan)
+            e = e.astype(object).where(e.notna(), np.nan)
+        pd.testing.assert_series_equal(a, e, check_names=False, obj=column)
+
+
+def test_round_trip_matches_original(tmp_path, tabs):
+    save_snapshot(tabs, str(tmp_path))
+    for mmap in (True, False):
+        data, manifest = load_snapshot(str(tmp_path), mmap=mmap)
+        assert set(data) == set(tabs)
+        for tab, df in tabs.items():
+            assert manifest['tabs'][tab]['rows'] == len(df)
+            assert_same_tab(data[tab], df)
+
+    kinds = {meta['name']: meta['kind'] for meta in manifest['tabs']['mixed']['columns']}
+    assert kinds == {
+        'text': 'text', 'amount': 'array', 'day': 'array', 'label': 'category', 'number_label': 'pickle',
+        'flag': 'array', 'mixed': 'pickle', 'nul': 'pickle',
+    }
+    assert manifest['tabs']['revenue']['columns'][0] == {'name': 'transaction_id', 'kind': 'text'}
+
+
+def test_round_trip_without_pyarrow(tmp_path, tabs, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    save_snapshot(tabs, str(tmp_path))
+    data, _ = load_snapshot(str(tmp_path))
+    for tab, df in tabs.items():
+        for column in df.columns:
+            assert not isinstance(data[tab][column].dtype, pd.StringDtype)
+        assert_same_tab(data[tab], df)
+
+
+def test_empty_tab_round_trip(tmp_path, tabs):
+    empty = {tab: df.iloc[:0] for tab, df in tabs.items()}
+    save_snapshot(empty, str(tmp_path))
+    data, _ = load_snapshot(str(tmp_path))
+    for tab, df in empty.items():
+        assert len(data[tab]) == 0
+        assert list(data[tab].columns) == list(df.columns)
+
+
+def test_unchanged_tab_keeps_hash_and_folder(tmp_path, tabs):
+    first = save_snapshot(tabs, str(tmp_path))
+    changed = dict(tabs, budget=tabs['budget'].assign(revenue_target_krw=tabs['budget']['revenue_target_krw'] + 1))
+    second = save_snapshot(changed, str(tmp_path))
+    assert second['tabs']['revenue'] == first['tabs']['revenue']
+    assert second['tabs']['budget']['hash'] != first['tabs']['budget']['hash']
+
+    # 같은 값이면 object/문자열 타입과 상관없이 같은 해시
+    as_string = tabs['revenue'].astype({'transaction_id': 'string'})
+    assert snapshot.encode_tab(as_string)[2] == snapshot.encode_tab(tabs['revenue'])[2]
+
+
+def test_other_format_version_is_rejected(tmp_path, tabs):
+    save_snapshot({'budget': tabs['budget']}, str(tmp_path))
+    path = os.path.join(str(tmp_path), MANIFEST_FILE)
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['format'] = snapshot.SNAPSHOT_FORMAT_VERSION - 1
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    assert read_manifest(str(tmp_path)) is None
+    assert load_snapshot(str(tmp_path)) == (None, None)
+
+
+def test_cache_sets_versions_before_returning(tmp_path, tabs):
+    data = {tab: df for tab, df in tabs.items() if tab != 'mixed'}
+    cache = SnapshotCache(str(tmp_path), lambda: LoadResult(data=dict(data), source='test'))
+
+    # 스냅샷이 없으면 로더 결과를 그대로 넘김 — 버전은 넘기기 전에 정해지고 저장 후에도 그대로
+    first = cache.get()
+    version = first.data_version
+    assert set(first.versions) == set(data)
+    for thread in [t for t in threading.enumerate() if t.name == 'cfo-snapshot-save']:
+        thread.join()
+    assert first.data_version == version
+    assert {tab: info['hash'] for tab, info in read_manifest(str(tmp_path))['tabs'].items()} == first.versions
+
+    # 재시작 후 스냅샷으로 연 결과도 같은 버전
+    restarted = SnapshotCache(str(tmp_path), lambda: LoadResult(data=dict(data), source='test'))
+    served = restarted.get()
+    assert served.source == 'snapshot'
+    assert served.data_version == version
+    restarted._refresh_thread.join()
+    assert restarted.get().data_version == version
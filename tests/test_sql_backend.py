@@ -0,0 +1,110 @@
+"""
+SqlCube (SQLite 쿼리) vs 원장 pandas 계산 / 메모리 큐브 — 셀, 합계, 모든 대시보드 섹션
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.cube import CUBE_DIMENSIONS
+from cfo.metrics import SECTIONS, MetricsEngine
+from cfo.schema import apply_schema
+from cfo.sql_backend import make_cube
+
+SELECTIONS = [
+    {},
+    {'countries': ['Korea']},
+    {'countries': ['USA', 'Vietnam'], 'teams': ['EO School', 'Branded Content']},
+]
+
+
+def reference_cells(df, kind, start=None, end=None, countries=None, teams=None):
+    """
+    기간/국가/팀 조건의 원장 → (year_month × 큐브 차원) 합계/건수, 키 순 정렬
+    """
+    dimensions = CUBE_DIMENSIONS[kind]
+    rows = df.dropna(subset=['date'] + dimensions)
+    if start is not None:
+        rows = rows[rows['date'] >= pd.Timestamp(start)]
+    if end is not None:
+        rows = rows[rows['date'] <= pd.Timestamp(end)]
+    if countries:
+        rows = rows[rows['country'].isin(countries)]
+    if teams:
+        rows = rows[rows['team'].isin(teams)]
+    keys = [rows['date'].dt.strftime('%Y-%m').rename('year_month')] + [rows[d].astype(object) for d in dimensions]
+    cells = rows.groupby(keys, observed=True)['amount_krw'].agg(['sum', 'count']).reset_index()
+    return cells.rename(columns={'sum': 'amount_krw'})
+
+
+def plain(cells, kind):
+    """
+    비교용 — 차원은 문자열, 키 순 정렬
+    """
+    keys = ['year_month'] + CUBE_DIMENSIONS[kind]
+    cells = cells[keys + ['amount_krw', 'count']].astype({d: object for d in keys})
+    cells = cells.astype({'amount_krw': float, 'count': np.int64})
+    return cells.sort_values(keys).reset_index(drop=True)
+
+
+def assert_same(a, b, path=''):
+    """
+    섹션 결과 (dict / list / DataFrame / 숫자) 비교
+    """
+    if isinstance(a, dict):
+        assert set(a) == set(b), path
+        for key in a:
+            assert_same(a[key], b[key], f'{path}.{key}')
+    elif isinstance(a, list):
+        assert len(a) == len(b), path
+        for i, (x, y) in enumerate(zip(a, b)):
+            assert_same(x, y, f'{path}[{i}]')
+    elif isinstance(a, pd.DataFrame):
+        pd.testing.assert_frame_equal(
+            a.reset_index(drop=True), b.reset_index(drop=True), check_exact=False, rtol=1e-9, obj=path,
+        )
+    elif isinstance(a, (float, np.floating)):
+        assert (np.isnan(a) and np.isnan(b)) or np.isclose(a, b, rtol=1e-9, atol=1e-6), (path, a, b)
+    else:
+        assert a == b, (path, a, b)
+
+
+@pytest.fixture(scope='module')
+def tabs(fake_data):
+    return {tab: apply_schema(tab, df) for tab, df in fake_data.items()}
+
+
+@pytest.fixture(scope='module')
+def sql_cube(tabs):
+    return make_cube(tabs, data_version='test', backend='sqlite')
+
+
+@pytest.mark.parametrize('kind', ['revenue', 'expense'])
+def test_cells_match_reference(tabs, sql_cube, periods, kind):
+    for start, end in periods:
+        for selections in SELECTIONS:
+            if kind == 'expense':
+                selections = {'countries': selections.get('countries')}
+            expected = plain(reference_cells(tabs[kind], kind, start, end, **selections), kind)
+            actual = plain(sql_cube.cells(kind, start, end, **selections), kind)
+            pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-12)
+
+
+def test_bounds_and_totals_match_reference(tabs, sql_cube, periods):
+    dates = pd.concat([tabs['revenue']['date'], tabs['expense']['date']])
+    assert sql_cube.min_date == dates.min() and sql_cube.max_date == dates.max()
+    for start, end in periods:
+        for selections in SELECTIONS:
+            expected = reference_cells(tabs['revenue'], 'revenue', start, end, **selections)['amount_krw'].sum()
+            actual = sql_cube.total('revenue', start, end, **selections)
+            assert np.isclose(actual, expected, rtol=1e-12, atol=1e-3)
+
+
+def test_sections_match_memory_cube(tabs, sql_cube, periods):
+    memory = MetricsEngine(tabs)
+    sql = MetricsEngine(tabs, cube=sql_cube)
+    for start, end in periods:
+        for selections in SELECTIONS:
+            filters = memory.filters(start, end, **selections)
+            for name in SECTIONS:
+                assert_same(memory.section(name, filters), sql.section(name, filters), f'{name}{tuple(filters)}')
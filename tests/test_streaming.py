@@ -0,0 +1,79 @@
+"""
+스트리밍 수집 (RowStore / DailyFold / StreamingCsvSource) vs 파일 전체를 한 번에 읽은 pandas 결과
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from cfo.cube import MONTHLY_CUBE, MonthlyCube, aggregate_daily
+from cfo.data_sources import TAB_NAMES, LocalCsvSource, StreamingCsvSource, load_all_tabs, parse_tab, read_tab_csv
+from cfo.fx import FxConverter
+from cfo.streaming import DailyFold, RowStore, count_rows
+
+
+@pytest.fixture(scope='module')
+def csv_dir(tmp_path_factory, fake_data):
+    directory = tmp_path_factory.mktemp('csv')
+    for tab, df in fake_data.items():
+        df.to_csv(os.path.join(directory, f'{TAB_NAMES[tab]}.csv'), index=False)
+    return str(directory)
+
+
+def read_chunks(path, tab, chunk_rows):
+    """
+    CSV → 검증/타입 지정한 청크 목록 (StreamingCsvSource 와 같은 방식)
+    """
+    chunks, first_row = [], 2
+    for chunk in read_tab_csv(tab, path, chunksize=chunk_rows):
+        frame, _ = parse_tab(tab, chunk, first_row=first_row)
+        chunks.append(frame)
+        first_row += len(chunk)
+    return chunks
+
+
+@pytest.mark.parametrize('tab', ['revenue', 'expense'])
+@pytest.mark.parametrize('chunk_rows', [97, 1000, 100_000])
+@pytest.mark.parametrize('exact_capacity', [True, False])
+def test_row_store_matches_whole_file(csv_dir, tab, chunk_rows, exact_capacity):
+    path = os.path.join(csv_dir, f'{TAB_NAMES[tab]}.csv')
+    expected, _ = parse_tab(tab, pd.read_csv(path))
+
+    # 상한보다 작게 시작하면 중간에 배열을 늘림
+    store = RowStore(tab, count_rows(path)[0] if exact_capacity else 16)
+    for frame in read_chunks(path, tab, chunk_rows):
+        store.append(frame)
+    pd.testing.assert_frame_equal(store.frame(), expected)
+
+
+@pytest.mark.parametrize('kind', ['revenue', 'expense'])
+@pytest.mark.parametrize('compact_rows', [50, 200_000])
+def test_daily_fold_matches_whole_file(csv_dir, kind, compact_rows):
+    path = os.path.join(csv_dir, f'{TAB_NAMES[kind]}.csv')
+    expected, _ = parse_tab(kind, pd.read_csv(path))
+
+    fold = DailyFold(kind, compact_rows=compact_rows)
+    for frame in read_chunks(path, kind, 250):
+        fold.add(frame)
+    pd.testing.assert_frame_equal(fold.cells(), aggregate_daily(expected, kind), check_exact=False, rtol=1e-12)
+
+
+@pytest.mark.parametrize('fx_mode', [None, 'month_end'])
+def test_streaming_source_matches_local_source(csv_dir, fx_mode):
+    whole = load_all_tabs(LocalCsvSource(csv_dir))
+    streamed = load_all_tabs(StreamingCsvSource(csv_dir, chunk_rows=333, fx_mode=fx_mode))
+    if fx_mode is not None:
+        whole.data = FxConverter(fx_mode).apply(whole.data)
+        streamed.data = FxConverter(fx_mode).apply(streamed.data)
+
+    assert set(streamed.data) == set(whole.data)
+    for tab in whole.data:
+        pd.testing.assert_frame_equal(streamed.data[tab], whole.data[tab], check_exact=False, rtol=1e-12)
+
+    # 스트리밍 중에 집계한 큐브 = 다 읽은 원장으로 만든 큐브
+    cube = streamed.derived[MONTHLY_CUBE]
+    expected = MonthlyCube(whole.data['revenue'], whole.data['expense'])
+    for kind in ('revenue', 'expense'):
+        pd.testing.assert_frame_equal(cube.daily[kind], expected.daily[kind], check_exact=False, rtol=1e-12)
+        pd.testing.assert_frame_equal(cube.monthly[kind], expected.monthly[kind], check_exact=False, rtol=1e-12)
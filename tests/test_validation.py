@@ -0,0 +1,160 @@
+"""
+validate_tab (고유값 단위 변환 + 격리) vs 값 하나씩 변환하는 파이썬 기준 구현
+"""
+
+import datetime
+import io
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfo.data_sources import TAB_NAMES, parse_tab, read_tab_csv
+from cfo.schema import FALSE_VALUES, TRUE_VALUES
+from cfo.validation import (
+    DATE_FORMATS, ISSUE_DATE, ISSUE_MISSING, ISSUE_NUMBER, ISSUE_UNKNOWN, MISSING_VALUES,
+    parse_bools, parse_dates, parse_numbers, validate_tab,
+)
+
+
+def reference_date(value):
+    """
+    값 하나 → Timestamp / None(빈 값) / 'invalid'
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)) or str(value).strip() in MISSING_VALUES:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return pd.Timestamp(datetime.datetime.strptime(str(value).strip(), fmt))
+        except ValueError:
+            continue
+    return 'invalid'
+
+
+def reference_number(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)) or str(value).strip() in MISSING_VALUES:
+        return None
+    for text in (str(value), re.sub(r'[,\s₩$%]', '', str(value))):
+        try:
+            return float(text)
+        except ValueError:
+            continue
+    return 'invalid'
+
+
+def reference_bool(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES or text in MISSING_VALUES:
+        return False
+    return 'invalid'
+
+
+DATES = [
+    '2024-03-05', '2024-03-05 13:45:00', '2024/03/05', '2024. 3. 5', '2024.03.05', '03/05/2024', ' 2024-03-05 ',
+    '2024-02-29', '2023-02-29', '2024-13-01', '05.03.2024', 'March 5', '', '-', '  ', None, '2024-03-05',
+]
+NUMBERS = [
+    '1234', '1,234', '₩1,234,567', '$12.50', '12%', ' 1 000 ', '-3.5', '1e3', '', '-', None, 'abc', '12원', '₩',
+]
+BOOLS = [t.upper() for t in TRUE_VALUES] + FALSE_VALUES + [' True ', 'fAlSe', '', 'maybe', '2', None]
+
+
+def as_input(values, categorical):
+    series = pd.Series(values, dtype=object, name='value')
+    return series.astype('category') if categorical else series
+
+
+@pytest.mark.parametrize('categorical', [False, True])
+def test_parse_dates_matches_reference(categorical):
+    values, invalid, missing = parse_dates(as_input(DATES, categorical))
+    expected = [reference_date(v) for v in DATES]
+    for value, bad, blank, want, raw in zip(values, invalid, missing, expected, DATES):
+        assert bad == (want == 'invalid'), raw
+        assert blank == (want is None), raw
+        assert (pd.isna(value) if want in (None, 'invalid') else value == want), raw
+
+
+@pytest.mark.parametrize('categorical', [False, True])
+def test_parse_numbers_matches_reference(categorical):
+    values, invalid, missing = parse_numbers(as_input(NUMBERS, categorical))
+    expected = [reference_number(v) for v in NUMBERS]
+    for value, bad, blank, want, raw in zip(values, invalid, missing, expected, NUMBERS):
+        assert bad == (want == 'invalid'), raw
+        assert blank == (want is None), raw
+        assert (np.isnan(value) if want in (None, 'invalid') else value == want), raw
+
+
+@pytest.mark.parametrize('categorical', [False, True])
+def test_parse_bools_matches_reference(categorical):
+    values, invalid, missing = parse_bools(as_input(BOOLS, categorical))
+    expected = [reference_bool(v) for v in BOOLS]
+    for value, bad, blank, want, raw in zip(values, invalid, missing, expected, BOOLS):
+        assert bad == (want == 'invalid'), raw
+        assert blank == (want is None), raw
+        assert value == (want is True), raw
+
+
+CSV = """transaction_id,date,country,team,amount_krw,currency,payment_status,notes
+REV-1,2024-01-05,Korea,EO School,"1,000",KRW,Paid,
+REV-2,2024/01/06, usa ,Video Production,₩2000,USD,pending,x
+REV-3,not a date,Korea,EO School,3000,KRW,Paid,
+REV-4,2024-01-08,Japan,EO School,,KRW,Paid,
+REV-5,,Korea,Branded Content,abc,KRW,Paid,
+REV-6,01/09/2024,Vietnam,EO School,$6.5,VND,Overdue,
+"""
+
+
+@pytest.mark.parametrize('reader', [pd.read_csv, lambda source: read_tab_csv('revenue', source)])
+def test_quarantine_rows_and_reasons(reader):
+    frame, report = validate_tab('revenue', reader(io.StringIO(CSV)), first_row=10)
+
+    assert report.rows == 6 and report.valid_rows == 3
+    assert list(frame['transaction_id']) == ['REV-1', 'REV-2', 'REV-6']
+    assert list(frame['amount_krw']) == [1000.0, 2000.0, 6.5]
+    assert list(frame['date']) == list(pd.to_datetime(['2024-01-05', '2024-01-06', '2024-01-09']))
+    assert list(frame['country']) == ['Korea', 'USA', 'Vietnam']
+    assert list(frame['payment_status']) == ['Paid', 'Pending', 'Overdue']
+
+    # 줄 번호는 first_row 부터, 사유는 격리 원인이 된 컬럼별로
+    quarantined = report.quarantined
+    assert list(quarantined['row']) == [12, 13, 14]
+    assert list(quarantined['transaction_id']) == ['REV-3', 'REV-4', 'REV-5']
+    assert list(quarantined['reason']) == [
+        f'date: {ISSUE_DATE}',
+        f'amount_krw: {ISSUE_MISSING}',
+        f'date: {ISSUE_MISSING}; amount_krw: {ISSUE_NUMBER}',
+    ]
+
+    issues = {(row['column'], row['issue']): row for row in report.issues.to_dict('records')}
+    assert issues[('date', ISSUE_DATE)]['examples'] == ['not a date']
+    assert issues[('amount_krw', ISSUE_NUMBER)]['count'] == 1
+    # 목록에 없는 값은 격리하지 않고 리포트에만
+    assert issues[('country', ISSUE_UNKNOWN)]['examples'] == ['Japan']
+    assert not issues[('country', ISSUE_UNKNOWN)]['quarantined']
+
+
+@pytest.mark.parametrize('tab', ['revenue', 'expense', 'cash', 'headcount', 'exchange_rates'])
+def test_category_reader_matches_object_reader(tmp_path, fake_data, tab):
+    path = os.path.join(str(tmp_path), f'{TAB_NAMES[tab]}.csv')
+    df = fake_data[tab].copy()
+    # 형식이 섞이거나 깨진 값 몇 개
+    date_column = next(c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c]))
+    df[date_column] = df[date_column].dt.strftime('%Y-%m-%d').astype(object)
+    df.loc[df.index[1], date_column] = df[date_column].iloc[1].replace('-', '/')
+    df.loc[df.index[2], date_column] = 'bad'
+    df.to_csv(path, index=False)
+
+    expected, expected_report = parse_tab(tab, pd.read_csv(path))
+    actual, report = parse_tab(tab, read_tab_csv(tab, path))
+    pd.testing.assert_frame_equal(actual, expected)
+    pd.testing.assert_frame_equal(report.issues, expected_report.issues)
+    assert len(report.quarantined) == len(expected_report.quarantined)
+    if len(expected_report.quarantined):
+        for column in ('row', 'reason'):
+            assert list(report.quarantined[column]) == list(expected_report.quarantined[column])